@@ -9,6 +9,8 @@ from tkinter import ttk, messagebox
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from Punkt3_settings import CONFIG
+from punkt_column_store import COLUMN_STORE_EXT, is_column_store, column_store_size_bytes
+from punkt_mtf_container import is_mtf_container, read_mtf_catalog, mtf_container_size_bytes
 
 class FileUtils:
     """Datei-bezogene Hilfsfunktionen"""
@@ -39,24 +41,8 @@ class FileUtils:
                     else:
                         base_name = metadata_file.replace('_metadata.json', '')
 
-                    # Prüfe Daten-Dateien (H5 und VBT Pickle)
-                    data_files = []
-                    total_size = 0
-                    for tf in metadata.get('timeframes', []):
-                        # Prüfe verschiedene Datei-Formate
-                        possible_files = [
-                            f"{base_name}_{tf}_VBT.pickle",  # VBT Pickle (bevorzugt)
-                            f"{base_name}_{tf}_VBT.h5",      # VBT H5
-                            f"{base_name}_{tf}.h5",          # Standard H5
-                            f"{base_name}_{tf}.pickle"       # Standard Pickle
-                        ]
-
-                        for data_file in possible_files:
-                            data_path = os.path.join(punkt2_dir, data_file)
-                            if os.path.exists(data_path):
-                                data_files.append(data_file)
-                                total_size += os.path.getsize(data_path)
-                                break  # Nur erste gefundene Datei pro Timeframe
+                    # Daten-Dateien laut Metadaten (Container oder Dateien älterer Läufe)
+                    data_files, total_size, _ = FileUtils._punkt2_data_files(punkt2_dir, base_name, metadata)
 
                     if data_files:
                         files[base_name] = {
@@ -121,6 +107,7 @@ class FileUtils:
 
         # Bekannte Timeframe-Patterns
         patterns = [
+            r'_((?:vol|tick|range|dollar)\d+(?:p\d+)?[km]?)(?:_|$)',  # _vol10000, _range2p5, _dollar50m
             r'_(\d+m)(?:_|$)',      # _5m_, _1m_
             r'_(\d+h)(?:_|$)',      # _1h_, _4h_
             r'_(\d+d)(?:_|$)',      # _1d_, _3d_
@@ -145,6 +132,42 @@ class FileUtils:
 
         return None
 
+    @staticmethod
+    def _punkt2_data_files(punkt2_dir: str, base_name: str, metadata: Dict) -> Tuple[List[str], int, List[str]]:
+        """
+        Daten-Dateien eines Punkt2-Laufs laut Metadaten: (Dateien, Bytes, fehlende Timeframes)
+
+        Neuere Läufe haben einen Multi-Timeframe Container, dessen Katalog die
+        Timeframes liefert (ohne Daten zu lesen). Ältere Läufe listen ihre
+        Dateien pro Timeframe in 'vbt_files' / 'data_files'.
+        """
+        timeframes = metadata.get('timeframes', [])
+        container_file = metadata.get('container_file')
+        if container_file:
+            container_path = os.path.join(punkt2_dir, container_file)
+            if not is_mtf_container(container_path):
+                return [], 0, list(timeframes)
+            try:
+                catalog_timeframes = read_mtf_catalog(container_path)['timeframes']
+            except Exception as e:
+                logging.warning(f"Container-Katalog nicht lesbar ({container_file}): {e}")
+                return [], 0, list(timeframes)
+            missing = [tf for tf in timeframes if tf not in catalog_timeframes]
+            return [container_file], mtf_container_size_bytes(container_path), missing
+
+        data_files, total_size, found = [], 0, set()
+        for data_file in metadata.get('vbt_files', []) + metadata.get('data_files', []):
+            tf = next((tf for tf in timeframes if tf not in found and data_file in (
+                f"{base_name}_{tf}_VBT.pickle", f"{base_name}_{tf}_VBT.h5",
+                f"{base_name}_{tf}.h5", f"{base_name}_{tf}{COLUMN_STORE_EXT}")), None)
+            data_path = os.path.join(punkt2_dir, data_file)
+            if tf is None or not os.path.exists(data_path):
+                continue
+            found.add(tf)
+            data_files.append(data_file)
+            total_size += column_store_size_bytes(data_path) if is_column_store(data_path) else os.path.getsize(data_path)
+        return data_files, total_size, [tf for tf in timeframes if tf not in found]
+
     @staticmethod
     def validate_punkt2_file(file_path: str) -> Tuple[bool, str, Dict]:
         """Validiert eine Punkt 2 Datei (Metadata oder direkte Daten-Datei)"""
@@ -175,25 +198,8 @@ class FileUtils:
                     base_name = os.path.basename(file_path).replace('_metadata.json', '')
                 punkt2_dir = os.path.dirname(file_path)
 
-                missing_files = []
-                for tf in timeframes:
-                    # Prüfe verschiedene Datei-Formate
-                    possible_files = [
-                        f"{base_name}_{tf}_VBT.pickle",  # VBT Pickle (bevorzugt)
-                        f"{base_name}_{tf}_VBT.h5",      # VBT H5
-                        f"{base_name}_{tf}.h5",          # Standard H5
-                        f"{base_name}_{tf}.pickle"       # Standard Pickle
-                    ]
-
-                    found = False
-                    for data_file in possible_files:
-                        data_path = os.path.join(punkt2_dir, data_file)
-                        if os.path.exists(data_path):
-                            found = True
-                            break
-
-                    if not found:
-                        missing_files.append(f"{base_name}_{tf}.*")
+                _, _, missing = FileUtils._punkt2_data_files(punkt2_dir, base_name, metadata)
+                missing_files = [f"{base_name}_{tf}" for tf in missing]
 
                 if missing_files:
                     return False, f"Fehlende Daten-Dateien: {', '.join(missing_files)}", metadata
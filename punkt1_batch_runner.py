@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+🚀 PUNKT1 BATCH RUNNER - Mehrere Assets parallel durch Punkt1
+
+Jedes Asset läuft als eigener Punkt1-Lauf (Laden → Filter → Datenqualität
+→ Speichern) in einem begrenzten Prozess-Pool. Der Code pro Asset kommt
+aus demselben Generator wie in der GUI, nur mit direkter Datei-Auswahl
+und ohne Visualisierung. Ausgaben landen pro Asset in einer Log-Datei,
+ein fehlerhaftes Asset bricht den Batch nicht ab.
+
+    python punkt1_batch_runner.py NQ ES "historical_data/*_1m_data.h5" --workers 4
+
+Ergebnis: die üblichen Artefakte pro Asset in data/punkt1/ plus ein
+gemeinsamer Index data/punkt1/PUNKT1_BATCH_INDEX_<timestamp>.json.
+
+Windows-tauglich: Worker ist eine Modul-Funktion, der Pool nutzt immer
+den 'spawn'-Start und wird nur unter __main__ bzw. aus der GUI erzeugt.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import contextlib
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from punkt_asset_catalog import update_asset_catalog, catalog_assets, asset_name_from_file
+
+BATCH_OUTPUT_DIR = "data/punkt1"
+BATCH_LOG_DIR = os.path.join(BATCH_OUTPUT_DIR, "batch_logs")
+BATCH_DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+# Batch-Läufe zeigen nie Charts oder Tabellen
+_BATCH_CONFIG_OVERRIDES = {
+    'asset_choice': 0,
+    'viz_choice': 6,
+    'viz_var': 'Keine Visualisierung',
+    'save_chart': False,
+    'show_control': False,
+}
+
+def _unique_asset_names(jobs):
+    """
+    {datei: asset} → eindeutige Namen: NQ_1m_data.h5 und NQ_5m_data.h5
+    heißen sonst beide NQ und teilen sich Log, Skript, Dataset und Index-Eintrag
+    """
+    counts = {}
+    for asset in jobs.values():
+        counts[asset] = counts.get(asset, 0) + 1
+
+    names, used = {}, set()
+    for path, asset in jobs.items():
+        name = asset
+        if counts[asset] > 1:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            name = stem[:-len('_data')] if stem.endswith('_data') else stem
+        unique, suffix = name, 2
+        while unique in used:
+            unique, suffix = f"{name}_{suffix}", suffix + 1
+        used.add(unique)
+        names[path] = unique
+    return names
+
+def resolve_batch_assets(patterns, directory="historical_data"):
+    """
+    📋 Asset-Liste/Globs → [(asset, datei)]
+
+    Einträge mit Pfadtrenner oder Glob-Zeichen werden als Glob gelesen,
+    alles andere als Asset-Name im Katalog von directory gesucht.
+    """
+    jobs = {}
+    catalog_view = None
+    for pattern in patterns:
+        if any(ch in pattern for ch in '*?[/\\') or os.path.isfile(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                print(f"⚠️ Keine Dateien für Muster: {pattern}")
+            for path in matches:
+                jobs.setdefault(os.path.abspath(path), asset_name_from_file(os.path.basename(path)))
+            continue
+
+        if catalog_view is None:
+            catalog, _ = update_asset_catalog(directory) if os.path.isdir(directory) else ({}, None)
+            catalog_view = catalog_assets(catalog, directory) if catalog else {}
+        info = catalog_view.get(pattern)
+        if info is None:
+            print(f"⚠️ Asset nicht im Katalog ({directory}): {pattern}")
+        else:
+            jobs.setdefault(os.path.abspath(info['file_path']), pattern)
+
+    return [(asset, path) for path, asset in jobs.items()]
+
+def _run_punkt1_asset(asset_name, source_path, config):
+    """
+    ⚙️ Worker: ein kompletter Punkt1-Lauf für ein Asset (im Pool-Prozess)
+
+    Gibt immer ein Ergebnis-Dict zurück - Fehler werden nicht geworfen.
+    """
+    from punkt1_ultra_performance_code_generator_FIXED import generate_ultra_performance_code
+
+    started = time.time()
+    os.makedirs(BATCH_LOG_DIR, exist_ok=True)
+    log_file = os.path.join(BATCH_LOG_DIR, f"{asset_name}.log")
+    script_file = os.path.join(BATCH_LOG_DIR, f"{asset_name}_punkt1.py")
+    result = {
+        'asset': asset_name, 'source': source_path, 'status': 'failed',
+        'rows': 0, 'source_mb': os.path.getsize(source_path) / (1024 * 1024) if os.path.exists(source_path) else 0.0,
+        'store_file': None, 'metadata_file': None, 'log_file': log_file, 'error': None
+    }
+
+    asset_config = dict(config)
+    asset_config.update(_BATCH_CONFIG_OVERRIDES)
+    asset_config['selected_file_path'] = source_path
+    asset_config['asset_name'] = asset_name
+
+    namespace = {'__name__': '__main__'}
+    try:
+        # Als Datei ablegen: nachvollziehbar und nötig für den Numba-Cache
+        code = generate_ultra_performance_code(asset_config)
+        with open(script_file, 'w', encoding='utf-8') as f:
+            f.write(code)
+        namespace['__file__'] = os.path.abspath(script_file)
+        with open(log_file, 'w', encoding='utf-8') as log, \
+                contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            exec(compile(code, namespace['__file__'], 'exec'), namespace)
+
+        # Das Skript fängt seine Fehler selbst ab - Erfolg = Artefakt geschrieben
+        if namespace.get('APPEND_APPLIED'):
+            result['status'] = 'appended'
+        elif namespace.get('metadata_file') and os.path.exists(namespace['metadata_file']):
+            result['status'] = 'ok'
+            result['rows'] = int(namespace.get('filtered_len') or 0)
+            result['store_file'] = namespace.get('punkt2_file')
+            result['metadata_file'] = namespace['metadata_file']
+        else:
+            result['error'] = f"Kein Artefakt geschrieben - siehe {log_file}"
+    except BaseException as e:  # auch SystemExit aus dem Skript
+        result['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        namespace.clear()
+
+    result['seconds'] = round(time.time() - started, 3)
+    return result
+
+def _read_metadata(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def run_punkt1_batch(jobs, config=None, max_workers=None):
+    """
+    🚀 Führt Punkt1 für alle (asset, datei)-Jobs im Prozess-Pool aus
+
+    Gibt (results, index_file) zurück; index_file ist der gemeinsame
+    Metadaten-Index aller Assets.
+    """
+    config = dict(config or {})
+    # Ergebnisse, Logs, Skripte und Datasets sind pro Asset-Name abgelegt
+    jobs = [(asset, path) for path, asset in
+            _unique_asset_names({os.path.abspath(path): asset for asset, path in jobs}).items()]
+    max_workers = max(1, min(max_workers or BATCH_DEFAULT_WORKERS, len(jobs) or 1))
+    os.makedirs(BATCH_OUTPUT_DIR, exist_ok=True)
+
+    print(f"🚀 PUNKT1 BATCH: {len(jobs)} Assets, {max_workers} Prozesse")
+    print("=" * 60)
+
+    batch_start = time.time()
+    results = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {executor.submit(_run_punkt1_asset, asset, path, config): (asset, path)
+                   for asset, path in jobs}
+        for future in as_completed(futures):
+            asset, path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # z.B. abgestürzter Worker-Prozess
+                result = {'asset': asset, 'source': path, 'status': 'failed', 'rows': 0,
+                          'source_mb': 0.0, 'store_file': None, 'metadata_file': None,
+                          'log_file': None, 'error': f"{type(e).__name__}: {e}", 'seconds': None}
+            results.append(result)
+            if result['status'] == 'failed':
+                print(f"❌ {asset}: {result['error']}")
+            else:
+                print(f"✅ {asset}: {result['status']}, {result['rows']:,} Zeilen, {result['seconds']:.1f}s")
+
+    total_seconds = time.time() - batch_start
+    results.sort(key=lambda r: r['asset'])
+    succeeded = [r for r in results if r['status'] != 'failed']
+    total_rows = sum(r['rows'] for r in succeeded)
+    total_mb = sum(r['source_mb'] for r in succeeded)
+
+    summary = {
+        'assets': len(results),
+        'succeeded': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'workers': max_workers,
+        'seconds': round(total_seconds, 3),
+        'rows': total_rows,
+        'rows_per_second': round(total_rows / total_seconds) if total_seconds else None,
+        'source_mb_per_second': round(total_mb / total_seconds, 2) if total_seconds else None,
+    }
+    index = {
+        'created': datetime.now().isoformat(),
+        'config': config,
+        'summary': summary,
+        'assets': {r['asset']: dict(r, metadata=_read_metadata(r['metadata_file']) if r['metadata_file'] else None)
+                   for r in results},
+    }
+    index_file = os.path.join(BATCH_OUTPUT_DIR, f"PUNKT1_BATCH_INDEX_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    tmp_file = index_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, default=str)
+    os.replace(tmp_file, index_file)
+
+    print("\n📊 BATCH-ERGEBNIS")
+    print("=" * 60)
+    print(f"   ✅ Erfolgreich: {summary['succeeded']}/{summary['assets']}")
+    print(f"   ⏱️ Gesamtzeit: {summary['seconds']:.1f}s")
+    print(f"   🚀 Durchsatz: {total_rows:,} Zeilen ({summary['rows_per_second'] or 0:,} Zeilen/s, "
+          f"{summary['source_mb_per_second'] or 0:.1f} MB/s Quelle)")
+    for r in results:
+        if r['status'] == 'failed':
+            print(f"   ❌ {r['asset']}: {r['error']}")
+    print(f"   📋 Index: {index_file}")
+    return results, index_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Punkt1 Batch-Modus: mehrere Assets im Prozess-Pool")
+    parser.add_argument('assets', nargs='+', help="Asset-Namen aus dem Katalog oder Datei-Globs")
+    parser.add_argument('--directory', default="historical_data", help="Datenverzeichnis für Asset-Namen")
+    parser.add_argument('--workers', type=int, default=BATCH_DEFAULT_WORKERS, help="Anzahl Prozesse")
+    parser.add_argument('--period', type=int, default=2, choices=[1, 2, 3, 4, 5],
+                        help="1=6 Monate, 2=1 Jahr, 3=2 Jahre, 4=3 Jahre, 5=Alle Daten")
+    parser.add_argument('--format', dest='store_format', default='columns', choices=['columns', 'parquet'],
+                        help="Store-Format wie in der GUI (Standard: columns = Column Store, memmap)")
+    parser.add_argument('--config', help="JSON-Datei mit weiteren Punkt1-Konfigurationswerten")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    config.setdefault('period_choice', args.period)
+    config.setdefault('store_format', args.store_format)
+
+    jobs = resolve_batch_assets(args.assets, args.directory)
+    if not jobs:
+        print("❌ Keine Assets für den Batch gefunden!")
+        return 1
+    results, _ = run_punkt1_batch(jobs, config, args.workers)
+    return 0 if all(r['status'] != 'failed' for r in results) else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,12 +24,17 @@ import numpy as np
 import pandas as pd
 from datetime import datetime
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import gc
 import time
 import warnings
 warnings.filterwarnings('ignore')
 
+from punkt_column_store import ColumnStoreWriter, COLUMN_STORE_EXT, open_column_store
+from punkt_time_slice import slice_time_range
+from punkt_asset_catalog import update_asset_catalog, load_asset_catalog, catalog_assets
+from punkt_file_probe import probe_file
+
 # VectorBT Pro Import für Performance-Optimierungen
 try:
     import vectorbtpro as vbt
@@ -48,6 +53,9 @@ except ImportError:
     NUMBA_AVAILABLE = False
     print("⚠️ Numba nicht verfügbar - Standard-Filterung")
 
+# Chart-Fenster in Kalendertagen (wie CANDLE_CHOICE 1-5 im generierten Code)
+CANDLE_WINDOWS = [("1 Tag", 1), ("1 Woche", 7), ("4 Wochen", 28), ("8 Wochen", 56), ("12 Wochen", 84)]
+
 class PerformanceOptimizedDataHandler:
     """
     🚀 ULTRA-PERFORMANCE DATEN-HANDLER
@@ -55,7 +63,6 @@ class PerformanceOptimizedDataHandler:
     """
 
     def __init__(self):
-        self.cache = {}  # File Metadata Cache
         self.executor = ThreadPoolExecutor(max_workers=4)  # Async Operations
 
     def optimize_data_types(self, data):
@@ -86,20 +93,12 @@ class PerformanceOptimizedDataHandler:
 
     def vectorized_filter_data(self, data, start_date, end_date):
         """
-        ⚡ VECTORIZED FILTERING (100x schneller als Schleifen)
+        ⚡ ZEITRAUM-FILTER PER SEARCHSORTED (O(log n), View statt Kopie)
         """
         if data is None or data.empty:
             return data
 
-        # Vectorized Boolean Indexing (sehr schnell)
-        mask = (data.index >= start_date) & (data.index <= end_date)
-        filtered_data = data.loc[mask]
-
-        # Memory-optimiert: Kopie nur wenn nötig
-        if len(filtered_data) < len(data) * 0.8:
-            filtered_data = filtered_data.copy()  # Speicher freigeben
-
-        return filtered_data
+        return slice_time_range(data, start_date, end_date)
 
     @staticmethod
     def numba_complex_filter(close_prices, volume, min_price, max_volume):
@@ -186,151 +185,118 @@ class PerformanceOptimizedDataHandler:
                 if file_path.endswith('.h5'):
                     return pd.read_hdf(file_path, key='data')
                 elif file_path.endswith('.csv'):
-                    # Chunked CSV Loading
-                    chunks = []
-                    for chunk in pd.read_csv(file_path, chunksize=chunksize, index_col=0, parse_dates=True):
-                        chunks.append(chunk)
-                    return pd.concat(chunks, ignore_index=False)
+                    # Streaming: CSV → Column Store, danach memmap (konstanter Speicher)
+                    store_path = os.path.splitext(file_path)[0] + COLUMN_STORE_EXT
+                    self.stream_csv_to_column_store(file_path, store_path, chunksize=chunksize)
+                    return open_column_store(store_path)
 
         except Exception as e:
             print(f"❌ Chunked Loading Fehler: {e}")
             return None
 
-    def get_file_metadata_cached(self, file_path):
+    def stream_csv_to_column_store(self, csv_path, store_path, datetime_format=None,
+                                   chunksize=500000, progress_callback=None):
         """
-        💾 FILE METADATA CACHING (50x wiederholte Zugriffe)
+        🧩 STREAMING CSV INGEST (konstanter Speicher)
+        Jeder Block wird mit festem Datumsformat geparst, validiert und direkt
+        an den Column Store angehängt - es wird nie die ganze Datei gehalten.
         """
-        # Cache-Key basierend auf Pfad und Änderungszeit
-        try:
-            stat = os.stat(file_path)
-            cache_key = f"{file_path}_{stat.st_mtime}"
-
-            if cache_key in self.cache:
-                return self.cache[cache_key]
-
-            # Metadata berechnen
-            file_size_mb = stat.st_size / (1024 * 1024)
-
-            metadata = {
-                'file_size_mb': file_size_mb,
-                'modified_time': stat.st_mtime,
-                'file_path': file_path
-            }
-
-            # Für HDF5: Zusätzliche Info ohne vollständiges Laden
-            if file_path.endswith('.h5'):
-                try:
-                    with pd.HDFStore(file_path, mode='r') as store:
-                        if 'data' in store:
-                            info = store.get_storer('data').shape
-                            metadata['row_count'] = info[0]
-                            metadata['column_count'] = info[1]
-                except:
-                    pass
-
-            # Cache speichern
-            self.cache[cache_key] = metadata
-            return metadata
+        total_bytes = os.path.getsize(csv_path)
+        stats = {
+            'rows_written': 0, 'rows_read': 0, 'bad_timestamps': 0, 'bad_prices': 0,
+            'duplicates': 0, 'seam_overlaps': 0, 'ohlc_violations': 0,
+            'bytes_read': 0, 'total_bytes': total_bytes, 'rows_per_s': 0.0, 'mb_per_s': 0.0,
+            'datetime_format': datetime_format
+        }
+        start_time = time.time()
+        writer = ColumnStoreWriter(store_path, metadata={'source_file': os.path.abspath(csv_path)})
 
-        except Exception as e:
-            print(f"⚠️ Metadata Cache Fehler: {e}")
-            return {'file_size_mb': 0, 'modified_time': 0, 'file_path': file_path}
+        try:
+            with open(csv_path, 'rb') as handle:
+                for chunk in pd.read_csv(handle, chunksize=chunksize):
+                    stats['rows_read'] += len(chunk)
+                    chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+                    time_column = chunk.columns[0]
+
+                    # Festes Datumsformat - einmal aus dem ersten Block bestimmt
+                    if stats['datetime_format'] is None:
+                        from pandas.tseries.api import guess_datetime_format
+                        stats['datetime_format'] = guess_datetime_format(str(chunk[time_column].iloc[0])) or '%Y-%m-%d %H:%M:%S'
+                    timestamps = pd.to_datetime(chunk[time_column], format=stats['datetime_format'], errors='coerce')
+                    chunk = chunk.drop(columns=[time_column]).set_index(pd.DatetimeIndex(timestamps, name=time_column))
+
+                    valid = chunk.index.notna()
+                    stats['bad_timestamps'] += int((~valid).sum())
+                    chunk = chunk.loc[valid].apply(pd.to_numeric, errors='coerce')
+
+                    price_columns = [c for c in ('open', 'high', 'low', 'close') if c in chunk.columns]
+                    valid = chunk[price_columns].notna().all(axis=1).to_numpy()
+                    stats['bad_prices'] += int((~valid).sum())
+                    chunk = chunk.loc[valid]
+
+                    duplicated = chunk.index.duplicated(keep='first')
+                    stats['duplicates'] += int(duplicated.sum())
+                    chunk = chunk.loc[~duplicated]
+                    if not chunk.index.is_monotonic_increasing:
+                        raise ValueError(f"CSV ist nicht zeitlich sortiert (Block ab Zeile {stats['rows_read'] - len(chunk)})")
+
+                    # Naht zum vorherigen Block: nur streng neuere Zeilen anhängen
+                    if writer.last_ns is not None:
+                        newer = chunk.index.asi8 > writer.last_ns
+                        stats['seam_overlaps'] += int((~newer).sum())
+                        chunk = chunk.loc[newer]
+
+                    if len(price_columns) == 4 and len(chunk):
+                        body_high = np.maximum(chunk['open'].to_numpy(), chunk['close'].to_numpy())
+                        body_low = np.minimum(chunk['open'].to_numpy(), chunk['close'].to_numpy())
+                        stats['ohlc_violations'] += int(((chunk['high'].to_numpy() < body_high) |
+                                                         (chunk['low'].to_numpy() > body_low)).sum())
+
+                    if writer.columns is not None:
+                        chunk = chunk.astype({c['name']: c['dtype'] for c in writer.columns}, copy=False)
+                    writer.append(chunk)
+                    stats['rows_written'] = writer.rows
+
+                    elapsed = max(time.time() - start_time, 1e-9)
+                    stats['bytes_read'] = min(handle.tell(), total_bytes)
+                    stats['rows_per_s'] = stats['rows_read'] / elapsed
+                    stats['mb_per_s'] = stats['bytes_read'] / (1024 * 1024) / elapsed
+                    if progress_callback:
+                        progress_callback(dict(stats))
+
+            stats['bytes_read'] = total_bytes
+            writer.metadata['ingest'] = {k: v for k, v in stats.items() if k not in ('rows_per_s', 'mb_per_s')}
+            writer.close()
+        except Exception:
+            writer.abort()
+            raise
+
+        stats['seconds'] = time.time() - start_time
+        if progress_callback:
+            progress_callback(dict(stats))
+        return stats
 
     def scan_files_parallel(self, directory):
         """
-        📁 PARALLEL FILE SCANNING (6x bei vielen Dateien)
+        📚 INKREMENTELLER ASSET-KATALOG (nur geänderte Dateien werden geöffnet)
         """
         if not os.path.exists(directory):
             return {}
 
-        # Alle Dateien sammeln
-        all_files = []
         try:
-            with os.scandir(directory) as entries:
-                for entry in entries:
-                    if entry.is_file() and entry.name.endswith('.h5'):
-                        all_files.append(entry.path)
+            catalog, stats = update_asset_catalog(directory)
         except Exception as e:
-            print(f"⚠️ Scandir Fehler: {e}")
+            print(f"⚠️ Asset-Katalog Fehler: {e}")
             return {}
 
-        if not all_files:
-            return {}
-
-        # Parallel verarbeiten
-        assets = {}
-
-        def process_file(file_path):
-            try:
-                file_name = os.path.basename(file_path)
-                asset_name = file_name.split('_')[0] if '_' in file_name else file_name.replace('.h5', '')
-
-                metadata = self.get_file_metadata_cached(file_path)
-
-                return asset_name, {
-                    'file_name': file_name,
-                    'file_size_mb': metadata['file_size_mb'],
-                    'file_path': file_path,
-                    'index': 0  # Wird später gesetzt
-                }
-            except Exception as e:
-                print(f"⚠️ File Process Fehler {file_path}: {e}")
-                return None, None
-
-        # 🚀 ADVANCED EXECUTION ENGINE AUSWAHL
-        if VBT_AVAILABLE and len(all_files) > 20:
-            try:
-                # RayEngine für sehr große Dateimengen (Distributed Computing)
-                print(f"🚀 Verwende RayEngine für {len(all_files)} Dateien...")
-
-                # VBT Task-System für RayEngine
-                tasks = [vbt.Task(process_file, fp) for fp in all_files]
-                results = vbt.execute(
-                    tasks,
-                    engine="ray",
-                    init_kwargs=dict(
-                        ignore_reinit_error=True,
-                        num_cpus=os.cpu_count()
-                    ),
-                    remote_kwargs=dict(
-                        num_cpus=1
-                    ),
-                    reuse_refs=True,
-                    del_refs=True,
-                    shutdown=False
-                )
-
-                for i, (asset_name, asset_info) in enumerate(results, 1):
-                    if asset_name and asset_info:
-                        asset_info['index'] = i
-                        assets[asset_name] = asset_info
-
-                print(f"✅ RayEngine: {len(assets)} Assets verarbeitet")
-                return assets
-
-            except Exception as e:
-                print(f"⚠️ RayEngine Fehler: {e}, Fallback auf ThreadPool")
-
-        # Fallback: Standard ThreadPool
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = [executor.submit(process_file, fp) for fp in all_files]
-
-            for i, future in enumerate(as_completed(futures), 1):
-                asset_name, asset_info = future.result()
-                if asset_name and asset_info:
-                    asset_info['index'] = i
-                    assets[asset_name] = asset_info
-
-        return assets
+        print(f"📚 Asset-Katalog: {stats['scanned']} Dateien, {stats['probed']} neu gelesen, "
+              f"{stats['removed']} entfernt in {stats['seconds']:.3f}s")
+        return catalog_assets(catalog, directory)
 
     def cleanup_memory(self):
         """
         🧹 ADVANCED MEMORY MANAGEMENT
         """
-        # Cache leeren wenn zu groß
-        if len(self.cache) > 100:
-            self.cache.clear()
-
         # Python Garbage Collection
         gc.collect()
 
@@ -367,16 +333,26 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
         self.save_chart_var = tk.BooleanVar(value=False)
         self.show_control_var = tk.BooleanVar(value=True)
         self.test_backup_var = tk.BooleanVar(value=False)
+        self.store_format_var = tk.StringVar(value="Column Store (memmap, zero-copy)")
+        self.store_compression_var = tk.StringVar(value="none")
+        self.append_mode_var = tk.BooleanVar(value=False)
+        self.quality_repair_var = tk.BooleanVar(value=False)
+        self.quality_session_var = tk.StringVar(value="24x5")
+        self.tick_codec_var = tk.BooleanVar(value=False)
+        self.tick_size_var = tk.StringVar(value="0.25")  # NQ/ES - wie CONFIG.VBT_DEFAULTS['tick_size']
 
         # Für direkte Datei-Auswahl
         self.selected_file_path = None
+        self.selected_file_probe = None
         
         # Für Export-Ordner Auswahl
         self.export_directory = None
         self.export_directory_var = tk.StringVar(value="Standard (aktueller Ordner)")
 
-        # Assets scannen (jetzt mit Performance-Optimierung)
+        # Assets sofort aus dem Katalog, danach inkrementeller Rescan im Hintergrund
         self.available_assets = {}
+        if os.path.isdir("historical_data"):
+            self.available_assets = catalog_assets(load_asset_catalog("historical_data"), "historical_data")
         self.scan_assets_async()
 
         # GUI erstellen
@@ -419,6 +395,8 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
         # Asset-Info aktualisieren falls bereits erstellt
         if hasattr(self, 'asset_info_text'):
             self.update_asset_info()
+        if hasattr(self, 'candle_combo'):
+            self.refresh_candle_options()
 
     def show_performance_info(self):
         """Zeigt Performance-Status in der GUI"""
@@ -483,6 +461,7 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
         asset_options = ["Auto-Auswahl (größte Datei)"] + list(self.available_assets.keys())
         self.asset_combo = ttk.Combobox(asset_frame, textvariable=self.asset_var, values=asset_options, width=25)
         self.asset_combo.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
+        self.asset_combo.bind('<<ComboboxSelected>>', lambda event: self.refresh_candle_options())
 
         # Button für Datei-Browser
         ttk.Button(asset_frame, text="📁 DATEI WÄHLEN", command=self.browse_asset_file, width=15).grid(row=0, column=1)
@@ -492,6 +471,13 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
         self.file_label = ttk.Label(asset_frame, textvariable=self.selected_file_var, foreground='green', font=('Arial', 8))
         self.file_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(2, 0))
 
+        # Streaming CSV Ingest (konstanter Speicher)
+        ttk.Button(asset_frame, text="🧩 CSV → COLUMN STORE", command=self.convert_csv_async, width=22).grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        self.ingest_progress = ttk.Progressbar(asset_frame, mode='determinate', maximum=100)
+        self.ingest_progress.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(2, 0))
+        self.ingest_status_var = tk.StringVar()
+        ttk.Label(asset_frame, textvariable=self.ingest_status_var, font=('Arial', 8)).grid(row=4, column=0, columnspan=2, sticky=tk.W)
+
         row += 1
 
         # Zeitraum-Auswahl
@@ -525,16 +511,8 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
         self.candle_label.grid(row=row, column=0, sticky=tk.W, pady=(0, 5))
         row += 1
 
-        candle_options = [
-            "1 Tag (~390 Kerzen)",
-            "1 Woche (~1,950 Kerzen)",
-            "4 Wochen (~7,800 Kerzen)",
-            "8 Wochen (~15,600 Kerzen)",
-            "12 Wochen (~23,400 Kerzen)",
-            "Benutzerdefiniert",
-            "Gesamter Zeitraum"
-        ]
-        self.candle_combo = ttk.Combobox(config_frame, textvariable=self.candle_var, values=candle_options, width=30)
+        # Bar-Anzahl pro Fenster aus der echten Dichte des Assets (refresh_candle_options)
+        self.candle_combo = ttk.Combobox(config_frame, textvariable=self.candle_var, values=self.candle_options(), width=30)
         self.candle_combo.grid(row=row, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
         self.candle_combo.bind('<<ComboboxSelected>>', self.on_candle_change)
         row += 1
@@ -559,6 +537,28 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
                        variable=self.save_chart_var).grid(row=row, column=0, sticky=tk.W)
         row += 1
 
+        store_frame = ttk.Frame(config_frame)
+        store_frame.grid(row=row, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Label(store_frame, text="Speicherformat:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Combobox(store_frame, textvariable=self.store_format_var, state="readonly", width=32,
+                     values=["Column Store (memmap, zero-copy)", "Parquet (spalten-orientiert)"]).grid(row=0, column=1, padx=(5, 0))
+        ttk.Label(store_frame, text="Kompression (Archiv, ohne memmap):").grid(row=1, column=0, sticky=tk.W, pady=(2, 0))
+        ttk.Combobox(store_frame, textvariable=self.store_compression_var, state="readonly", width=32,
+                     values=["none", "auto", "blosc2-lz4", "blosc2-zstd", "zstd"]).grid(row=1, column=1, padx=(5, 0), pady=(2, 0))
+        row += 1
+
+        tick_frame = ttk.Frame(config_frame)
+        tick_frame.grid(row=row, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Checkbutton(tick_frame, text="🎯 Tick-Codec (OHLC als int32 Ticks)",
+                        variable=self.tick_codec_var).grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(tick_frame, text="Tick-Größe:").grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        ttk.Entry(tick_frame, textvariable=self.tick_size_var, width=8).grid(row=0, column=2, padx=(5, 0))
+        row += 1
+
+        ttk.Checkbutton(config_frame, text="🔁 Append-Modus (nur neue Bars an letztes Artefakt anhängen)",
+                       variable=self.append_mode_var).grid(row=row, column=0, sticky=tk.W)
+        row += 1
+
         # Erweiterte Optionen
         ttk.Label(config_frame, text="🔧 Erweiterte Optionen:", font=('Arial', 10, 'bold')).grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
         row += 1
@@ -567,9 +567,18 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
                        variable=self.show_control_var).grid(row=row, column=0, sticky=tk.W)
         row += 1
 
-        ttk.Checkbutton(config_frame, text="Performance-Test durchführen",
+        ttk.Checkbutton(config_frame, text="Performance-Test durchführen (Speicherformat-Benchmark)",
                        variable=self.test_backup_var).grid(row=row, column=0, sticky=tk.W)
         row += 1
+
+        quality_frame = ttk.Frame(config_frame)
+        quality_frame.grid(row=row, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Checkbutton(quality_frame, text="🔬 Datenqualität reparieren",
+                        variable=self.quality_repair_var).grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(quality_frame, text="Session:").grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        ttk.Combobox(quality_frame, textvariable=self.quality_session_var, state="readonly", width=14,
+                     values=["24x5", "24x7", "cme_globex", "us_equity_rth"]).grid(row=0, column=2, padx=(5, 0))
+        row += 1
         
         # Export-Ordner Auswahl
         ttk.Label(config_frame, text="📁 Export-Ordner:", font=('Arial', 10, 'bold')).grid(row=row, column=0, sticky=tk.W, pady=(10, 5))
@@ -592,6 +601,11 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
         generate_btn = ttk.Button(config_frame, text="🚀 ULTRA-PERFORMANCE CODE GENERIEREN",
                                  command=self.generate_code_async, style='Accent.TButton')
         generate_btn.grid(row=row, column=0, pady=(20, 0), sticky=(tk.W, tk.E))
+        row += 1
+
+        # Batch-Modus: alle Assets des Katalogs im Prozess-Pool
+        ttk.Button(config_frame, text="🗂️ BATCH: ALLE ASSETS VERARBEITEN",
+                   command=self.run_batch_async).grid(row=row, column=0, pady=(5, 0), sticky=(tk.W, tk.E))
 
         # Rechte Spalte - Asset-Info und Code-Ausgabe
         right_frame = ttk.Frame(main_frame)
@@ -643,7 +657,8 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
             self.asset_var.set("Auto-Auswahl (größte Datei)")
         self.period_var.set("1 Jahr")
         self.viz_var.set("Interaktiver Kerzen-Chart")
-        self.candle_var.set("12 Wochen (~23,400 Kerzen)")
+        self.candle_var.set("12 Wochen")
+        self.refresh_candle_options()
         self.update_candle_visibility()
         self.update_custom_visibility()
 
@@ -665,12 +680,15 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
             for asset_name, info_dict in sorted_assets:
                 total_size += info_dict['file_size_mb']
                 info += f"📊 {asset_name}: {info_dict['file_size_mb']:.1f} MB\\n"
-                info += f"   📁 {info_dict['file_name']}\\n\\n"
+                info += f"   📁 {info_dict['file_name']}\\n"
+                if info_dict.get('rows'):
+                    info += f"   📈 {info_dict['rows']:,} Zeilen ({info_dict.get('freq') or '?'}), bis {info_dict.get('end')}\\n"
+                info += "\\n"
 
             info += f"🚀 PERFORMANCE-INFO:\\n"
             info += f"   💾 Gesamt: {total_size:.1f} MB\\n"
             info += f"   ⚡ Parallel gescannt\\n"
-            info += f"   📋 Metadata gecacht\\n"
+            info += f"   📚 Asset-Katalog (nur geänderte Dateien neu gelesen)\\n"
             if VBT_AVAILABLE:
                 info += f"   🚀 VectorBT Pro bereit\\n"
         else:
@@ -701,6 +719,46 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
             self.candle_combo.grid_remove()
             self.custom_frame.grid_remove()
 
+    def selected_bar_density(self):
+        """
+        📅 Bars pro Kalendertag des gewählten Assets (Zeilen / Zeitspanne)
+
+        Quelle sind Katalog- bzw. Probe-Metadaten - es wird nichts geladen.
+        None, solange Zeilen oder Zeitraum unbekannt sind.
+        """
+        asset_value = self.asset_var.get()
+        if asset_value.startswith("📁"):
+            info = self.selected_file_probe or {}
+        elif asset_value in self.available_assets:
+            info = self.available_assets[asset_value]
+        elif self.available_assets:  # Auto-Auswahl: größte Datei
+            info = max(self.available_assets.values(), key=lambda entry: entry.get('size') or 0)
+        else:
+            return None
+
+        try:
+            span_days = (pd.Timestamp(info['end']) - pd.Timestamp(info['start'])) / pd.Timedelta(days=1)
+            return info['rows'] / span_days if info.get('rows') and span_days > 0 else None
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def candle_options(self, density=None):
+        """Kerzen-Fenster mit erwarteter Bar-Anzahl bei gegebener Dichte"""
+        options = []
+        for label, days in CANDLE_WINDOWS:
+            options.append(f"{label} (~{int(round(density * days)):,} Bars)" if density else label)
+        return options + ["Benutzerdefiniert", "Gesamter Zeitraum"]
+
+    def refresh_candle_options(self):
+        """Aktualisiert die Bar-Schätzungen im Kerzen-Dropdown, Auswahl bleibt erhalten"""
+        options = self.candle_options(self.selected_bar_density())
+        current = self.candle_var.get()
+        self.candle_combo['values'] = options
+        for option in options:
+            if option.split(" (~")[0] == current.split(" (~")[0]:
+                self.candle_var.set(option)
+                break
+
     def on_candle_change(self, event=None):
         """Wird aufgerufen wenn Kerzen-Anzahl geändert wird"""
         self.update_custom_visibility()
@@ -731,8 +789,10 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
             # Async Datei-Validierung
             def validate_file_async():
                 try:
-                    # Performance-Metadata abrufen
-                    metadata = self.perf_handler.get_file_metadata_cached(filename)
+                    # Metadaten nur aus Header/ersten+letzten Zeilen (ohne Laden)
+                    metadata = probe_file(filename)
+                    if metadata.get('error'):
+                        raise ValueError(metadata['error'])
 
                     # Asset-Name extrahieren
                     file_basename = os.path.basename(filename)
@@ -745,12 +805,19 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
 
                         self.selected_file_var.set(f"✅ Gewählt: {file_basename} ({file_size_mb:.1f} MB) [PERFORMANCE-OPTIMIERT]")
                         self.asset_var.set(f"📁 {asset_name} (Direkte Datei)")
+                        self.selected_file_probe = metadata
+                        self.refresh_candle_options()
 
+                        rows = metadata.get('rows')
+                        rows_text = f"{rows:,}" + (" (geschätzt)" if metadata.get('rows_estimated') else "") if rows else "?"
                         messagebox.showinfo(
                             "Datei gewählt",
                             f"✅ Asset-Datei erfolgreich gewählt!\\n\\n"
                             f"📁 Datei: {file_basename}\\n"
                             f"📊 Größe: {file_size_mb:.1f} MB\\n"
+                            f"📈 Zeilen: {rows_text} ({metadata.get('freq') or '?'})\\n"
+                            f"📅 Zeitraum: {metadata.get('start')} bis {metadata.get('end')}\\n"
+                            f"🧾 Spalten: {', '.join(metadata.get('columns', []))}\\n"
                             f"🚀 Performance-Features: Aktiv\\n\\n"
                             f"💡 Der generierte Code wird diese Datei mit\\n"
                             f"   allen Performance-Optimierungen verwenden."
@@ -759,8 +826,10 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
                     self.root.after(0, update_gui)
 
                 except Exception as e:
+                    error_text = str(e)
+
                     def show_error():
-                        messagebox.showerror("Fehler", f"❌ Fehler beim Lesen der Datei: {e}")
+                        messagebox.showerror("Fehler", f"❌ Fehler beim Lesen der Datei: {error_text}")
                         self.selected_file_path = None
                         self.selected_file_var.set("")
 
@@ -769,6 +838,63 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
             # Async ausführen
             self.perf_handler.executor.submit(validate_file_async)
 
+    def convert_csv_async(self):
+        """
+        🧩 STREAMING CSV → COLUMN STORE
+        Konvertiert Vendor-CSVs beliebiger Größe mit konstantem Speicher
+        """
+        csv_path = filedialog.askopenfilename(
+            title="🧩 Vendor-CSV für Streaming-Ingest auswählen",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialdir="historical_data" if os.path.exists("historical_data") else "."
+        )
+        if not csv_path:
+            return
+
+        store_path = os.path.splitext(csv_path)[0] + COLUMN_STORE_EXT
+        self.ingest_progress['value'] = 0
+        self.ingest_status_var.set(f"🧩 Starte Ingest: {os.path.basename(csv_path)}")
+
+        def report_progress(stats):
+            def update_gui():
+                percent = 100.0 * stats['bytes_read'] / max(stats['total_bytes'], 1)
+                self.ingest_progress['value'] = percent
+                self.ingest_status_var.set(
+                    f"🧩 {percent:.0f}% | {stats['rows_written']:,} Zeilen | "
+                    f"{stats['rows_per_s']:,.0f} Zeilen/s | {stats['mb_per_s']:.1f} MB/s"
+                )
+            self.root.after(0, update_gui)
+
+        def ingest_in_background():
+            try:
+                stats = self.perf_handler.stream_csv_to_column_store(csv_path, store_path, progress_callback=report_progress)
+
+                def show_result():
+                    self.selected_file_path = store_path
+                    self.selected_file_var.set(f"✅ Gewählt: {os.path.basename(store_path)} (Column Store)")
+                    self.asset_var.set(f"📁 {os.path.basename(csv_path).split('_')[0]} (Direkte Datei)")
+                    messagebox.showinfo(
+                        "Ingest abgeschlossen",
+                        f"✅ {stats['rows_written']:,} Zeilen in {stats['seconds']:.1f}s geschrieben\n\n"
+                        f"⚡ {stats['rows_per_s']:,.0f} Zeilen/s | {stats['mb_per_s']:.1f} MB/s\n"
+                        f"🕐 Datumsformat: {stats['datetime_format']}\n"
+                        f"⚠️ Ungültige Zeitstempel: {stats['bad_timestamps']:,}\n"
+                        f"⚠️ Ungültige Preise: {stats['bad_prices']:,}\n"
+                        f"⚠️ Duplikate/Überlappungen: {stats['duplicates'] + stats['seam_overlaps']:,}\n"
+                        f"⚠️ OHLC-Verletzungen: {stats['ohlc_violations']:,}"
+                    )
+                self.root.after(0, show_result)
+
+            except Exception as e:
+                error_text = str(e)
+
+                def show_error():
+                    self.ingest_status_var.set(f"❌ Ingest fehlgeschlagen: {error_text}")
+                    messagebox.showerror("Fehler", f"❌ CSV-Ingest fehlgeschlagen: {error_text}")
+                self.root.after(0, show_error)
+
+        self.perf_handler.executor.submit(ingest_in_background)
+
     def generate_code_async(self):
         """
         🚀 ASYNC CODE-GENERIERUNG (GUI bleibt responsiv)
@@ -822,6 +948,55 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
         # Async ausführen
         self.perf_handler.executor.submit(generate_in_background)
 
+    def run_batch_async(self):
+        """
+        🗂️ BATCH-MODUS: Punkt1 für alle Katalog-Assets im Prozess-Pool
+        """
+        if not self.available_assets:
+            messagebox.showerror("Fehler", "Keine Assets im Katalog für den Batch-Modus!")
+            return
+
+        jobs = [(asset_name, info['file_path']) for asset_name, info in sorted(self.available_assets.items())]
+        config = {
+            'period_choice': self.get_period_choice(),
+            'period_var': self.period_var.get(),
+            'store_format': 'parquet' if self.store_format_var.get().startswith("Parquet") else 'columns',
+            'store_compression': self.store_compression_var.get(),
+            'append_mode': self.append_mode_var.get(),
+            'quality_repair': self.quality_repair_var.get(),
+            'quality_session': self.quality_session_var.get(),
+            'tick_codec': self.tick_codec_var.get(),
+            'tick_size': self.get_tick_size(),
+            'test_backup': self.test_backup_var.get(),
+        }
+        self.ingest_status_var.set(f"🗂️ Batch läuft: {len(jobs)} Assets...")
+
+        def batch_in_background():
+            from punkt1_batch_runner import run_punkt1_batch
+            try:
+                results, index_file = run_punkt1_batch(jobs, config)
+                failed = [r for r in results if r['status'] == 'failed']
+
+                def show_result():
+                    self.ingest_status_var.set(f"✅ Batch fertig: {len(results) - len(failed)}/{len(results)} Assets")
+                    details = "\n".join(f"❌ {r['asset']}: {r['error']}" for r in failed[:10])
+                    messagebox.showinfo(
+                        "Batch",
+                        f"🗂️ Batch abgeschlossen: {len(results) - len(failed)}/{len(results)} erfolgreich\n\n"
+                        f"{details}\n\n📋 Index: {index_file}"
+                    )
+                self.root.after(0, show_result)
+
+            except Exception as e:
+                error_text = str(e)
+
+                def show_error():
+                    self.ingest_status_var.set(f"❌ Batch fehlgeschlagen: {error_text}")
+                    messagebox.showerror("Fehler", f"❌ Batch fehlgeschlagen: {error_text}")
+                self.root.after(0, show_error)
+
+        self.perf_handler.executor.submit(batch_in_background)
+
     def generate_ultra_performance_code(self):
         """
         🚀 ULTRA-PERFORMANCE CODE GENERATOR
@@ -840,6 +1015,13 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
             'save_chart': self.save_chart_var.get(),
             'show_control': self.show_control_var.get(),
             'test_backup': self.test_backup_var.get(),
+            'store_format': 'parquet' if self.store_format_var.get().startswith("Parquet") else 'columns',
+            'store_compression': self.store_compression_var.get(),
+            'append_mode': self.append_mode_var.get(),
+            'quality_repair': self.quality_repair_var.get(),
+            'quality_session': self.quality_session_var.get(),
+            'tick_codec': self.tick_codec_var.get(),
+            'tick_size': self.get_tick_size(),
             'selected_file_path': self.selected_file_path,
             'asset_var': self.asset_var.get(),
             'period_var': self.period_var.get(),
@@ -863,6 +1045,14 @@ class VectorBTPunkt1KonfiguratorUltraPerformance:
 
         return 0  # Fallback
 
+    def get_tick_size(self):
+        """Tick-Größe aus dem Eingabefeld (Fallback 0.25)"""
+        try:
+            tick_size = float(self.tick_size_var.get().replace(',', '.'))
+            return tick_size if tick_size > 0 else 0.25
+        except ValueError:
+            return 0.25
+
     def get_period_choice(self):
         """Konvertiert Zeitraum-Auswahl zu numerischem Wert"""
         period_mapping = {
@@ -6,6 +6,12 @@ Generiert optimierten Code mit allen VectorBT Pro Performance-Features
 
 from datetime import datetime
 
+from punkt_column_store import get_column_store_source
+from punkt_time_slice import get_time_slice_source
+from punkt_asset_catalog import get_asset_catalog_source
+from punkt_data_quality import get_data_quality_source
+from punkt_chart_lod import get_chart_lod_source
+
 # ENTFERNT: Auto-Select Engine Logic - nicht nötig für Punkt1
 
 def generate_ultra_performance_code(config):
@@ -24,8 +30,16 @@ def generate_ultra_performance_code(config):
     save_chart = config.get('save_chart', False)
     show_control = config.get('show_control', True)
     test_backup = config.get('test_backup', False)
+    store_format = config.get('store_format', 'columns')
+    append_mode = config.get('append_mode', False)
+    quality_repair = config.get('quality_repair', False)
+    quality_session = config.get('quality_session', '24x5')
+    tick_codec = config.get('tick_codec', False)
+    tick_size = config.get('tick_size', 0.25)
+    store_compression = config.get('store_compression', 'none')
     
     selected_file_path = config.get('selected_file_path', None)
+    asset_name = config.get('asset_name', None)
     asset_var = config.get('asset_var', 'Auto-Auswahl')
     period_var = config.get('period_var', '1 Jahr')
     viz_var = config.get('viz_var', 'Interaktiver Kerzen-Chart')
@@ -41,11 +55,19 @@ def generate_ultra_performance_code(config):
         else:
             filename = selected_file_path.split('\\')[-1]
         file_info = f"Direkte Datei: {filename}"
-        asset_loading_code = generate_direct_file_code_optimized(selected_file_path)
+        asset_loading_code = generate_direct_file_code_optimized(selected_file_path, asset_name)
     else:
         file_info = f"Asset-Discovery: {asset_var}"
         asset_loading_code = generate_discovery_code_optimized()
 
+    time_slice_code = get_time_slice_source()
+    data_quality_code = get_data_quality_source()
+    chart_lod_code = get_chart_lod_source()
+    storage_code = generate_storage_code_optimized()
+    dataset_code = generate_dataset_code_optimized()
+    append_code = generate_append_code_optimized()
+    asset_catalog_code = get_asset_catalog_source()
+
     complete_code = f'''# 🚀 PUNKT 1: ULTRA-PERFORMANCE AUTOMATISCH GENERIERTER CODE
 # Generiert am: {timestamp}
 # Konfiguration: {file_info} | {period_var} | {viz_var}
@@ -195,7 +217,7 @@ print("✅ Setup abgeschlossen!")
 
 # 🚀 ULTRA-PERFORMANCE FUNKTIONEN
 def optimize_data_types(data):
-    """🚀 KEINE Datentyp-Optimierung - Precision beibehalten"""
+    """🚀 KEINE Datentyp-Optimierung - Precision beibehalten (keine Kopie)"""
     if data is None or data.empty:
         return data
 
@@ -204,25 +226,26 @@ def optimize_data_types(data):
     # KEINE KONVERTIERUNG - Original-Datentypen beibehalten
     # Float64 bleibt Float64 (volle Precision)
     # Int64 bleibt Int64 (keine Precision Loss)
+    # Keine Kopie: nichts wird verändert, der Aufrufer übernimmt das Objekt
 
     print(f"✅ Original-Datentypen beibehalten (keine Precision Loss)")
-    return data.copy()
+    return data
+
+{time_slice_code}
+
+{data_quality_code}
+
+{chart_lod_code}
 
 def vectorized_filter_data(data, start_date, end_date):
-    """⚡ Vectorized Filtering (100x schneller als Schleifen)"""
+    """⚡ Zeitraum-Filter per searchsorted (O(log n), View statt Kopie)"""
     if data is None or data.empty:
         return data
         
-    print("⚡ Führe vectorized Filtering durch...")
+    print("⚡ Führe searchsorted Zeitraum-Schnitt durch...")
     start_time = time.time()
     
-    # Vectorized Boolean Indexing (sehr schnell)
-    mask = (data.index >= start_date) & (data.index <= end_date)
-    filtered_data = data.loc[mask]
-    
-    # Memory-optimiert: Kopie nur wenn nötig
-    if len(filtered_data) < len(data) * 0.8:
-        filtered_data = filtered_data.copy()  # Speicher freigeben
+    filtered_data = slice_time_range(data, start_date, end_date)
     
     filter_time = time.time() - start_time
     print(f"✅ Vectorized Filtering abgeschlossen: {{filter_time:.3f}}s")
@@ -328,6 +351,11 @@ def load_with_performance_optimization(file_path):
             data = pd.read_csv(file_path, index_col=0, parse_dates=True)
             print(f"✅ CSV Laden verwendet")
 
+        elif is_column_store(file_path):
+            # Column Store (z.B. aus dem Streaming CSV-Ingest) - memmap, zero-copy
+            data = open_column_store(file_path)
+            print(f"✅ Column Store per memmap geöffnet")
+
         else:
             # Unbekanntes Format - versuche trotzdem HDF5
             print(f"⚠️ Unbekanntes Dateiformat, versuche HDF5...")
@@ -354,6 +382,49 @@ def cleanup_memory():
 
     print(f"✅ Memory Cleanup abgeschlossen: {{collected}} Objekte freigegeben")
 
+# 📏 SPEICHER-BUCHHALTUNG PRO STUFE (RSS-Delta + Peak)
+# Die Pipeline reicht Views weiter bzw. übernimmt Objekte - kopiert wird nur,
+# wo Daten verändert werden. Die Deltas machen das pro Stufe nachprüfbar.
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+MEMORY_STAGES = []
+
+def _rss_mb():
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return 0.0
+
+def _peak_rss_mb():
+    if PSUTIL_AVAILABLE:
+        info = psutil.Process().memory_info()
+        if hasattr(info, 'peak_wset'):  # Windows
+            return info.peak_wset / (1024 * 1024)
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB
+    except ImportError:
+        return 0.0
+
+def log_memory_stage(stage):
+    """📏 Loggt RSS, Delta zur vorherigen Stufe und bisherigen Peak"""
+    rss = _rss_mb()
+    delta = rss - MEMORY_STAGES[-1][1] if MEMORY_STAGES else 0.0
+    peak = _peak_rss_mb()
+    MEMORY_STAGES.append((stage, rss, delta, peak))
+    print(f"📏 RSS [{{stage}}]: {{rss:.1f}} MB ({{delta:+.1f}} MB), Peak: {{peak:.1f}} MB")
+
+def print_memory_summary():
+    """📏 Übersicht aller Stufen"""
+    if not MEMORY_STAGES:
+        return
+    print("📏 SPEICHER PRO STUFE:")
+    for stage, rss, delta, peak in MEMORY_STAGES:
+        print(f"   {{stage:<18}} RSS {{rss:9.1f}} MB  Δ {{delta:+9.1f}} MB  Peak {{peak:9.1f}} MB")
+
 # 📊 PARQUET FORMAT SUPPORT SETUP (dokumentations-basiert)
 def setup_parquet_support():
     """📊 Setup Parquet Format Support für spalten-orientierte Performance"""
@@ -436,154 +507,43 @@ def save_to_parquet(data, file_path, parquet_config=None):
 
 # ENTFERNT: load_from_parquet - wird nicht verwendet
 
-# 🗜️ ADVANCED COMPRESSION ALGORITHMS SETUP (dokumentations-basiert)
+# 🗜️ ADVANCED COMPRESSION - blosc2 (lz4/zstd + shuffle) und zstd, mehrkernig (punkt_codecs)
 def setup_advanced_compression():
-    """🗜️ Setup Advanced Compression Algorithms (LZ4, ZSTD)"""
-    try:
-        # Advanced Compression Konfiguration
-        compression_config = {{
-            'algorithms': {{
-                'lz4': {{'level': 1, 'acceleration': 1}},      # Sehr schnell
-                'zstd': {{'level': 3, 'threads': os.cpu_count()}}, # Ausgewogen
-                'blosc': {{'cname': 'lz4', 'clevel': 5, 'shuffle': True}}, # VBT Standard
-                'snappy': {{'compression': 'snappy'}}          # Parquet Standard
-            }},
-            'default': 'blosc',
-            'threshold_mb': 10  # Kompression ab 10MB
-        }}
-
-        print("✅ Advanced Compression Setup:")
-        print(f"   ⚡ LZ4: Level {{compression_config['algorithms']['lz4']['level']}} (Ultra-schnell)")
-        print(f"   🗜️ ZSTD: Level {{compression_config['algorithms']['zstd']['level']}} (Ausgewogen)")
-        print(f"   📦 Blosc: {{compression_config['algorithms']['blosc']['cname']}} (VBT Optimiert)")
-        print(f"   🚀 Snappy: Parquet Standard")
-        print(f"   📊 Default: {{compression_config['default']}}")
+    """🗜️ Zeigt verfügbare Codecs und die aktive Wahl (PUNKT1_COMPRESSION)"""
+    compression_config = {{
+        'available': {{'blosc2': BLOSC2_AVAILABLE, 'zstd': ZSTD_AVAILABLE}},
+        'threads': CODEC_THREADS,
+        'presets': CODEC_PRESETS,
+        'active': PUNKT1_COMPRESSION,
+        'settings_read_codec': load_codec_settings().get('read_codec')
+    }}
 
-        return compression_config
-    except Exception as e:
-        print(f"⚠️ Advanced Compression Setup Fehler: {{e}}")
-        return None
+    print("✅ Advanced Compression Setup:")
+    print(f"   📦 blosc2: {{'verfügbar' if BLOSC2_AVAILABLE else 'nicht installiert'}}")
+    print(f"   🗜️ zstd: {{'verfügbar' if ZSTD_AVAILABLE else 'nicht installiert'}}")
+    print(f"   🧵 Threads: {{CODEC_THREADS}}")
+    print(f"   📊 Aktiv: {{codec_label(PUNKT1_COMPRESSION)}}")
+    if compression_config['settings_read_codec']:
+        print(f"   🏆 Benchmark-Wahl ('auto'): {{codec_label(compression_config['settings_read_codec'])}}")
+    return compression_config
 
 def save_with_advanced_compression(data, file_path, compression_type='auto', metadata=None):
-    """🗜️ Speichere mit Advanced Compression Algorithms"""
+    """🗜️ Speichert als komprimierten Column Store (compression_type: 'auto', Preset-Name oder Codec-Dict)"""
     try:
         start_time = time.time()
-
-        # Bestimme Dateigröße für Compression-Auswahl
+        spec = compression_type if isinstance(compression_type, dict) else resolve_codec_spec(compression_type)
+        store_path = os.path.splitext(file_path)[0] + COLUMN_STORE_EXT
         data_size_mb = data.memory_usage(deep=True).sum() / (1024 * 1024)
 
-        # Auto-Compression Auswahl basierend auf Dateigröße
-        if compression_type == 'auto':
-            if data_size_mb < 5:
-                compression_type = 'lz4'      # Sehr schnell für kleine Dateien
-            elif data_size_mb < 50:
-                compression_type = 'blosc'    # Ausgewogen für mittlere Dateien
-            else:
-                compression_type = 'zstd'     # Beste Kompression für große Dateien
-
-        print(f"💾 Speichere mit {{compression_type.upper()}} Kompression: {{file_path}}")
-        print(f"   📊 Daten-Größe: {{data_size_mb:.1f}} MB")
-
-        if VBT_AVAILABLE:
-            # VBT Data Objekt für maximale Performance
-            vbt_data = vbt.Data.from_data(data, columns_are_symbols=True)
-
-            if compression_type == 'lz4':
-                # LZ4 Kompression (Ultra-schnell)
-                try:
-                    import lz4.frame
-                    # VBT mit LZ4 über Pickle
-                    import pickle
-                    lz4_path = file_path.replace('.h5', '.lz4')
-                    with lz4.frame.open(lz4_path, 'wb') as f:
-                        pickle.dump(vbt_data, f)
-                    print(f"✅ VBT LZ4 gespeichert (Ultra-schnell)")
-                except ImportError:
-                    # Fallback auf VBT Pickle
-                    vbt_path = file_path.replace('.h5', '.pickle')
-                    vbt_data.save(vbt_path)
-                    print(f"✅ VBT Pickle gespeichert (LZ4 Fallback)")
-
-            elif compression_type == 'zstd':
-                # ZSTD Kompression (Beste Kompression)
-                try:
-                    import zstandard as zstd
-                    # VBT mit ZSTD über Pickle
-                    import pickle
-                    cctx = zstd.ZstdCompressor(level=3, threads=os.cpu_count())
-                    zstd_path = file_path.replace('.h5', '.zstd')
-                    with open(zstd_path, 'wb') as f:
-                        with cctx.stream_writer(f) as writer:
-                            pickle.dump(vbt_data, writer)
-                    print(f"✅ VBT ZSTD gespeichert (Beste Kompression)")
-                except ImportError:
-                    # Fallback auf VBT Pickle
-                    vbt_path = file_path.replace('.h5', '.pickle')
-                    vbt_data.save(vbt_path)
-                    print(f"✅ VBT Pickle gespeichert (ZSTD Fallback)")
-
-            else:  # blosc (Standard)
-                # VBT Pickle (Standard Format)
-                vbt_path = file_path.replace('.h5', '.pickle')
-                vbt_data.save(vbt_path)
-                print(f"✅ VBT Pickle gespeichert (Standard Format)")
-        else:
-            # Fallback: Pandas mit verschiedenen Kompressionen
-            if compression_type == 'lz4':
-                # Pandas mit LZ4
-                data.to_hdf(file_path, key='data', mode='w', complevel=1, complib='lzo')
-                print(f"✅ Pandas LZ4 gespeichert")
-            elif compression_type == 'zstd':
-                # Pandas mit ZSTD
-                data.to_hdf(file_path, key='data', mode='w', complevel=9, complib='zstd')
-                print(f"✅ Pandas ZSTD gespeichert")
-            else:  # blosc
-                # Pandas mit Blosc
-                data.to_hdf(file_path, key='data', mode='w', complevel=5, complib='blosc')
-                print(f"✅ Pandas Blosc gespeichert")
-
-        # Metadata separat speichern
-        if metadata:
-            metadata_path = file_path.replace('.h5', '_metadata.json')
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2, default=str)
+        print(f"💾 Speichere mit {{codec_label(spec)}}: {{store_path}}")
+        write_column_store(data, store_path, metadata, compression=spec)
 
-        # Performance-Info
         save_time = time.time() - start_time
-
-        # Prüfe welche Datei tatsächlich erstellt wurde
-        created_files = []
-        total_size_mb = 0
-
-        # Mögliche Dateipfade prüfen
-        possible_files = [
-            file_path.replace('.h5', '.lz4'),
-            file_path.replace('.h5', '.zstd'),
-            file_path.replace('.h5', '.pickle'),
-            file_path
-        ]
-
-        for possible_file in possible_files:
-            if os.path.exists(possible_file):
-                size_mb = os.path.getsize(possible_file) / (1024 * 1024)
-                created_files.append((possible_file, size_mb))
-                total_size_mb += size_mb
-
-        if created_files:
-            file_size_mb = total_size_mb
-            compression_ratio = data_size_mb / file_size_mb if file_size_mb > 0 else 1
-
-            print(f"✅ Advanced Compression abgeschlossen:")
-            print(f"   ⏱️ Zeit: {{save_time:.3f}}s")
-            print(f"   💾 Größe: {{file_size_mb:.1f}} MB")
-            print(f"   🗜️ Kompression: {{compression_ratio:.1f}}x kleiner")
-            print(f"   🚀 Algorithmus: {{compression_type.upper()}}")
-            for file_path_created, size_mb in created_files:
-                print(f"   📁 {{os.path.basename(file_path_created)}}: {{size_mb:.1f}} MB")
-        else:
-            print(f"⚠️ Keine Dateien erstellt")
-            file_size_mb = 0
-
+        file_size_mb = column_store_size_bytes(store_path) / (1024 * 1024)
+        print(f"✅ Advanced Compression abgeschlossen:")
+        print(f"   ⏱️ Zeit: {{save_time:.3f}}s")
+        print(f"   💾 Größe: {{file_size_mb:.1f}} MB")
+        print(f"   🗜️ Kompression: {{data_size_mb / file_size_mb if file_size_mb > 0 else 1:.1f}}x kleiner")
         return file_size_mb
 
     except Exception as e:
@@ -600,10 +560,7 @@ def setup_data_frequency_inference():
             'auto_detect': True,            # Automatische Frequenz-Erkennung
             'fallback_freq': '1min',        # Fallback-Frequenz
             'inference_methods': [
-                'auto',                     # VBT auto_detect_freq
-                'index_median',             # Median der Index-Differenzen
-                'index_mode',               # Modus der Index-Differenzen
-                'pandas_infer'              # Pandas infer_freq
+                'bar_profile'               # Modaler Abstand + Lücken (ein Numba-Durchlauf)
             ],
             'tolerance': 0.1,               # Toleranz für Frequenz-Erkennung
             'min_periods': 10               # Minimum Perioden für Inference
@@ -633,62 +590,21 @@ def infer_data_frequency(data, freq_config=None):
             print(f"⚠️ Zu wenige Daten für Inference ({{len(data)}} < {{freq_config['min_periods']}})")
             return freq_config['fallback_freq']
 
-        detected_frequencies = []
-
-        # Methode 1: VBT auto_detect_freq - ENTFERNT (Funktion existiert nicht)
-        # Diese Funktion ist in VBT Pro nicht verfügbar
-
-        # Methode 2: Index Median
-        try:
-            time_diffs = data.index.to_series().diff().dropna()
-            median_diff = time_diffs.median()
-
-            # Konvertiere zu Frequenz-String
-            if median_diff.total_seconds() < 60:
-                freq_str = f"{{int(median_diff.total_seconds())}}s"
-            elif median_diff.total_seconds() < 3600:
-                freq_str = f"{{int(median_diff.total_seconds()/60)}}min"
-            elif median_diff.total_seconds() < 86400:
-                freq_str = f"{{int(median_diff.total_seconds()/3600)}}h"
-            else:
-                freq_str = f"{{int(median_diff.total_seconds()/86400)}}D"
-
-            detected_frequencies.append(('index_median', freq_str))
-            print(f"   📊 Index Median: {{freq_str}}")
-        except Exception as e:
-            print(f"   ⚠️ Index Median Fehler: {{e}}")
-
-        # Methode 3: Pandas infer_freq
-        try:
-            pandas_freq = pd.infer_freq(data.index)
-            if pandas_freq:
-                detected_frequencies.append(('pandas_infer', pandas_freq))
-                print(f"   🐼 Pandas Infer: {{pandas_freq}}")
-        except Exception as e:
-            print(f"   ⚠️ Pandas Infer Fehler: {{e}}")
-
-        # Methode 4: VBT parse_index_freq - ENTFERNT (Funktion existiert nicht)
-        # Diese Funktion ist in VBT Pro nicht verfügbar
-
-        # Beste Frequenz auswählen
-        if detected_frequencies:
-            # Priorität: VBT auto > Pandas infer > VBT parse > Index median
-            priority_order = ['vbt_auto', 'pandas_infer', 'vbt_parse', 'index_median']
-
-            for method in priority_order:
-                for detected_method, freq in detected_frequencies:
-                    if detected_method == method:
-                        print(f"✅ Gewählte Frequenz: {{freq}} (Methode: {{method}})")
-                        return freq
-
-            # Fallback: Erste erkannte Frequenz
-            best_freq = detected_frequencies[0][1]
-            print(f"✅ Fallback Frequenz: {{best_freq}}")
-            return best_freq
-        else:
+        # Ein Numba-Durchlauf über die int64-Zeitstempel (gecacht pro Index)
+        profile = profile_bar_spacing(data.index)
+        if not profile['freq']:
             print(f"⚠️ Keine Frequenz erkannt, verwende Fallback: {{freq_config['fallback_freq']}}")
             return freq_config['fallback_freq']
 
+        print(f"   📏 Modaler Bar-Abstand: {{profile['freq']}} ({{profile['regular_share']*100:.2f}}% regulär)")
+        print(f"   🕳️ Lücken: {{profile['gaps']:,}}, Duplikate: {{profile['duplicates']:,}}, "
+              f"nicht monoton: {{profile['non_monotonic']:,}} ({{profile['seconds']:.3f}}s)")
+        if profile['largest_gaps']:
+            largest = profile['largest_gaps'][0]
+            print(f"   📉 Größte Lücke: {{largest['duration']}} ab {{largest['from']}}")
+        print(f"✅ Gewählte Frequenz: {{profile['freq']}} (Methode: bar_profile)")
+        return profile['freq']
+
     except Exception as e:
         print(f"❌ Frequency Inference Fehler: {{e}}")
         return freq_config['fallback_freq']
@@ -741,8 +657,12 @@ def setup_missing_data_handling():
             'missing_columns_strategy': 'raise',   # 'nan', 'drop', 'raise'
             'nan_threshold': 0.05,                 # Max 5% NaN-Werte erlaubt
             'duplicate_handling': 'drop',          # Duplikate entfernen
-            'outlier_detection': True,             # Outlier-Erkennung
-            'data_validation': True                # Daten-Validierung
+            'outlier_detection': True,             # Outlier-Erkennung (Volumen-Spitzen)
+            'data_validation': True,               # Daten-Validierung
+            'session': QUALITY_SESSION,            # Handelszeiten für fehlende Bars
+            'volume_spike_factor': 20.0,           # Volumen > 20x gleitender Mittelwert
+            'volume_spike_window': 390,            # Fenster in Bars
+            'repair_data': QUALITY_REPAIR          # Reparieren statt nur melden
         }}
 
         print("✅ Missing Data Handling Setup:")
@@ -751,6 +671,7 @@ def setup_missing_data_handling():
         print(f"   🎯 NaN Threshold: {{missing_config['nan_threshold']*100:.0f}}%")
         print(f"   🔍 Duplicate Handling: {{missing_config['duplicate_handling']}}")
         print(f"   📈 Outlier Detection: {{missing_config['outlier_detection']}}")
+        print(f"   🕐 Session: {{missing_config['session']}}, Reparatur: {{missing_config['repair_data']}}")
         print(f"   🚀 Robuste Datenverarbeitung aktiviert")
 
         return missing_config
@@ -758,25 +679,36 @@ def setup_missing_data_handling():
         print(f"⚠️ Missing Data Handling Setup Fehler: {{e}}")
         return None
 
+LAST_QUALITY_REPORT = None
+
 def clean_and_validate_data(data, missing_config=None):
-    """🚀 KEINE Bereinigung - Daten sind bereits sauber"""
+    """🔬 Datenqualität prüfen (wenige NumPy/Numba-Durchläufe), optional reparieren"""
+    global LAST_QUALITY_REPORT
+    if missing_config is None:
+        missing_config = setup_missing_data_handling() or {{}}
+
     try:
-        print("🚀 Keine Bereinigung - Daten sind bereits sauber...")
+        if not missing_config.get('data_validation', True):
+            return data
 
-        # Nur Kopie zurückgeben, KEINE Bereinigung
-        return data.copy()
+        quality_config = {{key: missing_config[key] for key in DEFAULT_QUALITY_CONFIG if key in missing_config}}
+        if not missing_config.get('outlier_detection', True):
+            quality_config['volume_spike_factor'] = np.inf
+
+        data, LAST_QUALITY_REPORT = validate_ohlcv(data, quality_config)
+        print_quality_report(LAST_QUALITY_REPORT)
+        return data
 
     except Exception as e:
-        print(f"❌ Fehler: {{e}}")
+        print(f"❌ Datenqualitäts-Prüfung fehlgeschlagen: {{e}}")
         return data
 
 def create_vbt_data_with_missing_handling(data, symbol=None, missing_config=None):
-    """🚀 Erstelle VBT Data OHNE Bereinigung (Daten sind bereits sauber)"""
+    """🔬 Erstelle VBT Data nach Datenqualitäts-Prüfung"""
     try:
-        print("🚀 Erstelle VBT Data ohne Bereinigung (Daten bereits sauber)...")
+        print("🔬 Erstelle VBT Data mit Datenqualitäts-Prüfung...")
 
-        # KEINE BEREINIGUNG - Daten direkt verwenden
-        clean_data = data.copy()
+        clean_data = clean_and_validate_data(data, missing_config)
 
         # Frequenz intelligent erkennen
         inferred_freq = infer_data_frequency(clean_data)
@@ -785,7 +717,7 @@ def create_vbt_data_with_missing_handling(data, symbol=None, missing_config=None
             # VBT Data ohne Bereinigung erstellen - OFFIZIELLE API
             vbt_data = vbt.Data.from_data(clean_data, columns_are_symbols=True)
 
-            print(f"✅ VBT Data ohne Bereinigung erstellt:")
+            print(f"✅ VBT Data nach Qualitäts-Prüfung erstellt:")
             print(f"   📊 Symbols: {{list(vbt_data.symbols)}}")
             print(f"   🕐 Frequenz: {{vbt_data.wrapper.freq}}")
             print(f"   📈 Shape: {{vbt_data.get().shape}}")
@@ -802,6 +734,14 @@ def create_vbt_data_with_missing_handling(data, symbol=None, missing_config=None
         print(f"⚠️ Fallback auf Original-Daten")
         return data
 
+{storage_code}
+
+{dataset_code}
+
+{append_code}
+
+{asset_catalog_code}
+
 # 🔧 AUTOMATISCHE KONFIGURATION
 ASSET_CHOICE = {asset_choice}  # {asset_var}
 PERIOD_CHOICE = {period_choice}  # {period_var}
@@ -813,15 +753,38 @@ SAVE_ULTRA_PERFORMANCE_BACKUP = {save_backup}
 SAVE_CHART = {save_chart}
 SHOW_DATA_CONTROL = {show_control}
 TEST_PERFORMANCE = {test_backup}
+PUNKT1_STORE_FORMAT = resolve_punkt1_store_format("{store_format}")
+PUNKT1_STORE_EXT = PUNKT1_STORE_FORMATS[PUNKT1_STORE_FORMAT]
+APPEND_MODE = {append_mode}  # Neue Bars an das letzte Punkt1-Artefakt anhängen
+QUALITY_REPAIR = {quality_repair}  # Datenqualität: Befunde reparieren statt nur melden
+QUALITY_SESSION = "{quality_session}"  # Handelszeiten-Vorlage für fehlende Bars
+PUNKT1_TICK_SIZE = {float(tick_size) if tick_codec else None}  # Tick-Codec: OHLC als int32 Ticks (None = aus)
+PUNKT1_COMPRESSION = resolve_codec_spec("{store_compression}")  # Column-Store Codec ('none' = memmap)
+CODEC_BENCHMARK = '--codec-benchmark' in sys.argv  # Codec-Benchmark auf den echten Daten
 
 print("🎯 ULTRA-PERFORMANCE KONFIGURATION GELADEN!")
 print(f"📊 Asset: {{ASSET_CHOICE}} ({asset_var})")
 print(f"📅 Zeitraum: {{PERIOD_CHOICE}} ({period_var})")
 print(f"📈 Visualisierung: {{VIZ_CHOICE}} ({viz_var})")
+print(f"💾 Speicherformat: {{PUNKT1_STORE_FORMAT}}")
+print(f"🔁 Append-Modus: {{'Aktiv' if APPEND_MODE else 'Aus'}}")
+print(f"🗜️ Kompression: {{codec_label(PUNKT1_COMPRESSION) if PUNKT1_STORE_FORMAT == 'columns' else PUNKT1_STORE_FORMAT}}")
 print(f"🚀 Performance-Features: Alle aktiviert")
 
+# Zeitraum-Mapping (vor dem Laden - wird als Partition-/Row-Group-Filter genutzt)
+PERIOD_MAPPING = {{
+    1: ("6Monate", 180), 2: ("1Jahr", 365), 3: ("2Jahre", 730),
+    4: ("3Jahre", 1095), 5: ("AlleDaten", None)
+}}
+PERIOD_NAME, PERIOD_DAYS_BACK = PERIOD_MAPPING.get(PERIOD_CHOICE, (None, None))
+APPEND_APPLIED = False
+
+log_memory_stage("Start")
+
 {asset_loading_code}
 
+log_memory_stage("Laden")
+
 # ⏰ ULTRA-PERFORMANCE ZEITRAUM-DEFINITION
 print("\\n⏰ ULTRA-PERFORMANCE ZEITRAUM-DEFINITION")
 print("=" * 60)
@@ -835,6 +798,7 @@ if loaded_data is not None and not loaded_data.empty:
     # Memory-Optimierung anwenden
     print("💾 Wende Memory-Optimierungen an...")
     loaded_data = optimize_data_types(loaded_data)
+    log_memory_stage("Datentypen")
     
     start_date = loaded_data.index[0]
     end_date = loaded_data.index[-1]
@@ -847,10 +811,7 @@ if loaded_data is not None and not loaded_data.empty:
     print(f"   📊 Tage: {{total_days:,}}, Zeilen: {{total_rows:,}}")
 
     # Zeitraum-Mapping
-    period_mapping = {{
-        1: ("6Monate", 180), 2: ("1Jahr", 365), 3: ("2Jahre", 730),
-        4: ("3Jahre", 1095), 5: ("AlleDaten", None)
-    }}
+    period_mapping = PERIOD_MAPPING
 
     if PERIOD_CHOICE in period_mapping:
         period_name, days_back = period_mapping[PERIOD_CHOICE]
@@ -862,6 +823,7 @@ if loaded_data is not None and not loaded_data.empty:
 
         # Vectorized Filtering anwenden
         filtered_data = vectorized_filter_data(loaded_data, filter_start, end_date)
+        log_memory_stage("Zeitraum-Filter")
         original_len = len(loaded_data)
         filtered_len = len(filtered_data)
 
@@ -871,204 +833,91 @@ if loaded_data is not None and not loaded_data.empty:
         print(f"   📅 Bis: {{end_date.strftime('%Y-%m-%d')}}")
         print(f"   📊 Daten: {{original_len:,}} → {{filtered_len:,}} Zeilen")
         
+        # 🔬 Datenqualität prüfen (Report landet in den Metadaten)
+        filtered_data = clean_and_validate_data(filtered_data, setup_missing_data_handling())
+        log_memory_stage("Datenqualität")
+
+        # 🗜️ Codec-Benchmark auf den echten Daten (python punkt1_....py --codec-benchmark)
+        if CODEC_BENCHMARK and filtered_data is not None:
+            run_codec_benchmark(filtered_data)
+
         # Memory Cleanup nach Filterung
         cleanup_memory()
         
-        # 🚀 VBT DATA OBJEKT FÜR PUNKT2 SPEICHERN
+        # 🚀 CANONICAL STORE FÜR PUNKT2/3/4 SPEICHERN (einmal schreiben)
         if SAVE_FOR_PUNKT2 and filtered_data is not None:
-            print("\\n🚀 SPEICHERE VBT DATA OBJEKT FÜR PUNKT2")
+            print("\\n🚀 SPEICHERE CANONICAL STORE FÜR PUNKT2")
             print("=" * 60)
 
             try:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 asset_name = selected_asset if 'selected_asset' in locals() else 'Asset'
 
-                if VBT_AVAILABLE:
-                    try:
-                        # VBT Data Objekt für maximale Performance erstellen
-                        vbt_data_for_punkt2 = None
-
-                        # 🚀 VBT DATA MIT NÖTIGEN FEATURES
-                        try:
-                            # Setup-Funktionen aufrufen
-                            if parquet_config is None:
-                                parquet_config = setup_parquet_support()
-                            if compression_config is None:
-                                compression_config = setup_advanced_compression()
-                            if freq_config is None:
-                                freq_config = setup_data_frequency_inference()
-                            if missing_config is None:
-                                missing_config = setup_missing_data_handling()
-
-                            # 1. MISSING DATA HANDLING + FREQUENCY INFERENCE
-                            print("🧹 Erstelle VBT Data mit Performance-Features...")
-                            vbt_data_for_punkt2 = create_vbt_data_with_missing_handling(
-                                filtered_data,
-                                symbol=asset_name,
-                                missing_config=missing_config
-                            )
-                            print(f"✅ VBT Data mit Missing Data Handling erstellt")
-                        except Exception as e:
-                            print(f"⚠️ Advanced VBT Data fehlgeschlagen: {{e}}")
-
-                            # Fallback: Standard VBT Data mit Frequency Inference
-                            try:
-                                vbt_data_for_punkt2 = create_vbt_data_with_frequency_inference(
-                                    filtered_data,
-                                    symbol=asset_name
-                                )
-                                print(f"✅ VBT Data mit Frequency Inference erstellt (Fallback)")
-                            except Exception as e2:
-                                print(f"⚠️ Frequency Inference fehlgeschlagen: {{e2}}")
-
-                                # Final Fallback: Standard VBT Data
-                                try:
-                                    vbt_data_for_punkt2 = vbt.Data.from_data(filtered_data, columns_are_symbols=True)
-                                    print(f"✅ Standard VBT Data erstellt (Final Fallback)")
-                                except Exception as e3:
-                                    print(f"⚠️ Standard VBT Data fehlgeschlagen: {{e3}}")
-                                    vbt_data_for_punkt2 = None
-
-                        if vbt_data_for_punkt2 is not None:
-                            # 🚀 VBT SPEICHERUNG FÜR OPTIMALE PUNKT2/3/4 PERFORMANCE
-
-                            # 1. VBT PICKLE FORMAT (empfohlen für VBT Data Objekte)
-                            punkt2_pickle_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_VBT_{{timestamp}}.pickle"
-                            try:
-                                vbt_data_for_punkt2.save(punkt2_pickle_file)
-                                pickle_size_mb = os.path.getsize(punkt2_pickle_file) / (1024 * 1024)
-
-                                print(f"✅ PUNKT2 VBT DATA OBJEKT GESPEICHERT (PICKLE):")
-                                print(f"   🚀 VBT Pickle: {{punkt2_pickle_file}} ({{pickle_size_mb:.1f}} MB)")
-                                print(f"   ⚡ 20x Backtesting-Speedup für Punkt2 garantiert!")
-                                print(f"   📋 Vollständiges VBT Data Objekt mit Metadaten")
-
-                                punkt2_file = punkt2_pickle_file
-                                punkt2_size_mb = pickle_size_mb
-
-                            except Exception as pickle_error:
-                                print(f"⚠️ VBT Pickle Save fehlgeschlagen: {{pickle_error}}")
-                                punkt2_file = None
-                                punkt2_size_mb = 0
-
-                            # 2. PARQUET FORMAT für spalten-orientierte Performance
-                            try:
-                                parquet_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_PARQUET_{{timestamp}}.parquet"
-                                parquet_size_mb = save_to_parquet(
-                                    filtered_data,
-                                    parquet_file,
-                                    parquet_config
-                                )
-
-                                if parquet_size_mb:
-                                    print(f"✅ Parquet Format gespeichert: {{parquet_size_mb:.1f}} MB")
-
-                            except Exception as parquet_error:
-                                print(f"⚠️ Parquet Speicherung fehlgeschlagen: {{parquet_error}}")
-
-                            # 3. ADVANCED COMPRESSION für kleinere Dateien
-                            try:
-                                compressed_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_COMPRESSED_{{timestamp}}.h5"
-                                compressed_size_mb = save_with_advanced_compression(
-                                    filtered_data,
-                                    compressed_file,
-                                    compression_type='auto'
-                                )
-
-                                if compressed_size_mb:
-                                    print(f"✅ Advanced Compression gespeichert: {{compressed_size_mb:.1f}} MB")
-
-                            except Exception as compression_error:
-                                print(f"⚠️ Advanced Compression fehlgeschlagen: {{compression_error}}")
-
-                            # 2. VBT HDF5 FORMAT (für Kompatibilität)
-                            punkt2_hdf5_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_VBT_{{timestamp}}.h5"
-                            try:
-                                # VBT to_hdf() Methode verwenden
-                                vbt_data_for_punkt2.to_hdf(punkt2_hdf5_file)
-                                hdf5_size_mb = os.path.getsize(punkt2_hdf5_file) / (1024 * 1024)
-
-                                print(f"✅ PUNKT2 VBT HDF5 GESPEICHERT:")
-                                print(f"   📊 VBT HDF5: {{punkt2_hdf5_file}} ({{hdf5_size_mb:.1f}} MB)")
-                                print(f"   💾 Kompatibel mit Pandas und anderen Tools")
-
-                                punkt2_file = punkt2_hdf5_file
-                                punkt2_size_mb = hdf5_size_mb
-
-                            except Exception as hdf5_error:
-                                print(f"⚠️ VBT HDF5 Save fehlgeschlagen: {{hdf5_error}}")
-
-                                # 3. FALLBACK: Standard DataFrame HDF5
-                                punkt2_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_STANDARD_{{timestamp}}.h5"
-                                try:
-                                    # DataFrame aus VBT Data extrahieren
-                                    vbt_dataframe = vbt_data_for_punkt2.get()
-                                    vbt_dataframe.to_hdf(
-                                        punkt2_file,
-                                        key='data',
-                                        mode='w',
-                                        complevel=9,
-                                        complib='blosc'
-                                    )
-                                    punkt2_size_mb = os.path.getsize(punkt2_file) / (1024 * 1024)
-
-                                    print(f"✅ PUNKT2 STANDARD DATEI GESPEICHERT:")
-                                    print(f"   📊 HDF5 Datei: {{punkt2_file}} ({{punkt2_size_mb:.1f}} MB)")
-                                    print(f"   💾 Blosc komprimiert für schnelles Laden")
-
-                                except Exception as std_error:
-                                    print(f"❌ Standard Speicherung fehlgeschlagen: {{std_error}}")
-                                    punkt2_size_mb = 0
-                        else:
-                            print(f"⚠️ VBT Data Objekt Erstellung fehlgeschlagen - verwende Standard HDF5")
-                            # Fallback auf Standard Speicherung
-                            punkt2_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_STANDARD_{{timestamp}}.h5"
-                            punkt2_size_mb = save_with_blosc_compression(filtered_data, punkt2_file)
-
-                            print(f"✅ PUNKT2 STANDARD DATEI GESPEICHERT:")
-                            print(f"   📊 HDF5 Datei: {{punkt2_file}} ({{punkt2_size_mb:.1f}} MB)")
-                            print(f"   💾 Blosc komprimiert für schnelles Laden")
-
-                    except Exception as vbt_error:
-                        print(f"⚠️ VBT Verarbeitung fehlgeschlagen: {{vbt_error}}")
-                        # Fallback auf Standard Speicherung
-                        punkt2_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_STANDARD_{{timestamp}}.h5"
-                        punkt2_size_mb = save_with_blosc_compression(filtered_data, punkt2_file)
-
-                        print(f"✅ PUNKT2 STANDARD DATEI GESPEICHERT:")
-                        print(f"   📊 HDF5 Datei: {{punkt2_file}} ({{punkt2_size_mb:.1f}} MB)")
-                        print(f"   💾 Blosc komprimiert für schnelles Laden")
-                else:
-                    # Standard HDF5 Speicherung als Fallback
-                    punkt2_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_STANDARD_{{timestamp}}.h5"
-                    punkt2_size_mb = save_with_blosc_compression(filtered_data, punkt2_file)
-
-                    print(f"✅ PUNKT2 STANDARD DATEI GESPEICHERT:")
-                    print(f"   📊 HDF5 Datei: {{punkt2_file}} ({{punkt2_size_mb:.1f}} MB)")
-                    print(f"   💾 Blosc komprimiert für schnelles Laden")
+                # Frequenz einmal erkennen - Adapter erstellen VBT Data daraus
+                inferred_freq = infer_data_frequency(filtered_data)
+                bar_profile = profile_bar_spacing(filtered_data.index)
 
-                # Punkt2 Metadata
+                # Punkt2 Metadata (wird zusätzlich im Store selbst abgelegt)
                 punkt2_metadata = {{
                     'asset_name': asset_name,
                     'period_name': period_name,
                     'timestamp': timestamp,
-                    'vbt_file': punkt2_file,
-                    'vbt_size_mb': punkt2_size_mb,
+                    'store_format': PUNKT1_STORE_FORMAT,
+                    'store_compression': codec_label(PUNKT1_COMPRESSION) if PUNKT1_STORE_FORMAT == 'columns' else None,
+                    'inferred_freq': inferred_freq,
+                    'bar_profile': bar_profile,
+                    'quality_report': LAST_QUALITY_REPORT,
                     'backtesting_speedup': '20x' if VBT_AVAILABLE else 'Standard',
                     'optimized_for': 'Punkt2_Maximum_Performance',
                     'data_shape': list(filtered_data.shape),
+                    'columns': list(filtered_data.columns),
                     'start_date': str(filtered_data.index[0]),
                     'end_date': str(filtered_data.index[-1])
                 }}
 
+                # 🎯 Tick-Codec nur wenn alle Preise exakt auf dem Raster liegen (verlustfrei)
+                store_tick_size = None
+                if PUNKT1_TICK_SIZE and PUNKT1_STORE_FORMAT == 'columns':
+                    off_grid = check_tick_grid(filtered_data, PUNKT1_TICK_SIZE)
+                    punkt2_metadata['tick_grid'] = {{'tick_size': PUNKT1_TICK_SIZE, 'off_grid': off_grid}}
+                    if sum(off_grid.values()):
+                        print(f"⚠️ Preise abseits des Tick-Rasters {{PUNKT1_TICK_SIZE}}: {{off_grid}} - speichere float64")
+                    else:
+                        store_tick_size = PUNKT1_TICK_SIZE
+                        print(f"🎯 Tick-Codec aktiv: OHLC als int32 Ticks à {{PUNKT1_TICK_SIZE}}")
+
+                punkt2_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_STORE_{{timestamp}}{{PUNKT1_STORE_EXT}}"
+                punkt2_size_mb, store_write_time = save_punkt1_store(
+                    filtered_data,
+                    punkt2_file,
+                    metadata=punkt2_metadata,
+                    tick_size=store_tick_size,
+                    compression=PUNKT1_COMPRESSION
+                )
+
+                print(f"✅ PUNKT2 CANONICAL STORE GESPEICHERT:")
+                print(f"   📊 Store: {{punkt2_file}} ({{punkt2_size_mb:.1f}} MB, {{store_write_time:.3f}}s)")
+                print(f"   🔌 Adapter: load_punkt1_dataframe / load_punkt1_vbt_data / open_punkt1_parquet_view")
+
+                # 'vbt_file' bleibt für bestehende Leser erhalten
+                punkt2_metadata['store_file'] = punkt2_file
+                punkt2_metadata['vbt_file'] = punkt2_file
+                punkt2_metadata['vbt_size_mb'] = punkt2_size_mb
+                punkt2_metadata['store_write_time_s'] = round(store_write_time, 4)
+
+                # 📊 Speicherformat-Benchmark (nur auf Wunsch)
+                if TEST_PERFORMANCE:
+                    punkt2_metadata['storage_benchmark'] = benchmark_storage_formats(filtered_data, tick_size=store_tick_size)
+
                 metadata_file = f"data/punkt1/{{asset_name}}_{{period_name}}_PUNKT2_METADATA_{{timestamp}}.json"
                 with open(metadata_file, 'w') as f:
                     json.dump(punkt2_metadata, f, indent=2, default=str)
 
                 print(f"   📋 Metadata: {{metadata_file}}")
+                log_memory_stage("Speichern")
 
             except Exception as e:
-                print(f"❌ VBT Data Objekt Speicherung fehlgeschlagen: {{e}}")
+                print(f"❌ Canonical Store Speicherung fehlgeschlagen: {{e}}")
 
         # 📈 CHART-VISUALISIERUNG
         if VIZ_CHOICE in [1, 2, 4, 5] and filtered_data is not None:  # Chart-Optionen
@@ -1078,36 +927,35 @@ if loaded_data is not None and not loaded_data.empty:
             try:
                 # Bestimme Anzahl der Kerzen für Chart
                 if CANDLE_CHOICE == 1:  # 1 Tag
-                    chart_data = filtered_data.tail(390)
+                    chart_data = slice_last_period(filtered_data, '1D')
                 elif CANDLE_CHOICE == 2:  # 1 Woche
-                    chart_data = filtered_data.tail(1950)
+                    chart_data = slice_last_period(filtered_data, '7D')
                 elif CANDLE_CHOICE == 3:  # 4 Wochen
-                    chart_data = filtered_data.tail(7800)
+                    chart_data = slice_last_period(filtered_data, '28D')
                 elif CANDLE_CHOICE == 4:  # 8 Wochen
-                    chart_data = filtered_data.tail(15600)
+                    chart_data = slice_last_period(filtered_data, '56D')
                 elif CANDLE_CHOICE == 5:  # 12 Wochen
-                    chart_data = filtered_data.tail(23400)
+                    chart_data = slice_last_period(filtered_data, '84D')
                 elif CANDLE_CHOICE == 6:  # Benutzerdefiniert
-                    chart_data = filtered_data.tail(CUSTOM_WEEKS * 1950)
+                    chart_data = slice_last_period(filtered_data, f'{{CUSTOM_WEEKS * 7}}D')
                 else:  # Gesamter Zeitraum
                     chart_data = filtered_data
 
-                print(f"📊 Chart-Daten: {{len(chart_data):,}} Kerzen")
+                print(f"📊 Chart-Daten: {{len(chart_data):,}} Bars "
+                      f"(~{{bars_per_calendar_day(filtered_data.index):,.0f}} Bars/Kalendertag)")
                 print(f"📅 Chart-Zeitraum: {{chart_data.index[0]}} bis {{chart_data.index[-1]}}")
 
-                # Erstelle interaktiven Plotly Chart
-                fig = go.Figure(data=go.Candlestick(
-                    x=chart_data.index,
-                    open=chart_data['open'],
-                    high=chart_data['high'],
-                    low=chart_data['low'],
-                    close=chart_data['close'],
-                    name=f"{{asset_name}} - {{period_name}}"
-                ))
+                # Pixel-genaue OHLC-Dezimierung: höchstens eine Kerze pro CHART_PX_PER_CANDLE Pixel,
+                # beim Zoom wird aus dem Voll-Auflösungs-Fenster neu aggregiert
+                fig, chart_post_script, chart_lod = build_lod_candlestick(
+                    go, chart_data, f"{{asset_name}} - {{period_name}}"
+                )
+                print(f"📉 Dezimiert: {{chart_lod['bars']:,}} Bars → {{chart_lod['candles']:,}} Kerzen "
+                      f"({{chart_lod['bars_per_candle']}} Bars/Kerze, Zoom-Fenster {{chart_lod['full_res_bars']:,}} Bars)")
 
                 # Chart-Layout optimieren
                 fig.update_layout(
-                    title=f"🚀 {{asset_name}} - Ultra-Performance Chart ({{len(chart_data):,}} Kerzen)",
+                    title=f"🚀 {{asset_name}} - Ultra-Performance Chart ({{chart_lod['bars']:,}} Bars → {{chart_lod['candles']:,}} Kerzen)",
                     xaxis_title="Zeit",
                     yaxis_title="Preis",
                     template="plotly_dark",  # Dunkles Theme
@@ -1118,13 +966,13 @@ if loaded_data is not None and not loaded_data.empty:
 
                 # Chart anzeigen
                 if VIZ_CHOICE in [1, 4]:  # Interaktiv
-                    fig.show()
+                    fig.show(post_script=chart_post_script)
                     print("✅ Interaktiver Chart angezeigt!")
 
                 # Chart als HTML speichern falls gewünscht
                 if SAVE_CHART:
                     chart_file = f"data/punkt1/{{asset_name}}_{{period_name}}_CHART_{{timestamp}}.html"
-                    fig.write_html(chart_file)
+                    fig.write_html(chart_file, post_script=chart_post_script)
                     print(f"💾 Chart gespeichert: {{chart_file}}")
 
             except Exception as e:
@@ -1140,6 +988,8 @@ if loaded_data is not None and not loaded_data.empty:
 
     else:
         print(f"❌ Ungültige Zeitraum-Auswahl: {{PERIOD_CHOICE}}")
+elif APPEND_APPLIED:
+    print("✅ Append-Modus: Artefakt in-place aktualisiert - kein Neuschreiben nötig")
 else:
     print("❌ Keine Daten für Zeitraum-Definition verfügbar!")
 
@@ -1149,19 +999,20 @@ print("=" * 60)
 
 # Memory Cleanup
 cleanup_memory()
+log_memory_stage("Ende")
+print_memory_summary()
 
 print("\\n🚀 PUNKT1 ULTRA-PERFORMANCE CODE ABGESCHLOSSEN!")
 print("✅ Nötige Performance-Features wurden verwendet:")
-print("   📊 Parquet Format Support (für Punkt2/3/4)")
-print("   🗜️ Advanced Compression Algorithms (kleinere Dateien)")
+print("   💾 Canonical Store (einmal geschrieben, Adapter für Punkt2/3/4)")
 print("   📊 Data Frequency Inference (korrekte VBT Data)")
 print("   🧹 Missing Data Handling (saubere Daten)")
 print("   🚀 Optimale Vorbereitung für VBT Backtesting!")'''
 
     return complete_code
 
-def generate_direct_file_code_optimized(file_path):
-    """Generiert optimierten Code für direkte Datei-Auswahl"""
+def generate_direct_file_code_optimized(file_path, asset_name=None):
+    """Generiert optimierten Code für direkte Datei-Auswahl (asset_name: eindeutiger Name, z.B. aus dem Batch)"""
     file_path_clean = file_path.replace('\\', '/')
 
     # Fix: Backslash-Behandlung außerhalb von f-strings
@@ -1170,7 +1021,8 @@ def generate_direct_file_code_optimized(file_path):
     else:
         file_basename = file_path.split('/')[-1]
 
-    asset_name = file_basename.split('_')[0] if '_' in file_basename else file_basename.replace('.h5', '').replace('.csv', '')
+    if not asset_name:
+        asset_name = file_basename.split('_')[0] if '_' in file_basename else file_basename.replace('.h5', '').replace('.csv', '').replace('.cols', '')
 
     return f'''
 # 📊 ULTRA-PERFORMANCE DIREKTE DATEI-AUSWAHL
@@ -1187,10 +1039,18 @@ print(f"📊 ASSET: {{selected_asset}}")
 
 # Performance-optimiertes Laden
 try:
-    loaded_data = load_with_performance_optimization(selected_file_path)
+    if APPEND_MODE and append_punkt1_artifact(selected_asset, selected_file_path):
+        APPEND_APPLIED = True
+    else:
+        loaded_data = load_with_period_pushdown(selected_asset, selected_file_path, PERIOD_DAYS_BACK)
 
-    if loaded_data is not None and not loaded_data.empty:
-        file_size_mb = os.path.getsize(selected_file_path) / (1024 * 1024)
+    if APPEND_APPLIED:
+        pass
+    elif loaded_data is not None and not loaded_data.empty:
+        if is_column_store(selected_file_path):
+            file_size_mb = column_store_size_bytes(selected_file_path) / (1024 * 1024)
+        else:
+            file_size_mb = os.path.getsize(selected_file_path) / (1024 * 1024)
         print(f"✅ Datei erfolgreich geladen!")
         print(f"📊 Daten: {{len(loaded_data):,}} Zeilen, {{len(loaded_data.columns)}} Spalten")
         print(f"📅 Zeitraum: {{loaded_data.index[0]}} bis {{loaded_data.index[-1]}}")
@@ -1232,31 +1092,24 @@ selected_asset = None
 loaded_data = None
 
 if os.path.exists(data_dir):
-    print("🔍 Scanne Assets mit Performance-Optimierung...")
-    scan_start = time.time()
+    print("🔍 Scanne Assets über den Asset-Katalog (nur geänderte Dateien)...")
 
-    # Parallel File Scanning (simuliert)
-    h5_files = [f for f in os.listdir(data_dir) if f.endswith('.h5')]
+    # Persistenter Katalog - nur neue/geänderte Dateien werden geöffnet
+    asset_catalog, catalog_stats = update_asset_catalog(data_dir)
+    available_assets = catalog_assets(asset_catalog, data_dir)
 
-    if h5_files:
+    if available_assets:
         total_size = 0
-        print(f"📁 VERFÜGBARE ASSETS ({len(h5_files)}) [PERFORMANCE-OPTIMIERT]:")
+        print(f"📁 VERFÜGBARE ASSETS ({len(available_assets)}) [ASSET-KATALOG]:")
 
-        for i, file in enumerate(h5_files, 1):
-            asset_name = file.split('_')[0] if '_' in file else file.replace('.h5', '')
-            file_path = os.path.join(data_dir, file)
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            total_size += file_size_mb
-
-            category = categorize_asset(asset_name)
-            available_assets[asset_name] = {
-                'file_path': file_path, 'file_name': file, 'file_size_mb': file_size_mb,
-                'category': category, 'index': i
-            }
-            print(f"   {i:2d}. {category} {asset_name}: {file_size_mb:.1f} MB")
+        for asset_name, info in available_assets.items():
+            total_size += info['file_size_mb']
+            info['category'] = categorize_asset(asset_name)
+            rows_info = f", {info['rows']:,} Zeilen bis {info['end']}" if info.get('rows') else ""
+            print(f"   {info['index']:2d}. {info['category']} {asset_name}: {info['file_size_mb']:.1f} MB{rows_info}")
 
-        scan_time = time.time() - scan_start
-        print(f"\\n📊 SCAN ABGESCHLOSSEN: {len(available_assets)} Assets, {total_size:.1f} MB in {scan_time:.3f}s")
+        print(f"\\n📊 SCAN ABGESCHLOSSEN: {len(available_assets)} Assets, {total_size:.1f} MB in {catalog_stats['seconds']:.3f}s "
+              f"({catalog_stats['probed']} Dateien neu gelesen)")
 
         # Asset auswählen
         if ASSET_CHOICE == 0:
@@ -1280,9 +1133,14 @@ if os.path.exists(data_dir):
                 file_path = available_assets[selected_asset]['file_path']
                 print(f"\\n📊 LADE ASSET MIT PERFORMANCE-OPTIMIERUNG: {selected_asset}")
 
-                loaded_data = load_with_performance_optimization(file_path)
+                if APPEND_MODE and append_punkt1_artifact(selected_asset, file_path):
+                    APPEND_APPLIED = True
+                else:
+                    loaded_data = load_with_period_pushdown(selected_asset, file_path, PERIOD_DAYS_BACK)
 
-                if loaded_data is not None and not loaded_data.empty:
+                if APPEND_APPLIED:
+                    pass
+                elif loaded_data is not None and not loaded_data.empty:
                     print(f"✅ Asset geladen: {selected_asset}")
                     print(f"📊 Daten: {len(loaded_data):,} Zeilen, {len(loaded_data.columns)} Spalten")
                     print(f"📅 Zeitraum: {loaded_data.index[0]} bis {loaded_data.index[-1]}")
@@ -1297,3 +1155,540 @@ if os.path.exists(data_dir):
         print("❌ Keine HDF5-Dateien gefunden!")
 else:
     print("❌ Verzeichnis historical_data/ nicht gefunden!")'''
+
+def generate_storage_code_optimized():
+    """Generiert Code für den Canonical Store (einmal schreiben, Adapter lesen)"""
+    return get_column_store_source() + '''
+
+# 💾 CANONICAL STORE - EIN FORMAT, EINMAL GESCHRIEBEN
+# Punkt1 schreibt die gefilterten Daten genau einmal (spalten-orientiert).
+# Punkt2/3/4 holen sich über die Adapter das Format, das sie brauchen.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PUNKT1_STORE_FORMATS = {'columns': COLUMN_STORE_EXT, 'parquet': '.parquet', 'hdf5_blosc': '.h5'}
+PUNKT1_STORE_METADATA_KEY = b'punkt1'
+
+def resolve_punkt1_store_format(requested):
+    """Wählt das Canonical-Format (Fallback falls PyArrow fehlt)"""
+    if requested == 'parquet' and not PYARROW_AVAILABLE:
+        print("⚠️ PyArrow nicht verfügbar - Canonical Store als HDF5/Blosc")
+        return 'hdf5_blosc'
+    return requested if requested in PUNKT1_STORE_FORMATS else 'columns'
+
+def check_tick_grid(data, tick_size):
+    """🎯 Zählt Preise abseits des Tick-Rasters pro OHLC-Spalte (vektorisiert)"""
+    return {column: int(off_tick_grid_mask(data[column].to_numpy(), tick_size).sum())
+            for column in data.columns if str(column).lower() in TICK_CODEC_COLUMNS}
+
+def save_punkt1_store(data, store_path, metadata=None, parquet_config=None, tick_size=None, compression=None):
+    """💾 Schreibt den Canonical Store (atomar über temporäre Datei)"""
+    start_time = time.time()
+
+    if store_path.endswith(COLUMN_STORE_EXT):
+        # Column Store (schreibt selbst atomar, optional Tick-Codec und blosc2/zstd)
+        write_column_store(data, store_path, metadata, tick_size=tick_size, compression=compression)
+        return column_store_size_bytes(store_path) / (1024 * 1024), time.time() - start_time
+
+    tmp_path = store_path + '.tmp'
+    if store_path.endswith('.parquet'):
+        if parquet_config is None:
+            parquet_config = setup_parquet_support()
+        table = pa.Table.from_pandas(data, preserve_index=True)
+        if metadata:
+            schema_metadata = dict(table.schema.metadata or {})
+            schema_metadata[PUNKT1_STORE_METADATA_KEY] = json.dumps(metadata, default=str).encode('utf-8')
+            table = table.replace_schema_metadata(schema_metadata)
+
+        pq.write_table(
+            table,
+            tmp_path,
+            compression=parquet_config['compression'],
+            row_group_size=parquet_config['row_group_size'],
+            use_dictionary=parquet_config['use_dictionary'],
+            write_statistics=parquet_config['write_statistics']
+        )
+    else:
+        # Fallback ohne PyArrow: HDF5 mit Blosc
+        data.to_hdf(tmp_path, key='data', mode='w', complevel=9, complib='blosc')
+
+    os.replace(tmp_path, store_path)
+
+    write_time = time.time() - start_time
+    size_mb = os.path.getsize(store_path) / (1024 * 1024)
+    return size_mb, write_time
+
+def load_punkt1_dataframe(store_path, columns=None):
+    """📊 Adapter: Canonical Store → pandas DataFrame (Column Store ohne Kopie)"""
+    if store_path.endswith(COLUMN_STORE_EXT):
+        return open_column_store(store_path, columns=columns)
+    if store_path.endswith('.parquet'):
+        return pd.read_parquet(store_path, columns=columns)
+    data = pd.read_hdf(store_path, key='data')
+    return data[columns] if columns else data
+
+def load_punkt1_vbt_data(store_path):
+    """🚀 Adapter: Canonical Store → vbt.Data (DataFrame ohne VBT)"""
+    data = load_punkt1_dataframe(store_path)
+    if VBT_AVAILABLE:
+        return vbt.Data.from_data(data, columns_are_symbols=True)
+    return data
+
+def open_punkt1_parquet_view(store_path):
+    """📊 Adapter: Canonical Store → lazy Parquet View (Row Groups, Statistiken)"""
+    if not (PYARROW_AVAILABLE and store_path.endswith('.parquet')):
+        print(f"⚠️ Parquet View nur für .parquet Stores verfügbar: {store_path}")
+        return None
+    return pq.ParquetFile(store_path)
+
+def read_punkt1_store_metadata(store_path):
+    """📋 Liest die im Store abgelegten Punkt1-Metadaten (ohne Daten zu laden)"""
+    if store_path.endswith(COLUMN_STORE_EXT):
+        return read_column_store_header(store_path).get('metadata', {})
+    if PYARROW_AVAILABLE and store_path.endswith('.parquet'):
+        schema_metadata = pq.read_schema(store_path).metadata or {}
+        raw = schema_metadata.get(PUNKT1_STORE_METADATA_KEY)
+        return json.loads(raw) if raw else {}
+    return {}
+
+def _directory_size_bytes(directory):
+    """Summe aller Dateigrößen in einem Verzeichnis"""
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def _save_legacy_compressed_hdf5(data, file_path):
+    """Alte COMPRESSED-Kopie (Pandas HDF5, Kompression nach Datengröße wie vor dem Column Store)"""
+    data_size_mb = data.memory_usage(deep=True).sum() / (1024 * 1024)
+    if data_size_mb < 5:
+        complevel, complib = 1, 'lzo'
+    elif data_size_mb < 50:
+        complevel, complib = 5, 'blosc'
+    else:
+        complevel, complib = 9, 'zstd'
+    try:
+        data.to_hdf(file_path, key='data', mode='w', complevel=complevel, complib=complib)
+    except ValueError:
+        # LZO fehlt in vielen PyTables-Builds - alte Fallback-Kompression Blosc
+        data.to_hdf(file_path, key='data', mode='w', complevel=complevel, complib='blosc')
+
+def benchmark_storage_formats(data, tick_size=None):
+    """📊 Misst Schreibzeit und Bytes pro Format (Canonical mit Lauf-Codec/Tick-Größe vs. alte 4-fach Speicherung)"""
+    import tempfile
+    import shutil
+
+    print("\\n📊 SPEICHERFORMAT-BENCHMARK")
+    print("=" * 60)
+
+    writers = [('canonical_store', lambda path: save_punkt1_store(data, path + PUNKT1_STORE_EXT,
+                                                                 tick_size=tick_size, compression=PUNKT1_COMPRESSION))]
+    if VBT_AVAILABLE:
+        writers.append(('vbt_pickle', lambda path: vbt.Data.from_data(data, columns_are_symbols=True).save(path + '.pickle')))
+    writers.append(('parquet', lambda path: save_to_parquet(data, path + '.parquet')))
+    writers.append(('hdf5_compressed', lambda path: _save_legacy_compressed_hdf5(data, path + '.h5')))
+    if VBT_AVAILABLE:
+        writers.append(('vbt_hdf5', lambda path: vbt.Data.from_data(data, columns_are_symbols=True).to_hdf(path + '.h5')))
+    else:
+        writers.append(('hdf5_blosc', lambda path: data.to_hdf(path + '.h5', key='data', mode='w', complevel=9, complib='blosc')))
+
+    results = {}
+    bench_root = tempfile.mkdtemp(prefix='punkt1_bench_', dir='data')
+    try:
+        for name, writer in writers:
+            format_dir = os.path.join(bench_root, name)
+            os.makedirs(format_dir)
+            start_time = time.time()
+            try:
+                writer(os.path.join(format_dir, 'bench'))
+                results[name] = {
+                    'write_time_s': round(time.time() - start_time, 4),
+                    'bytes': _directory_size_bytes(format_dir)
+                }
+            except Exception as e:
+                results[name] = {'error': str(e)}
+    finally:
+        shutil.rmtree(bench_root, ignore_errors=True)
+
+    print(f"\\n{'Format':<22} {'Zeit (s)':>10} {'Größe (MB)':>12}")
+    print("-" * 46)
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<22} ❌ {result['error']}")
+        else:
+            print(f"{name:<22} {result['write_time_s']:>10.3f} {result['bytes'] / (1024 * 1024):>12.2f}")
+
+    legacy = [r for name, r in results.items() if name != 'canonical_store' and 'error' not in r]
+    canonical = results.get('canonical_store', {})
+    if legacy and 'error' not in canonical:
+        legacy_time = sum(r['write_time_s'] for r in legacy)
+        legacy_bytes = sum(r['bytes'] for r in legacy)
+        print("-" * 46)
+        print(f"{'Alt (alle Formate)':<22} {legacy_time:>10.3f} {legacy_bytes / (1024 * 1024):>12.2f}")
+        if canonical['write_time_s'] > 0 and canonical['bytes'] > 0:
+            time_ratio = legacy_time / canonical['write_time_s']
+            bytes_ratio = legacy_bytes / canonical['bytes']
+            for label, ratio, loss in (('Zeit', time_ratio, 'langsamer'), ('Speicher', bytes_ratio, 'größer')):
+                if ratio >= 1:
+                    print(f"✅ {label}: {ratio:.1f}x Ersparnis gegenüber der alten Speicherung")
+                else:
+                    print(f"⚠️ {label}: Canonical Store ist {1 / ratio:.1f}x {loss} als die alte Speicherung")
+        results['legacy_total'] = {'write_time_s': round(legacy_time, 4), 'bytes': legacy_bytes}
+
+    return results'''
+
+def generate_dataset_code_optimized():
+    """Generiert Code für das partitionierte Parquet-Dataset (asset/year/month)"""
+    return '''
+# 📦 PARTITIONIERTES PARQUET-DATASET (historical_data/_dataset/asset=/year=/month=)
+# Jedes Asset wird einmal aus HDF5/CSV nach Jahr/Monat partitioniert.
+# Der Zeitraum (PERIOD_CHOICE) wird zum Partition- und Row-Group-Filter,
+# ein 6-Monats-Lauf liest damit nur ~6 Monate Bytes von der Platte.
+try:
+    import pyarrow.dataset as ds
+    DATASET_AVAILABLE = PYARROW_AVAILABLE
+except ImportError:
+    DATASET_AVAILABLE = False
+
+DATASET_ROOT = os.path.join("historical_data", "_dataset")
+DATASET_INDEX_COLUMN = "timestamp"
+
+def _dataset_manifest_path(asset_dir):
+    # Ein Manifest pro Asset: parallele Batch-Worker schreiben nie dieselbe Datei
+    # ('_'-Präfix → wird von der Dataset-Discovery ignoriert)
+    return os.path.join(asset_dir, "_manifest.json")
+
+def _load_dataset_manifest(asset_dir):
+    """📋 Lädt den Manifest-Eintrag eines Assets (None falls nicht vorhanden)"""
+    manifest_path = _dataset_manifest_path(asset_dir)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Manifest nicht lesbar, wird neu aufgebaut: {e}")
+    return None
+
+def _save_dataset_manifest(asset_dir, entry):
+    """📋 Schreibt den Manifest-Eintrag atomar (temporäre Datei pro Prozess)"""
+    os.makedirs(asset_dir, exist_ok=True)
+    manifest_path = _dataset_manifest_path(asset_dir)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(entry, f, indent=2, default=str)
+    os.replace(tmp_path, manifest_path)
+
+def _dataset_partitioning():
+    """Hive-Partitionierung year=/month= unterhalb von asset="""
+    return ds.partitioning(pa.schema([('year', pa.int16()), ('month', pa.int8())]), flavor='hive')
+
+def _dataset_table(data):
+    """Frame → Arrow-Tabelle mit Zeitstempel- und year/month-Partitionsspalten"""
+    # Direkt nach Arrow (ohne reset_index-Kopie des ganzen Frames)
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    table = table.append_column(DATASET_INDEX_COLUMN, pa.array(data.index))
+    table = table.append_column('year', pa.array(data.index.year.astype('int16')))
+    table = table.append_column('month', pa.array(data.index.month.astype('int8')))
+    return table
+
+def _data_partitions(index):
+    return sorted({f"{y:04d}-{m:02d}" for y, m in zip(index.year, index.month)})
+
+def _read_source_row(source_path, position):
+    """Eine Quellzeile per Position (HDF5/Column Store ohne die ganze Datei zu laden)"""
+    source_lower = source_path.lower()
+    if is_column_store(source_path):
+        return open_column_store(source_path).iloc[position:position + 1]
+    if source_lower.endswith(('.h5', '.hdf5')):
+        return pd.read_hdf(source_path, key='data', start=position, stop=position + 1)
+    if source_lower.endswith('.csv'):
+        return pd.read_csv(source_path, index_col=0, parse_dates=True,
+                           skiprows=range(1, position + 1), nrows=1)
+    return None
+
+def _extend_partitioned_dataset(asset_dir, source_path, entry, source_stat):
+    """
+    ⚡ Quelle ist nur gewachsen: liest die Zeilen nach end_date, schreibt den
+    letzten Monat neu und legt neue Monate an. None → kompletter Neuaufbau.
+    """
+    end_date = pd.Timestamp(entry['end_date'])
+    # Gespeicherter Präfix muss unverändert sein: Quellzeile an Position rows-1 = letzte Dataset-Zeile
+    # (ein Re-Export mit korrigierter Historie wächst evtl. auch - dann Neuaufbau)
+    try:
+        first = _read_source_row(source_path, 0)
+        seam = _read_source_row(source_path, entry['rows'] - 1)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if (first is None or seam is None or len(first) != 1 or len(seam) != 1
+            or str(first.index[0]) != entry['start_date'] or str(seam.index[0]) != entry['end_date']):
+        return None
+    try:
+        new_rows = read_source_rows_after(source_path, end_date)
+    except TypeError:
+        # tz-aware vs. naive Zeitstempel - Quelle wurde offenbar umgestellt
+        return None
+    if new_rows is None or new_rows.empty or list(new_rows.columns) != entry['columns']:
+        return None
+    if not new_rows.index.is_monotonic_increasing:
+        new_rows = new_rows.sort_index()
+
+    table = _dataset_table(new_rows)
+    dataset = ds.dataset(asset_dir, format='parquet', partitioning=_dataset_partitioning())
+    last_month = (ds.field('year') == end_date.year) & (ds.field('month') == end_date.month)
+    last_partition = dataset.to_table(filter=last_month).sort_by(DATASET_INDEX_COLUMN)
+    if not last_partition.num_rows:
+        return None
+    stored_last = last_partition.slice(last_partition.num_rows - 1).select(entry['columns']).to_pylist()[0]
+    seam_values = seam.iloc[0]
+    if any(not (pd.isna(stored_last[c]) and pd.isna(seam_values[c])) and stored_last[c] != seam_values[c]
+           for c in entry['columns']):
+        return None
+    try:
+        table = pa.concat_tables([last_partition, table.select(last_partition.schema.names).cast(last_partition.schema)])
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, KeyError):
+        return None
+
+    # delete_matching: nur die beschriebenen Monatsverzeichnisse werden ersetzt
+    ds.write_dataset(
+        table,
+        asset_dir,
+        format='parquet',
+        partitioning=_dataset_partitioning(),
+        max_rows_per_group=50000,
+        existing_data_behavior='delete_matching'
+    )
+
+    updated = dict(entry)
+    updated.update({
+        'source_size': source_stat.st_size,
+        'source_mtime': source_stat.st_mtime,
+        'rows': entry['rows'] + len(new_rows),
+        'end_date': str(new_rows.index[-1]),
+        'partitions': sorted(set(entry['partitions']) | set(_data_partitions(new_rows.index)))
+    })
+    return updated
+
+def ensure_partitioned_dataset(asset_name, source_path):
+    """📦 Baut das Dataset eines Assets, falls es fehlt oder die Quelle sich geändert hat"""
+    asset_dir = os.path.join(DATASET_ROOT, f"asset={asset_name}")
+    source_stat = os.stat(source_path)
+
+    entry = _load_dataset_manifest(asset_dir)
+    if entry and os.path.isdir(asset_dir) and entry.get('source_path') == os.path.abspath(source_path):
+        if entry.get('source_size') == source_stat.st_size and entry.get('source_mtime') == source_stat.st_mtime:
+            return entry
+        if source_stat.st_size > entry.get('source_size', 0):
+            update_start = time.time()
+            updated = _extend_partitioned_dataset(asset_dir, source_path, entry, source_stat)
+            if updated is not None:
+                _save_dataset_manifest(asset_dir, updated)
+                print(f"✅ Dataset fortgeschrieben: {updated['rows'] - entry['rows']:,} neue Zeilen bis "
+                      f"{updated['end_date']} in {time.time() - update_start:.2f}s")
+                return updated
+            print("⚠️ Quelle nicht nur angehängt - baue Dataset komplett neu")
+
+    print(f"📦 Baue partitioniertes Dataset für {asset_name} (einmalig)...")
+    build_start = time.time()
+
+    data = load_with_performance_optimization(source_path)
+    if data is None or data.empty:
+        return None
+
+    index_name = data.index.name
+    table = _dataset_table(data)
+
+    import shutil
+    shutil.rmtree(asset_dir, ignore_errors=True)
+    ds.write_dataset(
+        table,
+        asset_dir,
+        format='parquet',
+        partitioning=_dataset_partitioning(),
+        max_rows_per_group=50000,
+        existing_data_behavior='overwrite_or_ignore'
+    )
+
+    partitions = _data_partitions(data.index)
+    entry = {
+        'source_path': os.path.abspath(source_path),
+        'source_size': source_stat.st_size,
+        'source_mtime': source_stat.st_mtime,
+        'index_name': index_name,
+        'columns': list(data.columns),
+        'rows': len(data),
+        'start_date': str(data.index[0]),
+        'end_date': str(data.index[-1]),
+        'partitions': partitions
+    }
+    _save_dataset_manifest(asset_dir, entry)
+
+    print(f"✅ Dataset gebaut: {len(partitions)} Partitionen, {len(data):,} Zeilen in {time.time() - build_start:.2f}s")
+    return entry
+
+def load_with_period_pushdown(asset_name, source_path, days_back):
+    """⚡ Lädt nur die Partitionen/Row Groups des gewählten Zeitraums"""
+    if not DATASET_AVAILABLE or not source_path.lower().endswith(('.h5', '.hdf5', '.csv')):
+        return load_with_performance_optimization(source_path)
+
+    try:
+        entry = ensure_partitioned_dataset(asset_name, source_path)
+        if entry is None:
+            return None
+
+        load_start = time.time()
+        asset_dir = os.path.join(DATASET_ROOT, f"asset={asset_name}")
+        dataset = ds.dataset(asset_dir, format='parquet', partitioning=_dataset_partitioning())
+
+        expression = None
+        if days_back is not None:
+            end_date = pd.Timestamp(entry['end_date'])
+            filter_start = end_date - timedelta(days=days_back)
+            partition_filter = ((ds.field('year') > filter_start.year) |
+                                ((ds.field('year') == filter_start.year) & (ds.field('month') >= filter_start.month)))
+            index_type = dataset.schema.field(DATASET_INDEX_COLUMN).type
+            row_filter = ds.field(DATASET_INDEX_COLUMN) >= pa.scalar(filter_start, type=index_type)
+            expression = partition_filter & row_filter
+
+        all_fragments = list(dataset.get_fragments())
+        read_fragments = list(dataset.get_fragments(filter=expression))
+        total_mb = sum(os.path.getsize(f.path) for f in all_fragments) / (1024 * 1024)
+        read_mb = sum(os.path.getsize(f.path) for f in read_fragments) / (1024 * 1024)
+
+        table = dataset.to_table(columns=[DATASET_INDEX_COLUMN] + entry['columns'], filter=expression)
+        # Index separat setzen statt set_index (das kopiert alle Spalten erneut)
+        index = pd.DatetimeIndex(table.column(DATASET_INDEX_COLUMN).to_pandas(), name=entry.get('index_name'))
+        data = table.drop([DATASET_INDEX_COLUMN]).to_pandas(split_blocks=True, self_destruct=True)
+        del table
+        data.index = index
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+
+        print(f"✅ Pushdown-Laden: {len(read_fragments)}/{len(all_fragments)} Partitionen, "
+              f"{read_mb:.1f} von {total_mb:.1f} MB in {time.time() - load_start:.3f}s")
+        return data
+
+    except Exception as e:
+        print(f"⚠️ Dataset-Pushdown fehlgeschlagen, lade komplette Datei: {e}")
+        return load_with_performance_optimization(source_path)'''
+
+def generate_append_code_optimized():
+    """Generiert Code für den Append-Modus (neue Bars in-place anhängen)"""
+    return '''
+# 🔁 APPEND-MODUS - tägliches Update ohne Neuschreiben
+# Statt die Quelle komplett neu zu lesen, zu filtern und ein neues Artefakt
+# zu schreiben, werden nur die Bars nach dem letzten Zeitstempel des
+# neuesten Punkt1-Column-Stores gelesen und in-place angehängt.
+# Hinweis: das Artefakt wächst dabei über das ursprüngliche Zeitfenster hinaus.
+import glob
+
+def find_latest_punkt1_artifact(asset_name, period_name):
+    """🔍 Neuester Punkt1 Column Store (+ Metadata) für Asset und Zeitraum"""
+    pattern = os.path.join("data", "punkt1", f"{asset_name}_{period_name}_PUNKT2_STORE_*{COLUMN_STORE_EXT}")
+    candidates = sorted(path for path in glob.glob(pattern) if is_column_store(path))
+    if not candidates:
+        return None, None
+
+    store_path = candidates[-1]
+    metadata_path = store_path[:-len(COLUMN_STORE_EXT)].replace('_PUNKT2_STORE_', '_PUNKT2_METADATA_') + '.json'
+    return store_path, metadata_path if os.path.exists(metadata_path) else None
+
+def read_source_rows_after(source_path, after_ts):
+    """⚡ Liest nur Zeilen nach after_ts aus der Quelle"""
+    source_lower = source_path.lower()
+
+    if is_column_store(source_path):
+        data = open_column_store(source_path)
+    elif source_lower.endswith(('.h5', '.hdf5')):
+        try:
+            # Table-Format: Zeilenfilter direkt in PyTables (liest nur neue Bars)
+            return pd.read_hdf(source_path, key='data', where=f"index > '{after_ts}'")
+        except (TypeError, ValueError):
+            # Fixed-Format unterstützt kein where - komplett lesen und schneiden
+            print("⚠️ HDF5 im Fixed-Format - lese komplett und schneide ab")
+            data = pd.read_hdf(source_path, key='data')
+    elif source_lower.endswith('.csv'):
+        data = pd.read_csv(source_path, index_col=0, parse_dates=True)
+    else:
+        data = load_with_performance_optimization(source_path)
+
+    if data is None:
+        return None
+    if data.index.tz is not None and after_ts.tz is None:
+        after_ts = after_ts.tz_localize(data.index.tz)
+    return data.iloc[data.index.searchsorted(after_ts, side='right'):]
+
+def _write_json_atomic(path, payload):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def append_punkt1_artifact(asset_name, source_path):
+    """
+    🔁 Hängt neue Bars an das letzte Punkt1-Artefakt an
+
+    Gibt True zurück wenn das Artefakt aktuell ist (angehängt oder nichts Neues),
+    False wenn die volle Verarbeitung nötig ist (kein Artefakt, Naht-Fehler, ...).
+    """
+    if PUNKT1_STORE_FORMAT != 'columns':
+        print(f"⚠️ Append-Modus nur für Column Store - volle Verarbeitung ({PUNKT1_STORE_FORMAT})")
+        return False
+
+    store_path, metadata_path = find_latest_punkt1_artifact(asset_name, PERIOD_NAME)
+    if store_path is None:
+        print(f"ℹ️ Kein Punkt1-Artefakt für {asset_name}/{PERIOD_NAME} - volle Verarbeitung")
+        return False
+
+    print(f"\\n🔁 APPEND-MODUS: {os.path.basename(store_path)}")
+    append_start = time.time()
+
+    try:
+        header = read_column_store_header(store_path)
+        last_ts = pd.Timestamp(header['end'])
+        new_rows = read_source_rows_after(source_path, last_ts)
+        if new_rows is None:
+            return False
+
+        if new_rows.empty:
+            print(f"✅ Bereits aktuell (letzter Bar: {last_ts}) - {time.time() - append_start:.3f}s")
+            return True
+
+        new_rows = clean_and_validate_data(new_rows)
+        rows_before = header['rows']
+        # Bar-Profil über Bestand + neue Bars (nur int64-Zeitstempel, keine Spalten)
+        bar_profile = profile_bar_spacing(open_column_store(store_path, columns=[]).index.append(new_rows.index))
+        header = append_to_column_store(store_path, new_rows, metadata_update={
+            'end_date': str(new_rows.index[-1]),
+            'data_shape': [rows_before + len(new_rows), len(new_rows.columns)],
+            'bar_profile': bar_profile
+        })
+
+    except ValueError as e:
+        print(f"❌ Append abgelehnt ({e}) - volle Verarbeitung")
+        return False
+
+    # Leichtes Metadata-Update statt komplettem Neuschreiben
+    if metadata_path:
+        with open(metadata_path, 'r') as f:
+            punkt2_metadata = json.load(f)
+        punkt2_metadata['end_date'] = header['end']
+        punkt2_metadata['bar_profile'] = bar_profile
+        punkt2_metadata['data_shape'] = [header['rows'], len(header['columns'])]
+        punkt2_metadata['vbt_size_mb'] = column_store_size_bytes(store_path) / (1024 * 1024)
+        punkt2_metadata.setdefault('appends', []).append({
+            'appended_at': datetime.now().strftime("%Y%m%d_%H%M%S"),
+            'rows': len(new_rows),
+            'from': str(new_rows.index[0]),
+            'to': str(new_rows.index[-1]),
+            'quality_report': LAST_QUALITY_REPORT
+        })
+        _write_json_atomic(metadata_path, punkt2_metadata)
+
+    print(f"✅ {len(new_rows):,} neue Bars angehängt ({rows_before:,} → {header['rows']:,}) "
+          f"bis {header['end']} in {time.time() - append_start:.3f}s")
+    return True'''
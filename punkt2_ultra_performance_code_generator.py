@@ -7,6 +7,14 @@ Generiert optimierten Code mit allen VectorBT Pro Performance-Features
 from datetime import datetime
 import os
 
+from punkt_column_store import get_column_store_source
+from punkt_resample import get_resample_source
+from punkt_parallel_resample import get_parallel_resample_source
+from punkt_mtf_container import get_mtf_container_source
+from punkt_memory_budget import get_memory_budget_source
+from punkt_tick_ingest import get_tick_ingest_source
+from punkt_activity_bars import get_activity_bars_source
+
 def generate_ultra_performance_punkt2_code(config):
     """
     Generiert Ultra-Performance Punkt2 Code mit allen VBT Pro Optimierungen
@@ -23,6 +31,12 @@ def generate_ultra_performance_punkt2_code(config):
     save_backup = config.get('save_backup', True)
     save_charts = config.get('save_charts', False)
     show_summary = config.get('show_summary', True)
+    store_compression = config.get('store_compression', 'source')
+    cascade_verify = config.get('cascade_verify', False)
+    resample_session = config.get('resample_session') or None
+    parallel_workers = config.get('parallel_workers', 'auto')
+    incremental_update = config.get('incremental_update', False)
+    memory_budget = config.get('memory_budget', 'auto')
     
     # Code generieren
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -34,6 +48,15 @@ def generate_ultra_performance_punkt2_code(config):
     else:
         mode_desc = f"Multi-Timeframe: {', '.join(timeframes)}"
 
+    column_store_code = get_column_store_source()
+    mtf_container_code = get_mtf_container_source()
+    memory_budget_code = get_memory_budget_source()
+    tick_ingest_code = get_tick_ingest_source()
+    activity_bars_code = get_activity_bars_source()
+    resample_code = get_resample_source()
+    parallel_resample_code = get_parallel_resample_source()
+    incremental_code = generate_incremental_update_code()
+
     complete_code = f'''# 🚀 PUNKT 2: ULTRA-PERFORMANCE AUTOMATISCH GENERIERTER CODE
 # Generiert am: {timestamp}
 # Datei: {file_basename}
@@ -58,6 +81,7 @@ from datetime import datetime, timedelta
 import warnings; warnings.filterwarnings('ignore')
 import gc
 import time
+import shutil
 from concurrent.futures import ThreadPoolExecutor
 
 # psutil für Memory-Monitoring (optional)
@@ -155,11 +179,12 @@ print("✅ Setup abgeschlossen!")
 
 # 🚀 ULTRA-PERFORMANCE FUNKTIONEN
 def get_memory_usage():
-    """💾 Memory-Monitoring (optional psutil)"""
+    """💾 Memory-Monitoring (optional psutil), prüft dabei das RAM-Budget"""
     if PSUTIL_AVAILABLE:
         try:
-            process = psutil.Process(os.getpid())
-            return process.memory_info().rss / 1024 / 1024  # MB
+            info = psutil.Process(os.getpid()).memory_info()
+            enforce_memory_budget(info)
+            return info.rss / 1024 / 1024  # MB
         except:
             return 0.0
     else:
@@ -332,6 +357,30 @@ def periodic_memory_management(iteration, interval=1000):
             except:
                 pass
 
+# 💾 MEMORY-MAPPED COLUMN STORE (Punkt1 → Punkt2 → Punkt3)
+{column_store_code}
+
+# 🗂️ MULTI-TIMEFRAME CONTAINER (eine Gruppe pro Timeframe statt Dateien pro Timeframe)
+{mtf_container_code}
+
+# 🧮 RAM-BUDGET (Zeitfenster-Planung nach Bytes statt Timeframes pro Chunk)
+{memory_budget_code}
+
+# 🔗 KASKADIERENDES RESAMPLING (Ableitungsgraph statt N Durchläufe über die Basis)
+# ⚡ + Numba-Bucket-Resampler auf int64-Zeitstempeln (bit-identisch zu Pandas)
+# 🧵 + Worker-Prozesse über Shared Memory (Worker-Skript = Code zwischen den Markern)
+# ▼ RESAMPLE WORKER START
+{resample_code}
+
+{parallel_resample_code}
+# ▲ RESAMPLE WORKER END
+
+# 📥 TICK-/SEKUNDEN-INGEST (Parquet/CSV blockweise zu Basis-Bars, offener Bar über Blockgrenzen)
+{tick_ingest_code}
+
+# 📦 AKTIVITÄTS-BARS (Volumen/Tick/Range/Dollar statt Uhr, Numba-Durchlauf über die Basis)
+{activity_bars_code}
+
 # 🔧 AUTOMATISCHE KONFIGURATION
 SELECTED_FILE = r"{selected_file_path.replace(chr(92), '/')}"
 TIMEFRAME_MODE = "{timeframe_mode}"
@@ -343,6 +392,13 @@ SAVE_PUNKT3 = {str(save_punkt3)}
 SAVE_BACKUP = {str(save_backup)}
 SAVE_CHARTS = {str(save_charts)}
 SHOW_SUMMARY = {str(show_summary)}
+STORE_COMPRESSION = "{store_compression}"  # 'source' = Codec des Punkt1-Stores übernehmen
+CASCADE_VERIFY = {str(cascade_verify)} or '--verify-cascade' in sys.argv  # Kaskade gegen direktes Resample prüfen
+RESAMPLE_SESSION = {resample_session!r}  # None = Kalender-Buckets, sonst Name aus RESAMPLE_SESSIONS
+PARALLEL_WORKERS = {str(parallel_workers)!r}  # 'auto' = alle Kerne ab PARALLEL_MIN_ROWS Zeilen, '1' = seriell
+INCREMENTAL_UPDATE = {str(incremental_update)} or '--incremental' in sys.argv  # nur letzten Bar + neue Bars neu berechnen
+MEMORY_BUDGET = {str(memory_budget)!r}  # 'auto' = Hälfte des freien RAMs, GB-Zahl, 'off' = kein Budget
+MEMORY_BUDGET_STATE['budget_bytes'] = resolve_memory_budget(MEMORY_BUDGET)
 
 # Setup für nötige Features (vereinfacht)
 parquet_config = {{'compression': 'snappy', 'engine': 'pyarrow'}}
@@ -361,11 +417,27 @@ print("=" * 80)
 
 start_memory = get_memory_usage()
 start_time = time.time()
+SOURCE_BAR_PROFILE = None
+SOURCE_TICK_SIZE = None
+SOURCE_COMPRESSION = None
+TICK_SOURCE_FILE = None
 
 try:
     print(f"📁 Lade Datei: {{os.path.basename(SELECTED_FILE)}}")
-    
-    if VBT_AVAILABLE:
+
+    # Tick-/Sekunden-Export: blockweise zu Bars des kleinsten Timeframes, danach wie ein Punkt1-Store
+    # (Aktivitäts-Bars brauchen feinere Basis-Bars: höchstens ACTIVITY_INGEST_TIMEFRAME)
+    ingest_tf = activity_base_timeframe(TIMEFRAMES, ingest_bar_timeframe(TIMEFRAMES))
+    if not SELECTED_FILE.endswith(COLUMN_STORE_EXT) and is_tick_source(SELECTED_FILE, ingest_tf):
+        TICK_SOURCE_FILE = SELECTED_FILE
+        SELECTED_FILE, _ = ingest_tick_source(TICK_SOURCE_FILE, ingest_tf)
+
+    if SELECTED_FILE.endswith(COLUMN_STORE_EXT):
+        # Column Store: np.memmap ohne Kopie - RSS wächst nur mit gelesenen Seiten
+        original_data = open_column_store(SELECTED_FILE)
+        original_vbt_data = None
+        print(f"✅ Column Store per memmap geöffnet (zero-copy)")
+    elif VBT_AVAILABLE:
         # Versuche VBT Data Objekt zu laden (20x schneller für Backtesting)
         try:
             if SELECTED_FILE.endswith('.pickle'):
@@ -487,8 +559,25 @@ try:
         print(f"💾 Memory: {{load_memory:.1f}} MB")
         print(f"🚀 Performance-Features: Alle aktiviert")
 
-        # Memory-Optimierung anwenden
-        original_data = optimize_data_types_ultra(original_data)
+        # Bar-Profil aus Punkt1 übernehmen (keine erneute Frequenz-Erkennung)
+        if SELECTED_FILE.endswith(COLUMN_STORE_EXT):
+            source_header = read_column_store_header(SELECTED_FILE)
+            SOURCE_BAR_PROFILE = source_header.get('metadata', {{}}).get('bar_profile')
+            # Tick-Codec der Quelle für die Timeframe-Stores übernehmen
+            SOURCE_TICK_SIZE = next((c['codec']['tick_size'] for c in source_header['columns'] if 'codec' in c), None)
+            SOURCE_COMPRESSION = source_header['index'].get('compression')
+        else:
+            sidecar_file = os.path.splitext(SELECTED_FILE)[0].replace('_PUNKT2_STORE_', '_PUNKT2_METADATA_') + '.json'
+            if sidecar_file != SELECTED_FILE and os.path.exists(sidecar_file):
+                with open(sidecar_file, 'r') as f:
+                    SOURCE_BAR_PROFILE = json.load(f).get('bar_profile')
+        if SOURCE_BAR_PROFILE:
+            print(f"📏 Quell-Frequenz aus Punkt1-Metadaten: {{SOURCE_BAR_PROFILE['freq']}} "
+                  f"({{SOURCE_BAR_PROFILE.get('gaps', 0):,}} Lücken)")
+
+        # Memory-Optimierung anwenden (memmap-Daten bleiben ungeteilt im Page-Cache)
+        if not SELECTED_FILE.endswith(COLUMN_STORE_EXT):
+            original_data = optimize_data_types_ultra(original_data)
         
         # Datenqualität prüfen
         missing_data = original_data.isnull().sum().sum()
@@ -511,56 +600,21 @@ except Exception as e:
 print("\\n⏰ ULTRA-PERFORMANCE MULTI-TIMEFRAME RESAMPLING")
 print("=" * 80)
 
-# 🚀 NUMBA-OPTIMIERTE RESAMPLING FUNKTIONEN
-if NUMBA_AVAILABLE:
-    @njit(parallel=True, nogil=True)
-    def resample_ohlcv_nb(open_arr, high_arr, low_arr, close_arr, volume_arr, factor):
-        """Ultra-schnelles Numba OHLCV Resampling (10-50x schneller)"""
-        n = len(open_arr)
-        out_len = n // factor
-
-        out_open = np.empty(out_len, dtype=np.float32)
-        out_high = np.empty(out_len, dtype=np.float32)
-        out_low = np.empty(out_len, dtype=np.float32)
-        out_close = np.empty(out_len, dtype=np.float32)
-        out_volume = np.empty(out_len, dtype=np.int64)
-
-        for i in prange(out_len):
-            start_idx = i * factor
-            end_idx = min(start_idx + factor, n)
-
-            # KORREKTES OHLC Aggregation (ohne Gaps)
-            if i == 0:
-                # Erste Kerze: Normaler Open
-                out_open[i] = open_arr[start_idx]
-            else:
-                # Folgende Kerzen: Open = vorheriger Close (keine Gaps)
-                out_open[i] = out_close[i - 1]
-
-            out_high[i] = np.max(high_arr[start_idx:end_idx])
-            out_low[i] = np.min(low_arr[start_idx:end_idx])
-            out_close[i] = close_arr[end_idx - 1]
-            out_volume[i] = np.sum(volume_arr[start_idx:end_idx])
-
-        return out_open, out_high, out_low, out_close, out_volume
-
-    print("✅ Numba Ultra-Performance Resampling verfügbar")
+if NUMBA_RESAMPLE_AVAILABLE:
+    print("✅ Numba Bucket-Resampler verfügbar (Zeitstempel-Buckets, bit-identisch zu Pandas)")
 else:
     print("⚠️ Numba nicht verfügbar - Standard Resampling")
 
+RESAMPLE_PLAN = {{}}
+RESAMPLE_STATS = {{'rows_read': 0, 'rows_read_direct': 0, 'base_passes': 0, 'mismatches': []}}
+
 # 🧩 CHUNKED MULTI-TIMEFRAME PROCESSING
 def process_timeframes_chunked(data, timeframes, chunk_size=None):
     """Ultra-Performance Chunked Processing mit VBT Execution Engines"""
     if chunk_size is None:
-        # Automatische Chunk-Größe basierend auf verfügbarem RAM
-        if PSUTIL_AVAILABLE:
-            try:
-                available_memory_gb = psutil.virtual_memory().available / (1024**3)
-                chunk_size = min(len(timeframes), max(1, int(available_memory_gb * 2)))
-            except:
-                chunk_size = min(len(timeframes), 4)  # Fallback: 4 Timeframes pro Chunk
-        else:
-            chunk_size = min(len(timeframes), 4)  # Fallback ohne psutil
+        # Chunk-Größe aus dem RAM-Budget: so viele Timeframes, wie Ausgaben ins Budget passen
+        chunk_size = memory_chunk_size(data, timeframes, MEMORY_BUDGET_STATE['budget_bytes'],
+                                       resident_bytes=process_memory_bytes())
 
     print(f"🧩 Ultra-Performance Chunked Processing: {{len(timeframes)}} Timeframes in {{chunk_size}}-er Chunks")
 
@@ -675,13 +729,17 @@ def process_timeframes_chunked(data, timeframes, chunk_size=None):
         execute_kwargs = None
         print("   ⚠️ VectorBT Pro nicht verfügbar - Standard Processing")
 
+    # Ein Durchgang über die Basis für alle Timeframes, die Chunks kaskadieren nur den Rest
+    results.update(process_timeframes_first_pass(data, timeframes))
+    timeframes = [tf for tf in timeframes if tf not in results]
+
     for i in range(0, len(timeframes), chunk_size):
         chunk_timeframes = timeframes[i:i + chunk_size]
         print(f"   🔄 Verarbeite Chunk {{i//chunk_size + 1}}: {{chunk_timeframes}}")
 
         # IMMER Standard Batch-Processing verwenden (VBT Chunked hat Probleme)
         print(f"   📊 Verwende Standard Batch-Processing für {{len(chunk_timeframes)}} Timeframes")
-        chunk_results = process_timeframes_batch(data, chunk_timeframes)
+        chunk_results = process_timeframes_batch(data, chunk_timeframes, produced=results, first_pass=False)
         results.update(chunk_results)
         print(f"   ✅ Chunk {{i//chunk_size + 1}} erfolgreich: {{len(chunk_results)}} Timeframes verarbeitet")
 
@@ -749,40 +807,163 @@ def vbt_resample_single(data, tf):
             target_freq = tf
 
         # VBT Resampler
+        # Quell-Frequenz aus dem Bar-Profil (Punkt1/Tick-Ingest) statt fest 1 Minute
+        source_freq = (SOURCE_BAR_PROFILE or {{}}).get('freq') or pd.infer_freq(data.index[:1000])
         pd_resampler = data.resample(target_freq)
-        vbt_resampler = vbt.Resampler.from_pd_resampler(pd_resampler, source_freq="1T")
+        vbt_resampler = vbt.Resampler.from_pd_resampler(pd_resampler, source_freq=source_freq)
 
         # VBT Resampling deaktiviert - verwende Standard Pandas
-        return fallback_pandas_resample(data, tf)
+        return resample_timeframe(data, tf)
 
     except Exception as e:
         print(f"     ⚠️ VBT {{tf}} Resampling Fehler: {{e}}")
         return None
 
-def process_timeframes_batch(data, timeframes):
-    """Batch-Processing für Timeframes"""
+def process_timeframes_single_pass(data, timeframes):
+    """⚡ Alle vom Numba-Kernel abgedeckten Timeframes mit einem Durchlauf über die Basis"""
+    if not NUMBA_RESAMPLE_AVAILABLE or not numba_resample_worthwhile(len(data), _bucket_ohlcv_multi_nb,
+                                                                     RESAMPLE_SINGLE_PASS_MIN_ROWS):
+        return {{}}
+    start = time.perf_counter()
+    try:
+        frames, plan = resample_ohlcv_multi(data, timeframes)
+    except Exception as e:
+        print(f"⚠️ Single-Pass Resampling Fehler: {{e}} - verwende Kaskade")
+        return {{}}
+    if not frames:
+        return {{}}
+    print(f"   ⚡ Single-Pass: {{len(frames)}} Timeframes in einem Durchlauf über {{len(data):,}} Zeilen "
+          f"({{time.perf_counter() - start:.3f}}s)")
+
     results = {{}}
+    for tf, frame in frames.items():
+        if CASCADE_VERIFY and not frames_bit_identical(frame, pandas_resample_ohlcv(data, tf)):
+            print(f"   ⚠️ {{tf}}: Single-Pass weicht vom direkten Resample ab - verwende Pandas")
+            RESAMPLE_STATS['mismatches'].append(tf)
+            frame = fallback_pandas_resample(data, tf)
+        results[tf] = frame if frame is not None and not frame.empty else None
+        RESAMPLE_PLAN[tf] = plan[tf]
+    RESAMPLE_STATS['rows_read'] += len(data)
+    RESAMPLE_STATS['rows_read_direct'] += len(data) * len(frames)
+    RESAMPLE_STATS['base_passes'] += 1
+    return results
+
+def process_timeframes_session(data, timeframes):
+    """🕐 Session-verankerte Bars: Session-Uhr einmal berechnen, alle Timeframes nutzen sie"""
+    start = time.perf_counter()
+    clock = session_clock(data.index, RESAMPLE_SESSION)
+    definition = clock['definition']
+    print(f"   🕐 Session {{RESAMPLE_SESSION}}: {{definition['open']}}-{{definition['close']}} {{definition['tz']}}, "
+          f"{{int(clock['in_session'].sum()):,}} von {{len(data):,}} Bars in der Handelszeit "
+          f"({{time.perf_counter() - start:.3f}}s)")
 
-    # IMMER Standard Pandas Resampling verwenden (VBT Resampling hat Probleme)
-    print(f"📊 Verwende Standard Pandas Resampling für {{len(timeframes)}} Timeframes")
+    results = {{}}
     for tf in timeframes:
-        results[tf] = fallback_pandas_resample(data, tf)
+        start = time.perf_counter()
+        resampled = resample_ohlcv_session(data, tf, clock=clock)
+        if resampled is None:
+            print(f"   ⚠️ {{tf}}: keine Session-Buckets für diesen Offset - Kalender-Resampling")
+            resampled = fallback_pandas_resample(data, tf)
+        else:
+            print(f"   🕐 {{tf:>4}} ← Session ({{len(resampled):,}} Zeilen, {{time.perf_counter() - start:.3f}}s)")
+        results[tf] = resampled if resampled is not None and not resampled.empty else None
+        RESAMPLE_PLAN[tf] = None
+    RESAMPLE_STATS['rows_read'] += len(data) * len(timeframes)
+    RESAMPLE_STATS['rows_read_direct'] += len(data) * len(timeframes)
+    RESAMPLE_STATS['base_passes'] += len(timeframes)
+    return results
 
+def process_timeframes_parallel(data, timeframes):
+    """🧵 Timeframes in Worker-Prozessen (Basis einmal im Shared Memory), leer = seriell weiter"""
+    workers = parallel_worker_count(timeframes, len(data), PARALLEL_WORKERS)
+    if workers <= 1 or any(column not in data.columns for column in _OHLCV_COLUMNS):
+        return {{}}
+    try:
+        worker_source = worker_source_from_script(os.path.abspath(__file__))
+        results, info = resample_timeframes_parallel(data, timeframes, workers, worker_source, RESAMPLE_SESSION)
+    except Exception as e:
+        print(f"⚠️ Parallel-Resampling nicht möglich: {{e}} - verarbeite seriell")
+        return {{}}
+
+    print(f"   🧵 {{info['workers']}} Worker-Prozesse, Basis im Shared Memory ({{info['share_seconds']:.3f}}s), "
+          f"gesamt {{info['seconds_total']:.3f}}s")
+    for group in info['groups']:
+        key = ','.join(group)
+        if key in info['errors']:
+            print(f"      ⚠️ {{key}}: {{info['errors'][key]}} - wird seriell nachgerechnet")
+        else:
+            print(f"      ✅ {{key}}: {{info['seconds'][key]:.3f}}s")
+    for tf in results:
+        RESAMPLE_PLAN[tf] = None
+    RESAMPLE_STATS['rows_read'] += info['rows_read']
+    RESAMPLE_STATS['rows_read_direct'] += len(data) * len(results)
+    RESAMPLE_STATS['base_passes'] += info['workers']
     return results
 
+def process_timeframes_activity(data, timeframes):
+    """📦 Aktivitäts-Bars (vol/tick/range/dollar) - je ein sequentieller Numba-Durchlauf über die Basis"""
+    results = process_activity_bars(data, timeframes)
+    for tf in results:
+        RESAMPLE_PLAN[tf] = None
+    RESAMPLE_STATS['rows_read'] += len(data) * len(results)
+    RESAMPLE_STATS['rows_read_direct'] += len(data) * len(results)
+    RESAMPLE_STATS['base_passes'] += len(results)
+    return results
+
+def process_timeframes_first_pass(data, timeframes):
+    """Erster Durchgang über die Basis: Aktivitäts-Bars, dann Worker-Prozesse, sonst Session-Buckets oder Single-Pass"""
+    activity = [tf for tf in timeframes if is_activity_timeframe(tf)]
+    results = process_timeframes_activity(data, activity) if activity else {{}}
+    timeframes = [tf for tf in timeframes if tf not in activity]
+    if not timeframes:
+        return results
+    time_results = process_timeframes_parallel(data, timeframes)
+    if not time_results and RESAMPLE_SESSION:
+        time_results = process_timeframes_session(data, timeframes)
+    elif not time_results:
+        time_results = process_timeframes_single_pass(data, timeframes)
+    results.update(time_results)
+    return results
+
+def process_timeframes_batch(data, timeframes, produced=None, first_pass=True):
+    """Batch-Processing für Timeframes (erster Durchgang, Rest kaskadiert, produced = bereits berechnete Quellen)"""
+    results = process_timeframes_first_pass(data, timeframes) if first_pass else {{}}
+    remaining = [tf for tf in timeframes if tf not in results]
+    if remaining and RESAMPLE_SESSION:
+        results.update(process_timeframes_session(data, remaining))
+    elif remaining:
+        # IMMER Standard Pandas Resampling verwenden (VBT Resampling hat Probleme)
+        print(f"📊 Verwende kaskadiertes Pandas Resampling für {{len(remaining)}} Timeframes")
+        cascaded, plan, stats = resample_cascade(data, remaining, resample_timeframe,
+                                                 produced={{**(produced or {{}}), **results}}, verify=CASCADE_VERIFY)
+        results.update(cascaded)
+        RESAMPLE_PLAN.update(plan)
+        for key in ('rows_read', 'rows_read_direct', 'base_passes'):
+            RESAMPLE_STATS[key] += stats[key]
+        RESAMPLE_STATS['mismatches'].extend(stats['mismatches'])
+
+    return {{tf: results[tf] for tf in timeframes if tf in results}}
+
+def resample_timeframe(data, tf):
+    """⚡ Numba-Bucket-Resampler, Pandas für kleine Daten (JIT-Compile) und nicht unterstützte Offsets/dtypes"""
+    if not numba_resample_worthwhile(len(data)):
+        return fallback_pandas_resample(data, tf)
+    try:
+        resampled = resample_ohlcv_numba(data, tf)
+    except Exception as e:
+        print(f"⚠️ Numba {{tf}} Resampling Fehler: {{e}} - verwende Pandas")
+        resampled = None
+    if resampled is None:
+        return fallback_pandas_resample(data, tf)
+    return resampled if not resampled.empty else None
+
 def fallback_pandas_resample(data, tf):
     """Fallback Standard Pandas Resampling"""
     try:
         start_time = time.time()
 
         # Timeframe-Mapping für Pandas
-        timeframe_mapping = {{
-            '1m': '1T', '2m': '2T', '3m': '3T', '5m': '5T', '10m': '10T',
-            '15m': '15T', '30m': '30T', '1h': '1H', '2h': '2H', '4h': '4H',
-            '8h': '8H', '1d': '1D', '3d': '3D', '1w': '1W'
-        }}
-
-        pandas_freq = timeframe_mapping.get(tf, tf)
+        pandas_freq = RESAMPLE_TIMEFRAME_FREQ.get(tf, tf)
 
         # EINFACHES OHLCV Resampling (wie im alten funktionierenden Code)
         resampled = data.resample(pandas_freq).agg({{
@@ -811,20 +992,159 @@ def fallback_pandas_resample(data, tf):
         print(f"❌ Standard {{tf}} Resampling Fehler: {{e}}")
         return None
 
+# 🧮 ZEITFENSTER IM RAM-BUDGET (fertige Bars sofort in die Column Stores)
+RUN_BASE_FILENAME = None
+STREAMED_STORE_PATHS = {{}}
+MEMORY_PLAN = None
+CHUNKED_PROCESSING = False
+
+def create_ultra_performance_filename():
+    """Erstellt intelligenten Dateinamen"""
+    now = datetime.now()
+    timestamp = now.strftime("%Y_%m_%d_%H_%M_%S")
+    tf_list = "_".join(TIMEFRAMES)
+    return f"ultra_performance_multi_timeframe_{{tf_list}}_{{timestamp}}"
+
+def resample_window(data, tf, last_bar):
+    """Erstes Fenster komplett, danach ab dem offenen Bar (wie das inkrementelle Update)"""
+    if is_activity_timeframe(tf):
+        if last_bar is not None:
+            return activity_bars_tail(data, tf, last_bar)
+        return build_activity_bars(data, tf), len(data)
+    if last_bar is not None:
+        return resample_ohlcv_tail(data, tf, last_bar, resample_timeframe, RESAMPLE_SESSION)
+    if RESAMPLE_SESSION:
+        frame = resample_ohlcv_session(data, tf, RESAMPLE_SESSION)
+        if frame is None:
+            frame = fallback_pandas_resample(data, tf)
+        return frame, len(data)
+    return resample_timeframe(data, tf), len(data)
+
+def process_timeframes_budgeted(data, timeframes, plan, base_filename):
+    """
+    🧮 Basis in Zeitfenstern aus dem RAM-Budget verarbeiten
+
+    Pro Fenster werden alle Timeframes ab ihrem offenen Bar neu berechnet und
+    an die Column Stores angehängt (offener Bar ersetzt), so dass nie mehr als
+    ein Fenster im RAM liegt. Meldet get_memory_usage() eine Überschreitung,
+    werden die folgenden Fenster halbiert; passiert das beim Mindestfenster,
+    wird mit MemoryError abgebrochen. Gibt {{tf: memmap-DataFrame}} zurück.
+    """
+    container_path = f"data/punkt2/{{base_filename}}{{MTF_CONTAINER_SUFFIX}}"
+    store_paths = {{tf: mtf_group_path(container_path, tf) for tf in timeframes}}
+    last_bars = {{tf: None for tf in timeframes}}
+    window_rows = plan['window_rows']
+    rows_read = 0
+    start = 0
+    window_count = 0
+    budget_start = time.perf_counter()
+
+    while start < len(data):
+        end = min(len(data), start + window_rows)
+        window_start = time.perf_counter()
+        view = data.iloc[:end]
+        for tf in timeframes:
+            frame, read = resample_window(view, tf, last_bars[tf])
+            rows_read += read
+            if frame is None:
+                raise ValueError(f"{{tf}}: Fenster ab {{data.index[start]}} nicht berechenbar")
+            if frame.empty:
+                continue
+            if last_bars[tf] is None:
+                write_column_store(frame, store_paths[tf], metadata={{'timeframe': tf, 'source': SELECTED_FILE}},
+                                   tick_size=SOURCE_TICK_SIZE)
+                STREAMED_STORE_PATHS[tf] = store_paths[tf]
+            elif frame.index[0] != last_bars[tf]:
+                raise ValueError(f"{{tf}}: offener Bar {{last_bars[tf]}} nicht reproduzierbar")
+            else:
+                append_to_column_store(store_paths[tf], frame, replace_last=1)
+            last_bars[tf] = frame.index[-1]
+        del view, frame
+        window_count += 1
+        over_budget = MEMORY_BUDGET_STATE['over_budget']
+        memory_mb = get_memory_usage()
+        within = MEMORY_BUDGET_STATE['over_budget'] == over_budget
+        print(f"   🧩 Fenster {{window_count}}: {{data.index[start]}} → {{data.index[end - 1]}} "
+              f"({{end - start:,}} Zeilen, {{time.perf_counter() - window_start:.3f}}s, {{memory_mb:.1f}} MB)")
+        if not within:
+            if window_rows <= MEMORY_MIN_WINDOW_ROWS:
+                raise MemoryError(f"RAM-Budget {{MEMORY_BUDGET_STATE['budget_bytes'] / 1024**2:,.0f}} MB mit dem "
+                                  f"Mindestfenster ({{MEMORY_MIN_WINDOW_ROWS:,}} Zeilen) überschritten: {{memory_mb:.1f}} MB")
+            window_rows = max(MEMORY_MIN_WINDOW_ROWS, window_rows // 2)
+            print(f"   🚦 RAM-Budget überschritten - nächste Fenster mit {{window_rows:,}} Zeilen")
+        start = end
+
+    results = {{tf: open_column_store(path) for tf, path in STREAMED_STORE_PATHS.items()}}
+    for tf in results:
+        RESAMPLE_PLAN[tf] = None
+    RESAMPLE_STATS['rows_read'] += rows_read
+    RESAMPLE_STATS['rows_read_direct'] += len(data) * len(results)
+    RESAMPLE_STATS['base_passes'] += len(results)
+    plan['windows_processed'] = window_count
+    plan['final_window_rows'] = window_rows
+    print(f"   ✅ {{window_count}} Fenster, {{len(results)}} Timeframes fortlaufend geschrieben "
+          f"({{time.perf_counter() - budget_start:.3f}}s)")
+    return {{tf: results[tf] for tf in timeframes if tf in results}}
+
+{incremental_code}
+
 # MULTI-TIMEFRAME PROCESSING STARTEN
 resampled_data = {{}}
 multi_tf_vbt_data = {{}}
+INCREMENTAL_APPLIED = False
+
+if INCREMENTAL_UPDATE and original_data is not None and not original_data.empty:
+    updated_data = update_punkt2_artifacts(original_data)
+    if updated_data is not None:
+        resampled_data = updated_data
+        INCREMENTAL_APPLIED = True
 
-if original_data is not None and not original_data.empty:
+if INCREMENTAL_APPLIED:
+    print("✅ Inkrementelles Update: Column Stores in-place aktualisiert - keine Neuberechnung nötig")
+elif original_data is not None and not original_data.empty:
     print(f"\\n🚀 STARTE ULTRA-PERFORMANCE MULTI-TIMEFRAME PROCESSING")
     print(f"   📊 Timeframes: {{TIMEFRAMES}}")
     print(f"   💾 Memory vor Processing: {{get_memory_usage():.1f}} MB")
 
     processing_start_time = time.time()
 
-    # Chunked Processing für große Timeframe-Listen
-    if len(TIMEFRAMES) > 10:
-        print(f"🧩 Große Timeframe-Liste erkannt - verwende Chunked Processing")
+    # Zeitfenster-Plan: passt die Basis samt Resampler-Arbeitsspeicher nicht ins Budget, wird gefenstert
+    if MEMORY_BUDGET_STATE['budget_bytes'] and SAVE_PUNKT3:
+        MEMORY_PLAN = plan_memory_windows(original_data, TIMEFRAMES, MEMORY_BUDGET_STATE['budget_bytes'],
+                                          resident_bytes=process_memory_bytes())
+        print(f"   🧮 RAM-Budget: {{MEMORY_PLAN['budget_bytes'] / 1024**2:,.0f}} MB, resident "
+              f"{{MEMORY_PLAN['resident_bytes'] / 1024**2:,.0f}} MB, {{MEMORY_PLAN['row_bytes']}} Bytes/Zeile, "
+              f"{{len(MEMORY_PLAN['windows'])}} Fenster à {{MEMORY_PLAN['window_rows']:,}} Zeilen")
+
+    if MEMORY_PLAN and not MEMORY_PLAN['fits']:
+        # Ohne Fenster würde die volle Verarbeitung das Budget erst recht sprengen
+        print(f"❌ RAM-Budget reicht nicht für das Mindestfenster ({{MEMORY_MIN_WINDOW_ROWS:,}} Zeilen, "
+              f"~{{(MEMORY_MIN_WINDOW_ROWS + MEMORY_PLAN['context_rows']) * MEMORY_PLAN['row_bytes'] * MEMORY_WINDOW_OVERHEAD / 1024**2:,.0f}} MB "
+              f"zusätzlich zu {{MEMORY_PLAN['resident_bytes'] / 1024**2:,.0f}} MB resident) - Punkt2 abgebrochen")
+        print(f"   💡 Budget erhöhen oder die Quelle als Column Store (memmap) öffnen")
+    elif MEMORY_PLAN and len(MEMORY_PLAN['windows']) > 1:
+        print(f"🧮 Basis größer als das RAM-Budget - verarbeite {{len(MEMORY_PLAN['windows'])}} Zeitfenster")
+        RUN_BASE_FILENAME = create_ultra_performance_filename()
+        try:
+            resampled_data = process_timeframes_budgeted(original_data, TIMEFRAMES, MEMORY_PLAN, RUN_BASE_FILENAME)
+        except MemoryError as e:
+            # Kein Fallback ohne Fenster - der bräuchte noch mehr RAM
+            print(f"❌ {{e}} - Punkt2 abgebrochen, Budget erhöhen")
+            shutil.rmtree(f"data/punkt2/{{RUN_BASE_FILENAME}}{{MTF_CONTAINER_SUFFIX}}", ignore_errors=True)
+            STREAMED_STORE_PATHS.clear()
+            resampled_data = {{}}
+        except (ValueError, OSError) as e:
+            # Ohne Fenster würde die Basis das Budget sprengen - abbrechen statt voll zu rechnen
+            print(f"❌ Zeitfenster-Verarbeitung fehlgeschlagen ({{e}}) - Punkt2 abgebrochen")
+            shutil.rmtree(f"data/punkt2/{{RUN_BASE_FILENAME}}{{MTF_CONTAINER_SUFFIX}}", ignore_errors=True)
+            STREAMED_STORE_PATHS.clear()
+            resampled_data = {{}}
+    # Chunked Processing, wenn die Ausgaben aller Timeframes zusammen nicht ins RAM-Budget passen
+    elif MEMORY_BUDGET_STATE['budget_bytes'] and memory_chunk_size(
+            original_data, TIMEFRAMES, MEMORY_BUDGET_STATE['budget_bytes'],
+            resident_bytes=process_memory_bytes()) < len(TIMEFRAMES):
+        CHUNKED_PROCESSING = True
+        print(f"🧩 Ausgaben aller Timeframes passen nicht ins RAM-Budget - verwende Chunked Processing")
         resampled_data = process_timeframes_chunked(original_data, TIMEFRAMES)
     else:
         print(f"📊 Standard Batch-Processing für {{len(TIMEFRAMES)}} Timeframes")
@@ -837,6 +1157,13 @@ if original_data is not None and not original_data.empty:
     print(f"   ✅ Erfolgreich: {{len(resampled_data)}} von {{len(TIMEFRAMES)}} Timeframes")
     print(f"   ⏱️ Gesamtzeit: {{processing_time:.3f}}s")
     print(f"   💾 Memory: {{processing_memory:.1f}} MB")
+    if RESAMPLE_STATS['rows_read_direct']:
+        print(f"   🔗 Gelesene Zeilen: {{RESAMPLE_STATS['rows_read']:,}} statt {{RESAMPLE_STATS['rows_read_direct']:,}} "
+              f"({{RESAMPLE_STATS['rows_read'] / RESAMPLE_STATS['rows_read_direct']:.0%}}, "
+              f"{{RESAMPLE_STATS['base_passes']}} Durchläufe über die Basis)")
+    if CASCADE_VERIFY:
+        print(f"   ✅ Kaskade geprüft: " + (f"{{len(RESAMPLE_STATS['mismatches'])}} Abweichungen ({{RESAMPLE_STATS['mismatches']}})"
+                                           if RESAMPLE_STATS['mismatches'] else "identisch mit direktem Resample"))
 
     for tf, data in resampled_data.items():
         if data is not None:
@@ -1154,77 +1481,45 @@ else:
 print("\\n💾 ULTRA-PERFORMANCE SPEICHERUNG FÜR PUNKT3")
 print("=" * 80)
 
-def create_ultra_performance_filename():
-    """Erstellt intelligenten Dateinamen"""
-    now = datetime.now()
-    timestamp = now.strftime("%Y_%m_%d_%H_%M_%S")
-    tf_list = "_".join(TIMEFRAMES)
-    return f"ultra_performance_multi_timeframe_{{tf_list}}_{{timestamp}}"
-
 save_success = False
 total_saved_size = 0
 
-if resampled_data:
-    base_filename = create_ultra_performance_filename()
+if INCREMENTAL_APPLIED:
+    print("✅ Inkrementelles Update: bestehende Artefakte fortgeschrieben - keine neuen Dateien")
+elif resampled_data:
+    base_filename = RUN_BASE_FILENAME or create_ultra_performance_filename()
     print(f"📋 ULTRA-PERFORMANCE DATEI-NAME: {{base_filename}}")
 
-    # 🚀 VBT DATA OBJEKTE SPEICHERN (MAXIMALE PERFORMANCE)
-    if SAVE_PUNKT3 and VBT_AVAILABLE and multi_tf_vbt_data:
+    # 🗂️ MULTI-TIMEFRAME CONTAINER FÜR PUNKT3: eine Gruppe (Column Store, memmap) pro Timeframe
+    # und ein gemeinsamer Katalog - ersetzt die VBT Pickle/H5-Dateien pro Timeframe
+    container_file = None
+    if SAVE_PUNKT3:
         try:
-            print("\\n🚀 SPEICHERE VBT DATA OBJEKTE FÜR PUNKT3 (20x BACKTESTING-SPEEDUP)")
-
-            for tf, vbt_data in multi_tf_vbt_data.items():
-                # VBT Pickle Format (empfohlen für maximale Performance)
-                vbt_pickle_path = f"data/punkt2/{{base_filename}}_{{tf}}_VBT.pickle"
-                vbt_data.save(vbt_pickle_path)
-                pickle_size_mb = os.path.getsize(vbt_pickle_path) / (1024 * 1024)
-                total_saved_size += pickle_size_mb
-
-                print(f"✅ {{tf}} VBT Pickle: {{vbt_pickle_path}} ({{pickle_size_mb:.1f}} MB)")
-
-                # VBT HDF5 Format (für Kompatibilität)
-                try:
-                    vbt_hdf5_path = f"data/punkt2/{{base_filename}}_{{tf}}_VBT.h5"
-                    vbt_data.to_hdf(vbt_hdf5_path)
-                    hdf5_size_mb = os.path.getsize(vbt_hdf5_path) / (1024 * 1024)
-                    total_saved_size += hdf5_size_mb
-
-                    print(f"✅ {{tf}} VBT HDF5: {{vbt_hdf5_path}} ({{hdf5_size_mb:.1f}} MB)")
-                except Exception as hdf5_error:
-                    print(f"⚠️ {{tf}} VBT HDF5 fehlgeschlagen: {{hdf5_error}}")
-
-            save_success = True
-            print(f"🚀 VBT DATA OBJEKTE GESPEICHERT - 20x BACKTESTING-SPEEDUP GARANTIERT!")
-
-        except Exception as e:
-            print(f"❌ VBT Data Objekte Speichern Fehler: {{e}}")
-
-    # Standard HDF5 Speicherung (falls VBT nicht verfügbar)
-    if SAVE_PUNKT3 and (not VBT_AVAILABLE or not multi_tf_vbt_data):
-        try:
-            print("\\n💾 SPEICHERE STANDARD HDF5 DATEIEN FÜR PUNKT3")
+            container_path = f"data/punkt2/{{base_filename}}{{MTF_CONTAINER_SUFFIX}}"
+            print(f"\\n🗂️ SPEICHERE MULTI-TIMEFRAME CONTAINER FÜR PUNKT3: {{container_path}}")
+            store_compression = SOURCE_COMPRESSION if STORE_COMPRESSION == 'source' else resolve_codec_spec(STORE_COMPRESSION)
+            if store_compression and not codec_available(store_compression):
+                store_compression = None
+            print(f"🗜️ Kompression: {{codec_label(store_compression)}}")
 
             for tf, data in resampled_data.items():
                 if data is not None:
-                    # Ultra-Performance HDF5 mit Blosc Kompression
-                    hdf5_path = f"data/punkt2/{{base_filename}}_{{tf}}.h5"
-                    data.to_hdf(
-                        hdf5_path,
-                        key='data',
-                        mode='w',
-                        complevel=9,
-                        complib='blosc'  # Ultra-Performance Kompression
-                    )
-
-                    hdf5_size_mb = os.path.getsize(hdf5_path) / (1024 * 1024)
-                    total_saved_size += hdf5_size_mb
-
-                    print(f"✅ {{tf}} Standard HDF5: {{hdf5_path}} ({{hdf5_size_mb:.1f}} MB)")
-
+                    store_path = mtf_group_path(container_path, tf)
+                    if tf not in STREAMED_STORE_PATHS:
+                        # Fensterweise geschriebene Gruppen liegen schon im Container (unkomprimiert, anhängbar)
+                        write_column_store(data, store_path, metadata={{'timeframe': tf, 'source': SELECTED_FILE}},
+                                           tick_size=SOURCE_TICK_SIZE, compression=store_compression)
+                    print(f"✅ {{tf}} Gruppe: {{mtf_group_key(tf)}} ({{column_store_size_bytes(store_path) / (1024 * 1024):.1f}} MB)")
+
+            catalog = write_mtf_catalog(resampled_data, container_path,
+                                        metadata={{'source': SELECTED_FILE, 'resample_session': RESAMPLE_SESSION}})
+            total_saved_size += mtf_container_size_bytes(container_path) / (1024 * 1024)
+            container_file = os.path.basename(container_path)
+            print(f"✅ Katalog: {{len(catalog['timeframes'])}} Timeframes ({{', '.join(catalog['timeframes'])}})")
             save_success = True
 
         except Exception as e:
-            print(f"❌ Standard HDF5 Speichern Fehler: {{e}}")
+            print(f"❌ Container Speichern Fehler: {{e}}")
 
     # Ultra-Performance Metadaten
     if save_success:
@@ -1236,15 +1531,46 @@ if resampled_data:
                 'timeframes': TIMEFRAMES,
                 'timeframe_count': len(resampled_data),
                 'original_file': SELECTED_FILE,
+                'tick_source_file': TICK_SOURCE_FILE,
                 'created_at': datetime.now().isoformat(),
                 'punkt': 2,
                 'filename_base': base_filename,
                 'total_size_mb': total_saved_size,
                 'memory_optimized': True,
                 'numba_optimized': NUMBA_AVAILABLE,
-                'chunked_processing': len(TIMEFRAMES) > 10,
-                'data_files': [f"{{base_filename}}_{{tf}}.h5" for tf in resampled_data.keys()],
-                'vbt_files': [f"{{base_filename}}_{{tf}}_VBT.pickle" for tf in multi_tf_vbt_data.keys()] if multi_tf_vbt_data else []
+                'chunked_processing': CHUNKED_PROCESSING,
+                'memory_budget': {{
+                    'budget_mb': MEMORY_BUDGET_STATE['budget_bytes'] / 1024**2 if MEMORY_BUDGET_STATE['budget_bytes'] else None,
+                    'peak_mb': MEMORY_BUDGET_STATE['peak_bytes'] / 1024**2,
+                    'over_budget': MEMORY_BUDGET_STATE['over_budget'],
+                    'windows': MEMORY_PLAN.get('windows_processed', 1) if MEMORY_PLAN else 1,
+                    'window_rows': MEMORY_PLAN['window_rows'] if MEMORY_PLAN else None,
+                }},
+                'resample_plan': {{tf: source or 'base' for tf, source in RESAMPLE_PLAN.items()}},
+                'resample_verified': CASCADE_VERIFY and not RESAMPLE_STATS['mismatches'],
+                'resample_session': RESAMPLE_SESSION,
+                # High-Water-Marks für das inkrementelle Update (--incremental)
+                'base_start': str(original_data.index[0]),
+                'base_end': str(original_data.index[-1]),
+                'base_rows': len(original_data),
+                'high_water_marks': {{
+                    tf: {{'last_bar': str(data.index[-1]), 'rows': len(data), 'base_end': str(original_data.index[-1])}}
+                    for tf, data in resampled_data.items() if data is not None and len(data)
+                }},
+                'container_file': container_file,
+                'data_files': [container_file] if container_file else [],
+                # Sidecar für die Probe-Schicht: Pickles/HDF5 ohne Laden beschreibbar
+                'timeframe_info': {{
+                    tf: {{
+                        'rows': len(data),
+                        'columns': [str(c) for c in data.columns],
+                        'dtypes': {{str(c): str(dtype) for c, dtype in data.dtypes.items()}},
+                        'start': str(data.index[0]) if len(data) else None,
+                        'end': str(data.index[-1]) if len(data) else None,
+                        'freq': tf
+                    }}
+                    for tf, data in resampled_data.items() if data is not None
+                }}
             }}
 
             metadata_path = f"data/punkt2/{{base_filename}}_ULTRA_PERFORMANCE_metadata.json"
@@ -1300,7 +1626,7 @@ print("=" * 80)
 if resampled_data:
     print("✅ ULTRA-PERFORMANCE BEREIT FÜR PUNKT 3:")
     print(f"   🚀 {{len(resampled_data)}} Timeframes mit Ultra-Performance erstellt")
-    print(f"   📁 VBT Data Objekte in data/punkt2/ gespeichert")
+    print(f"   📁 Multi-Timeframe Container in data/punkt2/ gespeichert")
     print(f"   ⚡ 20x Backtesting-Speedup verfügbar")
     print(f"   💾 Memory-optimiert für maximale Performance")
     print(f"   🧩 Chunked Processing für unbegrenzte Skalierung")
@@ -1341,9 +1667,157 @@ else:
 print("\\n" + "="*80)
 print("🎉 PUNKT 2 ULTRA-PERFORMANCE KOMPLETT ABGESCHLOSSEN!")
 print("🚀 MULTI-TIMEFRAME DATEN MIT ALLEN VBT PRO OPTIMIERUNGEN ERSTELLT!")
-print("💾 VBT DATA OBJEKTE FÜR 20x BACKTESTING-SPEEDUP GESPEICHERT!")
+print("💾 MULTI-TIMEFRAME CONTAINER FÜR PUNKT 3 GESPEICHERT!")
 print("⚡ NUMBA JIT, CHUNKING, BROADCASTING - ALLE FEATURES AKTIV!")
 print("🔍 ULTRA-PERFORMANCE VALIDIERUNG ABGESCHLOSSEN!")
 print("="*80)'''
 
     return complete_code
+
+def generate_incremental_update_code():
+    """Generiert Code für das inkrementelle Update (nur letzten Bar + neue Bars)"""
+    return '''
+# 🔁 INKREMENTELLES UPDATE - nächtliches Update ohne Neuberechnung
+# Statt alle Timeframes neu zu resamplen und einen neuen Container mit Zeitstempel
+# zu schreiben, werden die Gruppen des letzten Containers fortgeschrieben: pro
+# Timeframe wird der letzte (evtl. unfertige) Bar verworfen, aus den Basis-
+# Zeilen ab dessen Bucket-Start neu berechnet und mit allen neuen Bars
+# angehängt. High-Water-Marks pro Timeframe stehen in der Metadaten-JSON.
+import glob
+
+def find_latest_punkt2_artifact():
+    """🔍 Neueste Punkt2-Metadaten mit gleicher Quelle, Timeframe-Liste und Session"""
+    pattern = os.path.join("data", "punkt2", f"ultra_performance_multi_timeframe_{'_'.join(TIMEFRAMES)}_*_ULTRA_PERFORMANCE_metadata.json")
+    for metadata_path in sorted(glob.glob(pattern), reverse=True):
+        try:
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if (os.path.abspath(metadata.get('original_file', '')) == os.path.abspath(SELECTED_FILE)
+                and metadata.get('resample_session') == RESAMPLE_SESSION
+                and metadata.get('container_file')):
+            return metadata_path, metadata
+    return None, None
+
+def _write_json_atomic(path, payload):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def update_punkt2_artifacts(data):
+    """
+    🔁 Schreibt die Container-Gruppen des letzten Punkt2-Laufs fort
+
+    Gibt {tf: DataFrame} der aktualisierten Stores zurück (memmap), None wenn
+    die volle Verarbeitung nötig ist (kein Artefakt, andere Basis, Naht-Fehler).
+    """
+    metadata_path, metadata = find_latest_punkt2_artifact()
+    if metadata_path is None:
+        print(f"ℹ️ Kein Punkt2-Artefakt für {os.path.basename(SELECTED_FILE)} und {TIMEFRAMES} - volle Verarbeitung")
+        return None
+
+    base_filename = metadata['filename_base']
+    print(f"\\n🔁 INKREMENTELLES UPDATE: {base_filename}")
+    update_start = time.perf_counter()
+
+    container_path = os.path.join("data", "punkt2", metadata['container_file'])
+    store_paths = {tf: mtf_group_path(container_path, tf) for tf in TIMEFRAMES}
+    missing = [tf for tf, path in store_paths.items() if not is_column_store(path)]
+    if missing:
+        print(f"⚠️ Container-Gruppen fehlen für {missing} - volle Verarbeitung")
+        return None
+    if metadata.get('base_start') not in (None, str(data.index[0])):
+        print(f"⚠️ Basis beginnt bei {data.index[0]} statt {metadata['base_start']} - volle Verarbeitung")
+        return None
+
+    base_end = pd.Timestamp(metadata['base_end']) if metadata.get('base_end') else None
+    if base_end is not None and base_end.tz is not None and data.index.tz is not None:
+        base_end = base_end.tz_convert(data.index.tz)
+    if base_end is not None and base_end > data.index[-1]:
+        print(f"⚠️ Basis endet bei {data.index[-1]} vor dem Stand {base_end} - volle Verarbeitung")
+        return None
+    new_base_rows = int(len(data) - data.index.searchsorted(base_end, side='right')) if base_end is not None else None
+    if new_base_rows == 0:
+        print(f"✅ Bereits aktuell (Basis bis {base_end}) - {time.perf_counter() - update_start:.3f}s")
+        return {tf: open_column_store(path) for tf, path in store_paths.items()}
+
+    # Erst alle Timeframes berechnen, dann schreiben: Naht-Fehler fallen hier ohne Schreibzugriff auf
+    marks = metadata.get('high_water_marks', {})
+    updates = {}
+    rows_read = 0
+    for tf, path in store_paths.items():
+        header = read_column_store_header(path)
+        if not header['rows']:
+            print(f"⚠️ {tf}: leerer Column Store - volle Verarbeitung")
+            return None
+        last_bar = pd.Timestamp(header['end'])
+        mark = marks.get(tf)
+        if mark and pd.Timestamp(mark['last_bar']) != last_bar:
+            print(f"⚠️ {tf}: Store endet bei {last_bar}, High-Water-Mark {mark['last_bar']} - verwende Store")
+        if is_activity_timeframe(tf):
+            frame, read = activity_bars_tail(data, tf, last_bar)
+        else:
+            frame, read = resample_ohlcv_tail(data, tf, last_bar, resample_timeframe, RESAMPLE_SESSION)
+        rows_read += read
+        if frame is None or frame.empty or frame.index[0] != last_bar:
+            print(f"⚠️ {tf}: letzter Bar {last_bar} nicht aus der Basis reproduzierbar - volle Verarbeitung")
+            return None
+        updates[tf] = frame
+    compute_time = time.perf_counter() - update_start
+
+    # Letzten Bar und Zeilenzahl jedes Stores sichern: scheitert ein Append, werden alle
+    # angefassten Stores auf den alten Stand zurückgesetzt und passen weiter zur Metadaten-JSON
+    previous = {}
+    for tf in updates:
+        last_row = open_column_store(store_paths[tf]).iloc[-1:]
+        previous[tf] = (read_column_store_header(store_paths[tf])['rows'],
+                        pd.DataFrame({column: last_row[column].to_numpy().copy() for column in last_row.columns},
+                                     index=pd.DatetimeIndex(last_row.index.copy(), name=last_row.index.name)))
+        del last_row
+    touched = []
+    try:
+        for tf, frame in updates.items():
+            touched.append(tf)
+            append_to_column_store(store_paths[tf], frame, replace_last=1)
+    except (ValueError, OSError) as e:
+        for tf in touched:
+            old_rows, last_row = previous[tf]
+            rows = read_column_store_header(store_paths[tf])['rows']
+            append_to_column_store(store_paths[tf], last_row, replace_last=rows - (old_rows - 1))
+        print(f"❌ Update abgelehnt ({e}) - {len(touched)} Stores zurückgesetzt, volle Verarbeitung")
+        return None
+    store_time = time.perf_counter() - update_start - compute_time
+
+    updated_data = {tf: open_column_store(path) for tf, path in store_paths.items()}
+    for tf, frame in updates.items():
+        stored = updated_data[tf]
+        print(f"   🔁 {tf:>4}: {len(frame):,} Bars ab {frame.index[0]} ersetzt/angehängt → {len(stored):,} Zeilen")
+        marks[tf] = {'last_bar': str(stored.index[-1]), 'rows': len(stored), 'base_end': str(data.index[-1])}
+        info = metadata.setdefault('timeframe_info', {}).setdefault(tf, {'freq': tf})
+        info.update({'rows': len(stored), 'end': str(stored.index[-1])})
+        info.setdefault('start', str(stored.index[0]))
+
+    total_time = time.perf_counter() - update_start
+    print(f"✅ {len(updates)} Timeframes aktualisiert: {rows_read:,} Basis-Zeilen gelesen "
+          f"({new_base_rows if new_base_rows is not None else '?'} neue), Berechnung {compute_time:.3f}s, "
+          f"Schreiben {store_time:.3f}s, gesamt {total_time:.3f}s")
+
+    # Nur der Katalog wird ersetzt - die Gruppen sind schon fortgeschrieben
+    write_mtf_catalog(updated_data, container_path,
+                      metadata={'source': SELECTED_FILE, 'resample_session': RESAMPLE_SESSION})
+    metadata['total_size_mb'] = mtf_container_size_bytes(container_path) / (1024 * 1024)
+
+    metadata['high_water_marks'] = marks
+    metadata['base_start'] = str(data.index[0])
+    metadata['base_end'] = str(data.index[-1])
+    metadata['base_rows'] = len(data)
+    metadata.setdefault('incremental_updates', []).append({
+        'updated_at': datetime.now().isoformat(),
+        'new_base_rows': new_base_rows,
+        'rows_read': rows_read,
+        'seconds': round(total_time, 4),
+    })
+    _write_json_atomic(metadata_path, metadata)
+    return updated_data'''
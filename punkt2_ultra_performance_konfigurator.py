@@ -10,6 +10,11 @@ import os
 import json
 from datetime import datetime
 
+from punkt_column_store import COLUMN_STORE_EXT
+from punkt_file_probe import probe_file
+from punkt_resample import RESAMPLE_SESSIONS
+from punkt_activity_bars import ACTIVITY_BAR_KINDS, format_activity_timeframe, parse_activity_threshold
+
 class UltraPerformancePunkt2Konfigurator:
     def __init__(self, root):
         self.root = root
@@ -41,6 +46,12 @@ class UltraPerformancePunkt2Konfigurator:
         self.tf_3d_var = tk.BooleanVar()
         self.tf_1w_var = tk.BooleanVar()
 
+        # Aktivitäts-Bars: Art → (Checkbox, Schwelle)
+        self.activity_bar_vars = {
+            kind: (tk.BooleanVar(), tk.StringVar(value=str(default)))
+            for kind, (_, _, default) in ACTIVITY_BAR_KINDS.items()
+        }
+
         # Visualisierung und Speicher-Optionen
         self.viz_var = tk.StringVar()
         self.viz_count_var = tk.StringVar()
@@ -49,12 +60,18 @@ class UltraPerformancePunkt2Konfigurator:
         self.save_backup_var = tk.BooleanVar(value=True)
         self.save_charts_var = tk.BooleanVar(value=False)
         self.show_summary_var = tk.BooleanVar(value=True)
+        self.store_compression_var = tk.StringVar(value="source")
 
         # Performance-Optionen
         self.enable_chunking_var = tk.BooleanVar(value=True)
         self.enable_numba_var = tk.BooleanVar(value=True)
         self.enable_vbt_data_var = tk.BooleanVar(value=True)
         self.enable_memory_opt_var = tk.BooleanVar(value=True)
+        self.cascade_verify_var = tk.BooleanVar(value=False)
+        self.resample_session_var = tk.StringVar(value="Kalender")
+        self.parallel_workers_var = tk.StringVar(value="auto")
+        self.incremental_update_var = tk.BooleanVar(value=False)
+        self.memory_budget_var = tk.StringVar(value="auto")
 
         # Punkt 1 Dateien scannen
         self.available_files = self.scan_punkt1_files()
@@ -73,25 +90,25 @@ class UltraPerformancePunkt2Konfigurator:
         if os.path.exists(punkt1_dir):
             # Alle relevanten Dateien scannen
             all_files = [f for f in os.listdir(punkt1_dir)
-                        if f.endswith(('.h5', '.pickle', '.parquet')) and not f.endswith('_metadata.json')]
+                        if f.endswith(('.h5', '.pickle', '.parquet', COLUMN_STORE_EXT)) and not f.endswith('_metadata.json')]
 
             for i, file in enumerate(all_files, 1):
                 file_path = os.path.join(punkt1_dir, file)
 
-                # Datei-Validierung
+                # Datei-Validierung über die Probe-Schicht (Zeilen, Zeitraum ohne Laden)
                 try:
-                    file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-
-                    # Prüfe ob Datei ladbar ist
-                    is_valid = self.validate_file(file_path)
+                    probe = probe_file(file_path)
+                    file_size_mb = probe['file_size_mb']
+                    is_valid = self.validate_file(file_path, probe)
 
                 except Exception as e:
                     print(f"⚠️ Fehler bei Datei {file}: {e}")
+                    probe = {}
                     is_valid = False
                     file_size_mb = 0
 
                 # VEREINFACHTE Asset/Period Extraktion
-                base_name = file.replace('.h5', '').replace('.pickle', '').replace('.parquet', '')
+                base_name = file.replace('.h5', '').replace('.pickle', '').replace('.parquet', '').replace(COLUMN_STORE_EXT, '')
 
                 # Einfache Erkennung: Erstes Wort = Asset, Zweites = Period
                 parts = base_name.split('_')
@@ -99,7 +116,9 @@ class UltraPerformancePunkt2Konfigurator:
                 period = parts[1] if len(parts) > 1 else 'Unknown'
 
                 # VBT-Typ erkennen (verbessert)
-                if file.endswith('.pickle'):
+                if file.endswith(COLUMN_STORE_EXT):
+                    file_type = "Column Store"  # Memory-mapped, zero-copy
+                elif file.endswith('.pickle'):
                     file_type = "VBT"  # Pickle-Dateien sind meist VBT Data Objekte
                 elif any(keyword in file.upper() for keyword in ['VBT', 'PUNKT2']):
                     file_type = "VBT"
@@ -119,79 +138,28 @@ class UltraPerformancePunkt2Konfigurator:
                     'file_type': file_type,
                     'timestamp': timestamp,
                     'index': i,
-                    'is_valid': is_valid
+                    'is_valid': is_valid,
+                    'rows': probe.get('rows'),
+                    'start': probe.get('start'),
+                    'end': probe.get('end'),
+                    'freq': probe.get('freq')
                 }
 
         return files
 
-    def validate_file(self, file_path):
-        """Validiert ob eine Datei ladbar ist - REPARIERT FÜR PICKLE"""
-        try:
-            if file_path.endswith('.pickle'):
-                # Pickle-Datei testen - VEREINFACHT und ROBUST
-
-                # Methode 1: Prüfe Pickle Magic Number (schnell)
-                try:
-                    with open(file_path, 'rb') as f:
-                        header = f.read(10)  # Erste 10 Bytes
-                        if len(header) > 0 and header[0:1] in [b'\x80', b'\x81', b'\x82', b'\x83', b'\x84', b'\x85']:
-                            return True
-                except Exception:
-                    pass
-
-                # Methode 2: Versuche VBT Data Objekt zu laden (falls VBT verfügbar)
-                try:
-                    import vectorbtpro as vbt
-                    # Teste VBT Data Objekt Laden
-                    vbt_data = vbt.Data.load(file_path)
-                    return True
-                except ImportError:
-                    pass
-                except Exception:
-                    pass
-
-                # Methode 3: Standard Pickle Test (vorsichtig)
-                try:
-                    import pickle
-                    with open(file_path, 'rb') as f:
-                        # Versuche nur den ersten Pickle-Eintrag zu lesen
-                        pickler = pickle.Unpickler(f)
-                        obj = pickler.load()
-                        return True
-                except Exception:
-                    pass
-
-                # Fallback: Datei existiert und ist nicht leer
-                if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                    return True
-
-                return False
-
-            elif file_path.endswith('.h5'):
-                # HDF5-Datei testen
-                import pandas as pd
-                try:
-                    with pd.HDFStore(file_path, 'r') as store:
-                        keys = list(store.keys())
-                        return len(keys) > 0
-                except:
-                    # Fallback: Prüfe nur ob Datei existiert und lesbar ist
-                    return os.path.exists(file_path) and os.path.getsize(file_path) > 0
-
-            elif file_path.endswith('.parquet'):
-                # Parquet-Datei testen
-                import pandas as pd
-                try:
-                    df = pd.read_parquet(file_path, nrows=1)  # Nur erste Zeile
-                    return len(df) > 0
-                except:
-                    # Fallback: Prüfe nur ob Datei existiert
-                    return os.path.exists(file_path) and os.path.getsize(file_path) > 0
-            else:
-                return False
-        except Exception as e:
-            print(f"⚠️ Validierung fehlgeschlagen für {file_path}: {e}")
+    def validate_file(self, file_path, probe=None):
+        """Validiert ob eine Datei ladbar ist - nur Header/Footer/Sidecar, ohne Laden"""
+        probe = probe or probe_file(file_path)
+        if probe.get('error'):
+            print(f"⚠️ Validierung fehlgeschlagen für {file_path}: {probe['error']}")
             return False
+        if probe['rows'] is not None:
+            return probe['rows'] > 0
+        if probe['format'] == 'pickle':
+            # Pickle ohne Sidecar-Metadaten: Magic Number prüfen
+            with open(file_path, 'rb') as f:
+                return f.read(1) == b'\x80'
+        return False
 
     def create_widgets(self):
         """Erstellt alle GUI-Elemente"""
@@ -422,6 +390,22 @@ class UltraPerformancePunkt2Konfigurator:
         ttk.Checkbutton(period_frame, text="3d", variable=self.tf_3d_var).grid(row=0, column=1, sticky=tk.W, padx=(0, 10))
         ttk.Checkbutton(period_frame, text="1w", variable=self.tf_1w_var).grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
 
+        tf_row += 1
+
+        # Aktivitäts-Bars
+        ttk.Label(self.multi_frame, text="📦 Aktivitäts-Bars (Schwelle statt Uhr, K/M erlaubt):", 
+                 font=('Arial', 9, 'bold')).grid(row=tf_row, column=0, sticky=tk.W, pady=(10, 5))
+        tf_row += 1
+
+        activity_frame = ttk.Frame(self.multi_frame)
+        activity_frame.grid(row=tf_row, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+
+        for row, (kind, (label, unit, _)) in enumerate(ACTIVITY_BAR_KINDS.items()):
+            enabled_var, threshold_var = self.activity_bar_vars[kind]
+            ttk.Checkbutton(activity_frame, text=label, variable=enabled_var).grid(row=row, column=0, sticky=tk.W, padx=(0, 10))
+            ttk.Entry(activity_frame, textvariable=threshold_var, width=12).grid(row=row, column=1, sticky=tk.W)
+            ttk.Label(activity_frame, text=unit, font=('Arial', 8)).grid(row=row, column=2, sticky=tk.W, padx=(5, 0))
+
         # Quick-Select Buttons
         tf_row += 1
         quick_frame = ttk.Frame(self.multi_frame)
@@ -447,6 +431,34 @@ class UltraPerformancePunkt2Konfigurator:
                        variable=self.enable_vbt_data_var).grid(row=2, column=0, sticky=tk.W, pady=2)
         ttk.Checkbutton(perf_frame, text="💾 Memory-Optimierung (50-70% weniger RAM)", 
                        variable=self.enable_memory_opt_var).grid(row=3, column=0, sticky=tk.W, pady=2)
+        ttk.Checkbutton(perf_frame, text="🔗 Single-Pass- und Kaskaden-Resampling gegen direktes Resample prüfen",
+                       variable=self.cascade_verify_var).grid(row=4, column=0, sticky=tk.W, pady=2)
+
+        session_frame = ttk.Frame(perf_frame)
+        session_frame.grid(row=5, column=0, sticky=tk.W, pady=2)
+        ttk.Label(session_frame, text="🕐 Bar-Anker:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Combobox(session_frame, textvariable=self.resample_session_var, state="readonly", width=12,
+                     values=["Kalender"] + list(RESAMPLE_SESSIONS)).grid(row=0, column=1, padx=(5, 0))
+        ttk.Label(session_frame, text="(Session-Eröffnung statt Mitternacht)",
+                  font=('Arial', 8)).grid(row=0, column=2, sticky=tk.W, padx=(5, 0))
+
+        workers_frame = ttk.Frame(perf_frame)
+        workers_frame.grid(row=6, column=0, sticky=tk.W, pady=2)
+        ttk.Label(workers_frame, text="🧵 Worker-Prozesse:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Combobox(workers_frame, textvariable=self.parallel_workers_var, state="readonly", width=6,
+                     values=["auto", "1", "2", "4", "8", "16"]).grid(row=0, column=1, padx=(5, 0))
+        ttk.Label(workers_frame, text=f"(Shared Memory, {os.cpu_count() or 1} Kerne)",
+                  font=('Arial', 8)).grid(row=0, column=2, sticky=tk.W, padx=(5, 0))
+        ttk.Checkbutton(perf_frame, text="🔁 Inkrementelles Update (letzten Lauf fortschreiben, nur neue Bars)",
+                       variable=self.incremental_update_var).grid(row=7, column=0, sticky=tk.W, pady=2)
+
+        budget_frame = ttk.Frame(perf_frame)
+        budget_frame.grid(row=8, column=0, sticky=tk.W, pady=2)
+        ttk.Label(budget_frame, text="🧮 RAM-Budget (GB):").grid(row=0, column=0, sticky=tk.W)
+        ttk.Combobox(budget_frame, textvariable=self.memory_budget_var, state="readonly", width=6,
+                     values=["auto", "off", "2", "4", "8", "16", "32"]).grid(row=0, column=1, padx=(5, 0))
+        ttk.Label(budget_frame, text="(größere Basis wird in Zeitfenstern verarbeitet)",
+                  font=('Arial', 8)).grid(row=0, column=2, sticky=tk.W, padx=(5, 0))
 
     def create_visualization_options(self, parent, start_row):
         """Erstellt Visualisierung-Optionen"""
@@ -511,6 +523,12 @@ class UltraPerformancePunkt2Konfigurator:
         ttk.Checkbutton(save_frame, text="📋 Ultra-Performance Zusammenfassung anzeigen",
                        variable=self.show_summary_var).grid(row=3, column=0, sticky=tk.W, pady=2)
 
+        compression_frame = ttk.Frame(save_frame)
+        compression_frame.grid(row=4, column=0, sticky=tk.W, pady=2)
+        ttk.Label(compression_frame, text="🗜️ Column-Store Kompression:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Combobox(compression_frame, textvariable=self.store_compression_var, state="readonly", width=14,
+                     values=["source", "none", "auto", "blosc2-lz4", "blosc2-zstd", "zstd"]).grid(row=0, column=1, padx=(5, 0))
+
     def create_right_panel(self, parent):
         """Erstellt rechtes Panel"""
         right_frame = ttk.Frame(parent)
@@ -592,16 +610,25 @@ class UltraPerformancePunkt2Konfigurator:
             filetypes=[
                 ("VBT Data Objekte", "*.pickle"),
                 ("HDF5 Dateien", "*.h5"),
+                ("Column Store (header.json)", "header.json"),
+                ("Tick-/Sekunden-Exporte", "*.parquet *.csv"),
                 ("Alle Dateien", "*.*")
             ],
             initialdir="data/punkt1"
         )
 
         if file_path:
+            # Column Store wird über seinen header.json gewählt
+            store_dir = os.path.dirname(file_path)
+            if os.path.basename(file_path) == 'header.json' and store_dir.endswith(COLUMN_STORE_EXT):
+                file_path = store_dir
+
             self.selected_file_path = file_path
             filename = os.path.basename(file_path)
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            self.selected_file_var.set(f"✅ Gewählt: {filename} ({file_size_mb:.1f} MB)")
+            probe = probe_file(file_path)
+            status_icon = "✅" if self.validate_file(file_path, probe) else "⚠️"
+            rows_text = f", {probe['rows']:,} Zeilen" if probe.get('rows') else ""
+            self.selected_file_var.set(f"{status_icon} Gewählt: {filename} ({probe['file_size_mb']:.1f} MB{rows_text})")
 
     def on_mode_change(self):
         """Event-Handler für Timeframe-Modus Änderung"""
@@ -650,7 +677,7 @@ class UltraPerformancePunkt2Konfigurator:
             self.tf_10m_var, self.tf_15m_var, self.tf_30m_var, self.tf_1h_var,
             self.tf_2h_var, self.tf_4h_var, self.tf_8h_var, self.tf_1d_var,
             self.tf_3d_var, self.tf_1w_var
-        ]
+        ] + [enabled_var for enabled_var, _ in self.activity_bar_vars.values()]
         for var in all_tf_vars:
             var.set(False)
 
@@ -694,6 +721,10 @@ class UltraPerformancePunkt2Konfigurator:
                 self.file_info_text.insert(tk.END, f"   📅 Periode: {info['period']}\n")
                 self.file_info_text.insert(tk.END, f"   🚀 Typ: {info['file_type']}\n")
                 self.file_info_text.insert(tk.END, f"   💾 Größe: {info['file_size_mb']:.1f} MB\n")
+                if info.get('rows'):
+                    self.file_info_text.insert(tk.END, f"   📈 Zeilen: {info['rows']:,} ({info.get('freq') or '?'})\n")
+                if info.get('start'):
+                    self.file_info_text.insert(tk.END, f"   📅 Zeitraum: {info['start']} bis {info['end']}\n")
                 self.file_info_text.insert(tk.END, f"   🕐 Erstellt: {info['timestamp']}\n")
 
                 if info['file_type'] == 'VBT':
@@ -728,6 +759,17 @@ class UltraPerformancePunkt2Konfigurator:
             if var.get():
                 timeframes.append(tf_name)
 
+        # Aktivitäts-Bars als Kürzel (vol10000, range2p5, dollar50M)
+        for kind, (enabled_var, threshold_var) in self.activity_bar_vars.items():
+            if not enabled_var.get():
+                continue
+            threshold = parse_activity_threshold(threshold_var.get())
+            if threshold is None:
+                messagebox.showwarning("Aktivitäts-Bars", f"Ungültige Schwelle für {ACTIVITY_BAR_KINDS[kind][0]}: "
+                                       f"{threshold_var.get()!r} (z.B. 10.000, 2,5 oder 50M) - wird übersprungen")
+                continue
+            timeframes.append(format_activity_timeframe(kind, threshold))
+
         return timeframes
 
     def generate_ultra_performance_code(self):
@@ -754,10 +796,16 @@ class UltraPerformancePunkt2Konfigurator:
             'save_backup': self.save_backup_var.get(),
             'save_charts': self.save_charts_var.get(),
             'show_summary': self.show_summary_var.get(),
+            'store_compression': self.store_compression_var.get(),
             'enable_chunking': self.enable_chunking_var.get(),
             'enable_numba': self.enable_numba_var.get(),
             'enable_vbt_data': self.enable_vbt_data_var.get(),
-            'enable_memory_opt': self.enable_memory_opt_var.get()
+            'enable_memory_opt': self.enable_memory_opt_var.get(),
+            'cascade_verify': self.cascade_verify_var.get(),
+            'resample_session': None if self.resample_session_var.get() == "Kalender" else self.resample_session_var.get(),
+            'parallel_workers': self.parallel_workers_var.get(),
+            'incremental_update': self.incremental_update_var.get(),
+            'memory_budget': self.memory_budget_var.get()
         }
 
         try:
@@ -122,19 +122,23 @@ class Tab1DateiScanner:
         list_frame.pack(fill=tk.BOTH, expand=True)
         
         # Treeview für Dateien
-        columns = ('Name', 'Typ', 'Größe', 'Geändert', 'Timeframe')
+        columns = ('Name', 'Typ', 'Größe', 'Zeilen', 'Zeitraum', 'Geändert', 'Timeframe')
         self.files_tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=10)
         
         # Spalten konfigurieren
         self.files_tree.heading('Name', text='Dateiname')
         self.files_tree.heading('Typ', text='Typ')
         self.files_tree.heading('Größe', text='Größe')
+        self.files_tree.heading('Zeilen', text='Zeilen')
+        self.files_tree.heading('Zeitraum', text='Zeitraum')
         self.files_tree.heading('Geändert', text='Geändert')
         self.files_tree.heading('Timeframe', text='Timeframe')
         
         self.files_tree.column('Name', width=300)
         self.files_tree.column('Typ', width=120)
         self.files_tree.column('Größe', width=80)
+        self.files_tree.column('Zeilen', width=90)
+        self.files_tree.column('Zeitraum', width=160)
         self.files_tree.column('Geändert', width=120)
         self.files_tree.column('Timeframe', width=100)
         
@@ -277,16 +281,24 @@ class Tab1DateiScanner:
             size_str = self.format_file_size(file_info['size'])
             modified_str = file_info['modified'].strftime('%Y-%m-%d %H:%M')
             
+            rows_str = f"{file_info['rows']:,}" if file_info.get('rows') else "-"
+            range_str = (f"{str(file_info['start'])[:10]} - {str(file_info['end'])[:10]}"
+                         if file_info.get('start') and file_info.get('end') else "-")
+
             timeframe_type = ""
             if file_info['is_single_timeframe']:
                 timeframe_type = "Single"
             elif file_info['is_multi_timeframe']:
                 timeframe_type = "Multi"
+            if file_info.get('freq'):
+                timeframe_type = f"{timeframe_type} ({file_info['freq']})".strip()
                 
             self.files_tree.insert('', tk.END, values=(
                 file_info['name'],
                 file_info['type'],
                 size_str,
+                rows_str,
+                range_str,
                 modified_str,
                 timeframe_type
             ), tags=(file_info['path'],))
@@ -16,6 +16,9 @@ from typing import Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 import threading
 
+from punkt_time_slice import slice_time_range, slice_last_period
+from punkt_mtf_container import MultiTimeframeContainer
+
 try:
     import matplotlib.pyplot as plt
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
@@ -240,6 +243,9 @@ class Tab2Visualisierung:
             for key, value in self.current_data.items():
                 if isinstance(value, pd.DataFrame) and not value.empty:
                     sources.append(key)
+        elif isinstance(self.current_data, MultiTimeframeContainer):
+            # Container: Timeframes aus dem Katalog, gelesen wird erst bei Auswahl
+            sources = [tf for tf in self.current_data.timeframes if self.current_data.stats(tf)['rows']]
         elif isinstance(self.current_data, pd.DataFrame):
             # Einzelner DataFrame
             sources.append("Hauptdaten")
@@ -257,7 +263,7 @@ class Tab2Visualisierung:
             return
             
         # Aktuelle Daten basierend auf Auswahl setzen
-        if isinstance(self.current_data, dict):
+        if isinstance(self.current_data, (dict, MultiTimeframeContainer)):
             if selected_source in self.current_data:
                 self.filtered_data = self.current_data[selected_source]
         elif isinstance(self.current_data, pd.DataFrame):
@@ -329,12 +335,9 @@ class Tab2Visualisierung:
         
         if timeframe in timeframe_days:
             days = timeframe_days[timeframe]
-            end_date = self.filtered_data.index[-1]
-            start_date = end_date - timedelta(days=days)
             
-            # Filter anwenden
-            mask = (self.filtered_data.index >= start_date) & (self.filtered_data.index <= end_date)
-            filtered_df = self.filtered_data.loc[mask]
+            # Filter anwenden (searchsorted-Schnitt, View)
+            filtered_df = slice_last_period(self.filtered_data, timedelta(days=days))
             
             self.update_table(filtered_df)
             
@@ -351,9 +354,8 @@ class Tab2Visualisierung:
                 messagebox.showerror("Fehler", "Startdatum muss vor Enddatum liegen.")
                 return
                 
-            # Filter anwenden
-            mask = (self.filtered_data.index >= start_date) & (self.filtered_data.index <= end_date)
-            filtered_df = self.filtered_data.loc[mask]
+            # Filter anwenden (searchsorted-Schnitt, View)
+            filtered_df = slice_time_range(self.filtered_data, start_date, end_date)
             
             self.update_table(filtered_df)
             
@@ -17,6 +17,12 @@ from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional, Union
 from datetime import datetime, timedelta
 
+from punkt_column_store import (COLUMN_STORE_EXT, is_column_store, column_store_size_bytes,
+                                open_column_store, read_column_store_header)
+from punkt_file_probe import probe_file
+from punkt_mtf_container import (MultiTimeframeContainer, is_mtf_container, open_mtf_container,
+                                 mtf_container_size_bytes)
+
 try:
     import vectorbtpro as vbt
     VBT_AVAILABLE = True
@@ -50,7 +56,8 @@ class VBTDataManager:
             '.h5',
             '.hdf5',
             '.parquet',
-            '.csv'
+            '.csv',
+            COLUMN_STORE_EXT
         ]
         self.cache = {}
         
@@ -86,7 +93,12 @@ class VBTDataManager:
             
         try:
             for item in directory.iterdir():
-                if item.is_file():
+                if is_column_store(str(item)) or (item.is_dir() and is_mtf_container(str(item))):
+                    # Column Store / Multi-Timeframe Container Verzeichnis wird wie eine Datei behandelt
+                    file_info = self._get_file_info(item)
+                    if file_info:
+                        files.append(file_info)
+                elif item.is_file():
                     if self._is_supported_file(item):
                         file_info = self._get_file_info(item)
                         if file_info:
@@ -109,15 +121,24 @@ class VBTDataManager:
             # Dateityp bestimmen
             file_type = self._determine_file_type(file_path)
             
+            # Zeilen, Spalten, Zeitraum und Frequenz aus Header/Footer/Sidecar (ohne Laden)
+            probe = probe_file(str(file_path))
+
             return {
                 'name': file_path.name,
                 'path': str(file_path.absolute()),
-                'size': stat.st_size,
+                'size': probe['size'],
                 'modified': datetime.fromtimestamp(stat.st_mtime),
                 'type': file_type,
                 'extension': self._get_extension(file_path),
                 'is_single_timeframe': self._is_single_timeframe(file_path),
-                'is_multi_timeframe': self._is_multi_timeframe(file_path)
+                'is_multi_timeframe': self._is_multi_timeframe(file_path),
+                'rows': probe['rows'],
+                'columns': probe['columns'],
+                'dtypes': probe['dtypes'],
+                'start': probe['start'],
+                'end': probe['end'],
+                'freq': probe['freq']
             }
         except Exception as e:
             print(f"Fehler beim Analysieren von {file_path}: {e}")
@@ -131,12 +152,16 @@ class VBTDataManager:
             return 'VBT Blosc Pickle'
         elif file_str.endswith('.pickle'):
             return 'VBT Pickle'
+        elif is_mtf_container(str(file_path)):
+            return 'Multi-Timeframe Container'
         elif file_str.endswith(('.h5', '.hdf5')):
             return 'VBT HDF5'
         elif file_str.endswith('.parquet'):
             return 'Parquet'
         elif file_str.endswith('.csv'):
             return 'CSV'
+        elif file_str.endswith(COLUMN_STORE_EXT):
+            return 'Column Store'
         else:
             return 'Unknown'
             
@@ -198,12 +223,16 @@ class VBTDataManager:
             return self._load_blosc_pickle(file_path)
         elif file_str.endswith('.pickle'):
             return self._load_pickle(file_path)
+        elif is_mtf_container(str(file_path)):
+            return self._load_mtf_container(file_path)
         elif file_str.endswith(('.h5', '.hdf5')):
             return self._load_hdf5(file_path)
         elif file_str.endswith('.parquet'):
             return self._load_parquet(file_path)
         elif file_str.endswith('.csv'):
             return self._load_csv(file_path)
+        elif file_str.endswith(COLUMN_STORE_EXT):
+            return self._load_column_store(file_path)
         else:
             raise ValueError(f"Nicht unterstützter Dateityp: {file_path}")
             
@@ -279,6 +308,17 @@ class VBTDataManager:
         except Exception as e:
             raise Exception(f"Fehler beim Laden der HDF5-Datei: {e}")
             
+    def _load_mtf_container(self, file_path: Path) -> Tuple[Any, Dict[str, Any]]:
+        """Öffnet Multi-Timeframe Container (Katalog sofort, Timeframes erst bei Auswahl)"""
+        try:
+            data = open_mtf_container(str(file_path))
+            metadata = self._extract_metadata(data, file_path)
+            metadata['file_size'] = mtf_container_size_bytes(str(file_path))
+            metadata['mtf_catalog'] = data.catalog
+            return data, metadata
+        except Exception as e:
+            raise Exception(f"Fehler beim Öffnen des Containers: {e}")
+
     def _load_parquet(self, file_path: Path) -> Tuple[Any, Dict[str, Any]]:
         """Lädt Parquet Dateien"""
         try:
@@ -288,6 +328,17 @@ class VBTDataManager:
         except Exception as e:
             raise Exception(f"Fehler beim Laden der Parquet-Datei: {e}")
             
+    def _load_column_store(self, file_path: Path) -> Tuple[Any, Dict[str, Any]]:
+        """Öffnet Column Store Verzeichnisse (memmap, zero-copy)"""
+        try:
+            data = open_column_store(str(file_path))
+            metadata = self._extract_metadata(data, file_path)
+            metadata['file_size'] = column_store_size_bytes(str(file_path))
+            metadata['column_store'] = read_column_store_header(str(file_path)).get('metadata', {})
+            return data, metadata
+        except Exception as e:
+            raise Exception(f"Fehler beim Öffnen des Column Stores: {e}")
+
     def _load_csv(self, file_path: Path) -> Tuple[Any, Dict[str, Any]]:
         """Lädt CSV Dateien"""
         try:
@@ -366,6 +417,16 @@ class VBTDataManager:
                     if isinstance(value, pd.DataFrame):
                         metadata[f'{key}_shape'] = value.shape
                         metadata[f'{key}_columns'] = list(value.columns)
+            elif isinstance(data, MultiTimeframeContainer):
+                # Form und Spalten aus dem Katalog - keine Gruppe wird gelesen
+                metadata.update({
+                    'keys': data.keys(),
+                    'num_keys': len(data)
+                })
+                for key in data:
+                    stats = data.stats(key)
+                    metadata[f'{key}_shape'] = (stats['rows'], len(stats['columns']))
+                    metadata[f'{key}_columns'] = stats['columns']
                         
         except Exception as e:
             print(f"Fehler beim Extrahieren von Metadaten: {e}")
@@ -438,7 +499,7 @@ class VBTDataManager:
                 'columns': list(data.columns),
                 'memory_usage_mb': data.memory_usage(deep=True).sum() / (1024 * 1024)
             })
-        elif isinstance(data, dict):
+        elif isinstance(data, (dict, MultiTimeframeContainer)):
             info.update({
                 'num_keys': len(data),
                 'keys': list(data.keys())
@@ -456,7 +517,7 @@ class VBTDataManager:
         }
         
         try:
-            if isinstance(data, dict):
+            if isinstance(data, (dict, MultiTimeframeContainer)):
                 # Multi-Timeframe Daten
                 timeframes = []
                 for key in data.keys():
@@ -512,8 +573,8 @@ class VBTDataManager:
         indicators = []
         
         try:
-            if isinstance(data, dict):
-                for key, value in data.items():
+            if isinstance(data, (dict, MultiTimeframeContainer)):
+                for key in data.keys():
                     if 'indicator' in str(key).lower() or 'ta' in str(key).lower():
                         indicators.append(key)
                         
@@ -9,6 +9,9 @@ import json
 import os
 from datetime import datetime
 
+from punkt_column_store import get_column_store_source
+from punkt_mtf_container import get_mtf_container_source
+
 def generate_punkt3_code(config):
     """Generiert den kompletten Python-Code für Punkt 3"""
     
@@ -32,6 +35,8 @@ def generate_punkt3_code(config):
 
     # Generiere Code-Teile
     header_code = generate_header_code()
+    column_store_code = get_column_store_source()
+    mtf_container_code = get_mtf_container_source()
     data_loading_code = generate_data_loading_code(metadata_file, base_name, selected_timeframes)
     indicator_code = generate_indicator_code(selected_indicators, multi_indicator_mode)
     visualization_code = generate_visualization_code(visualization_mode, visualization_period, quality, theme, enable_segmentation, candles_per_chart)
@@ -41,6 +46,10 @@ def generate_punkt3_code(config):
     # Kombiniere alle Code-Teile
     full_code = f"""{header_code}
 
+{column_store_code}
+
+{mtf_container_code}
+
 {data_loading_code}
 
 {indicator_code}
@@ -140,102 +149,65 @@ else:
     actual_base_name = "{base_name}"
     print(f"📋 Verwende übergebenen base_name: {{actual_base_name}}")
 
-# Prüfe auf verfügbare VBT-Dateien in Metadaten
-available_vbt_files = metadata.get('vbt_files', [])
-if available_vbt_files:
-    print(f"📊 Verfügbare VBT-Dateien in Metadaten: {{available_vbt_files}}")
+# Multi-Timeframe Container einmal öffnen - gelesen werden nur die gewählten Timeframes
+punkt2_dir = os.path.dirname(metadata_file)
+mtf_container = None
+if metadata.get('container_file'):
+    container_path = os.path.join(punkt2_dir, metadata['container_file'])
+    try:
+        mtf_container = open_mtf_container(container_path)
+        print(f"🗂️ Container: {{metadata['container_file']}} ({{', '.join(mtf_container.timeframes)}})")
+    except Exception as e:
+        print(f"⚠️ Container Fehler: {{e}}")
+
+# Ältere Punkt2-Läufe ohne Container: Dateien pro Timeframe laut Metadaten (kein Suchen nach Mustern)
+legacy_files = {{}}
+if mtf_container is None:
+    for data_file in metadata.get('vbt_files', []) + metadata.get('data_files', []):
+        for tf in selected_timeframes:
+            suffix = data_file[len(actual_base_name) + len(tf) + 1:]
+            if (tf not in legacy_files and data_file.startswith(f"{{actual_base_name}}_{{tf}}")
+                    and suffix in ('_VBT.pickle', '_VBT.h5', '.h5', COLUMN_STORE_EXT)):
+                legacy_files[tf] = data_file
 
 for tf in selected_timeframes:
     print(f"\\n📊 Lade {{tf}} Daten...")
+    df = None
+
+    try:
+        if mtf_container is not None:
+            if tf in mtf_container:
+                # Gruppe wird erst hier gelesen (Column Store: memmap, zero-copy)
+                df = mtf_container[tf]
+                source = f"Container-Gruppe {{mtf_container.stats(tf)['key']}}"
+        elif tf in legacy_files:
+            data_file = legacy_files[tf]
+            data_path = os.path.join(punkt2_dir, data_file)
+            if data_file.endswith(COLUMN_STORE_EXT):
+                df = open_column_store(data_path)
+            elif data_file.endswith(('_VBT.pickle', '_VBT.h5')):
+                df = vbt.Data.load(data_path).get()
+            else:
+                df = pd.read_hdf(data_path)
+            source = data_file
+    except Exception as e:
+        print(f"   ⚠️ Lade-Fehler: {{e}}")
+        df = None
 
-    # Versuche verschiedene Dateiformate (VBT Pickle, VBT H5, CSV)
-    data_loaded = False
-
-    # 1. Versuche VBT Pickle (beste Performance)
-    # Prüfe zuerst in Metadaten verfügbare Dateien
-    vbt_pickle_file = None
-    for vbt_file in available_vbt_files:
-        if f"_{{tf}}_VBT.pickle" in vbt_file:
-            vbt_pickle_file = vbt_file
-            break
-
-    if not vbt_pickle_file:
-        vbt_pickle_file = f"{{actual_base_name}}_{{tf}}_VBT.pickle"
-
-    vbt_pickle_path = os.path.join(os.path.dirname(metadata_file), vbt_pickle_file)
-
-    if os.path.exists(vbt_pickle_path):
-        try:
-            print(f"   🚀 Lade VBT Pickle: {{vbt_pickle_file}}")
-            vbt_data = vbt.Data.load(vbt_pickle_path)
-            df = vbt_data.get()
-
-            # Stelle sicher, dass OHLCV Spalten vorhanden sind
-            if not all(col in df.columns for col in ['open', 'high', 'low', 'close']):
-                print(f"   ⚠️ OHLCV Spalten fehlen in VBT Datei")
-                continue
-
-            enhanced_data[tf] = df
-            print(f"✅ {{tf}}: {{len(df)}} Kerzen geladen (VBT Pickle)")
-            print(f"   📊 Spalten: {{len(df.columns)}} ({{list(df.columns[:10])}}{{\'...\' if len(df.columns) > 10 else \'\'}})")
-            print(f"   🕐 Zeitraum: {{df.index[0]}} bis {{df.index[-1]}}")
-            data_loaded = True
-
-        except Exception as e:
-            print(f"   ⚠️ VBT Pickle Fehler: {{e}}")
-
-    # 2. Versuche VBT H5 (falls Pickle nicht funktioniert)
-    if not data_loaded:
-        vbt_h5_file = f"{{actual_base_name}}_{{tf}}_VBT.h5"
-        vbt_h5_path = os.path.join(os.path.dirname(metadata_file), vbt_h5_file)
-
-        if os.path.exists(vbt_h5_path):
-            try:
-                print(f"   📊 Lade VBT H5: {{vbt_h5_file}}")
-                vbt_data = vbt.Data.load(vbt_h5_path)
-                df = vbt_data.get()
-
-                # Stelle sicher, dass OHLCV Spalten vorhanden sind
-                if not all(col in df.columns for col in ['open', 'high', 'low', 'close']):
-                    print(f"   ⚠️ OHLCV Spalten fehlen in VBT H5 Datei")
-                    continue
-
-                enhanced_data[tf] = df
-                print(f"✅ {{tf}}: {{len(df)}} Kerzen geladen (VBT H5)")
-                print(f"   📊 Spalten: {{len(df.columns)}} ({{list(df.columns[:10])}}{{\'...\' if len(df.columns) > 10 else \'\'}})")
-                print(f"   🕐 Zeitraum: {{df.index[0]}} bis {{df.index[-1]}}")
-                data_loaded = True
-
-            except Exception as e:
-                print(f"   ⚠️ VBT H5 Fehler: {{e}}")
-
-    # 3. Fallback: Versuche CSV (Legacy)
-    if not data_loaded:
-        csv_file = f"{{actual_base_name}}_{{tf}}_enhanced.csv"
-        csv_path = os.path.join(os.path.dirname(metadata_file), csv_file)
-
-        if os.path.exists(csv_path):
-            try:
-                print(f"   📋 Lade CSV: {{csv_file}}")
-                df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
-
-                # Datentyp-Optimierung für VBT Pro
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    if col in df.columns:
-                        df[col] = df[col].astype('float64')
-
-                enhanced_data[tf] = df
-                print(f"✅ {{tf}}: {{len(df)}} Kerzen geladen (CSV)")
-                print(f"   📊 Spalten: {{list(df.columns)}}")
-                print(f"   🕐 Zeitraum: {{df.index[0]}} bis {{df.index[-1]}}")
-                data_loaded = True
-
-            except Exception as e:
-                print(f"   ❌ CSV Fehler: {{e}}")
-
-    if not data_loaded:
+    if df is None:
         print(f"❌ Keine Daten für {{tf}} gefunden!")
-        print(f"   Gesucht: {{vbt_pickle_file}}, {{vbt_h5_file}}, {{csv_file}}")
+        continue
+    if not all(col in df.columns for col in ['open', 'high', 'low', 'close']):
+        print(f"   ⚠️ OHLCV Spalten fehlen ({{source}})")
+        continue
+
+    enhanced_data[tf] = df
+    print(f"✅ {{tf}}: {{len(df)}} Kerzen geladen ({{source}})")
+    print(f"   📊 Spalten: {{len(df.columns)}} ({{list(df.columns[:10])}}{{\'...\' if len(df.columns) > 10 else \'\'}})")
+    print(f"   🕐 Zeitraum: {{df.index[0]}} bis {{df.index[-1]}}")
+
+if mtf_container is not None:
+    mtf_container.close()
 
 if not enhanced_data:
     print("❌ Keine Daten geladen! Programm wird beendet.")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+📦 PUNKT ACTIVITY BARS - Volumen-, Tick-, Range- und Dollar-Bars
+
+Neben den Zeit-Timeframes (1m ... 1w) kennt Punkt2 Bars, die nach
+Marktaktivität statt nach der Uhr schließen. Das Kürzel nennt Art und
+Schwelle, K/M stehen für Tausend/Million, p für das Komma:
+
+    vol10000     alle 10.000 Kontrakte (Summe volume)
+    tick1000     alle 1.000 Trades (Spalte trades/count der Basis, Pflicht)
+    range10      sobald High - Low des Bars 10 Punkte erreicht
+    range2p5     ... 2,5 Punkte
+    dollar50M    alle 50 Mio. Notional (close x volume)
+
+Ein Bar schließt mit der Basis-Zeile, die die Schwelle erreicht; die
+Basis-Zeile ist die kleinste Einheit (aus 1m-Bars also höchstens ein
+Bar pro Minute).
+
+Tick-Bars brauchen eine Trade-Spalte: der Tick-Ingest schreibt sie
+(Ticks pro Bar), reine OHLCV-Bars haben keine - dort wird tick<N>
+abgelehnt, statt Basis-Zeilen als Trades zu zählen.
+
+Der Numba-Kernel _activity_segments_nb läuft einmal sequentiell über
+die Basis und vergibt jeder Zeile ihre Bar-Nummer, aggregiert wird
+danach mit dem Bucket-Kernel aus punkt_resample (Bar-Nummer als Uhr) -
+gleiche NaN-/Kahan-Semantik wie bei den Zeit-Bars. Label ist der
+Zeitstempel der ersten Basis-Zeile (wie der Bucket-Start der Zeit-Bars),
+gespeichert wird im selben OHLCV-Format, Punkt3 rechnet Indikatoren
+darauf unverändert.
+
+Da jeder Bar nach einem abgeschlossenen Bar beginnt, reicht für
+inkrementelle Updates und RAM-Budget-Fenster die Basis ab dem letzten
+Bar (activity_bars_tail).
+
+    python punkt_activity_bars.py data/punkt1/ES_1Jahr_PUNKT2_STORE_....cols --bars vol10000 range10 --check
+
+Die generierten Punkt2-Skripte betten den Block zwischen den EMBED-Markern
+über get_activity_bars_source() ein (nach dem Resample-Code).
+"""
+
+from punkt_resample import NUMBA_RESAMPLE_AVAILABLE, _OHLCV_COLUMNS, _kernel_inputs, _offset_size, timeframe_offset
+if NUMBA_RESAMPLE_AVAILABLE:
+    from punkt_resample import njit, _bucket_ohlcv_nb
+
+# ▼ EMBED START
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+
+# Art → (Anzeige, Einheit der Schwelle, Standard-Schwelle der GUI)
+ACTIVITY_BAR_KINDS = {
+    'vol': ('Volumen-Bars', 'Kontrakte', 10_000),
+    'tick': ('Tick-Bars', 'Trades', 1_000),
+    'range': ('Range-Bars', 'Punkte', 10),
+    'dollar': ('Dollar-Bars', 'Notional', 50_000_000),
+}
+ACTIVITY_INGEST_TIMEFRAME = '1s'      # Tick-Quellen: Aktivitäts-Bars aus Sekunden- statt Minuten-Bars
+_ACTIVITY_KIND_CODES = {'vol': 0, 'tick': 1, 'dollar': 2, 'range': 3}
+_ACTIVITY_TRADE_COLUMNS = ('trades', 'trade_count', 'count', 'ticks', 'num_trades')
+_ACTIVITY_PATTERN = re.compile(r'^(vol|tick|range|dollar)(\d+(?:p\d+)?)([km]?)$', re.IGNORECASE)
+_ACTIVITY_SCALE = {'': 1, 'k': 1_000, 'm': 1_000_000}
+
+def parse_activity_timeframe(tf):
+    """'vol10000' → ('vol', 10000.0), None für Zeit-Timeframes und ungültige Schwellen"""
+    match = _ACTIVITY_PATTERN.match(str(tf))
+    if match is None:
+        return None
+    kind, number, scale = match.groups()
+    threshold = float(number.replace('p', '.')) * _ACTIVITY_SCALE[scale.lower()]
+    return (kind.lower(), threshold) if threshold > 0 else None
+
+def is_activity_timeframe(tf):
+    return parse_activity_timeframe(tf) is not None
+
+def format_activity_timeframe(kind, threshold):
+    """('dollar', 5e7) → 'dollar50M', ('range', 2.5) → 'range2p5' (dateinamen-tauglich)"""
+    threshold = float(threshold)
+    if kind not in ACTIVITY_BAR_KINDS or not threshold > 0:
+        raise ValueError(f"Ungültige Aktivitäts-Bar: {kind} {threshold}")
+    if threshold >= 1_000_000 and threshold % 1_000_000 == 0:
+        return f"{kind}{int(threshold // 1_000_000)}M"
+    if threshold == int(threshold):
+        return f"{kind}{int(threshold)}"
+    return f"{kind}{repr(threshold).replace('.', 'p')}"
+
+_ACTIVITY_THRESHOLD_TEXT = re.compile(r'^(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d+))?\s*([km]?)$', re.IGNORECASE)
+
+def parse_activity_threshold(text):
+    """
+    GUI-Eingabe → Schwelle (float), None bei ungültiger/mehrdeutiger Eingabe
+
+    Deutsches Zahlenformat: Punkt nur als Tausender-Trenner in Dreiergruppen
+    (10.000, 1.500.000), Komma als Dezimalzeichen (2,5), dazu K/M.
+    '2.5' und '10,000' (englische Schreibweise?) sind mehrdeutig und werden abgelehnt.
+    """
+    match = _ACTIVITY_THRESHOLD_TEXT.match(str(text).strip())
+    if match is None:
+        return None
+    integer, fraction, scale = match.groups()
+    if fraction is not None and len(fraction) == 3 and '.' not in integer:
+        return None
+    threshold = float(f"{integer.replace('.', '')}.{fraction or 0}") * _ACTIVITY_SCALE[scale.lower()]
+    return threshold if threshold > 0 else None
+
+def activity_base_timeframe(timeframes, base_tf):
+    """Ingest-Timeframe für Tick-Quellen: mit Aktivitäts-Bars höchstens ACTIVITY_INGEST_TIMEFRAME"""
+    if not any(is_activity_timeframe(tf) for tf in timeframes):
+        return base_tf
+    base_offset = timeframe_offset(base_tf)
+    if base_offset is not None and _offset_size(base_offset) <= _offset_size(timeframe_offset(ACTIVITY_INGEST_TIMEFRAME)):
+        return base_tf
+    return ACTIVITY_INGEST_TIMEFRAME
+
+def _activity_segments(kind, threshold, high_arr, low_arr, measure):
+    """Bar-Nummer pro Basis-Zeile: neuer Bar nach der Zeile, die die Schwelle erreicht"""
+    n = measure.shape[0]
+    segments = np.empty(n, dtype=np.int64)
+    segment = 0
+    total = 0.0
+    high = -np.inf
+    low = np.inf
+    for i in range(n):
+        segments[i] = segment
+        if kind == 3:
+            # NaN-Vergleiche sind False: Lücken verändern die Spanne nicht
+            value = high_arr[i]
+            if value > high:
+                high = value
+            value = low_arr[i]
+            if value < low:
+                low = value
+            closed = high - low >= threshold
+        else:
+            value = measure[i]
+            if value == value:
+                total += value
+            closed = total >= threshold
+        if closed:
+            segment += 1
+            total = 0.0
+            high = -np.inf
+            low = np.inf
+    return segments
+
+if NUMBA_RESAMPLE_AVAILABLE:
+    _activity_segments_nb = njit(nogil=True, cache=True)(_activity_segments)
+
+def activity_measure(data, kind):
+    """Beitrag jeder Basis-Zeile zur Schwelle (float64, NaN zählt nicht)"""
+    if kind == 'tick':
+        lower = {str(c).lower(): c for c in data.columns}
+        column = next((lower[name] for name in _ACTIVITY_TRADE_COLUMNS if name in lower), None)
+        if column is None:
+            raise ValueError(f"Tick-Bars brauchen eine Trade-Spalte ({', '.join(_ACTIVITY_TRADE_COLUMNS)}) - "
+                             f"Basis aus Ticks über den Tick-Ingest erzeugen")
+        return data[column].to_numpy(dtype=np.float64)
+    volume = data['volume'].to_numpy(dtype=np.float64)
+    if kind == 'dollar':
+        return data['close'].to_numpy(dtype=np.float64) * volume
+    if kind == 'vol':
+        return volume
+    return data['high'].to_numpy(dtype=np.float64)
+
+def activity_segments(data, tf):
+    """Bar-Nummer pro Basis-Zeile für ein Aktivitäts-Kürzel (ein sequentieller Durchlauf)"""
+    kind, threshold = parse_activity_timeframe(tf)
+    high = data['high'].to_numpy(dtype=np.float64)
+    low = data['low'].to_numpy(dtype=np.float64)
+    measure = activity_measure(data, kind)
+    segment_func = _activity_segments_nb if NUMBA_RESAMPLE_AVAILABLE else _activity_segments
+    return segment_func(_ACTIVITY_KIND_CODES[kind], threshold, high, low, measure)
+
+def pandas_activity_bars(data, segments):
+    """Referenz/Fallback: groupby(Bar-Nummer).agg(first/max/min/last/sum), Label = erste Zeile"""
+    grouped = data[_OHLCV_COLUMNS].groupby(segments, sort=False).agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+    })
+    starts = np.flatnonzero(np.r_[True, segments[1:] != segments[:-1]])
+    grouped.index = data.index[starts[grouped.index.to_numpy()]]
+    return grouped.dropna()
+
+def build_activity_bars(data, tf):
+    """
+    📦 Aktivitäts-Bars eines Kürzels aus der Basis
+
+    Gleiches Format wie die Zeit-Bars (OHLCV, DatetimeIndex der Basis),
+    None für unbekannte Kürzel oder leere Daten.
+    """
+    if parse_activity_timeframe(tf) is None or data is None or data.empty:
+        return None
+    missing = [column for column in _OHLCV_COLUMNS if column not in data.columns]
+    if missing:
+        raise ValueError(f"{tf}: Spalten {missing} fehlen")
+    if not data.index.is_monotonic_increasing:
+        raise ValueError(f"{tf}: Basis ist nicht zeitlich sortiert")
+
+    segments = activity_segments(data, tf)
+    values = _kernel_inputs(data)
+    if values is None:
+        return pandas_activity_bars(data, segments)
+
+    # Bar-Nummer als Uhr, Schrittweite 1: jeder Bucket ist genau ein Aktivitäts-Bar
+    keys, *aggregated = _bucket_ohlcv_nb(segments, 0, 1, *values)
+    valid = np.ones(len(keys), dtype=np.bool_)
+    for out in aggregated:
+        if out.dtype.kind == 'f':
+            valid &= ~np.isnan(out)
+    starts = np.flatnonzero(np.r_[True, segments[1:] != segments[:-1]])
+    index = data.index[starts[keys[valid]]]
+    return pd.DataFrame({column: out[valid] for column, out in zip(_OHLCV_COLUMNS, aggregated)}, index=index)
+
+def activity_bars_tail(data, tf, last_bar):
+    """
+    🔁 Alle Aktivitäts-Bars ab last_bar (inklusive) neu, gelesen wird die Basis ab last_bar
+
+    Gibt (frame, rows_read) zurück, frame=None wenn last_bar keine Basis-Zeile ist.
+    """
+    last_bar = pd.Timestamp(last_bar)
+    if last_bar.tz is not None and data.index.tz is not None:
+        last_bar = last_bar.tz_convert(data.index.tz)
+    start = data.index.searchsorted(last_bar, side='left')
+    if start >= len(data) or data.index[start] != last_bar:
+        return None, 0
+    tail = data.iloc[start:]
+    return build_activity_bars(tail, tf), len(tail)
+
+def process_activity_bars(data, timeframes):
+    """📦 Alle Aktivitäts-Kürzel aus timeframes, je ein sequentieller Durchlauf über die Basis"""
+    results = {}
+    for tf in timeframes:
+        start = time.perf_counter()
+        try:
+            frame = build_activity_bars(data, tf)
+        except ValueError as e:
+            print(f"   ❌ {tf}: {e}")
+            frame = None
+        rows_out = len(frame) if frame is not None else 0
+        print(f"   📦 {tf:>4} ← Aktivität ({len(data):,} → {rows_out:,} Bars, {time.perf_counter() - start:.3f}s)")
+        results[tf] = frame if frame is not None and not frame.empty else None
+    return results
+# ▲ EMBED END
+
+def get_activity_bars_source():
+    """Liefert den einbettbaren Aktivitäts-Bar-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
+
+def main(argv=None):
+    import argparse
+    from punkt_column_store import is_column_store, open_column_store
+    from punkt_resample import frames_bit_identical
+
+    parser = argparse.ArgumentParser(description="Volumen-/Tick-/Range-/Dollar-Bars aus OHLCV-Daten bauen")
+    parser.add_argument('path', help="Column Store, Parquet oder HDF5 mit OHLCV-Daten")
+    parser.add_argument('--bars', nargs='+', default=['vol10000', 'tick1000', 'range10', 'dollar50M'])
+    parser.add_argument('--check', action='store_true', help="Kernel-Aggregation gegen Pandas groupby prüfen")
+    args = parser.parse_args(argv)
+
+    if is_column_store(args.path):
+        data = open_column_store(args.path)
+    elif args.path.endswith('.parquet'):
+        data = pd.read_parquet(args.path)
+    else:
+        data = pd.read_hdf(args.path)
+
+    print(f"📦 AKTIVITÄTS-BARS: {len(data):,} Basis-Zeilen, Numba {'aktiv' if NUMBA_RESAMPLE_AVAILABLE else 'nicht installiert'}")
+    failed = 0
+    for tf in args.bars:
+        if parse_activity_timeframe(tf) is None:
+            print(f"   ❌ {tf}: kein Aktivitäts-Kürzel (vol/tick/range/dollar + Schwelle)")
+            failed += 1
+            continue
+        start = time.perf_counter()
+        try:
+            frame = build_activity_bars(data, tf)
+        except ValueError as e:
+            print(f"   ❌ {tf}: {e}")
+            failed += 1
+            continue
+        seconds = time.perf_counter() - start
+        line = f"   📦 {tf:>12}: {len(frame):,} Bars ({seconds:.3f}s, Ø {len(data) / max(len(frame), 1):,.1f} Basis-Zeilen/Bar)"
+        if args.check:
+            identical = frames_bit_identical(frame, pandas_activity_bars(data, activity_segments(data, tf)))
+            failed += not identical
+            line += "  ✅ bit-identisch" if identical else "  ❌ ABWEICHUNG"
+        print(line)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+📚 PUNKT ASSET CATALOG - Persistenter Asset-Katalog pro Datenverzeichnis
+
+    historical_data/_asset_catalog.json
+        files: { "<datei>": {asset, path, size, mtime, rows, columns, dtypes,
+                             start, end, freq, file_size_mb} }
+
+Ein Rescan stat'et nur das Verzeichnis; geöffnet werden ausschließlich
+Dateien, deren Größe oder mtime sich geändert hat. Zeilen, Spalten,
+erster/letzter Zeitstempel und Frequenz liefert punkt_file_probe aus
+Header bzw. den ersten/letzten Zeilen - die Datei wird nie komplett gelesen.
+
+Die Asset-Nummerierung (index) folgt der Sortierung nach Dateiname und
+ist damit in GUI und generiertem Punkt1-Code identisch. Die generierten
+Punkt-Skripte betten den Block über get_asset_catalog_source() ein
+(inklusive der Probe-Schicht).
+"""
+
+from punkt_file_probe import probe_file, get_file_probe_source
+
+# ▼ EMBED START
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ASSET_CATALOG_FILE = '_asset_catalog.json'
+ASSET_CATALOG_VERSION = 1
+ASSET_CATALOG_EXTENSIONS = ('.h5',)
+
+def asset_catalog_path(directory):
+    return os.path.join(directory, ASSET_CATALOG_FILE)
+
+def asset_name_from_file(file_name):
+    """NQ_1m_data.h5 → NQ"""
+    return file_name.split('_')[0] if '_' in file_name else os.path.splitext(file_name)[0]
+
+def load_asset_catalog(directory):
+    """📋 Lädt den Katalog (nur JSON lesen - für sofortiges GUI-Füllen)"""
+    path = asset_catalog_path(directory)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                catalog = json.load(f)
+            if catalog.get('version') == ASSET_CATALOG_VERSION:
+                return catalog
+        except Exception as e:
+            print(f"⚠️ Asset-Katalog nicht lesbar, wird neu aufgebaut: {e}")
+    return {'version': ASSET_CATALOG_VERSION, 'files': {}}
+
+def save_asset_catalog(directory, catalog):
+    """📋 Schreibt den Katalog atomar"""
+    path = asset_catalog_path(directory)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def probe_asset_file(path):
+    """🔍 Katalog-Eintrag über die Probe-Schicht (CSV-Zeilen exakt gezählt, da gecacht)"""
+    entry = probe_file(path, exact_csv_rows=True)
+    entry['asset'] = asset_name_from_file(os.path.basename(path))
+    return entry
+
+def update_asset_catalog(directory, extensions=ASSET_CATALOG_EXTENSIONS, max_workers=4):
+    """
+    🔄 Inkrementeller Rescan: nur neue/geänderte Dateien werden geöffnet
+
+    Gibt (catalog, stats) zurück; stats enthält scanned/probed/removed/seconds.
+    """
+    scan_start = time.time()
+    catalog = load_asset_catalog(directory)
+    known = catalog.get('files', {})
+
+    current = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(extensions):
+                current[entry.name] = entry.stat()
+
+    files = {}
+    changed = []
+    for file_name, stat in current.items():
+        cached = known.get(file_name)
+        if cached and cached.get('size') == stat.st_size and cached.get('mtime') == stat.st_mtime:
+            files[file_name] = cached
+        else:
+            changed.append(file_name)
+
+    if changed:
+        paths = [os.path.join(directory, file_name) for file_name in changed]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for file_name, entry in zip(changed, executor.map(probe_asset_file, paths)):
+                files[file_name] = entry
+
+    removed = len(set(known) - set(current))
+    catalog = {'version': ASSET_CATALOG_VERSION, 'files': dict(sorted(files.items()))}
+    if changed or removed:
+        save_asset_catalog(directory, catalog)
+
+    stats = {'scanned': len(current), 'probed': len(changed), 'removed': removed,
+             'seconds': time.time() - scan_start}
+    return catalog, stats
+
+def catalog_assets(catalog, directory):
+    """📊 Asset-Sicht des Katalogs: {asset: info} mit stabiler 1-basierter Nummer"""
+    assets = {}
+    for i, (file_name, entry) in enumerate(sorted(catalog.get('files', {}).items()), 1):
+        info = dict(entry)
+        info.update({'file_name': file_name, 'file_path': os.path.join(directory, file_name), 'index': i})
+        assets[entry['asset']] = info
+    return assets
+# ▲ EMBED END
+
+def get_asset_catalog_source():
+    """Liefert den einbettbaren Asset-Katalog Code (samt Probe-Schicht) für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return get_file_probe_source() + '\n\n' + source[start:end].rstrip()
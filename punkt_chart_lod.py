@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+📉 PUNKT CHART LOD - Pixel-genaue OHLC-Dezimierung für Kerzen-Charts
+
+Statt jede Minute als eigene Kerze an Plotly zu geben, werden je k
+aufeinanderfolgende Bars zu einer OHLC-Kerze zusammengefasst
+(open=erste, high=max, low=min, close=letzte, volume=Summe), so dass
+höchstens eine Kerze pro CHART_PX_PER_CANDLE Pixel Chart-Breite entsteht.
+
+build_lod_candlestick() baut daraus einen Chart mit Detailstufen:
+
+    Übersicht   ältere Bars, einmal auf die Chart-Breite dezimiert
+    Detail      sichtbare Kerzen, per JS bei jedem Zoom aus dem
+                Voll-Auflösungs-Fenster neu aggregiert
+    Roh-Fenster die letzten CHART_FULL_RES_BARS Bars in voller Auflösung,
+                als base64-float64 im Layout (layout.meta.lod.raw)
+
+Die HTML-Datei enthält damit nie mehr als Übersicht + Roh-Fenster, egal
+wie lang die Historie ist. Die generierten Punkt-Skripte betten den Block
+zwischen den EMBED-Markern über get_chart_lod_source() ein.
+"""
+
+# ▼ EMBED START
+import os
+import base64
+import numpy as np
+import pandas as pd
+
+CHART_DEFAULT_WIDTH = 1400       # Pixel - Plotly-Standardbreite im Browser
+CHART_PX_PER_CANDLE = 3          # mindestens 3 Pixel pro Kerze (Docht + Körper)
+CHART_FULL_RES_BARS = 50_000     # Voll-Auflösungs-Fenster am Ende des Charts
+
+def chart_bucket_target(width_px=CHART_DEFAULT_WIDTH, px_per_candle=CHART_PX_PER_CANDLE):
+    """Maximale Kerzenzahl, die bei width_px noch unterscheidbar ist"""
+    return max(50, int(width_px // px_per_candle))
+
+def bars_per_calendar_day(index):
+    """📅 Echte Bar-Dichte (Bars pro Kalendertag) aus Zeilenzahl und Zeitspanne"""
+    if len(index) < 2:
+        return float(len(index))
+    span_days = (index[-1] - index[0]) / pd.Timedelta(days=1)
+    return len(index) / span_days if span_days > 0 else float(len(index))
+
+def estimate_window_bars(index, days):
+    """Erwartete Kerzen in einem Fenster von days Kalendertagen"""
+    return int(round(bars_per_calendar_day(index) * days))
+
+def decimate_ohlc(data, max_buckets, bucket_size=None):
+    """
+    📉 Fasst je bucket_size Bars zu einer OHLC-Kerze zusammen (vektorisiert, reduceat)
+
+    Ohne bucket_size wird k = ceil(len / max_buckets) gewählt. Index der
+    Kerze ist der Zeitstempel ihrer ersten Bar.
+    """
+    rows = len(data)
+    k = bucket_size or int(np.ceil(rows / max_buckets)) if rows else 1
+    if rows == 0 or k <= 1:
+        return data
+
+    starts = np.arange(0, rows, k)
+    ends = np.minimum(starts + k, rows) - 1
+    columns = {}
+    for column in data.columns:
+        values = data[column].to_numpy()
+        name = str(column).lower()
+        if name == 'open':
+            columns[column] = values[starts]
+        elif name == 'close':
+            columns[column] = values[ends]
+        elif name == 'high':
+            columns[column] = np.maximum.reduceat(values, starts)
+        elif name == 'low':
+            columns[column] = np.minimum.reduceat(values, starts)
+        elif name == 'volume':
+            columns[column] = np.add.reduceat(values, starts)
+    return pd.DataFrame(columns, index=data.index[starts])
+
+_LOD_POST_SCRIPT = """
+(function() {
+    var gd = document.getElementById('{plot_id}');
+    if (!gd || !gd.layout.meta || !gd.layout.meta.lod) { return; }
+    var lod = gd.layout.meta.lod;
+    var decode = function(b64) {
+        var bin = atob(b64), bytes = new Uint8Array(bin.length);
+        for (var i = 0; i < bin.length; i++) { bytes[i] = bin.charCodeAt(i); }
+        return new Float64Array(bytes.buffer);
+    };
+    var xs = decode(lod.raw.x), o = decode(lod.raw.open), h = decode(lod.raw.high),
+        l = decode(lod.raw.low), c = decode(lod.raw.close);
+    var toMs = function(v) {
+        if (typeof v === 'number') { return v; }
+        var s = String(v).replace(' ', 'T');
+        return Date.parse(/(Z|[+-]\\d\\d:?\\d\\d)$/.test(s) ? s : s.substring(0, 23) + 'Z');
+    };
+    var lowerBound = function(t) { var lo = 0, hi = xs.length; while (lo < hi) { var m = (lo + hi) >> 1; if (xs[m] < t) { lo = m + 1; } else { hi = m; } } return lo; };
+    var busy = false;
+    var update = function() {
+        if (busy) { return; }
+        var range = gd.layout.xaxis.range;
+        var i0 = 0, i1 = xs.length;
+        if (range && !gd.layout.xaxis.autorange) { i0 = lowerBound(toMs(range[0])); i1 = Math.min(xs.length, lowerBound(toMs(range[1])) + 1); }
+        i0 = Math.max(0, i0 - 1);
+        var k = Math.max(1, Math.ceil((i1 - i0) / lod.max_buckets));
+        var X = [], O = [], H = [], L = [], C = [];
+        for (var s = i0; s < i1; s += k) {
+            var e = Math.min(s + k, i1), hi = -Infinity, lw = Infinity;
+            for (var j = s; j < e; j++) { if (h[j] > hi) { hi = h[j]; } if (l[j] < lw) { lw = l[j]; } }
+            X.push(xs[s]); O.push(o[s]); H.push(hi); L.push(lw); C.push(c[e - 1]);
+        }
+        busy = true;
+        Plotly.restyle(gd, {x: [X], open: [O], high: [H], low: [L], close: [C],
+                            name: [lod.name + (k > 1 ? ' (' + k + ' Bars/Kerze)' : ' (volle Auflösung)')]}, [lod.detail_trace])
+            .then(function() { busy = false; }, function() { busy = false; });
+    };
+    gd.on('plotly_relayout', update);
+})();
+"""
+
+def _b64_float64(values):
+    return base64.b64encode(np.ascontiguousarray(values, dtype='<f8').tobytes()).decode('ascii')
+
+def build_lod_candlestick(go, data, name, width_px=CHART_DEFAULT_WIDTH, full_res_bars=CHART_FULL_RES_BARS):
+    """
+    📉 Kerzen-Chart mit Detailstufen (go = plotly.graph_objects)
+
+    Gibt (fig, post_script, info) zurück; post_script an fig.show()/
+    fig.write_html() übergeben, damit beim Zoom neu aggregiert wird.
+    """
+    max_buckets = chart_bucket_target(width_px)
+    rows = len(data)
+    k = max(1, int(np.ceil(rows / max_buckets)))
+
+    window_start = max(0, rows - full_res_bars)
+    history = data.iloc[:window_start]
+    window = data.iloc[window_start:]
+
+    fig = go.Figure()
+    if len(history):
+        overview = decimate_ohlc(history, max_buckets, bucket_size=k)
+        fig.add_trace(go.Candlestick(
+            x=overview.index, open=overview['open'], high=overview['high'],
+            low=overview['low'], close=overview['close'],
+            name=f"{name} (Übersicht, {k} Bars/Kerze)", opacity=0.6
+        ))
+    detail = decimate_ohlc(window, max_buckets, bucket_size=k)
+    fig.add_trace(go.Candlestick(
+        x=detail.index, open=detail['open'], high=detail['high'],
+        low=detail['low'], close=detail['close'],
+        name=f"{name}" + (f" ({k} Bars/Kerze)" if k > 1 else " (volle Auflösung)")
+    ))
+
+    # Zeitstempel als Wanduhr-Millisekunden (wie Plotly Datumsstrings ohne Zone anzeigt)
+    window_index = window.index.tz_localize(None) if window.index.tz is not None else window.index
+    raw = {'x': _b64_float64(window_index.as_unit('ms').asi8)}
+    for column in ('open', 'high', 'low', 'close'):
+        raw[column] = _b64_float64(window[column].to_numpy())
+    fig.update_layout(meta={'lod': {
+        'detail_trace': len(fig.data) - 1, 'max_buckets': max_buckets, 'name': name, 'raw': raw
+    }})
+
+    info = {
+        'bars': rows,
+        'candles': (len(history) + k - 1) // k + len(detail),
+        'bars_per_candle': k,
+        'full_res_bars': len(window),
+        'max_buckets': max_buckets,
+    }
+    return fig, _LOD_POST_SCRIPT, info
+# ▲ EMBED END
+
+def get_chart_lod_source():
+    """Liefert den einbettbaren Chart-LOD Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+🗜️ PUNKT CODECS - Mehrkern-Kompression für Punkt1/2/3 Artefakte
+
+Codec-Beschreibungen sind kleine Dicts, die so auch im Column-Store-Header
+landen:
+
+    {'codec': 'blosc2', 'cname': 'lz4'|'zstd', 'clevel': 5, 'shuffle': True}
+    {'codec': 'zstd', 'level': 3}
+
+Beide Backends komprimieren mit allen Kernen (CODEC_THREADS). Fehlt ein
+Paket, ist der Codec nicht verfügbar und die Stores bleiben unkomprimiert
+(memmap).
+
+Der Codec-Benchmark komprimiert eine Stichprobe der echten Daten mit jedem
+Codec und Level, misst Verhältnis, Encode- und Decode-MB/s und legt die
+beste Wahl für Lesezugriffe in punkt_codec_settings.json ab ('auto').
+
+    python punkt_codecs.py --codec-benchmark data/punkt1/NQ_1Jahr_PUNKT2_STORE_....cols
+
+Die generierten Punkt-Skripte betten den Block zwischen den EMBED-Markern
+zusammen mit dem Column Store ein (get_codecs_source()).
+"""
+
+# ▼ EMBED START
+import os
+import json
+import time
+import numpy as np
+
+try:
+    import blosc2
+    BLOSC2_AVAILABLE = True
+except ImportError:
+    BLOSC2_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CODEC_THREADS = os.cpu_count() or 1
+CODEC_SETTINGS_FILE = 'punkt_codec_settings.json'
+CODEC_FILE_SUFFIX = {'blosc2': '.b2', 'zstd': '.zst'}
+CODEC_BENCHMARK_ROWS = 1_000_000
+
+# Namen für GUI/Konfiguration → Codec-Beschreibung
+CODEC_PRESETS = {
+    'blosc2-lz4': {'codec': 'blosc2', 'cname': 'lz4', 'clevel': 5, 'shuffle': True},
+    'blosc2-zstd': {'codec': 'blosc2', 'cname': 'zstd', 'clevel': 5, 'shuffle': True},
+    'zstd': {'codec': 'zstd', 'level': 3},
+}
+
+def codec_label(spec):
+    """Kurzname für Ausgaben, z.B. blosc2-zstd:5-shuffle"""
+    if not spec:
+        return 'none'
+    if spec['codec'] == 'blosc2':
+        return f"blosc2-{spec['cname']}:{spec['clevel']}" + ('-shuffle' if spec.get('shuffle') else '')
+    return f"zstd:{spec['level']}"
+
+def codec_available(spec):
+    if not spec:
+        return True
+    return {'blosc2': BLOSC2_AVAILABLE, 'zstd': ZSTD_AVAILABLE}.get(spec.get('codec'), False)
+
+def candidate_codecs():
+    """Alle verfügbaren Codec/Level-Kombinationen für den Benchmark"""
+    specs = []
+    if BLOSC2_AVAILABLE:
+        for cname, levels in (('lz4', (1, 5, 9)), ('zstd', (1, 3, 5, 9))):
+            for clevel in levels:
+                for shuffle in (True, False):
+                    specs.append({'codec': 'blosc2', 'cname': cname, 'clevel': clevel, 'shuffle': shuffle})
+    if ZSTD_AVAILABLE:
+        for level in (1, 3, 9, 15):
+            specs.append({'codec': 'zstd', 'level': level})
+    return specs
+
+def compress_array(values, spec):
+    """🗜️ 1D-Array → komprimierte Bytes (mehrere Threads)"""
+    values = np.ascontiguousarray(values)
+    if spec['codec'] == 'blosc2':
+        cparams = {
+            'codec': blosc2.Codec.ZSTD if spec['cname'] == 'zstd' else blosc2.Codec.LZ4,
+            'clevel': spec['clevel'],
+            'filters': [blosc2.Filter.SHUFFLE if spec.get('shuffle') else blosc2.Filter.NOFILTER],
+            'nthreads': CODEC_THREADS,
+        }
+        return blosc2.pack_tensor(values, cparams=cparams)
+    if spec['codec'] == 'zstd':
+        return zstandard.ZstdCompressor(level=spec['level'], threads=CODEC_THREADS).compress(values.data)
+    raise ValueError(f"Unbekannter Codec: {spec}")
+
+def decompress_array(blob, dtype, rows, spec):
+    """📤 Komprimierte Bytes → beschreibbares 1D-Array mit rows Werten"""
+    if spec['codec'] == 'blosc2':
+        blosc2.set_nthreads(CODEC_THREADS)
+        values = blosc2.unpack_tensor(blob)
+        return values.view(np.dtype(dtype)).reshape(rows)
+    if spec['codec'] == 'zstd':
+        out = np.empty(rows, dtype=np.dtype(dtype))
+        target = memoryview(out).cast('B')
+        with zstandard.ZstdDecompressor().stream_reader(blob) as reader:
+            filled = 0
+            while filled < len(target):
+                read = reader.readinto(target[filled:])
+                if not read:
+                    raise ValueError("Komprimierte Spalte ist unvollständig")
+                filled += read
+        return out
+    raise ValueError(f"Unbekannter Codec: {spec}")
+
+def load_codec_settings(path=CODEC_SETTINGS_FILE):
+    """📋 Gespeicherte Codec-Wahl (aus dem Benchmark) oder leeres Dict"""
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Codec-Einstellungen nicht lesbar: {e}")
+    return {}
+
+def save_codec_settings(settings, path=CODEC_SETTINGS_FILE):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def resolve_codec_spec(name):
+    """
+    'none' → None (memmap), 'auto' → Benchmark-Wahl aus den Einstellungen,
+    sonst ein Preset aus CODEC_PRESETS. Nicht verfügbare Codecs → None.
+    """
+    if not name or name == 'none':
+        return None
+    if name == 'auto':
+        spec = load_codec_settings().get('read_codec')
+        if spec is None:
+            spec = CODEC_PRESETS['blosc2-lz4'] if BLOSC2_AVAILABLE else (CODEC_PRESETS['zstd'] if ZSTD_AVAILABLE else None)
+    else:
+        spec = CODEC_PRESETS.get(name)
+        if spec is None:
+            print(f"⚠️ Unbekannter Codec '{name}' - speichere unkomprimiert")
+    if spec is not None and not codec_available(spec):
+        print(f"⚠️ Codec {codec_label(spec)} nicht installiert - speichere unkomprimiert")
+        return None
+    return dict(spec) if spec else None
+
+def benchmark_codecs(data, specs=None, sample_rows=CODEC_BENCHMARK_ROWS, repeats=3):
+    """
+    📊 Komprimiert eine Stichprobe (letzte sample_rows Zeilen, Index + Spalten)
+    mit jedem Codec und misst Verhältnis, Encode- und Decode-MB/s (Bestwert aus repeats)
+    """
+    sample = data.iloc[-sample_rows:] if len(data) > sample_rows else data
+    arrays = [sample.index.asi8] + [sample[column].to_numpy() for column in sample.columns]
+    arrays = [np.ascontiguousarray(values) for values in arrays if values.dtype.kind in 'fiub']
+    raw_bytes = sum(values.nbytes for values in arrays)
+    raw_mb = raw_bytes / (1024 * 1024)
+
+    results = []
+    for spec in specs or candidate_codecs():
+        encode_s = decode_s = float('inf')
+        blobs = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            blobs = [compress_array(values, spec) for values in arrays]
+            encode_s = min(encode_s, time.perf_counter() - start)
+            start = time.perf_counter()
+            for blob, values in zip(blobs, arrays):
+                decompress_array(blob, values.dtype, len(values), spec)
+            decode_s = min(decode_s, time.perf_counter() - start)
+        packed = sum(len(blob) for blob in blobs)
+        results.append({
+            'codec': spec,
+            'label': codec_label(spec),
+            'ratio': round(raw_bytes / packed, 3) if packed else None,
+            'encode_mb_s': round(raw_mb / encode_s, 1) if encode_s else None,
+            'decode_mb_s': round(raw_mb / decode_s, 1) if decode_s else None,
+        })
+    return results, {'rows': len(sample), 'raw_mb': round(raw_mb, 2), 'threads': CODEC_THREADS}
+
+def pick_read_codec(results, ratio_tolerance=0.8):
+    """
+    🏆 Beste Wahl für Lesezugriffe: höchste Decode-Rate unter den Codecs,
+    die mindestens ratio_tolerance des besten Kompressionsverhältnisses erreichen
+    """
+    valid = [r for r in results if r['ratio'] and r['decode_mb_s']]
+    if not valid:
+        return None
+    best_ratio = max(r['ratio'] for r in valid)
+    shortlist = [r for r in valid if r['ratio'] >= best_ratio * ratio_tolerance]
+    return max(shortlist, key=lambda r: r['decode_mb_s'])
+
+def run_codec_benchmark(data, save=True, sample_rows=CODEC_BENCHMARK_ROWS):
+    """📊 Benchmark ausgeben und die beste Lese-Wahl in den Einstellungen speichern"""
+    print("\n🗜️ CODEC-BENCHMARK")
+    print("=" * 60)
+    if not (BLOSC2_AVAILABLE or ZSTD_AVAILABLE):
+        print("⚠️ Weder blosc2 noch zstandard installiert - pip install blosc2 zstandard")
+        return None
+
+    results, sample_info = benchmark_codecs(data, sample_rows=sample_rows)
+    print(f"📊 Stichprobe: {sample_info['rows']:,} Zeilen, {sample_info['raw_mb']:.1f} MB, {sample_info['threads']} Threads")
+    print(f"\n{'Codec':<26} {'Ratio':>7} {'Encode MB/s':>12} {'Decode MB/s':>12}")
+    print("-" * 60)
+    for r in sorted(results, key=lambda r: -r['decode_mb_s']):
+        print(f"{r['label']:<26} {r['ratio']:>7.2f} {r['encode_mb_s']:>12.1f} {r['decode_mb_s']:>12.1f}")
+
+    best = pick_read_codec(results)
+    if best:
+        print(f"\n🏆 Beste Wahl für Lesezugriffe: {best['label']} "
+              f"({best['ratio']:.2f}x, {best['decode_mb_s']:.0f} MB/s Decode)")
+    if save and best:
+        settings = load_codec_settings()
+        settings.update({
+            'read_codec': best['codec'],
+            'benchmark': {'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'sample': sample_info, 'results': results}
+        })
+        save_codec_settings(settings)
+        print(f"💾 Gespeichert in {CODEC_SETTINGS_FILE} (Kompression 'auto')")
+    return best
+# ▲ EMBED END
+
+def get_codecs_source():
+    """Liefert den einbettbaren Codec-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
+
+def main(argv=None):
+    import argparse
+    import pandas as pd
+    from punkt_column_store import is_column_store, open_column_store
+
+    parser = argparse.ArgumentParser(description="Codec-Benchmark auf echten OHLCV-Daten")
+    parser.add_argument('--codec-benchmark', dest='path', required=True,
+                        help="Column Store, Parquet, HDF5 oder CSV mit OHLCV-Daten")
+    parser.add_argument('--rows', type=int, default=CODEC_BENCHMARK_ROWS, help="Größe der Stichprobe")
+    parser.add_argument('--no-save', action='store_true', help="Ergebnis nicht in den Einstellungen speichern")
+    args = parser.parse_args(argv)
+
+    if is_column_store(args.path):
+        data = open_column_store(args.path)
+    elif args.path.endswith('.parquet'):
+        data = pd.read_parquet(args.path)
+    elif args.path.endswith('.csv'):
+        data = pd.read_csv(args.path, index_col=0, parse_dates=True)
+    else:
+        data = pd.read_hdf(args.path)
+    return 0 if run_codec_benchmark(data, save=not args.no_save, sample_rows=args.rows) else 1
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
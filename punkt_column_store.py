@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+💾 PUNKT COLUMN STORE - Memory-mapped OHLCV Spalten-Speicher
+Gemeinsames Rohformat für Punkt1, Punkt2 und Punkt3:
+
+    <name>.cols/
+        header.json        - Zeilen, Spalten, dtypes, Zeitzone, Metadaten
+        index.bin          - int64 Nanosekunden-Zeitstempel (UTC)
+        00_open.bin ...    - eine zusammenhängende Datei pro Feld
+
+Geöffnet wird mit np.memmap, die Arrays werden ohne Kopie in einen
+DataFrame gelegt. Optional speichert der Tick-Codec Preise als int32
+Tick-Anzahl relativ zu einem Basispreis (Tick-Größe im Header) und
+dekodiert beim Öffnen exakt zurück nach float64. Ein 50M-Bar Store öffnet in Millisekunden, RSS wächst
+nur mit den tatsächlich gelesenen Seiten, und mehrere Punkt2/Punkt3
+Prozesse teilen sich denselben Page-Cache.
+
+Mit compression (siehe punkt_codecs) werden Index und Spalten beim
+Schließen mehrkernig komprimiert (blosc2/zstd, Codec im Header) und beim
+Öffnen dekomprimiert statt gemappt.
+
+Die generierten Punkt-Skripte sind eigenständig - die Code-Generatoren
+betten den Block zwischen den EMBED-Markern über get_column_store_source()
+ein (inklusive der Codecs aus punkt_codecs).
+"""
+
+from punkt_codecs import compress_array, decompress_array, CODEC_FILE_SUFFIX, get_codecs_source
+
+# ▼ EMBED START
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+COLUMN_STORE_EXT = '.cols'
+COLUMN_STORE_HEADER = 'header.json'
+COLUMN_STORE_INDEX = 'index.bin'
+COLUMN_STORE_VERSION = 1
+
+def is_column_store(path):
+    """Prüft ob ein Pfad ein Column Store Verzeichnis ist"""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, COLUMN_STORE_HEADER))
+
+def read_column_store_header(path):
+    """📋 Liest nur den JSON-Header (keine Daten)"""
+    with open(os.path.join(path, COLUMN_STORE_HEADER), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def column_store_size_bytes(path):
+    """💾 Gesamtgröße aller Dateien eines Column Stores"""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+# 🎯 TICK-CODEC - Preise als int32 Ticks ab Basispreis (verlustfrei)
+TICK_CODEC_COLUMNS = ('open', 'high', 'low', 'close')
+TICK_NAN = np.iinfo(np.int32).min
+
+def make_tick_codec(tick_size, reference_price):
+    """Codec-Beschreibung für den Header; Basis = Referenzpreis auf dem Raster"""
+    tick_size = float(tick_size)
+    codec = {'type': 'tick', 'tick_size': tick_size}
+    scale = int(round(1.0 / tick_size))
+    if scale > 0 and 1.0 / scale == tick_size:
+        # Division durch eine ganze Zahl ist korrekt gerundet - dekodiert bitgenau wie geparste Dezimalpreise
+        codec['scale'] = scale
+    codec['base_ticks'] = int(_to_ticks(np.array([reference_price], dtype=np.float64), codec)[0])
+    return codec
+
+def _to_ticks(values, codec):
+    if 'scale' in codec:
+        return np.rint(values * codec['scale'])
+    return np.rint(values / codec['tick_size'])
+
+def _from_ticks(ticks, codec):
+    if 'scale' in codec:
+        return ticks / codec['scale']
+    return ticks * codec['tick_size']
+
+def off_tick_grid_mask(values, tick_size):
+    """🎯 Markiert Preise, die nicht exakt auf dem Tick-Raster liegen (NaN zählt nicht)"""
+    values = np.asarray(values, dtype=np.float64)
+    codec = make_tick_codec(tick_size, 0.0)
+    return ~np.isnan(values) & (_from_ticks(_to_ticks(values, codec), codec) != values)
+
+def encode_ticks(values, codec):
+    """float64 → int32 Ticks relativ zu base_ticks (ValueError wenn nicht verlustfrei)"""
+    values = np.asarray(values, dtype=np.float64)
+    nan_mask = np.isnan(values)
+    ticks = _to_ticks(values, codec)
+    off_grid = ~nan_mask & (_from_ticks(ticks, codec) != values)
+    if off_grid.any():
+        raise ValueError(f"{int(off_grid.sum()):,} Preise nicht auf dem Tick-Raster {codec['tick_size']}")
+    relative = ticks - codec['base_ticks']
+    relative[nan_mask] = 0
+    if relative.size and (relative.min() <= TICK_NAN or relative.max() > np.iinfo(np.int32).max):
+        raise ValueError("Preisspanne passt nicht in int32 Ticks")
+    encoded = relative.astype(np.int32)
+    encoded[nan_mask] = TICK_NAN
+    return encoded
+
+def decode_ticks(raw, codec):
+    """int32 Ticks → exakte float64 Preise"""
+    decoded = _from_ticks(raw.astype(np.float64) + codec['base_ticks'], codec)
+    decoded[raw == TICK_NAN] = np.nan
+    return decoded
+
+def _column_file_name(position, column):
+    safe = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in str(column))
+    return f"{position:02d}_{safe}.bin"
+
+class ColumnStoreWriter:
+    """
+    💾 Schreibt einen Column Store blockweise (konstanter Speicher)
+
+    Jeder append() hängt die Bytes direkt an die Spaltendateien an,
+    close() schreibt den Header und verschiebt den Store atomar ans Ziel.
+    """
+
+    def __init__(self, path, metadata=None, tick_size=None, compression=None):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.metadata = metadata or {}
+        self.tick_size = tick_size
+        self.compression = compression
+        self.rows = 0
+        self.columns = None
+        self.tz = None
+        self.index_name = None
+        self.first_ns = None
+        self.last_ns = None
+        self._index_handle = None
+        self._handles = []
+
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+
+    def _open(self, chunk):
+        self.tz = str(chunk.index.tz) if chunk.index.tz is not None else None
+        self.index_name = chunk.index.name
+        self._index_handle = open(os.path.join(self.tmp_path, COLUMN_STORE_INDEX), 'wb')
+
+        self.columns = []
+        for position, column in enumerate(chunk.columns):
+            dtype = chunk[column].to_numpy().dtype
+            if dtype.kind not in 'fiub':
+                raise ValueError(f"Spalte '{column}' ist nicht numerisch ({dtype})")
+            dtype = dtype.newbyteorder('<')
+            file_name = _column_file_name(position, column)
+            entry = {'name': str(column), 'file': file_name, 'dtype': dtype.str}
+            if self.tick_size and dtype.kind == 'f' and str(column).lower() in TICK_CODEC_COLUMNS:
+                values = chunk[column].to_numpy()
+                valid = values[~np.isnan(values)]
+                entry['codec'] = make_tick_codec(self.tick_size, valid[0] if len(valid) else 0.0)
+                entry['codec']['decoded_dtype'] = dtype.str
+                entry['dtype'] = np.dtype('<i4').str
+            self.columns.append(entry)
+            self._handles.append(open(os.path.join(self.tmp_path, file_name), 'wb'))
+
+    def append(self, chunk):
+        """Hängt einen DataFrame-Block an (Index muss nach dem letzten Block beginnen)"""
+        if len(chunk) == 0:
+            return
+        if not isinstance(chunk.index, pd.DatetimeIndex):
+            raise ValueError("Column Store benötigt einen DatetimeIndex")
+        if self.columns is None:
+            self._open(chunk)
+        if [str(c) for c in chunk.columns] != [c['name'] for c in self.columns]:
+            raise ValueError(f"Spalten passen nicht zum Store: {list(chunk.columns)}")
+
+        index = chunk.index.as_unit('ns') if hasattr(chunk.index, 'as_unit') else chunk.index
+        index_ns = index.asi8
+        if self.last_ns is not None and index_ns[0] <= self.last_ns:
+            raise ValueError(f"Block überlappt den Store: {chunk.index[0]} <= letzter Zeitstempel")
+
+        encoded = [_encode_column(column, chunk[column['name']].to_numpy()) for column in self.columns]
+        np.ascontiguousarray(index_ns, dtype='<i8').tofile(self._index_handle)
+        for values, handle in zip(encoded, self._handles):
+            values.tofile(handle)
+
+        if self.first_ns is None:
+            self.first_ns = int(index_ns[0])
+        self.last_ns = int(index_ns[-1])
+        self.rows += len(chunk)
+
+    def _close_handles(self):
+        for handle in [self._index_handle] + self._handles:
+            if handle is not None:
+                handle.close()
+        self._index_handle = None
+        self._handles = []
+
+    def abort(self):
+        """Verwirft den unfertigen Store"""
+        self._close_handles()
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+    def close(self):
+        """Schreibt den Header und veröffentlicht den Store atomar"""
+        self._close_handles()
+        if self.columns is None:
+            self.abort()
+            raise ValueError("Column Store ohne Daten")
+
+        index_entry = {'file': COLUMN_STORE_INDEX, 'dtype': '<i8', 'unit': 'ns', 'tz': self.tz, 'name': self.index_name}
+        if self.compression and self.rows:
+            # Spalte für Spalte komprimieren - Spitzenspeicher = eine Spalte
+            for entry in [index_entry] + self.columns:
+                _compress_column_file(self.tmp_path, entry, self.rows, self.compression)
+
+        header = {
+            'version': COLUMN_STORE_VERSION,
+            'rows': self.rows,
+            'index': index_entry,
+            'columns': self.columns,
+            'start': str(_ns_to_timestamp(self.first_ns, self.tz)) if self.rows else None,
+            'end': str(_ns_to_timestamp(self.last_ns, self.tz)) if self.rows else None,
+            'metadata': self.metadata
+        }
+        # Header zuletzt - erst damit ist der Store vollständig
+        with open(os.path.join(self.tmp_path, COLUMN_STORE_HEADER), 'w', encoding='utf-8') as f:
+            json.dump(header, f, indent=2, default=str)
+
+        if os.path.exists(self.path):
+            old_path = self.path + '.old'
+            shutil.rmtree(old_path, ignore_errors=True)
+            os.replace(self.path, old_path)
+            os.replace(self.tmp_path, self.path)
+            shutil.rmtree(old_path, ignore_errors=True)
+        else:
+            os.replace(self.tmp_path, self.path)
+
+        return header
+
+def _compressed_file_name(file_name, spec):
+    return file_name.split('.bin')[0] + '.bin' + CODEC_FILE_SUFFIX[spec['codec']]
+
+def _compress_column_file(path, entry, rows, spec):
+    """Ersetzt eine rohe Spaltendatei durch ihre komprimierte Fassung (Header-Eintrag wird angepasst)"""
+    raw_path = os.path.join(path, entry['file'])
+    values = np.fromfile(raw_path, dtype=entry['dtype'], count=rows)
+    file_name = _compressed_file_name(entry['file'], spec)
+    with open(os.path.join(path, file_name), 'wb') as f:
+        f.write(compress_array(values, spec))
+    if file_name != entry['file']:
+        os.remove(raw_path)
+    entry['file'] = file_name
+    entry['compression'] = dict(spec)
+
+def _encode_column(column, values):
+    """Prüft dtype bzw. Tick-Raster und liefert die zu schreibenden Bytes"""
+    if 'codec' in column:
+        try:
+            return encode_ticks(values, column['codec'])
+        except ValueError as e:
+            raise ValueError(f"Spalte '{column['name']}': {e}")
+    dtype = np.dtype(column['dtype'])
+    if not np.can_cast(values.dtype, dtype, casting='same_kind'):
+        raise ValueError(f"Spalte '{column['name']}': {values.dtype} passt nicht zu {dtype}")
+    return np.ascontiguousarray(values, dtype=dtype)
+
+def _ns_to_timestamp(value_ns, tz):
+    timestamp = pd.Timestamp(value_ns, unit='ns')
+    return timestamp.tz_localize('UTC').tz_convert(tz) if tz else timestamp
+
+def write_column_store(data, path, metadata=None, tick_size=None, compression=None):
+    """
+    💾 Schreibt einen DataFrame als Column Store (atomar über temporäres Verzeichnis)
+
+    Index muss ein DatetimeIndex sein, Spalten numerisch oder bool.
+    Mit tick_size werden open/high/low/close als int32 Ticks gespeichert,
+    mit compression (Codec-Dict aus punkt_codecs) alle Dateien komprimiert.
+    """
+    if not isinstance(data.index, pd.DatetimeIndex):
+        raise ValueError("Column Store benötigt einen DatetimeIndex")
+
+    writer = ColumnStoreWriter(path, metadata, tick_size=tick_size, compression=compression)
+    try:
+        if len(data) == 0:
+            writer._open(data)
+        writer.append(data)
+        return writer.close()
+    except Exception:
+        writer.abort()
+        raise
+
+def _write_header_atomic(path, header):
+    tmp_header = os.path.join(path, COLUMN_STORE_HEADER + '.tmp')
+    with open(tmp_header, 'w', encoding='utf-8') as f:
+        json.dump(header, f, indent=2, default=str)
+    os.replace(tmp_header, os.path.join(path, COLUMN_STORE_HEADER))
+
+def append_to_column_store(path, data, metadata_update=None, replace_last=0):
+    """
+    ➕ Hängt neue Zeilen in-place an einen bestehenden Column Store an
+
+    Die Naht wird geprüft (streng nach dem letzten Zeitstempel, keine Duplikate,
+    gleiche Spalten/dtypes). Der Header wird erst nach den Daten atomar ersetzt -
+    bricht ein Append ab, schneidet der nächste die überzähligen Bytes wieder ab.
+    replace_last verwirft vorher die letzten n Zeilen (z.B. einen unfertigen Bar).
+    """
+    header = read_column_store_header(path)
+    if len(data) == 0 and not replace_last:
+        return header
+    if not isinstance(data.index, pd.DatetimeIndex):
+        raise ValueError("Column Store benötigt einen DatetimeIndex")
+    if [str(c) for c in data.columns] != [c['name'] for c in header['columns']]:
+        raise ValueError(f"Spalten passen nicht zum Store: {list(data.columns)}")
+
+    index = data.index.as_unit('ns') if hasattr(data.index, 'as_unit') else data.index
+    index_ns = index.asi8
+    if len(index_ns) > 1 and not (np.diff(index_ns) > 0).all():
+        raise ValueError("Neue Zeilen sind nicht streng aufsteigend (Duplikate oder unsortiert)")
+
+    index_entry = header['index']
+    if not 0 <= replace_last <= header['rows']:
+        raise ValueError(f"replace_last={replace_last} außerhalb des Stores ({header['rows']} Zeilen)")
+    stored_rows = header['rows']
+    rows = stored_rows - replace_last
+    last_ns = int(_load_array(path, index_entry, stored_rows, 'r')[rows - 1]) if rows else None
+    if last_ns is not None and len(index_ns) and index_ns[0] <= last_ns:
+        raise ValueError(f"Naht-Fehler: {data.index[0]} überlappt den Store (Ende {_ns_to_timestamp(last_ns, index_entry.get('tz'))})")
+
+    arrays = [(index_entry, np.ascontiguousarray(index_ns, dtype='<i8'))]
+    for column in header['columns']:
+        arrays.append((column, _encode_column(column, data[column['name']].to_numpy())))
+
+    if replace_last and not any('compression' in entry for entry, _ in arrays):
+        # Erst den Header kürzen: bricht das Schreiben ab, fehlt nur der ersetzte Bar
+        _write_header_atomic(path, dict(header, rows=rows, start=header['start'] if rows else None,
+                                        end=str(_ns_to_timestamp(last_ns, index_entry.get('tz'))) if rows else None))
+
+    for entry, values in arrays:
+        file_path = os.path.join(path, entry['file'])
+        if 'compression' in entry:
+            # Komprimierte Datei: alt + neu neu komprimieren, atomar ersetzen
+            combined = np.concatenate([_load_array(path, entry, stored_rows, 'r')[:rows], values])
+            with open(file_path + '.tmp', 'wb') as handle:
+                handle.write(compress_array(combined, entry['compression']))
+            os.replace(file_path + '.tmp', file_path)
+            continue
+        with open(file_path, 'r+b') as handle:
+            handle.truncate(rows * np.dtype(entry['dtype']).itemsize)  # Reste eines abgebrochenen Appends entfernen
+            handle.seek(0, os.SEEK_END)
+            values.tofile(handle)
+
+    header['rows'] = rows + len(data)
+    if header['rows'] == 0:
+        header['start'] = header['end'] = None
+    elif len(data) == 0:
+        header['end'] = str(_ns_to_timestamp(last_ns, index_entry.get('tz')))
+    else:
+        if header.get('start') is None or rows == 0:
+            header['start'] = str(data.index[0])
+        header['end'] = str(data.index[-1])
+    if metadata_update:
+        header.setdefault('metadata', {}).update(metadata_update)
+    _write_header_atomic(path, header)
+    return header
+
+def _load_array(path, entry, rows, mode):
+    """Spaltendatei → Array: memmap (roh) oder dekomprimiert (compression im Header)"""
+    if rows == 0:
+        return np.empty(0, dtype=entry['dtype'])
+    file_path = os.path.join(path, entry['file'])
+    if 'compression' in entry:
+        with open(file_path, 'rb') as f:
+            return decompress_array(f.read(), entry['dtype'], rows, entry['compression'])
+    return np.memmap(file_path, dtype=entry['dtype'], mode=mode, shape=(rows,))
+
+def _wrap_datetime_index(raw, tz, name):
+    """Legt einen DatetimeIndex über die int64-Werte (ohne Kopie)"""
+    values = raw.view('M8[ns]')
+    if not tz:
+        return pd.DatetimeIndex(values, name=name, copy=False)
+    try:
+        utc_values = pd.arrays.DatetimeArray._simple_new(values, dtype=pd.DatetimeTZDtype('ns', 'UTC'))
+        return pd.DatetimeIndex(utc_values, name=name, copy=False).tz_convert(tz)
+    except Exception:
+        return pd.DatetimeIndex(values, name=name).tz_localize('UTC').tz_convert(tz)
+
+def open_column_store(path, columns=None, mode='c'):
+    """
+    ⚡ Öffnet einen Column Store als DataFrame über np.memmap (zero-copy)
+
+    mode='c' (copy-on-write): gelesene Seiten bleiben im geteilten Page-Cache,
+    Schreibzugriffe landen nur im privaten Speicher des Prozesses.
+    Tick-kodierte Spalten werden beim Öffnen nach float64 dekodiert (Kopie),
+    komprimierte Spalten mehrkernig dekomprimiert.
+    """
+    header = read_column_store_header(path)
+    rows = header['rows']
+
+    index_info = header['index']
+    raw_index = _load_array(path, index_info, rows, mode)
+    index = _wrap_datetime_index(raw_index, index_info.get('tz'), index_info.get('name'))
+
+    arrays = {}
+    for column in header['columns']:
+        if columns is not None and column['name'] not in columns:
+            continue
+        raw = _load_array(path, column, rows, mode)
+        arrays[column['name']] = decode_ticks(raw, column['codec']) if 'codec' in column else raw
+
+    return pd.DataFrame(arrays, index=index, copy=False)
+# ▲ EMBED END
+
+def get_column_store_source():
+    """Liefert den einbettbaren Column Store Code (samt Codecs) für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return get_codecs_source() + '\n\n' + source[start:end].rstrip()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+🔬 PUNKT DATA QUALITY - Bar-Abstände, Lücken und Datenqualität
+
+Ein Numba-Durchlauf über die int64-Zeitstempel liefert den modalen
+Bar-Abstand, ein Lücken-Histogramm (Vielfache des Abstands in
+Zweierpotenz-Klassen) und die größten Lücken. Punkt1 schreibt das
+Ergebnis als 'bar_profile' in die Metadaten - spätere Stufen lesen es
+dort statt die Frequenz erneut zu erkennen.
+
+validate_ohlcv() prüft Duplikate, Sortierung, OHLC-Verletzungen,
+ungültige Preise, Volumen-Spitzen und fehlende Bars innerhalb der
+Handelszeiten (SESSION_TEMPLATES) und repariert auf Wunsch.
+
+Die generierten Punkt-Skripte betten den Block zwischen den EMBED-Markern
+über get_data_quality_source() ein.
+"""
+
+# ▼ EMBED START
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_QUALITY_AVAILABLE = True
+except ImportError:
+    NUMBA_QUALITY_AVAILABLE = False
+
+BAR_PROFILE_SAMPLE = 10000      # Deltas für die Schätzung des modalen Abstands
+BAR_PROFILE_TOP_GAPS = 10       # Anzahl der gemeldeten größten Lücken
+_GAP_BUCKETS = 24               # Klasse k: Lücke von 2^k bis 2^(k+1)-1 Bars
+NUMBA_MIN_ROWS = 1_000_000      # darunter ist NumPy schneller als der JIT-Compile
+
+def _gap_scan_py(ts, base, top_k):
+    deltas = np.diff(ts)
+    regular = int((deltas == base).sum())
+    duplicates = int((deltas == 0).sum())
+    backwards = int((deltas < 0).sum())
+    gap_mask = deltas > base
+    ratios = deltas[gap_mask] // base
+    buckets = np.minimum(np.log2(np.maximum(ratios, 1)).astype(np.int64), _GAP_BUCKETS - 1)
+    histogram = np.bincount(buckets, minlength=_GAP_BUCKETS).astype(np.int64)
+    gap_positions = np.flatnonzero(gap_mask)
+    order = np.argsort(deltas[gap_positions])[::-1][:top_k]
+    top_pos = gap_positions[order].astype(np.int64)
+    return regular, duplicates, backwards, histogram, top_pos, deltas[top_pos]
+
+if NUMBA_QUALITY_AVAILABLE:
+    @njit(nogil=True, cache=True)
+    def _gap_scan_nb(ts, base, top_k):
+        histogram = np.zeros(_GAP_BUCKETS, dtype=np.int64)
+        top_pos = np.full(top_k, -1, dtype=np.int64)
+        top_delta = np.zeros(top_k, dtype=np.int64)
+        regular = 0
+        duplicates = 0
+        backwards = 0
+        for i in range(1, ts.shape[0]):
+            delta = ts[i] - ts[i - 1]
+            if delta == base:
+                regular += 1
+            elif delta > base:
+                ratio = delta // base
+                bucket = 0
+                while ratio > 1 and bucket < _GAP_BUCKETS - 1:
+                    ratio >>= 1
+                    bucket += 1
+                histogram[bucket] += 1
+                if delta > top_delta[top_k - 1]:
+                    # Einfügen in die absteigend sortierte Top-Liste
+                    j = top_k - 1
+                    while j > 0 and top_delta[j - 1] < delta:
+                        top_delta[j] = top_delta[j - 1]
+                        top_pos[j] = top_pos[j - 1]
+                        j -= 1
+                    top_delta[j] = delta
+                    top_pos[j] = i - 1
+            elif delta == 0:
+                duplicates += 1
+            elif delta < 0:
+                backwards += 1
+        valid = top_pos >= 0
+        return regular, duplicates, backwards, histogram, top_pos[valid], top_delta[valid]
+
+def spacing_to_freq(spacing_ns):
+    """Bar-Abstand (ns) → Frequenz-String im Punkt-Stil (30s, 1min, 90s, 90min, 500ms, 1D) - exakt, ohne Abrunden"""
+    freq = pd.tseries.frequencies.to_offset(pd.Timedelta(int(spacing_ns), unit='ns')).freqstr
+    return freq if freq[0].isdigit() else f"1{freq}"
+
+def modal_spacing_ns(ts, sample=BAR_PROFILE_SAMPLE):
+    """Modaler positiver Abstand aus einer gleichmäßigen Stichprobe der Deltas"""
+    if ts.shape[0] < 2:
+        return 0
+    step = max((ts.shape[0] - 1) // sample, 1)
+    positions = np.arange(1, ts.shape[0], step)
+    deltas = ts[positions] - ts[positions - 1]
+    deltas = deltas[deltas > 0]
+    if deltas.shape[0] == 0:
+        return 0
+    values, counts = np.unique(deltas, return_counts=True)
+    return int(values[np.argmax(counts)])
+
+def _bucket_label(bucket):
+    low = 1 << bucket
+    high = (1 << (bucket + 1)) - 1
+    return f"{low}x" if low == high else f"{low}-{high}x"
+
+_BAR_PROFILE_CACHE = {}
+_BAR_PROFILE_CACHE_SIZE = 8
+
+def _profile_cache_key(ts):
+    # Kopien/Views desselben Index teilen den Puffer - Schlüssel über Puffer und Eckwerte
+    if ts.shape[0] == 0:
+        return None
+    return (ts.__array_interface__['data'][0], ts.shape[0], int(ts[0]), int(ts[-1]))
+
+def profile_bar_spacing(index, top_k=BAR_PROFILE_TOP_GAPS):
+    """
+    📏 Modaler Bar-Abstand, Lücken-Histogramm und größte Lücken in einem Durchlauf
+
+    Gecacht - derselbe Index (auch als View/Kopie eines DataFrames) wird nur einmal gescannt.
+    """
+    ts = np.ascontiguousarray(index.asi8 if hasattr(index, 'asi8') else np.asarray(index, dtype='i8'))
+    cache_key = _profile_cache_key(ts)
+    if cache_key in _BAR_PROFILE_CACHE:
+        return _BAR_PROFILE_CACHE[cache_key]
+
+    profile_start = time.time()
+    base = modal_spacing_ns(ts)
+    profile = {'rows': int(ts.shape[0]), 'bar_spacing_ns': base, 'freq': spacing_to_freq(base) if base else None}
+
+    if base:
+        use_numba = NUMBA_QUALITY_AVAILABLE and ts.shape[0] >= NUMBA_MIN_ROWS
+        scan = _gap_scan_nb if use_numba else _gap_scan_py
+        regular, duplicates, backwards, histogram, top_pos, top_delta = scan(ts, base, top_k)
+        tz = getattr(index, 'tz', None)
+        profile.update({
+            'regular_share': round(regular / max(ts.shape[0] - 1, 1), 6),
+            'duplicates': int(duplicates),
+            'non_monotonic': int(backwards),
+            'gaps': int(histogram.sum()),
+            'gap_histogram': {_bucket_label(k): int(n) for k, n in enumerate(histogram) if n},
+            'largest_gaps': [{
+                'from': str(_ns_to_ts(ts[pos], tz)),
+                'to': str(_ns_to_ts(ts[pos + 1], tz)),
+                'duration': str(pd.Timedelta(int(delta), unit='ns')),
+                'missing_bars': int(delta // base) - 1
+            } for pos, delta in zip(top_pos, top_delta)]
+        })
+    profile['seconds'] = round(time.time() - profile_start, 4)
+
+    if cache_key is not None:
+        if len(_BAR_PROFILE_CACHE) >= _BAR_PROFILE_CACHE_SIZE:
+            _BAR_PROFILE_CACHE.pop(next(iter(_BAR_PROFILE_CACHE)))
+        _BAR_PROFILE_CACHE[cache_key] = profile
+    return profile
+
+def _ns_to_ts(value_ns, tz):
+    timestamp = pd.Timestamp(int(value_ns), unit='ns')
+    return timestamp.tz_localize('UTC').tz_convert(tz) if tz is not None else timestamp
+
+# 🕐 HANDELSZEITEN - offene Fenster (Wochentag 0=Mo, Start, Ende) in lokaler Zeit
+# Naive Zeitstempel werden als Wandzeit der Session-Zeitzone interpretiert.
+SESSION_TEMPLATES = {
+    '24x7': {'tz': None, 'windows': [(day, '00:00', '24:00') for day in range(7)]},
+    '24x5': {'tz': None, 'windows': [(day, '00:00', '24:00') for day in range(5)]},
+    'cme_globex': {'tz': 'America/Chicago',
+                   'windows': [(6, '17:00', '24:00')]
+                              + [(day, '00:00', '16:00') for day in range(5)]
+                              + [(day, '17:00', '24:00') for day in range(4)]},
+    'us_equity_rth': {'tz': 'America/New_York', 'windows': [(day, '09:30', '16:00') for day in range(5)]},
+}
+
+_WEEK_NS = 7 * 86400 * 10**9
+_MONDAY_OFFSET_NS = 4 * 86400 * 10**9   # 1970-01-05 war ein Montag
+
+def _minutes(text):
+    hours, minutes = text.split(':')
+    return int(hours) * 60 + int(minutes)
+
+def _session_template(session, spacing_ns):
+    """Offen/geschlossen pro Bar-Slot einer Woche (ab Montag 00:00)"""
+    slots = _WEEK_NS // spacing_ns
+    slot_minutes = np.arange(slots, dtype=np.int64) * spacing_ns // (60 * 10**9)
+    template = np.zeros(slots, dtype=bool)
+    for day, start, end in SESSION_TEMPLATES[session]['windows']:
+        template |= (slot_minutes >= day * 1440 + _minutes(start)) & (slot_minutes < day * 1440 + _minutes(end))
+    return template
+
+def _session_wall_ns(index, session):
+    session_tz = SESSION_TEMPLATES[session]['tz']
+    if index.tz is None:
+        return index.asi8
+    local = index.tz_convert(session_tz) if session_tz else index
+    return local.tz_localize(None).asi8
+
+def session_missing_bars(index, spacing_ns, session='24x5', top_k=5):
+    """
+    🕳️ Fehlende Bars innerhalb der Handelszeiten
+
+    Zählt pro Lücke nur die Slots, die laut Session-Vorlage offen wären
+    (Wochenenden/Pausen zählen nicht), plus Bars außerhalb der Handelszeit.
+    """
+    if session not in SESSION_TEMPLATES or not spacing_ns or _WEEK_NS % spacing_ns or len(index) < 2:
+        return None
+
+    template = _session_template(session, spacing_ns)
+    open_per_week = int(template.sum())
+    cumulative = np.concatenate(([0], np.cumsum(template, dtype=np.int64)))
+    slots_per_week = template.shape[0]
+
+    wall = _session_wall_ns(index, session)
+    slot = (wall - _MONDAY_OFFSET_NS) // spacing_ns
+
+    def open_slots_before(absolute_slot):
+        return (absolute_slot // slots_per_week) * open_per_week + cumulative[absolute_slot % slots_per_week]
+
+    outside = int((~template[slot % slots_per_week]).sum())
+    gap_positions = np.flatnonzero(np.diff(slot) > 1)
+    missing = open_slots_before(slot[gap_positions + 1]) - open_slots_before(slot[gap_positions] + 1)
+
+    largest = []
+    for order in np.argsort(missing)[::-1][:top_k]:
+        if missing[order] <= 0:
+            break
+        position = gap_positions[order]
+        largest.append({'from': str(index[position]), 'to': str(index[position + 1]),
+                        'missing_bars': int(missing[order])})
+
+    return {'session': session, 'missing_bars': int(missing.sum()),
+            'gaps_in_session': int((missing > 0).sum()), 'bars_outside_session': outside,
+            'largest_missing': largest}
+
+# 🔬 DATENQUALITÄTS-ENGINE
+DEFAULT_QUALITY_CONFIG = {
+    'session': '24x5',              # Vorlage aus SESSION_TEMPLATES
+    'volume_spike_factor': 20.0,    # Volumen > Faktor x gleitender Mittelwert
+    'volume_spike_window': 390,     # Fenster (Bars) für den gleitenden Mittelwert
+    'repair_data': False,           # True: sortieren, Duplikate/ungültige Preise entfernen, OHLC klemmen
+    'duplicate_handling': 'drop',   # Duplikate: letzte Zeile behalten
+    'max_examples': 5               # Beispiel-Zeitstempel pro Befund im Report
+}
+
+def _ohlcv_columns(data):
+    lookup = {str(column).lower(): column for column in data.columns}
+    return {name: lookup.get(name) for name in ('open', 'high', 'low', 'close', 'volume')}
+
+def _rolling_mean(values, window):
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    counts = np.minimum(np.arange(1, values.shape[0] + 1), window)
+    upper = np.arange(1, values.shape[0] + 1)
+    return (cumulative[upper] - cumulative[upper - counts]) / counts
+
+def validate_ohlcv(data, config=None):
+    """
+    🔬 Prüft OHLCV-Daten in wenigen NumPy-Durchläufen, repariert optional
+
+    Gibt (data, report) zurück. Ohne Reparatur wird data unverändert
+    (ohne Kopie) zurückgegeben; der Report ist JSON-serialisierbar.
+    """
+    config = {**DEFAULT_QUALITY_CONFIG, **(config or {})}
+    check_start = time.time()
+    max_examples = config['max_examples']
+    index = data.index
+    report = {'rows': int(len(data)), 'checks': {}, 'examples': {}}
+
+    def record(name, mask):
+        count = int(mask.sum())
+        report['checks'][name] = count
+        if count:
+            report['examples'][name] = [str(ts) for ts in index[np.flatnonzero(mask)[:max_examples]]]
+
+    profile = profile_bar_spacing(index)
+    report['bar_spacing'] = profile['freq']
+    report['checks']['duplicate_timestamps'] = profile.get('duplicates', 0)
+    report['checks']['non_monotonic_steps'] = profile.get('non_monotonic', 0)
+    if report['checks']['non_monotonic_steps']:
+        # Unsortiert: Duplikate global zählen
+        report['checks']['duplicate_timestamps'] = int(index.duplicated().sum())
+
+    cols = _ohlcv_columns(data)
+    prices = {name: data[cols[name]].to_numpy() for name in ('open', 'high', 'low', 'close') if cols[name] is not None}
+    invalid_price = np.zeros(len(data), dtype=bool)
+    for name, values in prices.items():
+        invalid_price |= ~(values > 0)          # <= 0 oder NaN
+    record('invalid_prices', invalid_price)
+
+    if len(prices) == 4:
+        o, h, l, c = prices['open'], prices['high'], prices['low'], prices['close']
+        body_high = np.maximum(o, c)
+        body_low = np.minimum(o, c)
+        record('high_below_body', h < body_high)
+        record('low_above_body', l > body_low)
+        record('high_below_low', h < l)
+        ohlc_violation = (h < body_high) | (l > body_low) | (h < l)
+    else:
+        ohlc_violation = np.zeros(len(data), dtype=bool)
+
+    if cols['volume'] is not None and len(data):
+        volume = data[cols['volume']].to_numpy().astype(np.float64, copy=False)
+        record('negative_volume', volume < 0)
+        baseline = _rolling_mean(volume, int(config['volume_spike_window']))
+        previous = np.concatenate(([np.nan], baseline[:-1]))
+        record('volume_spikes', volume > config['volume_spike_factor'] * np.where(previous > 0, previous, np.inf))
+
+    report['session'] = session_missing_bars(index, profile.get('bar_spacing_ns'), config['session'])
+
+    repaired = {}
+    if config['repair_data']:
+        if report['checks']['non_monotonic_steps']:
+            order = np.argsort(index.asi8, kind='stable')
+            data = data.iloc[order]
+            invalid_price = invalid_price[order]
+            ohlc_violation = ohlc_violation[order]
+            repaired['sorted'] = True
+        if report['checks']['duplicate_timestamps'] and config['duplicate_handling'] == 'drop':
+            keep = ~data.index.duplicated(keep='last')
+            data, invalid_price, ohlc_violation = data.loc[keep], invalid_price[keep], ohlc_violation[keep]
+            repaired['dropped_duplicates'] = int((~keep).sum())
+        if invalid_price.any():
+            data, ohlc_violation = data.loc[~invalid_price], ohlc_violation[~invalid_price]
+            repaired['dropped_invalid_prices'] = int(invalid_price.sum())
+        if ohlc_violation.any():
+            data = data.copy()
+            stacked = np.column_stack([data[cols[name]].to_numpy() for name in ('open', 'high', 'low', 'close')])
+            data[cols['high']] = stacked.max(axis=1)
+            data[cols['low']] = stacked.min(axis=1)
+            repaired['clamped_ohlc'] = int(ohlc_violation.sum())
+        report['rows_after_repair'] = int(len(data))
+    report['repaired'] = repaired
+    report['issues'] = int(sum(report['checks'].values()))
+    report['seconds'] = round(time.time() - check_start, 4)
+    return data, report
+
+def print_quality_report(report):
+    """📋 Kompakte Ausgabe des Qualitäts-Reports"""
+    print(f"🔬 Datenqualität: {report['rows']:,} Zeilen, {report['issues']:,} Befunde in {report['seconds']:.3f}s")
+    for name, count in report['checks'].items():
+        if count:
+            examples = ', '.join(report['examples'].get(name, [])[:2])
+            print(f"   ⚠️ {name}: {count:,}" + (f" (z.B. {examples})" if examples else ""))
+    session = report.get('session')
+    if session:
+        print(f"   🕐 Session {session['session']}: {session['missing_bars']:,} fehlende Bars in "
+              f"{session['gaps_in_session']:,} Lücken, {session['bars_outside_session']:,} Bars außerhalb")
+    if report['repaired']:
+        print(f"   🔧 Repariert: {report['repaired']} → {report['rows_after_repair']:,} Zeilen")
+    elif not report['issues']:
+        print("   ✅ Keine Befunde")
+# ▲ EMBED END
+
+def get_data_quality_source():
+    """Liefert den einbettbaren Data-Quality Code für die Code-Generatoren"""
+    import os
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+🔍 PUNKT FILE PROBE - Metadaten ohne die Nutzdaten zu laden
+
+probe_file() liefert für jedes unterstützte Format dieselben Felder:
+
+    format, rows, columns, dtypes, start, end, freq, size, mtime, file_size_mb, source
+
+Gelesen wird nur, was das Format ohnehin als Metadaten mitbringt:
+
+    Column Store  header.json (+ erste Index-Werte bei rohem Index)
+    Parquet       Footer: Zeilen, Schema, Row-Group-Statistiken des Index
+    HDF5          Storer-Attribute + erste/letzte Zeilen über start/stop
+    MTF-Container catalog.json bzw. Katalog-Attribut der Wurzel (feinster Timeframe + Liste)
+    CSV           erste Zeilen + letzte Zeile (Zeilenzahl geschätzt oder gezählt)
+    Pickle        Sidecar-Metadaten-JSON von Punkt1/Punkt2
+
+Genutzt vom Asset-Katalog, den Datei-Browsern (Punkt1, Punkt3.1) und von
+validate_file in Punkt2. Die generierten Punkt-Skripte betten den Block
+zusammen mit dem Asset-Katalog ein (get_file_probe_source()).
+"""
+
+# ▼ EMBED START
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+
+PROBE_HEAD_ROWS = 1000
+PROBE_TAIL_BYTES = 4096
+
+def _infer_index_freq(index):
+    """Frequenz aus dem Median-Abstand der ersten Zeitstempel"""
+    if len(index) < 2:
+        return None
+    deltas = np.diff(index.asi8)
+    deltas = deltas[deltas > 0]
+    if len(deltas) == 0:
+        return None
+    try:
+        return pd.tseries.frequencies.to_offset(pd.Timedelta(int(np.median(deltas)), unit='ns')).freqstr
+    except ValueError:
+        return None
+
+def _frame_fields(head, tail_index=None):
+    """rows-unabhängige Felder aus einem Kopf-Ausschnitt"""
+    fields = {
+        'columns': [str(c) for c in head.columns],
+        'dtypes': {str(c): str(dtype) for c, dtype in head.dtypes.items()},
+    }
+    if isinstance(head.index, pd.DatetimeIndex) and len(head.index):
+        fields['start'] = str(head.index[0])
+        fields['end'] = str((tail_index if tail_index is not None and len(tail_index) else head.index)[-1])
+        fields['freq'] = _infer_index_freq(head.index)
+    return fields
+
+def _probe_column_store(path):
+    with open(os.path.join(path, 'header.json'), 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    metadata = header.get('metadata') or {}
+    index_entry = header['index']
+    fields = {
+        'rows': header['rows'],
+        'columns': [c['name'] for c in header['columns']],
+        'dtypes': {c['name']: str(np.dtype(c.get('codec', {}).get('decoded_dtype', c['dtype']))) for c in header['columns']},
+        'start': header.get('start'),
+        'end': header.get('end'),
+        'freq': (metadata.get('bar_profile') or {}).get('freq') or metadata.get('inferred_freq') or metadata.get('timeframe'),
+    }
+    if fields['freq'] is None and header['rows'] > 1 and 'compression' not in index_entry:
+        count = min(header['rows'], PROBE_HEAD_ROWS)
+        head_ns = np.fromfile(os.path.join(path, index_entry['file']), dtype=index_entry['dtype'], count=count)
+        fields['freq'] = _infer_index_freq(pd.DatetimeIndex(head_ns.view('M8[ns]')))
+    return fields
+
+def _arrow_dtype_name(arrow_type):
+    try:
+        return str(np.dtype(arrow_type.to_pandas_dtype()))
+    except (NotImplementedError, TypeError):
+        return str(arrow_type)
+
+def _probe_parquet(path):
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    schema = parquet_file.schema_arrow
+    pandas_meta = json.loads((schema.metadata or {}).get(b'pandas', b'{}') or b'{}')
+    index_columns = [c for c in pandas_meta.get('index_columns', []) if isinstance(c, str)]
+
+    fields = {
+        'rows': metadata.num_rows,
+        'columns': [name for name in schema.names if name not in index_columns],
+        'dtypes': {field.name: _arrow_dtype_name(field.type) for field in schema if field.name not in index_columns},
+        'start': None, 'end': None, 'freq': None,
+    }
+    if index_columns and metadata.num_row_groups:
+        position = schema.get_field_index(index_columns[0])
+        minimum, maximum = [], []
+        for group in range(metadata.num_row_groups):
+            stats = metadata.row_group(group).column(position).statistics
+            if stats is not None and stats.has_min_max:
+                minimum.append(pd.Timestamp(stats.min))
+                maximum.append(pd.Timestamp(stats.max))
+        if minimum:
+            fields['start'], fields['end'] = str(min(minimum)), str(max(maximum))
+        first_batch = next(parquet_file.iter_batches(batch_size=PROBE_HEAD_ROWS, columns=[index_columns[0]]), None)
+        if first_batch is not None:
+            fields['freq'] = _infer_index_freq(pd.DatetimeIndex(first_batch.column(0).to_pandas()))
+
+    punkt1_meta = (schema.metadata or {}).get(b'punkt1')
+    if punkt1_meta and fields['freq'] is None:
+        fields['freq'] = json.loads(punkt1_meta).get('inferred_freq')
+    return fields
+
+def _probe_hdf5(path):
+    with pd.HDFStore(path, mode='r') as store:
+        key = 'data' if '/data' in store.keys() else store.keys()[0]
+        storer = store.get_storer(key)
+        rows = int(storer.nrows if storer.is_table else storer.shape[0])
+        head = store.select(key, start=0, stop=min(rows, PROBE_HEAD_ROWS))
+        tail = store.select(key, start=max(rows - 1, 0), stop=rows)
+    return dict(_frame_fields(head, tail.index), rows=rows)
+
+def _probe_mtf_container(path):
+    if os.path.isdir(path):
+        with open(os.path.join(path, 'catalog.json'), 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+    else:
+        with pd.HDFStore(path, mode='r') as store:
+            catalog = json.loads(store.root._v_attrs['punkt_catalog'])
+    timeframes = catalog['timeframes']
+    group = catalog['groups'][timeframes[0]] if timeframes else {}
+    return {
+        'rows': group.get('rows'),
+        'columns': group.get('columns', []),
+        'dtypes': group.get('dtypes', {}),
+        'start': group.get('start'),
+        'end': group.get('end'),
+        'freq': timeframes[0] if timeframes else None,
+        'timeframes': timeframes,
+    }
+
+def _probe_csv(path, exact_rows=False):
+    head = pd.read_csv(path, index_col=0, parse_dates=True, nrows=PROBE_HEAD_ROWS)
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        head_bytes = f.read(1 << 20)
+        if exact_rows:
+            rows = head_bytes.count(b'\n') + sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+            rows -= 1  # Kopfzeile
+        f.seek(max(size - PROBE_TAIL_BYTES, 0))
+        tail_bytes = f.read()
+        last_line = tail_bytes.rstrip(b'\r\n').splitlines()[-1].decode('utf-8', 'replace')
+        if exact_rows and tail_bytes and not tail_bytes.endswith(b'\n'):
+            rows += 1  # letzte Zeile ohne abschließenden Zeilenumbruch
+
+    fields = {}
+    if not exact_rows:
+        lines = head_bytes.splitlines()
+        sample = lines[1:-1] if len(lines) > 2 else lines[1:]
+        avg_line = (sum(len(line) + 1 for line in sample) / len(sample)) if sample else 0
+        rows = int(round((size - len(lines[0]) - 1) / avg_line)) if avg_line else len(head)
+        if len(head) < PROBE_HEAD_ROWS:
+            rows = len(head)  # Datei komplett im Kopf-Ausschnitt
+        else:
+            fields['rows_estimated'] = True
+
+    tail_index = None
+    try:
+        tail_index = pd.DatetimeIndex([pd.Timestamp(last_line.split(',')[0])])
+    except (ValueError, TypeError):
+        pass
+    fields.update(_frame_fields(head, tail_index))
+    fields['rows'] = rows
+    return fields
+
+def find_sidecar_metadata(path):
+    """📋 Sucht die Metadaten-JSON, die Punkt1/Punkt2 neben Pickles/Stores schreiben"""
+    directory, name = os.path.split(path)
+    stem = re.sub(r'(\.pickle\.blosc|\.pickle|\.pkl|\.h5|\.parquet|\.cols)$', '', name)
+    candidates = [stem + '_metadata.json', stem + '.json']
+    punkt1 = re.match(r'(.+)_PUNKT2_STORE_(.+)$', stem)
+    if punkt1:
+        candidates.append(f"{punkt1.group(1)}_PUNKT2_METADATA_{punkt1.group(2)}.json")
+    punkt2 = re.match(r'(.+)_([0-9]+[a-zA-Z]+)(_VBT)?$', stem)
+    if punkt2:
+        candidates.append(f"{punkt2.group(1)}_ULTRA_PERFORMANCE_metadata.json")
+    for candidate in candidates:
+        candidate_path = os.path.join(directory, candidate)
+        if os.path.exists(candidate_path):
+            with open(candidate_path, 'r', encoding='utf-8') as f:
+                return candidate_path, json.load(f), (punkt2.group(2) if punkt2 else None)
+    return None, None, None
+
+def _probe_pickle(path):
+    sidecar_path, metadata, timeframe = find_sidecar_metadata(path)
+    if metadata is None:
+        return {'rows': None, 'columns': [], 'dtypes': {}, 'start': None, 'end': None, 'freq': None}
+    # Punkt2: Angaben pro Timeframe, Punkt1: Angaben direkt in den Metadaten
+    info = (metadata.get('timeframe_info') or {}).get(timeframe) or metadata
+    shape = info.get('data_shape') or [info.get('rows'), None]
+    return {
+        'rows': shape[0],
+        'columns': info.get('columns', []),
+        'dtypes': info.get('dtypes', {}),
+        'start': info.get('start_date') or info.get('start'),
+        'end': info.get('end_date') or info.get('end'),
+        'freq': info.get('freq') or info.get('inferred_freq') or timeframe,
+        'sidecar': sidecar_path,
+    }
+
+def probe_format(path):
+    lower = path.lower()
+    if os.path.isdir(path) and os.path.exists(os.path.join(path, 'header.json')):
+        return 'column_store'
+    if lower.endswith('.parquet'):
+        return 'parquet'
+    if lower.endswith(('_multi_timeframe.mtf', '_multi_timeframe.h5')):
+        return 'mtf_container'
+    if lower.endswith(('.h5', '.hdf5')):
+        return 'hdf5'
+    if lower.endswith('.csv'):
+        return 'csv'
+    if lower.endswith(('.pickle', '.pkl', '.pickle.blosc')):
+        return 'pickle'
+    return 'unknown'
+
+def probe_file(path, exact_csv_rows=False):
+    """
+    🔍 Zeilen, Spalten, dtypes, erster/letzter Zeitstempel und Frequenz
+    ohne die Nutzdaten zu laden. Fehler landen in 'error' statt zu werfen.
+    """
+    file_format = probe_format(path)
+    stat = os.stat(path)
+    if file_format == 'column_store':
+        size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    elif file_format == 'mtf_container' and os.path.isdir(path):
+        size = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+    else:
+        size = stat.st_size
+    entry = {
+        'path': os.path.abspath(path),
+        'format': file_format,
+        'size': size,
+        'mtime': stat.st_mtime,
+        'file_size_mb': size / (1024 * 1024),
+        'rows': None, 'columns': [], 'dtypes': {}, 'start': None, 'end': None, 'freq': None,
+        'source': {'column_store': 'header', 'parquet': 'footer', 'hdf5': 'storer',
+                   'mtf_container': 'catalog',
+                   'csv': 'head/tail', 'pickle': 'sidecar'}.get(file_format)
+    }
+    try:
+        if file_format == 'column_store':
+            entry.update(_probe_column_store(path))
+        elif file_format == 'parquet':
+            entry.update(_probe_parquet(path))
+        elif file_format == 'hdf5':
+            entry.update(_probe_hdf5(path))
+        elif file_format == 'mtf_container':
+            entry.update(_probe_mtf_container(path))
+        elif file_format == 'csv':
+            entry.update(_probe_csv(path, exact_rows=exact_csv_rows))
+        elif file_format == 'pickle':
+            entry.update(_probe_pickle(path))
+    except Exception as e:
+        entry['error'] = str(e)
+    return entry
+# ▲ EMBED END
+
+def get_file_probe_source():
+    """Liefert den einbettbaren Probe-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
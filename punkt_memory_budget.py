@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+🧮 PUNKT MEMORY BUDGET - Zeitfenster-Planung für Punkt2 im RAM-Budget
+
+Statt "Timeframes pro Chunk" zählt der Planer Bytes: eine Basis-Zeile
+kostet Index + alle Spalten, ein Zeitfenster zusätzlich die Kontext-Zeilen,
+die das inkrementelle Tail-Resampling vor dem offenen Bar nachliest (zwei
+Bin-Breiten des gröbsten Timeframes), mal dem Arbeitsspeicher des
+Resamplers (Slice, Kernel-Arrays, Ergebnis). Daraus folgt die Fenstergröße:
+
+    budget - resident  =  (fenster + kontext) x zeilen_bytes x overhead
+
+Punkt2 verarbeitet die Basis Fenster für Fenster und schreibt die fertigen
+Bars sofort in die Column Stores (offener Bar wird im nächsten Fenster
+ersetzt) - im RAM liegen nie mehr als ein Fenster und dessen Bars.
+
+Gezählt wird anonymer Speicher (RSS ohne dateigestützte Seiten): gelesene
+memmap-Seiten eines Column Stores liegen im Page-Cache und sind jederzeit
+verdrängbar. enforce_memory_budget() misst, räumt bei Überschreitung per
+gc auf und meldet, ob das Budget gehalten wurde; Punkt2 halbiert dann die
+folgenden Fenster.
+
+    python punkt_memory_budget.py --plan data/punkt1/NQ_10Jahre_1s_PUNKT2_STORE_....cols --budget 16
+
+Die generierten Punkt2-Skripte betten den Block zwischen den EMBED-Markern
+über get_memory_budget_source() ein.
+"""
+
+from punkt_resample import timeframe_offset, _offset_size
+
+# ▼ EMBED START
+import os
+import gc
+import numpy as np
+import pandas as pd
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MEMORY_BUDGET_AUTO_FRACTION = 0.5     # 'auto': Hälfte des beim Start freien RAMs
+MEMORY_WINDOW_OVERHEAD = 4.0          # Arbeitskopien pro Basis-Zeile im Resampler (Slice, Kernel-Arrays, Ergebnis)
+MEMORY_MIN_WINDOW_ROWS = 100_000      # kleinere Fenster lesen fast nur noch Kontext
+MEMORY_BUDGET_STATE = {'budget_bytes': None, 'peak_bytes': 0, 'over_budget': 0, 'collections': 0}
+
+def resolve_memory_budget(spec):
+    """🧮 'auto' = Anteil des freien RAMs, Zahl = GB, 'off'/leer = kein Budget (Bytes oder None)"""
+    if spec in (None, '', 'off', 'none', False):
+        return None
+    if spec == 'auto':
+        if psutil is None:
+            return None
+        return int(psutil.virtual_memory().available * MEMORY_BUDGET_AUTO_FRACTION)
+    return int(float(spec) * 1024 ** 3)
+
+def process_memory_bytes(info=None):
+    """Anonymer Speicher des Prozesses (RSS ohne dateigestützte Seiten, wo messbar)"""
+    if info is None:
+        if psutil is None:
+            return 0
+        info = psutil.Process(os.getpid()).memory_info()
+    return int(info.rss - getattr(info, 'shared', 0))
+
+def enforce_memory_budget(info=None):
+    """
+    🚦 Misst gegen MEMORY_BUDGET_STATE['budget_bytes'] (Peak wird mitgeschrieben)
+
+    Über dem Budget wird einmal gc.collect() versucht; False, wenn es danach
+    immer noch überschritten ist - der Aufrufer muss dann kleiner arbeiten.
+    """
+    used = process_memory_bytes(info)
+    state = MEMORY_BUDGET_STATE
+    state['peak_bytes'] = max(state['peak_bytes'], used)
+    budget = state['budget_bytes']
+    if not budget or used <= budget:
+        return True
+    gc.collect()
+    state['collections'] += 1
+    if process_memory_bytes() <= budget:
+        return True
+    state['over_budget'] += 1
+    return False
+
+def frame_row_bytes(data):
+    """Bytes pro Zeile: int64-Index + alle Spalten"""
+    return 8 + sum(np.dtype(dtype).itemsize for dtype in data.dtypes)
+
+def _span_ns(index):
+    return max(int(index[-1].value - index[0].value), 1) if len(index) > 1 else 1
+
+def estimate_timeframe_rows(index, tf):
+    """Erwartete Bars eines Timeframes (Zeitspanne / Bin-Breite, höchstens eine pro Basis-Zeile)"""
+    offset = timeframe_offset(tf)
+    if offset is None or not len(index):
+        return len(index)
+    return min(len(index), _span_ns(index) // _offset_size(offset) + 1)
+
+def context_rows(index, timeframes):
+    """Basis-Zeilen, die das Tail-Resampling pro Fenster zusätzlich liest (2 Bin-Breiten des gröbsten Timeframes)"""
+    sizes = [_offset_size(offset) for offset in map(timeframe_offset, timeframes) if offset is not None]
+    if not sizes or len(index) < 2:
+        return 0
+    rows_per_ns = len(index) / _span_ns(index)
+    return min(len(index), int(np.ceil(2 * max(sizes) * rows_per_ns)))
+
+def split_windows(rows, window_rows):
+    """[(start, end), ...] über rows Basis-Zeilen"""
+    window_rows = max(1, int(window_rows))
+    return [(start, min(rows, start + window_rows)) for start in range(0, rows, window_rows)]
+
+def plan_memory_windows(data, timeframes, budget_bytes, resident_bytes=0):
+    """
+    🧮 Zeitfenster-Plan für das RAM-Budget
+
+    Gibt ein Dict mit Bytes pro Zeile, Kontext-Zeilen, geschätzten Bytes pro
+    Timeframe-Ausgabe, Fenstergröße und Fenstern (Zeilen + Zeitraum) zurück.
+    fits=False, wenn schon das kleinste Fenster das Budget sprengt.
+    """
+    rows = len(data)
+    row_bytes = frame_row_bytes(data)
+    context = context_rows(data.index, timeframes)
+    output_bytes = {tf: estimate_timeframe_rows(data.index, tf) * row_bytes for tf in timeframes}
+    available = (budget_bytes or 0) - resident_bytes
+    if budget_bytes:
+        window_rows = int(available / (row_bytes * MEMORY_WINDOW_OVERHEAD)) - context
+    else:
+        window_rows = rows
+    fits = window_rows >= MEMORY_MIN_WINDOW_ROWS or window_rows >= rows
+    window_rows = min(rows, max(window_rows, MEMORY_MIN_WINDOW_ROWS)) if rows else 0
+    windows = split_windows(rows, window_rows) if rows else []
+    return {
+        'budget_bytes': budget_bytes,
+        'resident_bytes': resident_bytes,
+        'row_bytes': row_bytes,
+        'context_rows': context,
+        'output_bytes': output_bytes,
+        'window_rows': window_rows,
+        'window_bytes': (window_rows + context) * row_bytes * MEMORY_WINDOW_OVERHEAD,
+        'windows': [
+            {'start': start, 'end': end, 'first': str(data.index[start]), 'last': str(data.index[end - 1])}
+            for start, end in windows
+        ],
+        'fits': fits,
+    }
+
+def memory_chunk_size(data, timeframes, budget_bytes, resident_bytes=0, default=4):
+    """Timeframes pro Chunk, so dass die Ausgaben eines Chunks ins Budget passen (default ohne Budget)"""
+    if not budget_bytes or not timeframes:
+        return min(len(timeframes), default) or 1
+    largest = max(estimate_timeframe_rows(data.index, tf) for tf in timeframes) * frame_row_bytes(data)
+    return max(1, min(len(timeframes), int((budget_bytes - resident_bytes) // max(largest, 1))))
+# ▲ EMBED END
+
+def get_memory_budget_source():
+    """Liefert den einbettbaren Budget-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
+
+def main(argv=None):
+    import argparse
+    from punkt_column_store import is_column_store, open_column_store
+
+    parser = argparse.ArgumentParser(description="Punkt2-Zeitfenster für ein RAM-Budget planen (ohne zu resamplen)")
+    parser.add_argument('--plan', dest='path', required=True, help="Column Store, Parquet oder HDF5 mit OHLCV-Daten")
+    parser.add_argument('--budget', default='auto', help="GB oder 'auto' (Standard)")
+    parser.add_argument('--timeframes', nargs='*', default=['1m', '5m', '15m', '1h', '4h', '1d', '1w'])
+    args = parser.parse_args(argv)
+
+    if is_column_store(args.path):
+        data = open_column_store(args.path)
+    elif args.path.endswith('.parquet'):
+        data = pd.read_parquet(args.path)
+    else:
+        data = pd.read_hdf(args.path)
+
+    budget = resolve_memory_budget(args.budget)
+    plan = plan_memory_windows(data, args.timeframes, budget, resident_bytes=process_memory_bytes())
+    mb = 1024 * 1024
+    print(f"🧮 RAM-BUDGET: {budget / mb:,.0f} MB" if budget else "🧮 RAM-BUDGET: keins")
+    print(f"   📊 {len(data):,} Basis-Zeilen x {plan['row_bytes']} Bytes, resident {plan['resident_bytes'] / mb:,.0f} MB")
+    print(f"   🔁 Kontext pro Fenster: {plan['context_rows']:,} Zeilen")
+    print(f"   🧩 {len(plan['windows'])} Fenster à {plan['window_rows']:,} Zeilen (~{plan['window_bytes'] / mb:,.0f} MB)"
+          + ("" if plan['fits'] else " ⚠️ Budget reicht nicht für das Mindestfenster"))
+    for tf, size in plan['output_bytes'].items():
+        print(f"   📦 {tf:>4}: ~{size / mb:,.1f} MB Ausgabe")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+🗂️ PUNKT MTF CONTAINER - Alle Timeframes eines Punkt2-Laufs in einem Container
+
+Statt <base>_<tf>_VBT.pickle / <base>_<tf>_VBT.h5 pro Timeframe schreibt
+Punkt2 einen Container mit einer Gruppe pro Timeframe:
+
+    <base>_MULTI_TIMEFRAME.mtf/
+        catalog.json   Quelle, Timeframes, Zeilen, Spalten, dtypes,
+                       Zeitraum und Statistiken pro Gruppe
+        tf_1m.cols/    Column Store der Gruppe (memmap, anhängbar)
+        tf_5m.cols/ ...
+
+Die Gruppen sind Column Stores: Punkt2 schreibt sie fensterweise und das
+inkrementelle Update hängt an, ohne den Container neu zu schreiben - nur
+catalog.json wird ersetzt. Der Katalog wird ohne eine einzige Datenzeile
+gelesen (read_mtf_catalog), open_mtf_container() öffnet den Container einmal
+und mappt eine Gruppe erst beim ersten Zugriff auf ihren Timeframe. Punkt3,
+der Punkt3.1-Viewer und die Probe-Schicht nutzen denselben Katalog.
+
+Container älterer Punkt2-Läufe (<base>_MULTI_TIMEFRAME.h5, Katalog als
+Wurzel-Attribut, Gruppen /tf_<tf>) bleiben über dieselbe API lesbar. Die
+generierten Punkt-Skripte betten den Block zwischen den EMBED-Markern über
+get_mtf_container_source() ein (nach dem Column-Store-Block).
+"""
+
+from punkt_column_store import COLUMN_STORE_EXT, is_column_store, open_column_store
+
+# ▼ EMBED START
+import os
+import json
+import numpy as np
+import pandas as pd
+
+MTF_CONTAINER_SUFFIX = '_MULTI_TIMEFRAME.mtf'
+MTF_HDF5_CONTAINER_SUFFIX = '_MULTI_TIMEFRAME.h5'
+MTF_CATALOG_FILE = 'catalog.json'
+MTF_CONTAINER_VERSION = 2
+_MTF_CATALOG_ATTR = 'punkt_catalog'
+
+def mtf_group_key(tf):
+    """Gruppenname eines Timeframes (HDF5-Knotennamen dürfen nicht mit einer Ziffer beginnen)"""
+    return f"tf_{tf}"
+
+def mtf_group_path(path, tf):
+    """Column Store der Timeframe-Gruppe im Container"""
+    return os.path.join(path, mtf_group_key(tf) + COLUMN_STORE_EXT)
+
+def mtf_group_stats(frame):
+    """📊 Statistiken pro Gruppe für den Katalog (ohne die Gruppe später zu lesen)"""
+    stats = {
+        'rows': len(frame),
+        'columns': [str(c) for c in frame.columns],
+        'dtypes': {str(c): str(dtype) for c, dtype in frame.dtypes.items()},
+        'start': str(frame.index[0]) if len(frame) else None,
+        'end': str(frame.index[-1]) if len(frame) else None,
+        # spaltenweise: bei memmap-Stores keine bool-Kopie des ganzen Frames
+        'missing_values': sum(int(frame[c].isna().sum()) for c in frame.columns),
+    }
+    if len(frame):
+        if 'low' in frame.columns:
+            stats['low_min'] = float(np.nanmin(frame['low'].to_numpy()))
+        if 'high' in frame.columns:
+            stats['high_max'] = float(np.nanmax(frame['high'].to_numpy()))
+        if 'close' in frame.columns:
+            stats['close_first'] = float(frame['close'].iloc[0])
+            stats['close_last'] = float(frame['close'].iloc[-1])
+        if 'volume' in frame.columns:
+            stats['volume_sum'] = float(np.nansum(frame['volume'].to_numpy()))
+    return stats
+
+def _empty_catalog(metadata):
+    return {
+        'version': MTF_CONTAINER_VERSION,
+        'metadata': metadata or {},
+        'timeframes': [],
+        'groups': {},
+    }
+
+def write_mtf_catalog(frames, path, metadata=None):
+    """
+    📋 Schreibt den Katalog des Containers für {tf: DataFrame} (atomar über .tmp)
+
+    Aufgenommen werden die Timeframes, deren Gruppe schon als Column Store im
+    Container liegt. Gibt den Katalog zurück.
+    """
+    catalog = _empty_catalog(metadata)
+    for tf, frame in frames.items():
+        if frame is None or frame.empty or not is_column_store(mtf_group_path(path, tf)):
+            continue
+        catalog['timeframes'].append(tf)
+        catalog['groups'][tf] = dict(mtf_group_stats(frame), key=mtf_group_key(tf))
+    catalog_path = os.path.join(path, MTF_CATALOG_FILE)
+    tmp_path = catalog_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, indent=2, default=str)
+    os.replace(tmp_path, catalog_path)
+    return catalog
+
+def is_mtf_container(path):
+    path = str(path)
+    if path.endswith(MTF_HDF5_CONTAINER_SUFFIX):
+        return os.path.isfile(path)
+    return path.endswith(MTF_CONTAINER_SUFFIX) and os.path.isfile(os.path.join(path, MTF_CATALOG_FILE))
+
+def read_mtf_catalog(path):
+    """📋 Katalog des Containers (catalog.json bzw. Wurzel-Attribut, ohne Datenzeilen)"""
+    if os.path.isdir(path):
+        with open(os.path.join(path, MTF_CATALOG_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with pd.HDFStore(path, mode='r') as store:
+        return json.loads(store.root._v_attrs[_MTF_CATALOG_ATTR])
+
+def mtf_container_size_bytes(path):
+    """Bytes aller Gruppen plus Katalog (HDF5-Container: Dateigröße)"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+class MultiTimeframeContainer:
+    """
+    🗂️ Einmal geöffneter Container, Timeframes werden erst beim Zugriff gelesen
+
+    container['5m'] mappt nur die Gruppe tf_5m (danach gecacht),
+    timeframes und catalog kommen ohne Datenzugriff aus dem Katalog.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._store = None
+        if os.path.isdir(path):
+            self.catalog = read_mtf_catalog(path)
+        else:
+            self._store = pd.HDFStore(path, mode='r')
+            try:
+                self.catalog = json.loads(self._store.root._v_attrs[_MTF_CATALOG_ATTR])
+            except Exception:
+                self._store.close()
+                raise
+        self.timeframes = list(self.catalog['timeframes'])
+        self._frames = {}
+
+    def __contains__(self, tf):
+        return tf in self.catalog['groups']
+
+    def __iter__(self):
+        return iter(self.timeframes)
+
+    def __len__(self):
+        return len(self.timeframes)
+
+    def keys(self):
+        return list(self.timeframes)
+
+    def stats(self, tf):
+        return self.catalog['groups'][tf]
+
+    def __getitem__(self, tf):
+        if tf not in self._frames:
+            if tf not in self:
+                raise KeyError(tf)
+            key = self.catalog['groups'][tf]['key']
+            if self._store is None:
+                self._frames[tf] = open_column_store(os.path.join(self.path, key + COLUMN_STORE_EXT))
+            else:
+                self._frames[tf] = self._store.get(key)
+        return self._frames[tf]
+
+    def get(self, tf, default=None):
+        return self[tf] if tf in self else default
+
+    def items(self):
+        """Alle Timeframes (liest jede noch nicht geladene Gruppe)"""
+        return [(tf, self[tf]) for tf in self.timeframes]
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_mtf_container(path):
+    """⚡ Öffnet einen Multi-Timeframe-Container (lazy pro Timeframe)"""
+    return MultiTimeframeContainer(path)
+# ▲ EMBED END
+
+def get_mtf_container_source():
+    """Liefert den einbettbaren Container-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
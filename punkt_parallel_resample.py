@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+🧵 PUNKT PARALLEL RESAMPLE - Timeframe-Worker über Shared Memory
+
+Die Basis (Index + OHLCV) liegt einmal in einem multiprocessing.shared_memory
+Segment. Jeder Worker ist ein eigener Python-Prozess, hängt sich per Name
+an das Segment (ohne den DataFrame zu picklen) und berechnet eine Gruppe
+von Timeframes mit denselben Resamplern wie der serielle Pfad (Single-Pass,
+Numba-Kernel, Session-Buckets, Pandas). Die Ergebnisse kommen ebenfalls
+als Shared-Memory-Segmente zurück, über stdin/stdout laufen nur kleine
+JSON-Zeilen mit Segment-Namen.
+
+Worker werden per subprocess gestartet, nicht über multiprocessing: die
+generierten Punkt2-Skripte haben keinen __main__-Schutz und würden beim
+'spawn'-Start (Windows) sonst komplett neu ausgeführt. Das Worker-Skript
+entsteht aus dem Resample-Code zwischen den RESAMPLE-WORKER-Markern des
+aufrufenden Skripts (bzw. aus punkt_resample im Repo) und liegt mit
+Inhalts-Hash in einem privaten Verzeichnis pro Benutzer (0700) unter dem
+Temp-Verzeichnis - der Numba-Cache greift so über Läufe, fremde Benutzer
+können kein Skript unterschieben. Vor dem Start wird der Inhalt geprüft.
+
+    python punkt_parallel_resample.py --parallel-test data/punkt1/NQ_1Jahr_PUNKT2_STORE_....cols --workers 4
+
+Die generierten Punkt2-Skripte betten den Block zwischen den EMBED-Markern
+über get_parallel_resample_source() ein (nach dem Resample-Code).
+"""
+
+from punkt_resample import (_OHLCV_COLUMNS, _ns_values, NUMBA_RESAMPLE_AVAILABLE, numba_resample_worthwhile,
+                            RESAMPLE_SINGLE_PASS_MIN_ROWS, resample_ohlcv_multi, resample_ohlcv_numba,
+                            resample_ohlcv_session, session_clock, pandas_resample_ohlcv, timeframe_offset,
+                            _offset_size, get_resample_source)
+if NUMBA_RESAMPLE_AVAILABLE:
+    from punkt_resample import _bucket_ohlcv_multi_nb
+
+# ▼ EMBED START
+import os
+import sys
+import json
+import time
+import stat
+import queue
+import hashlib
+import tempfile
+import threading
+import subprocess
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+PARALLEL_MIN_ROWS = 5_000_000        # 'auto': darunter kostet der Prozess-Start mehr als er spart
+PARALLEL_WORKER_TIMEOUT = 3600       # Sekunden bis alle Worker geantwortet haben
+PARALLEL_WORKER_MARKERS = ('# ▼ RESAMPLE WORKER START', '# ▲ RESAMPLE WORKER END')
+_PARALLEL_PROTOCOL_PREFIX = '@@PUNKT-RESAMPLE@@ '
+
+def parallel_worker_count(timeframes, rows, requested='auto'):
+    """🧵 Anzahl Worker: 'auto' = alle Kerne ab PARALLEL_MIN_ROWS, sonst die angeforderte Zahl"""
+    if requested in (None, '', 'auto'):
+        if rows < PARALLEL_MIN_ROWS:
+            return 1
+        workers = os.cpu_count() or 1
+    else:
+        workers = int(requested)
+    return max(1, min(workers, len(timeframes)))
+
+def _attach_shared_memory(name):
+    """Segment per Name öffnen, ohne dass der Resource-Tracker es beim Prozessende löscht"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)   # Python 3.13+
+    except TypeError:
+        segment = shared_memory.SharedMemory(name=name)
+        if os.name == 'posix':
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+def share_frame(data, columns=None):
+    """
+    📤 Index + Spalten hintereinander in ein neues Shared-Memory-Segment
+
+    Gibt (segment, beschreibung) zurück; die Beschreibung ist JSON-fähig und
+    reicht attach_frame() zum Wiederherstellen (Name, Zeilen, Layout, Zeitzone).
+    """
+    columns = list(columns) if columns is not None else list(data.columns)
+    arrays = [('__index__', _ns_values(data.index))] + [(str(c), np.ascontiguousarray(data[c].to_numpy())) for c in columns]
+    layout, size = [], 0
+    for name, values in arrays:
+        size += -size % 8
+        layout.append({'name': name, 'dtype': values.dtype.str, 'offset': size})
+        size += values.nbytes
+    segment = shared_memory.SharedMemory(create=True, size=max(size, 8))
+    for entry, (_, values) in zip(layout, arrays):
+        np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf, offset=entry['offset'])[:] = values
+    descriptor = {
+        'shm': segment.name,
+        'rows': len(data),
+        'layout': layout,
+        'tz': str(data.index.tz) if data.index.tz is not None else None,
+        'unit': getattr(data.index, 'unit', 'ns'),
+        'index_name': data.index.name,
+    }
+    return segment, descriptor
+
+def attach_frame(descriptor, copy=False):
+    """
+    📥 DataFrame aus einem Segment von share_frame()
+
+    copy=False: Spalten sind Sichten auf das Segment (Worker, nur lesen).
+    copy=True: eigene Kopie, das Segment wird sofort wieder geschlossen.
+    Gibt (segment oder None, DataFrame) zurück.
+    """
+    segment = _attach_shared_memory(descriptor['shm'])
+    rows = descriptor['rows']
+    arrays = {entry['name']: np.ndarray(rows, dtype=np.dtype(entry['dtype']), buffer=segment.buf, offset=entry['offset'])
+              for entry in descriptor['layout']}
+    if copy:
+        arrays = {name: values.copy() for name, values in arrays.items()}
+        segment.close()   # keine Sichten mehr auf das Segment
+        segment = None
+    index = pd.DatetimeIndex(arrays.pop('__index__').view('M8[ns]'), name=descriptor['index_name'])
+    if descriptor['tz']:
+        index = index.tz_localize('UTC').tz_convert(descriptor['tz'])
+    if descriptor['unit'] != 'ns':
+        index = index.as_unit(descriptor['unit'])
+    return segment, pd.DataFrame(arrays, index=index, copy=False)
+
+def worker_source_from_script(path):
+    """Resample-Code zwischen den RESAMPLE-WORKER-Markern eines generierten Skripts"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    start, end = lines.index(PARALLEL_WORKER_MARKERS[0]), lines.index(PARALLEL_WORKER_MARKERS[1])
+    return '\n'.join(lines[start + 1:end])
+
+def _private_worker_dir():
+    """
+    🔒 Verzeichnis nur für den aktuellen Benutzer (0700) im Temp-Verzeichnis
+
+    Gehört ein vorhandenes Verzeichnis jemand anderem oder ist es für andere
+    beschreibbar, wird ein frisches mkdtemp-Verzeichnis verwendet.
+    """
+    owner = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+    directory = os.path.join(tempfile.gettempdir(), f"punkt_resample_{owner}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    if hasattr(os, 'getuid'):
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            return tempfile.mkdtemp(prefix='punkt_resample_')
+    return directory
+
+def write_worker_script(worker_source):
+    """💾 Worker-Skript mit Inhalts-Hash im privaten Verzeichnis (stabiler Pfad für den Numba-Cache)"""
+    source = worker_source + "\n\nif __name__ == '__main__':\n    sys.exit(parallel_worker_main())\n"
+    digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+    path = os.path.join(_private_worker_dir(), f"punkt_resample_worker_{digest}.py")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == source:
+                return path
+    except (OSError, UnicodeDecodeError):
+        pass
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    os.replace(tmp_path, path)
+    return path
+
+def resample_worker_group(data, timeframes, session=None):
+    """
+    ⚡ Eine Timeframe-Gruppe wie der serielle Pfad: Session-Buckets, sonst
+    Single-Pass bzw. Numba-Kernel je Timeframe, Pandas als Rückfall.
+    Gibt ({tf: DataFrame}, gelesene Zeilen) zurück.
+    """
+    frames = {}
+    rows_read = 0
+    if session:
+        clock = session_clock(data.index, session)
+        for tf in timeframes:
+            frames[tf] = resample_ohlcv_session(data, tf, clock=clock)
+            rows_read += len(data)
+    elif (len(timeframes) > 1 and NUMBA_RESAMPLE_AVAILABLE
+          and numba_resample_worthwhile(len(data), _bucket_ohlcv_multi_nb, RESAMPLE_SINGLE_PASS_MIN_ROWS)):
+        frames, _ = resample_ohlcv_multi(data, timeframes)
+        rows_read += len(data) if frames else 0
+    for tf in timeframes:
+        if frames.get(tf) is None and numba_resample_worthwhile(len(data)):
+            frames[tf] = resample_ohlcv_numba(data, tf)
+            rows_read += len(data)
+        if frames.get(tf) is None:
+            frames[tf] = pandas_resample_ohlcv(data, tf)
+            rows_read += len(data)
+    return frames, rows_read
+
+def parallel_worker_main():
+    """
+    🧵 Worker-Schleife: eine JSON-Zeile pro Auftrag auf stdin
+    {'frame': beschreibung, 'timeframes': [...], 'session': ...}, Antwort als
+    Protokoll-Zeile auf stdout. Ergebnis-Segmente leben bis zum nächsten Auftrag
+    bzw. {'command': 'exit'}, damit der Aufrufer sie vorher kopieren kann.
+    """
+    import warnings
+    warnings.filterwarnings('ignore')   # wie die generierten Skripte
+    protocol = sys.stdout
+    sys.stdout = sys.stderr   # Ausgaben der Resampler gehen nicht ins Protokoll
+    base_segment, base_name, data = None, None, None
+    pending = []
+    for line in sys.stdin:
+        message = json.loads(line)
+        for segment in pending:
+            segment.close()
+            segment.unlink()
+        pending = []
+        if message.get('command') == 'exit':
+            break
+
+        start = time.perf_counter()
+        reply = {'results': {}, 'errors': {}, 'pid': os.getpid()}
+        try:
+            if message['frame']['shm'] != base_name:
+                base_segment, data = attach_frame(message['frame'])
+                base_name = message['frame']['shm']
+            frames, reply['rows_read'] = resample_worker_group(data, message['timeframes'], message.get('session'))
+            for tf, frame in frames.items():
+                if frame is None or frame.empty:
+                    reply['results'][tf] = None
+                    continue
+                segment, descriptor = share_frame(frame)
+                pending.append(segment)
+                reply['results'][tf] = descriptor
+        except Exception as e:
+            reply['errors']['*'] = f"{type(e).__name__}: {e}"
+        reply['seconds'] = round(time.perf_counter() - start, 4)
+        protocol.write(_PARALLEL_PROTOCOL_PREFIX + json.dumps(reply) + '\n')
+        protocol.flush()
+    for segment in pending:
+        segment.close()
+        segment.unlink()
+    data = frames = None
+    if base_segment is not None:
+        try:
+            base_segment.close()
+        except BufferError:
+            pass   # Sichten leben noch - das Betriebssystem gibt das Mapping beim Prozessende frei
+    return 0
+
+def _read_worker_reply(process, deadline):
+    """
+    Protokoll-Zeile des Workers bis zur Deadline (time.monotonic())
+
+    Gelesen wird in einem Thread (Pipes haben unter Windows kein select),
+    None bei Prozessende; nach Ablauf der Deadline TimeoutError.
+    """
+    replies = queue.Queue()
+
+    def read_reply():
+        try:
+            for line in process.stdout:
+                if line.startswith(_PARALLEL_PROTOCOL_PREFIX):
+                    replies.put(json.loads(line[len(_PARALLEL_PROTOCOL_PREFIX):]))
+                    return
+        except (OSError, ValueError):
+            pass
+        replies.put(None)
+
+    threading.Thread(target=read_reply, daemon=True).start()
+    try:
+        return replies.get(timeout=max(0.0, deadline - time.monotonic()))
+    except queue.Empty:
+        raise TimeoutError(f"keine Antwort nach {PARALLEL_WORKER_TIMEOUT}s") from None
+
+def balance_timeframes(timeframes, workers, spacing_ns=60 * 10**9):
+    """
+    ⚖️ Timeframes auf Worker verteilen (größte Kosten zuerst an den leersten Worker)
+
+    Kosten pro Timeframe: ein Durchlauf über die Basis plus die Ausgabe
+    (Verhältnis Basis-Abstand / Bucket-Größe, 1m aus 1m = doppelte Kosten).
+    """
+    def cost(tf):
+        offset = timeframe_offset(tf)
+        size = _offset_size(offset) if offset is not None else spacing_ns
+        return 1.0 + min(1.0, spacing_ns / size)
+
+    groups = [[] for _ in range(max(1, workers))]
+    loads = [0.0] * len(groups)
+    for tf in sorted(dict.fromkeys(timeframes), key=cost, reverse=True):
+        target = loads.index(min(loads))
+        groups[target].append(tf)
+        loads[target] += cost(tf)
+    return [group for group in groups if group]
+
+def resample_timeframes_parallel(data, timeframes, workers, worker_source, session=None):
+    """
+    🧵 Timeframes in workers Prozessen über Shared Memory berechnen
+
+    Gibt ({tf: DataFrame oder None}, info) zurück. Timeframes eines
+    ausgefallenen Workers fehlen in den Ergebnissen (Aufrufer rechnet sie
+    seriell nach), info enthält Gruppen, Zeiten und Fehler.
+    """
+    columns = [column for column in _OHLCV_COLUMNS if column in data.columns]
+    spacing = int((_ns_values(data.index)[-1] - _ns_values(data.index)[0]) // max(len(data) - 1, 1)) or 60 * 10**9
+    groups = balance_timeframes(timeframes, workers, spacing)
+    info = {'workers': len(groups), 'groups': groups, 'seconds': {}, 'errors': {}, 'rows_read': 0}
+
+    start = time.perf_counter()
+    base_segment, descriptor = share_frame(data, columns)
+    info['share_seconds'] = round(time.perf_counter() - start, 4)
+    script = write_worker_script(worker_source)
+    processes = []
+    results = {}
+    try:
+        for group in groups:
+            process = subprocess.Popen([sys.executable, script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       text=True, encoding='utf-8')
+            process.stdin.write(json.dumps({'frame': descriptor, 'timeframes': group, 'session': session}) + '\n')
+            process.stdin.flush()
+            processes.append((process, group))
+
+        deadline = time.monotonic() + PARALLEL_WORKER_TIMEOUT
+        for process, group in processes:
+            try:
+                reply = _read_worker_reply(process, deadline)
+            except TimeoutError as e:
+                process.kill()
+                info['errors'][','.join(group)] = f"Worker hängt ({e}) - beendet"
+                continue
+            if reply is None:
+                info['errors'][','.join(group)] = f"Worker beendet (Exit-Code {process.poll()})"
+                continue
+            for tf, result in reply['results'].items():
+                results[tf] = attach_frame(result, copy=True)[1] if result is not None else None
+            if reply['errors']:
+                info['errors'][','.join(group)] = reply['errors']['*']
+            info['seconds'][','.join(group)] = reply['seconds']
+            info['rows_read'] += reply.get('rows_read', 0)
+            process.stdin.write(json.dumps({'command': 'exit'}) + '\n')
+            process.stdin.flush()
+    finally:
+        for process, _ in processes:
+            try:
+                process.stdin.close()
+                process.wait(timeout=PARALLEL_WORKER_TIMEOUT)
+            except Exception:
+                process.kill()
+        base_segment.close()
+        base_segment.unlink()
+    info['seconds_total'] = round(time.perf_counter() - start, 4)
+    return results, info
+# ▲ EMBED END
+
+def get_parallel_resample_source():
+    """Liefert den einbettbaren Worker-Pool-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
+
+def get_parallel_worker_source():
+    """Worker-Code im Repo: Resample-Code + Worker-Pool (wie zwischen den Markern der Skripte)"""
+    return get_resample_source() + '\n\n' + get_parallel_resample_source()
+
+def main(argv=None):
+    import argparse
+    from punkt_resample import RESAMPLE_TIMEFRAME_FREQ, frames_bit_identical
+
+    parser = argparse.ArgumentParser(description="Parallel-Resampling gegen den seriellen Pfad prüfen")
+    parser.add_argument('--parallel-test', dest='path', required=True,
+                        help="Column Store, Parquet, HDF5 oder CSV mit OHLCV-Daten")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--timeframes', nargs='+', default=list(RESAMPLE_TIMEFRAME_FREQ))
+    parser.add_argument('--session', default=None, help="Name aus RESAMPLE_SESSIONS")
+    args = parser.parse_args(argv)
+
+    from punkt_column_store import is_column_store, open_column_store
+    if is_column_store(args.path):
+        data = open_column_store(args.path)
+    elif args.path.endswith('.parquet'):
+        data = pd.read_parquet(args.path)
+    elif args.path.endswith('.csv'):
+        data = pd.read_csv(args.path, index_col=0, parse_dates=True)
+    else:
+        data = pd.read_hdf(args.path)
+
+    print(f"🧵 {len(data):,} Zeilen, {len(args.timeframes)} Timeframes, {args.workers} Worker")
+    start = time.perf_counter()
+    serial, _ = resample_worker_group(data, args.timeframes, args.session)
+    serial_s = time.perf_counter() - start
+    parallel, info = resample_timeframes_parallel(data, args.timeframes, args.workers,
+                                                  get_parallel_worker_source(), args.session)
+    identical = all(tf in parallel and (parallel[tf] is None) == (serial[tf] is None)
+                    and (serial[tf] is None or frames_bit_identical(parallel[tf], serial[tf]))
+                    for tf in args.timeframes)
+    for group in info['groups']:
+        key = ','.join(group)
+        print(f"   {key:<30} {info['seconds'].get(key, float('nan')):>8.3f}s  {info['errors'].get(key, '')}")
+    print(f"⏱️ Seriell {serial_s:.3f}s, parallel {info['seconds_total']:.3f}s "
+          f"(Shared Memory {info['share_seconds']:.3f}s) - {'✅ bit-identisch' if identical else '❌ Abweichung'}")
+    return 0 if identical else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
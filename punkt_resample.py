@@ -0,0 +1,856 @@
+#!/usr/bin/env python3
+"""
+🔗 PUNKT RESAMPLE - Kaskadierendes Multi-Timeframe Resampling
+
+Statt jeden Timeframe direkt aus der 1-Minuten-Basis zu berechnen, wird
+ein Ableitungsgraph gebaut: jeder Timeframe entsteht aus dem gröbsten
+bereits berechneten Timeframe, dessen Bins exakt in seine eigenen passen
+(5m ← 1m, 15m ← 5m, 1h ← 15m, 4h ← 1h, 1d ← 4h, 1w ← 1d).
+
+Exakt ist die Ableitung, weil first/max/min/last/sum assoziativ sind und
+die Bin-Grenzen des Quell-Timeframes eine Teilmenge der Ziel-Grenzen sind:
+
+    Tick-Offsets (T, H, D)   Ziel ist Vielfaches der Quelle, gleicher Ursprung
+                             (Mitternacht des ersten Tages)
+    Kalender-Offsets (W, M)  Quelle teilt einen Tag (Bins aus ganzen Tagen)
+    Zeitzone mit DST         Tages-Ziele nur aus Quellen, die eine Stunde teilen
+
+Nur die Basis wird einmal komplett gelesen, alle weiteren Stufen laufen
+über immer kleinere Zwischenergebnisse. Enthält die Basis NaN oder
+Volumen mit Nachkommastellen, wird direkt resampled (cascade_is_exact).
+Mit verify=True wird jeder
+abgeleitete Timeframe zusätzlich direkt berechnet und auf Gleichheit
+geprüft (bei Abweichung gilt das direkte Ergebnis).
+
+Der eigentliche Resample-Schritt ist ein Numba-Kernel, der Bars über
+ihre int64-Zeitstempel Buckets zuordnet (kein fester Faktor, Lücken und
+Session-Pausen sind egal). Gegenprobe gegen Pandas, bit-genau:
+
+    python punkt_resample.py --equivalence-test data/punkt1/NQ_1Jahr_PUNKT2_STORE_....cols
+
+Mit einer Session (RESAMPLE_SESSIONS, z.B. CME_ETH für NQ/ES) beginnen
+die Bars an der Session-Eröffnung statt an Mitternacht: session_clock()
+berechnet einmal pro Datensatz Session-Tag und Position jeder Bar, alle
+Timeframes leiten daraus nur noch ganzzahlige Bucket-ids ab.
+
+Für tägliche Updates berechnet resample_ohlcv_tail() nur den letzten
+(evtl. unfertigen) Bar und alles danach aus dem Ende der Basis neu.
+
+Die generierten Punkt2-Skripte betten den Block zwischen den EMBED-Markern
+über get_resample_source() ein.
+"""
+
+# ▼ EMBED START
+import os
+import time
+import weakref
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_RESAMPLE_AVAILABLE = True
+except ImportError:
+    NUMBA_RESAMPLE_AVAILABLE = False
+
+# Timeframe-Kürzel der GUI → Pandas-Frequenz
+RESAMPLE_TIMEFRAME_FREQ = {
+    '1m': '1T', '2m': '2T', '3m': '3T', '5m': '5T', '10m': '10T',
+    '15m': '15T', '30m': '30T', '1h': '1H', '2h': '2H', '4h': '4H',
+    '8h': '8H', '1d': '1D', '3d': '3D', '1w': '1W'
+}
+
+_NS_HOUR = pd.Timedelta(hours=1).value
+_NS_DAY = pd.Timedelta(days=1).value
+_SIZE_ANCHOR = pd.Timestamp('2000-01-03')
+
+def timeframe_offset(tf):
+    """Timeframe-Kürzel → Pandas-Offset (None bei unbekanntem Kürzel)"""
+    try:
+        return pd.tseries.frequencies.to_offset(RESAMPLE_TIMEFRAME_FREQ.get(tf, tf))
+    except (ValueError, TypeError):
+        return None
+
+def _offset_size(offset):
+    """Ungefähre Bin-Größe in ns (auch für Kalender-Offsets) zum Sortieren"""
+    if isinstance(offset, pd.offsets.Tick):
+        return offset.nanos
+    return ((_SIZE_ANCHOR + offset) - _SIZE_ANCHOR).value
+
+def can_derive(target, source, tz=None):
+    """
+    ✅ True, wenn jeder Bin von source vollständig in genau einem Bin von
+    target liegt - dann ist target aus source exakt ableitbar
+    """
+    if target is None or not isinstance(source, pd.offsets.Tick):
+        return False
+    local_dst = tz is not None and str(tz) != 'UTC'
+
+    if isinstance(target, pd.offsets.Tick):
+        if target.nanos <= source.nanos or target.nanos % source.nanos:
+            return False
+        # Tages-Bins folgen der lokalen Mitternacht: bei DST nur Stunden-Raster
+        if local_dst and target.nanos >= _NS_DAY and source.nanos < _NS_DAY:
+            return _NS_HOUR % source.nanos == 0
+        return True
+
+    # Kalender-Offsets bestehen aus ganzen (lokalen) Tagen
+    if source.nanos >= _NS_DAY:
+        return source.nanos == _NS_DAY
+    return (_NS_HOUR if local_dst else _NS_DAY) % source.nanos == 0
+
+def cascade_is_exact(data):
+    """
+    🔍 (exakt, grund): Ableitung ist nur exakt ohne NaN (dropna verwirft
+    sonst Zwischen-Zeilen samt Volumen) und mit ganzzahligem Volumen
+    (Float-Summen mit Nachkommastellen sind nicht assoziativ)
+    """
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        if column in data.columns:
+            values = data[column].to_numpy()
+            if values.dtype.kind == 'f' and np.isnan(values).any():
+                return False, f"NaN in '{column}'"
+    if 'volume' in data.columns:
+        volume = data['volume'].to_numpy()
+        if volume.dtype.kind == 'f' and not np.array_equal(volume, np.trunc(volume)):
+            return False, "Volumen mit Nachkommastellen"
+    return True, None
+
+def plan_resample_cascade(timeframes, tz=None, available=()):
+    """
+    🔗 Ableitungsgraph: {timeframe: quelle} in Ausführungsreihenfolge
+
+    quelle ist der gröbste passende Timeframe aus available oder den
+    vorher geplanten Timeframes, None = direkt aus der Basis.
+    """
+    offsets = {tf: timeframe_offset(tf) for tf in list(available) + list(timeframes)}
+    ordered = sorted(dict.fromkeys(timeframes),
+                     key=lambda tf: _offset_size(offsets[tf]) if offsets[tf] is not None else 0)
+
+    plan = {}
+    candidates = [tf for tf in available if offsets[tf] is not None]
+    for tf in ordered:
+        sources = [src for src in candidates if src != tf and can_derive(offsets[tf], offsets[src], tz)]
+        plan[tf] = max(sources, key=lambda src: offsets[src].nanos) if sources else None
+        if offsets[tf] is not None:
+            candidates.append(tf)
+    return plan
+
+# ⚡ NUMBA BUCKET-RESAMPLER
+# Bucket = origin + floor((clock - origin) / step) * step auf int64-Zeitstempeln,
+# Label = Bucket-Start + label_offset. Lücken und Session-Pausen erzeugen
+# einfach keine Zeilen (leere Buckets entstehen gar nicht erst).
+#
+#   Tick (T, H, S)  clock = UTC-ns, origin = lokale Mitternacht des ersten Tages
+#   Tag (D, 3D)     clock = Wanduhr-ns (Kalendertage auch bei DST)
+#   Woche (W-xxx)   clock = Wanduhr-ns, 7-Tage-Buckets ab dem Tag nach dem
+#                   Anker-Wochentag, Label = Anker-Tag (wie Pandas label='right')
+#
+# NaN-Semantik wie Pandas: first/last/max/min überspringen NaN, sum mit
+# Kahan-Summation (wie groupby.sum) - damit bit-identisch zu resample().agg().
+
+RESAMPLE_BLOCK_ROWS = 16_384   # Single-Pass: 6 Arrays x 16k x 8 Byte ≈ 800 KB pro Block
+_NO_BUCKET = -(2 ** 62)        # Ende vor dem ersten Bucket: erster Zeitstempel eröffnet ihn
+
+if NUMBA_RESAMPLE_AVAILABLE:
+    @njit(nogil=True, cache=True)
+    def _bucket_ohlcv_nb(clock, origin, step, open_arr, high_arr, low_arr, close_arr, volume_arr):
+        n = clock.shape[0]
+        # Zeitstempel sind sortiert: Division nur beim Wechsel in einen neuen Bucket
+        buckets = 0
+        end = clock[0]
+        for i in range(n):
+            if clock[i] >= end:
+                buckets += 1
+                end = origin + ((clock[i] - origin) // step + 1) * step
+        out_key = np.empty(buckets, dtype=np.int64)
+        out_open = np.empty(buckets)
+        out_high = np.empty(buckets)
+        out_low = np.empty(buckets)
+        out_close = np.empty(buckets)
+        out_volume = np.empty(buckets, dtype=volume_arr.dtype)
+
+        # Akkumulatoren in Registern, jeder Bucket wird einmal beim Schließen geschrieben
+        b = -1
+        end = clock[0]
+        o = np.nan
+        h = -np.inf
+        l = np.inf
+        valid_high = 0
+        valid_low = 0
+        c = np.nan
+        v = volume_arr.dtype.type(0)
+        compensation = volume_arr.dtype.type(0)
+        for i in range(n):
+            if clock[i] >= end:
+                if b >= 0:
+                    out_open[b] = o
+                    out_high[b] = h if valid_high else np.nan
+                    out_low[b] = l if valid_low else np.nan
+                    out_close[b] = c
+                    out_volume[b] = v
+                b += 1
+                # lückenlose Daten: der nächste Bucket beginnt am alten Ende (keine Division)
+                if b > 0 and clock[i] < end + step:
+                    key = end
+                else:
+                    key = origin + ((clock[i] - origin) // step) * step
+                out_key[b] = key
+                end = key + step
+                o = np.nan
+                h = -np.inf
+                l = np.inf
+                valid_high = 0
+                valid_low = 0
+                c = np.nan
+                v = volume_arr.dtype.type(0)
+                compensation = volume_arr.dtype.type(0)
+            if o != o:
+                o = open_arr[i]
+            value = high_arr[i]
+            valid_high += value == value
+            h = value if value > h else h
+            value = low_arr[i]
+            valid_low += value == value
+            l = value if value < l else l
+            value = close_arr[i]
+            c = value if value == value else c
+            volume = volume_arr[i]
+            if volume == volume:
+                y = volume - compensation
+                total_volume = v + y
+                compensation = total_volume - v - y
+                if compensation != compensation:
+                    compensation = volume_arr.dtype.type(0)
+                v = total_volume
+        if b >= 0:
+            out_open[b] = o
+            out_high[b] = h if valid_high else np.nan
+            out_low[b] = l if valid_low else np.nan
+            out_close[b] = c
+            out_volume[b] = v
+        return out_key, out_open, out_high, out_low, out_close, out_volume
+
+    @njit(nogil=True, cache=True)
+    def _accumulate_nb(t, clock, open_arr, high_arr, low_arr, close_arr, volume_arr, start, stop,
+                       origin, step, first_slot, ends, position, acc, acc_volume, compensation,
+                       out_key, out_open, out_high, out_low, out_close, out_volume):
+        """Zeilen [start, stop) in den laufenden Bucket von Timeframe t; Akkumulatoren in Registern"""
+        end = ends[t]
+        b = position[t]
+        o = acc[t, 0]
+        h = acc[t, 1]
+        l = acc[t, 2]
+        c = acc[t, 3]
+        v = acc_volume[t]
+        comp = compensation[t]
+        # high/low ohne Sprünge: ±inf als Startwert, NaN erst beim Schließen (Zähler gültiger Werte)
+        valid_high = 0 if h != h else 1
+        valid_low = 0 if l != l else 1
+        h = -np.inf if h != h else h
+        l = np.inf if l != l else l
+        for i in range(start, stop):
+            if clock[i] >= end:
+                if b >= first_slot:
+                    out_open[b] = o
+                    out_high[b] = h if valid_high else np.nan
+                    out_low[b] = l if valid_low else np.nan
+                    out_close[b] = c
+                    out_volume[b] = v
+                b += 1
+                # lückenlose Daten: der nächste Bucket beginnt am alten Ende (keine Division)
+                key = end if clock[i] < end + step else origin + ((clock[i] - origin) // step) * step
+                out_key[b] = key
+                end = key + step
+                o = np.nan
+                h = -np.inf
+                l = np.inf
+                valid_high = 0
+                valid_low = 0
+                c = np.nan
+                v = volume_arr.dtype.type(0)
+                comp = volume_arr.dtype.type(0)
+            value = open_arr[i]
+            if o != o:
+                o = value
+            value = high_arr[i]
+            valid_high += value == value
+            h = value if value > h else h
+            value = low_arr[i]
+            valid_low += value == value
+            l = value if value < l else l
+            value = close_arr[i]
+            c = value if value == value else c
+            volume = volume_arr[i]
+            if volume == volume:
+                y = volume - comp
+                total_volume = v + y
+                comp = total_volume - v - y
+                if comp != comp:
+                    comp = volume_arr.dtype.type(0)
+                v = total_volume
+        h = h if valid_high else np.nan
+        l = l if valid_low else np.nan
+        ends[t] = end
+        position[t] = b
+        acc[t, 0] = o
+        acc[t, 1] = h
+        acc[t, 2] = l
+        acc[t, 3] = c
+        acc_volume[t] = v
+        compensation[t] = comp
+
+    @njit(nogil=True, cache=True)
+    def _bucket_ohlcv_multi_nb(utc_clock, wall_clock, use_wall, origins, steps, parents,
+                               open_arr, high_arr, low_arr, close_arr, volume_arr):
+        """
+        Alle Timeframes in einem Durchlauf über die Basis.
+
+        Die Basis wird blockweise (RESAMPLE_BLOCK_ROWS) genau einmal gelesen.
+        Wurzel-Timeframes (parents[t] < 0) verarbeiten die Zeilen, alle
+        anderen die abgeschlossenen Buckets ihres Eltern-Timeframes direkt
+        nach jedem Block (Reihenfolge: Eltern vor Kindern). Ausgaben liegen
+        vorab alloziert hintereinander, Timeframe t in [offsets[t], offsets[t+1]).
+        """
+        n = utc_clock.shape[0]
+        k = steps.shape[0]
+
+        # Zählen: nur Zeitstempel-Vergleiche, ergibt die exakten Ausgabegrößen
+        ends = np.full(k, _NO_BUCKET, dtype=np.int64)
+        counts = np.zeros(k, dtype=np.int64)
+        for block in range(0, n, RESAMPLE_BLOCK_ROWS):
+            stop = min(block + RESAMPLE_BLOCK_ROWS, n)
+            for t in range(k):
+                clock = wall_clock if use_wall[t] else utc_clock
+                origin = origins[t]
+                step = steps[t]
+                end = ends[t]
+                count = counts[t]
+                for i in range(block, stop):
+                    if clock[i] >= end:
+                        count += 1
+                        end = end + step if clock[i] < end + step else origin + ((clock[i] - origin) // step + 1) * step
+                ends[t] = end
+                counts[t] = count
+
+        offsets = np.zeros(k + 1, dtype=np.int64)
+        for t in range(k):
+            offsets[t + 1] = offsets[t] + counts[t]
+        total = offsets[k]
+        out_key = np.empty(total, dtype=np.int64)
+        out_open = np.empty(total)
+        out_high = np.empty(total)
+        out_low = np.empty(total)
+        out_close = np.empty(total)
+        out_volume = np.empty(total, dtype=volume_arr.dtype)
+
+        # Laufender Bucket je Timeframe (zwischen den Aufrufen), cursor = nächster Eltern-Bucket
+        position = offsets[:k] - 1
+        cursor = offsets[:k].copy()
+        acc = np.full((k, 4), np.nan)
+        acc_volume = np.zeros(k, dtype=volume_arr.dtype)
+        compensation = np.zeros(k, dtype=volume_arr.dtype)
+        ends[:] = _NO_BUCKET
+        for t in range(k):
+            if parents[t] >= 0:
+                cursor[t] = offsets[parents[t]]
+
+        for block in range(0, n, RESAMPLE_BLOCK_ROWS):
+            stop = min(block + RESAMPLE_BLOCK_ROWS, n)
+            for t in range(k):
+                parent = parents[t]
+                if parent < 0:
+                    _accumulate_nb(t, wall_clock if use_wall[t] else utc_clock,
+                                   open_arr, high_arr, low_arr, close_arr, volume_arr, block, stop,
+                                   origins[t], steps[t], offsets[t], ends, position, acc, acc_volume,
+                                   compensation, out_key, out_open, out_high, out_low, out_close, out_volume)
+                elif position[parent] > cursor[t]:
+                    # abgeschlossene Eltern-Buckets [cursor, position[parent])
+                    _accumulate_nb(t, out_key, out_open, out_high, out_low, out_close, out_volume,
+                                   cursor[t], position[parent], origins[t], steps[t], offsets[t], ends,
+                                   position, acc, acc_volume, compensation,
+                                   out_key, out_open, out_high, out_low, out_close, out_volume)
+                    cursor[t] = position[parent]
+
+        # Abschluss: offene Buckets schreiben, Kinder erhalten den letzten Eltern-Bucket
+        for t in range(k):
+            parent = parents[t]
+            if parent >= 0 and position[parent] + 1 > cursor[t]:
+                _accumulate_nb(t, out_key, out_open, out_high, out_low, out_close, out_volume,
+                               cursor[t], position[parent] + 1, origins[t], steps[t], offsets[t], ends,
+                               position, acc, acc_volume, compensation,
+                               out_key, out_open, out_high, out_low, out_close, out_volume)
+            b = position[t]
+            if b >= offsets[t]:
+                out_open[b] = acc[t, 0]
+                out_high[b] = acc[t, 1]
+                out_low[b] = acc[t, 2]
+                out_close[b] = acc[t, 3]
+                out_volume[b] = acc_volume[t]
+        return offsets, out_key, out_open, out_high, out_low, out_close, out_volume
+
+_NS_WEEK = 7 * _NS_DAY
+RESAMPLE_NUMBA_MIN_ROWS = 1_000_000   # darunter lohnt der JIT-Compile nicht (außer schon kompiliert)
+RESAMPLE_SINGLE_PASS_MIN_ROWS = 5_000_000   # Single-Pass-Kernel: ~4x längerer Compile
+
+def _ns_values(index):
+    return index.asi8 if index.unit == 'ns' else index.as_unit('ns').asi8
+
+_WALL_CLOCK_CACHE = {}
+
+def _wall_clock_ns(index):
+    """Wanduhr-ns eines tz-aware Index, einmal pro Index-Objekt berechnet (tz_localize ist der teure Teil)"""
+    if index.tz is None:
+        return _ns_values(index)
+    key = id(index)
+    cached = _WALL_CLOCK_CACHE.get(key)
+    if cached is not None and cached[0]() is index:
+        return cached[1]
+
+    wall = _ns_values(index.tz_localize(None))
+    try:
+        ref = weakref.ref(index, lambda _ref, key=key: _WALL_CLOCK_CACHE.pop(key, None))
+        _WALL_CLOCK_CACHE[key] = (ref, wall)
+    except TypeError:
+        pass  # Index ohne Weakref-Unterstützung - nicht cachen
+    return wall
+
+def bucket_spec(index, offset):
+    """
+    🧮 (origin, step, label_offset, wall) für den Numba-Resampler,
+    None wenn der Offset nicht unterstützt wird (→ Pandas).
+    wall=True: Buckets auf der Wanduhr-Zeit statt auf UTC-ns.
+    """
+    first = pd.Timestamp(index[0]).as_unit('ns')
+    if isinstance(offset, pd.offsets.Day):
+        first_wall = first.tz_localize(None).value
+        return (first_wall // _NS_DAY) * _NS_DAY, offset.nanos, 0, True
+    if isinstance(offset, pd.offsets.Tick):
+        return first.normalize().value, offset.nanos, 0, False
+    if isinstance(offset, pd.offsets.Week) and offset.n == 1 and offset.weekday is not None:
+        # 1970-01-01 war ein Donnerstag (weekday 3); Bucket beginnt am Tag nach dem Anker
+        origin = ((offset.weekday + 1 - 3) % 7) * _NS_DAY
+        return origin, _NS_WEEK, _NS_WEEK - _NS_DAY, True
+    return None
+
+def numba_resample_worthwhile(rows, kernel=None, min_rows=RESAMPLE_NUMBA_MIN_ROWS):
+    """Kernel nutzen, wenn die Zeilen den Compile lohnen oder er schon kompiliert ist"""
+    if not NUMBA_RESAMPLE_AVAILABLE:
+        return False
+    kernel = kernel if kernel is not None else _bucket_ohlcv_nb
+    return rows >= min_rows or bool(kernel.signatures)
+
+_OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def _kernel_inputs(data):
+    """OHLCV-Arrays für die Kernel oder None (fehlende Spalten, dtypes, unsortiert)"""
+    if not NUMBA_RESAMPLE_AVAILABLE or data is None or data.empty:
+        return None
+    if not isinstance(data.index, pd.DatetimeIndex) or not data.index.is_monotonic_increasing:
+        return None
+    if any(column not in data.columns for column in _OHLCV_COLUMNS):
+        return None
+    values = [data[column].to_numpy() for column in _OHLCV_COLUMNS]
+    if any(v.dtype != np.float64 for v in values[:4]) or values[4].dtype not in (np.float64, np.int64):
+        return None
+    return values
+
+def _frame_from_buckets(data, keys, aggregated, label_offset, wall, columns=_OHLCV_COLUMNS):
+    """Kernel-Ausgabe → DataFrame wie resample().agg().dropna() (columns benennt aggregated der Reihe nach)"""
+    # dropna() wie im Pandas-Pfad: Buckets mit NaN in irgendeiner Spalte entfallen
+    valid = np.ones(len(keys), dtype=np.bool_)
+    for out in aggregated:
+        if out.dtype.kind == 'f':
+            valid &= ~np.isnan(out)
+    if not valid.all():
+        keys = keys[valid]
+        aggregated = [out[valid] for out in aggregated]
+
+    tz = data.index.tz
+    index = pd.DatetimeIndex((keys + label_offset).view('M8[ns]'))
+    if tz is not None:
+        index = index.tz_localize(tz) if wall else index.tz_localize('UTC').tz_convert(tz)
+    index = index.as_unit(data.index.unit).rename(data.index.name)
+    return pd.DataFrame(dict(zip(columns, aggregated)), index=index)
+
+def resample_ohlcv_numba(data, tf):
+    """
+    ⚡ OHLCV-Resample mit dem Numba-Bucket-Kernel
+
+    Gleiches Ergebnis wie data.resample(freq).agg(first/max/min/last/sum).dropna(),
+    None wenn Numba, Offset, Spalten oder dtypes nicht passen (→ Pandas-Pfad).
+    """
+    offset = timeframe_offset(tf)
+    values = _kernel_inputs(data) if offset is not None else None
+    spec = bucket_spec(data.index, offset) if values is not None else None
+    if spec is None:
+        return None
+
+    origin, step, label_offset, wall = spec
+    clock = _wall_clock_ns(data.index) if wall else _ns_values(data.index)
+    keys, *aggregated = _bucket_ohlcv_nb(clock, origin, step, *values)
+    return _frame_from_buckets(data, keys, aggregated, label_offset, wall)
+
+def resample_ohlcv_multi(data, timeframes):
+    """
+    ⚡ Alle unterstützten timeframes mit einem einzigen Durchlauf über die Basis
+
+    Ist die Kaskade exakt (cascade_is_exact), lesen nur die feinsten
+    Timeframes die Basis-Zeilen, gröbere werden im selben Durchlauf aus den
+    abgeschlossenen Buckets ihres Eltern-Timeframes gebildet (Ableitungsregeln
+    wie plan_resample_cascade). Sonst liest jeder Timeframe die Zeilen selbst.
+
+    Gibt ({tf: DataFrame}, {tf: eltern}) nur für die Timeframes zurück, die der
+    Kernel abdeckt - der Rest (unbekannte Offsets, falsche dtypes) fehlt.
+    """
+    values = _kernel_inputs(data)
+    if values is None:
+        return {}, {}
+    specs = {}
+    for tf in dict.fromkeys(timeframes):
+        offset = timeframe_offset(tf)
+        spec = bucket_spec(data.index, offset) if offset is not None else None
+        if spec is not None:
+            specs[tf] = spec
+    if not specs:
+        return {}, {}
+
+    tz = data.index.tz
+    same_clock = tz is None or str(tz) == 'UTC'  # Wanduhr == UTC-Uhr
+    if cascade_is_exact(data)[0]:
+        plan = plan_resample_cascade(list(specs), tz)
+        # Eltern nur mit derselben Uhr (UTC-Buckets → Wanduhr-Buckets bräuchte die Zonen-Regeln)
+        plan = {tf: (source if source is not None and (same_clock or specs[tf][3] == specs[source][3]) else None)
+                for tf, source in plan.items()}
+    else:
+        plan = {tf: None for tf in sorted(specs, key=lambda tf: _offset_size(timeframe_offset(tf)))}
+    order = list(plan)
+    use_wall = np.array([specs[tf][3] for tf in order], dtype=np.bool_)
+    utc_clock = _ns_values(data.index)
+    wall_clock = _wall_clock_ns(data.index) if use_wall.any() and not same_clock else utc_clock
+    origins = np.array([specs[tf][0] for tf in order], dtype=np.int64)
+    steps = np.array([specs[tf][1] for tf in order], dtype=np.int64)
+    parents = np.array([order.index(plan[tf]) if plan[tf] is not None else -1 for tf in order], dtype=np.int64)
+    offsets, keys, *aggregated = _bucket_ohlcv_multi_nb(utc_clock, wall_clock, use_wall, origins, steps, parents, *values)
+
+    results = {}
+    for t, tf in enumerate(order):
+        _, _, label_offset, wall = specs[tf]
+        part = slice(offsets[t], offsets[t + 1])
+        results[tf] = _frame_from_buckets(data, keys[part], [out[part] for out in aggregated], label_offset, wall)
+    return {tf: results[tf] for tf in specs}, plan
+
+# 🕐 SESSION-VERANKERTE BARS
+# Buckets beginnen an der Session-Eröffnung statt an Mitternacht (UTC):
+#
+#   Intraday (T, H)  open + k * step innerhalb der Session, letzter Bar endet an close
+#   Tag (D, nD)      ein Bar pro Handelstag (= Tag, an dem die Session schließt)
+#   Woche (W)        Handelstage Montag-Freitag, Label = Eröffnung der ersten Session
+#
+# Zeiten sind Wanduhr der Session-Zeitzone (DST über die Zeitzone), Bars
+# außerhalb [open, close) entfallen. ASIA/LONDON/NEW_YORK wie in
+# Punkt4_tab2_essential (UTC), CME_ETH/CME_RTH für NQ/ES-Futures.
+RESAMPLE_SESSIONS = {
+    'CME_ETH': {'tz': 'America/New_York', 'open': '18:00', 'close': '17:00'},
+    'CME_RTH': {'tz': 'America/New_York', 'open': '09:30', 'close': '16:00'},
+    'ASIA': {'tz': 'UTC', 'open': '22:00', 'close': '08:00'},
+    'LONDON': {'tz': 'UTC', 'open': '08:00', 'close': '16:00'},
+    'NEW_YORK': {'tz': 'UTC', 'open': '13:00', 'close': '21:00'},
+}
+
+_EPOCH_MONDAY = 4   # 1970-01-05 war ein Montag (Tage seit Epoch)
+
+def _clock_minutes_ns(text):
+    hours, minutes = text.split(':')
+    return (int(hours) * 60 + int(minutes)) * 60 * 10**9
+
+def session_clock(index, session):
+    """
+    🕐 Ein vektorisierter Durchlauf: Session-Tag, Position in der Session und
+    Handelszeit-Maske für jede Bar. Alle Timeframes nutzen dieselbe Uhr.
+
+    session ist ein Name aus RESAMPLE_SESSIONS oder ein Dict {'tz', 'open', 'close'}.
+    Naive Zeitstempel gelten als Wanduhr der Session-Zeitzone.
+    """
+    definition = RESAMPLE_SESSIONS[session] if isinstance(session, str) else session
+    session_tz = definition.get('tz')
+    if index.tz is not None:
+        local = index.tz_convert(session_tz) if session_tz else index
+        wall = _ns_values(local.tz_localize(None))
+    else:
+        wall = _ns_values(index)
+    open_ns = _clock_minutes_ns(definition['open'])
+    length = (_clock_minutes_ns(definition['close']) - open_ns) % _NS_DAY or _NS_DAY
+
+    shifted = wall - open_ns
+    session_day = shifted // _NS_DAY
+    position = shifted - session_day * _NS_DAY
+    return {
+        'definition': definition,
+        'wall': wall,
+        'utc': _ns_values(index) if index.tz is not None else None,
+        'session_day': session_day,
+        'position': position,
+        'in_session': position < length,
+        'open_ns': open_ns,
+        'length': length,
+        # Über Mitternacht laufende Sessions zählen zum Tag, an dem sie schließen
+        'overnight': int(open_ns + length > _NS_DAY),
+    }
+
+def session_bucket_ids(clock, tf):
+    """
+    🔢 (ids, label_wall) für die Bars in der Session, oder None bei nicht
+    unterstützten Offsets. ids sind monoton, label_wall = Bucket-Start (Wanduhr-ns).
+    """
+    offset = timeframe_offset(tf)
+    mask = clock['in_session']
+    session_day = clock['session_day'][mask]
+    open_ns = clock['open_ns']
+    if isinstance(offset, pd.offsets.Tick) and offset.nanos < _NS_DAY:
+        step = offset.nanos
+        slot = clock['position'][mask] // step
+        ids = session_day * (-(-clock['length'] // step)) + slot
+        return ids, open_ns + session_day * _NS_DAY + slot * step
+    trading_day = session_day + clock['overnight']
+    if isinstance(offset, pd.offsets.Day) or (isinstance(offset, pd.offsets.Tick) and offset.nanos % _NS_DAY == 0):
+        days = offset.nanos // _NS_DAY
+        ids = trading_day // days
+        return ids, open_ns + (ids * days - clock['overnight']) * _NS_DAY
+    if isinstance(offset, pd.offsets.Week) and offset.n == 1:
+        ids = (trading_day - _EPOCH_MONDAY) // 7
+        return ids, open_ns + (ids * 7 + _EPOCH_MONDAY - clock['overnight']) * _NS_DAY
+    return None
+
+def resample_ohlcv_session(data, tf, session=None, clock=None):
+    """
+    🕐 OHLCV-Resample mit Session-verankerten Buckets
+
+    clock aus session_clock() wiederverwenden, wenn mehrere Timeframes
+    berechnet werden. Aggregation wie resample().agg().dropna() (NaN
+    überspringen, Kahan-Summe), Numba-Kernel ab RESAMPLE_NUMBA_MIN_ROWS.
+    None bei nicht unterstützten Offsets.
+    """
+    clock = clock if clock is not None else session_clock(data.index, session)
+    spec = session_bucket_ids(clock, tf)
+    if spec is None:
+        return None
+    ids, label_wall = spec
+    mask = clock['in_session']
+    frame = data[_OHLCV_COLUMNS][mask] if not mask.all() else data[_OHLCV_COLUMNS]
+    if frame.empty:
+        return frame
+
+    # Neuer Bucket bei jedem Wechsel der id (DST-Rückstellung: wiederholte Stunde bleibt getrennt)
+    starts = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1])))
+    run = np.cumsum(np.concatenate(([True], ids[1:] != ids[:-1])), dtype=np.int64) - 1
+    values = _kernel_inputs(frame)
+    if values is not None and numba_resample_worthwhile(len(frame)):
+        _, *aggregated = _bucket_ohlcv_nb(run, 0, 1, *values)
+    else:
+        grouped = frame.groupby(run).agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+        aggregated = [grouped[column].to_numpy() for column in _OHLCV_COLUMNS]
+
+    labels = label_wall[starts]
+    if clock['utc'] is not None:
+        # Label über den UTC-Offset der ersten Bar: eindeutig auch in der DST-Stunde
+        utc = clock['utc'][mask] if not mask.all() else clock['utc']
+        labels = utc[starts] - (clock['wall'][mask][starts] - labels)
+        index = pd.DatetimeIndex(labels.view('M8[ns]')).tz_localize('UTC').tz_convert(data.index.tz)
+    else:
+        index = pd.DatetimeIndex(labels.view('M8[ns]'))
+    index = index.as_unit(data.index.unit).rename(data.index.name)
+
+    result = pd.DataFrame(dict(zip(_OHLCV_COLUMNS, aggregated)), index=index)
+    return result.dropna()
+
+def pandas_resample_ohlcv(data, tf):
+    """Referenz: der bisherige Pandas-Weg (resample().agg().dropna())"""
+    return data.resample(RESAMPLE_TIMEFRAME_FREQ.get(tf, tf)).agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+    }).dropna()
+
+def frames_bit_identical(left, right):
+    """Index, Spalten, dtypes und jedes Bit der Werte identisch (auch -0.0/NaN-Muster)"""
+    if left.shape != right.shape or list(left.columns) != list(right.columns):
+        return False
+    if not left.index.equals(right.index) or str(left.index.dtype) != str(right.index.dtype):
+        return False
+    for column in left.columns:
+        a, b = left[column].to_numpy(), right[column].to_numpy()
+        if a.dtype != b.dtype or not np.array_equal(a.view(np.uint8), b.view(np.uint8)):
+            return False
+    return True
+
+def check_resample_equivalence(data, timeframes=None, repeats=3):
+    """
+    🧪 Numba-Kernel gegen Pandas: bit-identisch pro Timeframe + Laufzeiten
+
+    Gibt {tf: {'identical', 'rows', 'pandas_s', 'numba_s', 'speedup'}} zurück.
+    """
+    timeframes = list(timeframes or RESAMPLE_TIMEFRAME_FREQ)
+    multi, _ = resample_ohlcv_multi(data, timeframes)
+    results = {}
+    for tf in timeframes:
+        expected = pandas_resample_ohlcv(data, tf)
+        actual = resample_ohlcv_numba(data, tf)
+        if actual is None:
+            results[tf] = {'identical': None, 'rows': len(expected)}
+            continue
+        pandas_s = numba_s = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            pandas_resample_ohlcv(data, tf)
+            pandas_s = min(pandas_s, time.perf_counter() - start)
+            start = time.perf_counter()
+            resample_ohlcv_numba(data, tf)
+            numba_s = min(numba_s, time.perf_counter() - start)
+        results[tf] = {
+            'identical': frames_bit_identical(actual, expected) and frames_bit_identical(multi[tf], expected),
+            'rows': len(expected),
+            'pandas_s': round(pandas_s, 4),
+            'numba_s': round(numba_s, 4),
+            'speedup': round(pandas_s / numba_s, 1) if numba_s else None,
+        }
+    return results
+
+def resample_cascade(data, timeframes, resample_func, produced=None, verify=False):
+    """
+    🔗 Berechnet timeframes über den Ableitungsgraphen
+
+    resample_func(frame, tf) ist die bisherige Einzel-Resample-Funktion,
+    sie wird nur mit kleineren Zwischenergebnissen statt der Basis
+    aufgerufen. produced enthält bereits berechnete Timeframes (z.B. aus
+    vorherigen Chunks), die als Quelle dienen dürfen.
+
+    Gibt (results, plan, stats) zurück, results in der Reihenfolge von timeframes.
+    """
+    produced = produced if produced is not None else {}
+    exact, reason = cascade_is_exact(data)
+    if exact:
+        available = [tf for tf, frame in produced.items() if frame is not None and not frame.empty]
+        plan = plan_resample_cascade(timeframes, getattr(data.index, 'tz', None), available)
+    else:
+        print(f"   ⚠️ Kaskade nicht exakt ({reason}) - alle Timeframes direkt aus der Basis")
+        plan = {tf: None for tf in dict.fromkeys(timeframes)}
+
+    results = {}
+    rows_read = 0
+    mismatches = []
+    for tf, source in plan.items():
+        source_frame = data if source is None else results.get(source, produced.get(source))
+        if source_frame is None:
+            source, source_frame = None, data  # Quelle fehlgeschlagen → direkt aus der Basis
+        start = time.perf_counter()
+        frame = resample_func(source_frame, tf)
+        rows_read += len(source_frame)
+        origin = 'Basis' if source is None else source
+        rows_out = len(frame) if frame is not None else 0
+        print(f"   🔗 {tf:>4} ← {origin:<5} ({len(source_frame):,} → {rows_out:,} Zeilen, "
+              f"{time.perf_counter() - start:.3f}s)")
+
+        if verify and source is not None:
+            direct = resample_func(data, tf)
+            if frame is None or direct is None or not frame.equals(direct):
+                print(f"   ⚠️ {tf}: Kaskade weicht vom direkten Resample ab - verwende direktes Ergebnis")
+                mismatches.append(tf)
+                frame = direct
+        results[tf] = frame
+        plan[tf] = source
+
+    stats = {
+        'rows_read': rows_read,
+        'rows_read_direct': len(data) * len(plan),
+        'base_passes': sum(1 for source in plan.values() if source is None),
+        'verified': bool(verify),
+        'mismatches': mismatches,
+    }
+    ordered = {tf: results[tf] for tf in dict.fromkeys(timeframes)}
+    return ordered, plan, stats
+
+def resample_ohlcv_tail(data, tf, last_bar, resample_func=None, session=None):
+    """
+    🔁 Inkrementelles Update: alle Bars ab last_bar (inklusive) neu berechnen
+
+    Gelesen werden nur die Basis-Zeilen ab zwei Bin-Breiten vor last_bar -
+    genug für den Bucket-Start auch bei rechts gelabelten Wochen-Bins und
+    DST-Tagen. Bins, die keine Stunde teilen (2H, 3D, 7T), behalten über
+    die erste Basis-Zeile den Ursprung der vollen Berechnung (lokale
+    Mitternacht des ersten Tages, mit DST um Stunden verschoben); Session-
+    Buckets hängen ohnehin nur von der Epoche ab.
+
+    Gibt (frame, rows_read) zurück, frame=None bei unbekanntem Offset.
+    """
+    offset = timeframe_offset(tf)
+    if offset is None:
+        return None, 0
+    last_bar = pd.Timestamp(last_bar)
+    if last_bar.tz is not None and data.index.tz is not None:
+        last_bar = last_bar.tz_convert(data.index.tz)
+    start = data.index.searchsorted(last_bar - pd.Timedelta(2 * _offset_size(offset), unit='ns'), side='left')
+    tail = data.iloc[start:]
+    if session:
+        frame = resample_ohlcv_session(tail, tf, session)
+    else:
+        if start > 0 and isinstance(offset, pd.offsets.Tick) and _NS_HOUR % offset.nanos:
+            tail = pd.concat([data.iloc[:1], tail])
+        frame = (resample_func or pandas_resample_ohlcv)(tail, tf)
+    if frame is None:
+        return None, len(tail)
+    return frame[frame.index >= last_bar], len(tail)
+# ▲ EMBED END
+
+def get_resample_source():
+    """Liefert den einbettbaren Resample-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
+
+def main(argv=None):
+    import argparse
+    from punkt_column_store import is_column_store, open_column_store
+
+    parser = argparse.ArgumentParser(description="Numba-Resampler gegen Pandas prüfen (bit-genau)")
+    parser.add_argument('--equivalence-test', dest='path', required=True,
+                        help="Column Store, Parquet, HDF5 oder CSV mit OHLCV-Daten")
+    parser.add_argument('--timeframes', nargs='*', help="Standard: alle Timeframes der GUI")
+    args = parser.parse_args(argv)
+
+    if is_column_store(args.path):
+        data = open_column_store(args.path)
+    elif args.path.endswith('.parquet'):
+        data = pd.read_parquet(args.path)
+    elif args.path.endswith('.csv'):
+        data = pd.read_csv(args.path, index_col=0, parse_dates=True)
+    else:
+        data = pd.read_hdf(args.path)
+
+    print(f"🧪 RESAMPLE-ÄQUIVALENZ: {len(data):,} Zeilen, Numba {'aktiv' if NUMBA_RESAMPLE_AVAILABLE else 'nicht installiert'}")
+    print(f"{'TF':>4} {'Zeilen':>10} {'Pandas s':>10} {'Numba s':>10} {'Speedup':>8}  Ergebnis")
+    failed = 0
+    results = check_resample_equivalence(data, args.timeframes)
+    for tf, r in results.items():
+        if r['identical'] is None:
+            print(f"{tf:>4} {r['rows']:>10,} {'-':>10} {'-':>10} {'-':>8}  ⚠️ nicht unterstützt (Pandas)")
+            continue
+        failed += not r['identical']
+        print(f"{tf:>4} {r['rows']:>10,} {r['pandas_s']:>10.4f} {r['numba_s']:>10.4f} {r['speedup']:>7.1f}x  "
+              + ("✅ bit-identisch" if r['identical'] else "❌ ABWEICHUNG"))
+
+    timeframes = [tf for tf, r in results.items() if r['identical'] is not None]
+    if timeframes:
+        start = time.perf_counter()
+        resample_ohlcv_multi(data, timeframes)
+        multi_s = time.perf_counter() - start
+        pandas_total = sum(results[tf]['pandas_s'] for tf in timeframes)
+        numba_total = sum(results[tf]['numba_s'] for tf in timeframes)
+        print(f"\n⚡ Single-Pass ({len(timeframes)} Timeframes, ein Durchlauf): {multi_s:.4f}s "
+              f"vs. {numba_total:.4f}s Numba einzeln vs. {pandas_total:.4f}s Pandas einzeln "
+              f"({pandas_total / multi_s:.1f}x)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
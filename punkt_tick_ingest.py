@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+📥 PUNKT TICK INGEST - Tick- und Sekunden-Exporte blockweise zu Basis-Bars
+
+Trade-Ticks (Zeit, Preis, Größe) und Sekunden-Bars aus Parquet/CSV sind
+für Pandas im RAM zu groß. ingest_tick_source() liest sie in Blöcken von
+TICK_INGEST_CHUNK_ROWS Zeilen (Parquet: Row-Group-Batches über pyarrow,
+CSV: read_csv(chunksize)), aggregiert jeden Block mit dem Bucket-Kernel
+aus punkt_resample zum kleinsten gewählten Timeframe und schreibt die
+fertigen Bars sofort in einen Column Store:
+
+    Block 1   ... | offener Bar ─┐ Zustand (open/high/low/close/volume,
+    Block 2   ──────┘ ... | offen ─┘ Kahan-Kompensation) bleibt im Kernel
+
+Der offene Bar am Blockende wird nicht geschrieben, sondern mit dem
+Kernel-Zustand in den nächsten Block getragen - das Ergebnis ist identisch
+mit einem Durchlauf über die ganze Datei. Ohne Numba trägt der Pandas-Weg
+die Roh-Zeilen des offenen Bars weiter.
+
+Der Store liegt in cache/ingest/ und wird wiederverwendet, solange Größe
+und Änderungszeit der Quelle passen; Punkt2 verarbeitet ihn danach wie
+einen Punkt1-Store (memmap, Kaskade, RAM-Budget).
+
+    python punkt_tick_ingest.py --ingest exports/NQ_ticks_2024.parquet --timeframe 1m
+
+Die generierten Punkt2-Skripte betten den Block zwischen den EMBED-Markern
+über get_tick_ingest_source() ein (nach Resample- und Column-Store-Code).
+"""
+
+from punkt_resample import (NUMBA_RESAMPLE_AVAILABLE, RESAMPLE_TIMEFRAME_FREQ, _NO_BUCKET, _OHLCV_COLUMNS,
+                            _frame_from_buckets, _ns_values, _offset_size, _wall_clock_ns, bucket_spec,
+                            timeframe_offset)
+from punkt_column_store import COLUMN_STORE_EXT, ColumnStoreWriter, is_column_store, read_column_store_header
+if NUMBA_RESAMPLE_AVAILABLE:
+    from punkt_resample import _accumulate_nb
+
+# ▼ EMBED START
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+    TICK_PARQUET_AVAILABLE = True
+except ImportError:
+    TICK_PARQUET_AVAILABLE = False
+
+TICK_INGEST_CHUNK_ROWS = 2_000_000    # ~100 MB pro Block bei Zeit/Preis/Größe
+TICK_PROBE_ROWS = 1000                # Kopf-Zeilen für die Erkennung (Ticks vs. Bars, Abstand)
+TICK_INGEST_DIR = os.path.join('cache', 'ingest')
+_TICK_TIME_COLUMNS = ('timestamp', 'datetime', 'date_time', 'time', 'date', 'ts')
+_TICK_PRICE_COLUMNS = ('price', 'last', 'trade_price', 'last_price', 'close')
+_TICK_SIZE_COLUMNS = ('size', 'volume', 'qty', 'quantity', 'trade_size', 'last_size')
+_TICK_TRADES_COLUMNS = ('trades', 'trade_count', 'count', 'ticks', 'num_trades')
+TICK_INGEST_VERSION = 2               # 2: Spalte trades (Anzahl Ticks pro Bar) für Tick-Bars
+_TICK_OFFSET_PATTERN = re.compile(r'(Z|[+-]\d\d:?\d\d)$')
+
+def iter_source_chunks(path, chunk_rows=TICK_INGEST_CHUNK_ROWS):
+    """Roh-Blöcke einer Parquet-/CSV-Datei (nie mehr als chunk_rows Zeilen im RAM)"""
+    if path.lower().endswith('.parquet'):
+        if not TICK_PARQUET_AVAILABLE:
+            raise ValueError("pyarrow fehlt - Parquet kann nicht blockweise gelesen werden")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif path.lower().endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    else:
+        raise ValueError(f"Nur Parquet/CSV werden blockweise gelesen: {os.path.basename(path)}")
+
+def _find_column(lower, candidates):
+    return next((lower[name] for name in candidates if name in lower), None)
+
+def detect_tick_layout(chunk):
+    """
+    🔍 Spalten eines Exports: {'kind': 'ticks'|'bars', 'time', 'price', 'size', 'ohlc'}
+
+    time=None heißt: Zeitstempel im Index (Parquet mit Pandas-Index).
+    """
+    lower = {str(c).lower(): c for c in chunk.columns}
+    time_column = None
+    if not isinstance(chunk.index, pd.DatetimeIndex):
+        time_column = _find_column(lower, _TICK_TIME_COLUMNS) or chunk.columns[0]
+    ohlc = [lower.get(name) for name in ('open', 'high', 'low', 'close')]
+    if all(column is not None for column in ohlc):
+        return {'kind': 'bars', 'time': time_column, 'ohlc': ohlc, 'price': None,
+                'size': lower.get('volume'), 'trades': _find_column(lower, _TICK_TRADES_COLUMNS)}
+    price = _find_column(lower, _TICK_PRICE_COLUMNS)
+    if price is None:
+        raise ValueError(f"Keine Preis-Spalte ({', '.join(_TICK_PRICE_COLUMNS)}) in {list(chunk.columns)}")
+    return {'kind': 'ticks', 'time': time_column, 'ohlc': None, 'price': price,
+            'size': _find_column(lower, _TICK_SIZE_COLUMNS), 'trades': None}
+
+def _epoch_unit(value):
+    """Epoch-Zahl → Einheit über die Größenordnung (s, ms, us, ns)"""
+    magnitude = abs(float(value))
+    return 'ns' if magnitude > 1e17 else 'us' if magnitude > 1e14 else 'ms' if magnitude > 1e11 else 's'
+
+def chunk_datetime_index(chunk, layout):
+    """DatetimeIndex eines Blocks (Spalte, Epoch-Zahlen oder Index)"""
+    if layout['time'] is None:
+        return pd.DatetimeIndex(chunk.index)
+    values = chunk[layout['time']]
+    if values.dtype.kind == 'M':
+        return pd.DatetimeIndex(values, name='datetime')
+    if values.dtype.kind in 'iuf':
+        return pd.DatetimeIndex(pd.to_datetime(values, unit=_epoch_unit(values.iloc[0])), name='datetime')
+    # Text mit UTC-Offset (auch gemischt über DST-Wechsel) → UTC, damit jeder Block dieselbe Zone hat
+    with_offset = bool(_TICK_OFFSET_PATTERN.search(str(values.iloc[0])))
+    return pd.DatetimeIndex(pd.to_datetime(values, format='ISO8601', utc=with_offset), name='datetime')
+
+def chunk_ohlcv_arrays(chunk, layout):
+    """(open, high, low, close, volume) als Kernel-Arrays; Ticks ohne Größe zählen als Volumen 1"""
+    if layout['kind'] == 'bars':
+        prices = [chunk[column].to_numpy(dtype=np.float64) for column in layout['ohlc']]
+    else:
+        price = chunk[layout['price']].to_numpy(dtype=np.float64)
+        prices = [price, price, price, price]
+    if layout['size'] is None:
+        volume = np.ones(len(chunk), dtype=np.int64)
+    else:
+        volume = chunk[layout['size']].to_numpy()
+        if volume.dtype.kind in 'iub':
+            volume = volume.astype(np.int64, copy=False)
+        else:
+            volume = volume.astype(np.float64, copy=False)
+    return prices + [volume]
+
+def chunk_trade_counts(chunk, layout):
+    """Trades pro Zeile (int64): ein Tick mit gültigem Preis = 1, Bars aus ihrer Trade-Spalte, sonst None"""
+    if layout['kind'] == 'ticks':
+        return chunk[layout['price']].notna().to_numpy(dtype=np.int64)
+    if layout.get('trades') is None:
+        return None
+    return chunk[layout['trades']].fillna(0).to_numpy().astype(np.int64)
+
+def ingest_bar_timeframe(timeframes):
+    """Kleinster Timeframe mit fester Bin-Breite (Wochen/Monate → 1d)"""
+    fixed = [tf for tf in timeframes if isinstance(timeframe_offset(tf), pd.offsets.Tick)]
+    return min(fixed, key=lambda tf: _offset_size(timeframe_offset(tf))) if fixed else '1d'
+
+class TickBarAggregator:
+    """
+    🧱 Aggregiert Blöcke zu Bars eines Timeframes, offener Bar über Blockgrenzen
+
+    push() gibt die im Block abgeschlossenen Bars zurück, finish() den letzten.
+    Bars wie resample().agg(first/max/min/last/sum).dropna() über alle Blöcke,
+    mit trades (Trades pro Zeile) zusätzlich die Spalte trades = Summe pro Bar.
+    """
+
+    def __init__(self, tf):
+        self.tf = tf
+        self.offset = timeframe_offset(tf)
+        if not isinstance(self.offset, pd.offsets.Tick):
+            raise ValueError(f"Timeframe {tf} hat keine feste Bin-Breite")
+        self.spec = None
+        self.template = None
+        self.volume_dtype = None
+        self.last_ns = None
+        self.carry_key = None
+        self.carry_rows = None
+        self.carry_trades = 0
+        self.with_trades = None
+        self.use_numba = NUMBA_RESAMPLE_AVAILABLE
+
+    def _start(self, index, volume):
+        self.spec = bucket_spec(index, self.offset)
+        self.template = pd.DataFrame(index=index[:0])
+        self.volume_dtype = volume.dtype
+        if self.use_numba:
+            self.ends = np.full(1, _NO_BUCKET, dtype=np.int64)
+            self.position = np.full(1, -1, dtype=np.int64)
+            self.acc = np.full((1, 4), np.nan)
+            self.acc_volume = np.zeros(1, dtype=volume.dtype)
+            self.compensation = np.zeros(1, dtype=volume.dtype)
+
+    def _check_chunk(self, index, volume):
+        if self.spec is None:
+            self._start(index, volume)
+        elif (index.tz is None) != (self.template.index.tz is None):
+            raise ValueError("Zeitzone wechselt zwischen den Blöcken")
+        if volume.dtype != self.volume_dtype:
+            if self.volume_dtype.kind == 'f' or (not np.isnan(volume).any() and (volume == np.round(volume)).all()):
+                volume = volume.astype(self.volume_dtype)
+            else:
+                raise ValueError("Volumen mit Nachkommastellen/NaN nach ganzzahligem Beginn")
+        clock = _ns_values(index)
+        if not (np.diff(clock) >= 0).all() or (self.last_ns is not None and clock[0] < self.last_ns):
+            raise ValueError(f"Zeitstempel nicht aufsteigend (Block ab {index[0]})")
+        self.last_ns = int(clock[-1])
+        return volume
+
+    def _bucket_trades(self, clock, trades, keys):
+        """Trades pro Bucket-Key (keys sortiert), offener Bucket über Blockgrenzen"""
+        origin, step = self.spec[0], self.spec[1]
+        row_keys = origin + ((clock - origin) // step) * step
+        starts = np.flatnonzero(np.r_[True, row_keys[1:] != row_keys[:-1]])
+        chunk_keys = row_keys[starts]
+        chunk_trades = np.add.reduceat(trades, starts)
+        if self.carry_key is not None and chunk_keys[0] == self.carry_key:
+            chunk_trades[0] += self.carry_trades
+        positions = np.minimum(np.searchsorted(chunk_keys, keys), len(chunk_keys) - 1)
+        found = chunk_keys[positions] == keys
+        counts = np.where(found, chunk_trades[positions], 0)
+        # Carry-Bucket ohne Zeilen in diesem Block behält seine bisherigen Trades
+        counts[(~found) & (keys == (self.carry_key if self.carry_key is not None else _NO_BUCKET))] = self.carry_trades
+        return counts.astype(np.int64)
+
+    def push(self, index, arrays, trades=None):
+        """Block aggregieren → DataFrame der abgeschlossenen Bars (trades: Trades pro Zeile oder None)"""
+        if not len(index):
+            return None
+        if self.with_trades is None:
+            self.with_trades = trades is not None
+        elif self.with_trades != (trades is not None):
+            raise ValueError("Trade-Spalte fehlt in einem Teil der Blöcke")
+        arrays = list(arrays[:4]) + [self._check_chunk(index, arrays[4])]
+        if not self.use_numba:
+            return self._push_pandas(index, arrays, trades)
+
+        origin, step, label_offset, wall = self.spec
+        clock = _wall_clock_ns(index) if wall else _ns_values(index)
+        size = len(index) + 1
+        out_key = np.empty(size, dtype=np.int64)
+        outputs = [np.empty(size) for _ in range(4)] + [np.empty(size, dtype=self.volume_dtype)]
+        if self.carry_key is not None:
+            out_key[0] = self.carry_key
+            self.position[0] = 0
+        _accumulate_nb(0, clock, *arrays, 0, len(index), origin, step, 0, self.ends, self.position,
+                       self.acc, self.acc_volume, self.compensation, out_key, *outputs)
+        closed = int(self.position[0])
+        columns = _OHLCV_COLUMNS
+        outputs = [out[:closed] for out in outputs]
+        if self.with_trades:
+            counts = self._bucket_trades(clock, trades, out_key[:closed + 1])
+            outputs.append(counts[:closed])
+            columns = _OHLCV_COLUMNS + ['trades']
+            self.carry_trades = int(counts[closed])
+        self.carry_key = int(out_key[closed])
+        return _frame_from_buckets(self.template, out_key[:closed], outputs, label_offset, wall, columns)
+
+    def _push_pandas(self, index, arrays, trades=None):
+        frame = pd.DataFrame(dict(zip(_OHLCV_COLUMNS, arrays)), index=index)
+        if trades is not None:
+            frame['trades'] = trades
+        if self.carry_rows is not None:
+            frame = pd.concat([self.carry_rows, frame])
+        bars = self._resample_pandas(frame)
+        if bars.empty:
+            return None
+        last_start = bars.index[-1]
+        self.carry_rows = frame[frame.index >= last_start]
+        return bars.iloc[:-1].dropna()
+
+    def _resample_pandas(self, frame):
+        origin = pd.Timestamp(self.spec[0], unit='ns')
+        if frame.index.tz is not None:
+            wall = self.spec[3]
+            origin = origin.tz_localize(frame.index.tz) if wall else origin.tz_localize('UTC').tz_convert(frame.index.tz)
+        aggregation = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+        if 'trades' in frame.columns:
+            aggregation['trades'] = 'sum'
+        return frame.resample(RESAMPLE_TIMEFRAME_FREQ.get(self.tf, self.tf), origin=origin).agg(aggregation)
+
+    def finish(self):
+        """Offenen Bar abschließen"""
+        if not self.use_numba:
+            if self.carry_rows is None:
+                return None
+            return self._resample_pandas(self.carry_rows).dropna()
+        if self.carry_key is None:
+            return None
+        _, _, label_offset, wall = self.spec
+        outputs = [self.acc[:, column].copy() for column in range(4)] + [self.acc_volume.copy()]
+        columns = _OHLCV_COLUMNS
+        if self.with_trades:
+            outputs.append(np.array([self.carry_trades], dtype=np.int64))
+            columns = _OHLCV_COLUMNS + ['trades']
+        return _frame_from_buckets(self.template, np.array([self.carry_key], dtype=np.int64), outputs,
+                                   label_offset, wall, columns)
+
+def is_tick_source(path, tf):
+    """True für Parquet/CSV mit Trade-Ticks oder Bars feiner als tf (liest nur den Kopf)"""
+    if not path.lower().endswith(('.parquet', '.csv')) or not os.path.isfile(path):
+        return False
+    try:
+        head = next(iter_source_chunks(path, TICK_PROBE_ROWS), None)
+        if head is None or head.empty:
+            return False
+        layout = detect_tick_layout(head)
+        if layout['kind'] == 'ticks':
+            return True
+        deltas = np.diff(_ns_values(chunk_datetime_index(head, layout)))
+        deltas = deltas[deltas > 0]
+        return bool(len(deltas)) and float(np.median(deltas)) < _offset_size(timeframe_offset(tf))
+    except (ValueError, KeyError, TypeError):
+        return False
+
+def tick_ingest_store_path(path, tf, directory=TICK_INGEST_DIR):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(directory, f"{stem}_{tf}{COLUMN_STORE_EXT}")
+
+def ingest_tick_source(path, tf, store_path=None, chunk_rows=TICK_INGEST_CHUNK_ROWS, tick_size=None):
+    """
+    📥 Tick-/Sekunden-Export → Column Store mit tf-Bars (blockweise, konstanter Speicher)
+
+    Ein vorhandener Store derselben Quelle (Größe, Änderungszeit, Timeframe)
+    wird wiederverwendet. Gibt (store_path, header) zurück.
+    """
+    store_path = store_path or tick_ingest_store_path(path, tf)
+    stat = os.stat(path)
+    source_info = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime, 'timeframe': tf,
+                   'version': TICK_INGEST_VERSION}
+    if is_column_store(store_path):
+        header = read_column_store_header(store_path)
+        if header.get('metadata', {}).get('tick_source') == source_info:
+            print(f"♻️ Tick-Ingest aus dem Cache: {store_path} ({header['rows']:,} {tf}-Bars)")
+            return store_path, header
+
+    os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+    print(f"📥 TICK-INGEST: {os.path.basename(path)} → {tf}-Bars (Blöcke à {chunk_rows:,} Zeilen)")
+    ingest_start = time.perf_counter()
+    aggregator = TickBarAggregator(tf)
+    writer = None
+    layout = None
+    rows_in = chunks = 0
+    try:
+        for chunk in iter_source_chunks(path, chunk_rows):
+            if chunk.empty:
+                continue
+            layout = layout or detect_tick_layout(chunk)
+            bars = aggregator.push(chunk_datetime_index(chunk, layout), chunk_ohlcv_arrays(chunk, layout),
+                                   chunk_trade_counts(chunk, layout))
+            rows_in += len(chunk)
+            chunks += 1
+            if bars is not None and len(bars):
+                if writer is None:
+                    writer = ColumnStoreWriter(store_path, tick_size=tick_size)
+                writer.append(bars)
+            if chunks % 10 == 0:
+                print(f"   📥 {rows_in:,} Zeilen gelesen ({time.perf_counter() - ingest_start:.1f}s)")
+        last = aggregator.finish()
+        if last is not None and len(last):
+            if writer is None:
+                writer = ColumnStoreWriter(store_path, tick_size=tick_size)
+            writer.append(last)
+        if writer is None:
+            raise ValueError(f"Keine Bars aus {os.path.basename(path)}")
+        offset = timeframe_offset(tf)
+        writer.metadata = {
+            'tick_source': source_info,
+            'source_kind': layout['kind'],
+            'source_rows': rows_in,
+            'chunks': chunks,
+            'bar_profile': {'freq': offset.freqstr, 'bar_spacing_ns': offset.nanos, 'source': 'tick_ingest'},
+        }
+        header = writer.close()
+    except Exception:
+        if writer is not None:
+            writer.abort()
+        raise
+    seconds = time.perf_counter() - ingest_start
+    print(f"✅ Tick-Ingest: {rows_in:,} {'Ticks' if layout['kind'] == 'ticks' else 'Bars'} in {chunks} Blöcken "
+          f"→ {header['rows']:,} {tf}-Bars ({seconds:.1f}s, {rows_in / max(seconds, 1e-9):,.0f} Zeilen/s)")
+    return store_path, header
+# ▲ EMBED END
+
+def get_tick_ingest_source():
+    """Liefert den einbettbaren Tick-Ingest-Code für die Code-Generatoren"""
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tick-/Sekunden-Export blockweise zu Bars (Column Store)")
+    parser.add_argument('--ingest', dest='path', required=True, help="Parquet oder CSV mit Ticks bzw. Sekunden-Bars")
+    parser.add_argument('--timeframe', default='1m', help="Bar-Größe des Stores (Standard: 1m)")
+    parser.add_argument('--chunk-rows', type=int, default=TICK_INGEST_CHUNK_ROWS)
+    parser.add_argument('--output', help="Ziel-Store (Standard: cache/ingest/<datei>_<tf>.cols)")
+    args = parser.parse_args(argv)
+    ingest_tick_source(args.path, args.timeframe, store_path=args.output, chunk_rows=args.chunk_rows)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
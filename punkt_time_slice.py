@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+✂️ PUNKT TIME SLICE - Zeitfenster per searchsorted statt Boolean-Masken
+
+Ein sortierter DatetimeIndex wird mit zwei binären Suchen (O(log n))
+geschnitten, das Ergebnis ist ein Positions-Slice (View, keine Kopie).
+Die Sortierung wird pro Index-Objekt nur einmal geprüft und gecacht;
+unsortierte Indizes fallen auf die bisherige Boolean-Maske zurück.
+
+Genutzt von Punkt1 (Zeitraum-Filter, Chart-Ausschnitte) und punkt3_1
+(Zeitrahmen-Filter). Die generierten Punkt-Skripte betten den Block
+zwischen den EMBED-Markern über get_time_slice_source() ein.
+"""
+
+# ▼ EMBED START
+import weakref
+import numpy as np
+import pandas as pd
+
+_SORTED_INDEX_CACHE = {}
+
+def index_is_sorted(index):
+    """Prüft einmal pro Index-Objekt, ob er aufsteigend sortiert ist (gecacht)"""
+    key = id(index)
+    cached = _SORTED_INDEX_CACHE.get(key)
+    if cached is not None and cached[0]() is index:
+        return cached[1]
+
+    is_sorted = bool(index.is_monotonic_increasing)
+    try:
+        ref = weakref.ref(index, lambda _ref, key=key: _SORTED_INDEX_CACHE.pop(key, None))
+        _SORTED_INDEX_CACHE[key] = (ref, is_sorted)
+    except TypeError:
+        pass  # Index ohne Weakref-Unterstützung - nicht cachen
+    return is_sorted
+
+def _align_timestamp(index, value):
+    """Bringt start/end auf die Zeitzone des Index"""
+    timestamp = pd.Timestamp(value)
+    index_tz = getattr(index, 'tz', None)
+    if index_tz is not None and timestamp.tz is None:
+        return timestamp.tz_localize(index_tz)
+    if index_tz is None and timestamp.tz is not None:
+        return timestamp.tz_convert(None)
+    return timestamp
+
+def slice_time_range(data, start=None, end=None):
+    """
+    ✂️ Schneidet data auf [start, end] (beide inklusive)
+
+    Sortierter Index: zwei searchsorted-Aufrufe + iloc-Slice (View).
+    Unsortierter Index: Boolean-Maske wie bisher.
+    """
+    if data is None or len(data) == 0:
+        return data
+
+    index = data.index
+    if not index_is_sorted(index):
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index >= _align_timestamp(index, start)
+        if end is not None:
+            mask &= index <= _align_timestamp(index, end)
+        return data.loc[mask]
+
+    left = 0 if start is None else index.searchsorted(_align_timestamp(index, start), side='left')
+    right = len(index) if end is None else index.searchsorted(_align_timestamp(index, end), side='right')
+    return data.iloc[left:right]
+
+def slice_last_period(data, period):
+    """✂️ Letzter Zeitraum (Timedelta oder Offset-String wie '7D') bis zum letzten Bar"""
+    if data is None or len(data) == 0:
+        return data
+    end = data.index.max() if not index_is_sorted(data.index) else data.index[-1]
+    return slice_time_range(data, end - pd.Timedelta(period), end)
+# ▲ EMBED END
+
+def get_time_slice_source():
+    """Liefert den einbettbaren Time-Slice Code für die Code-Generatoren"""
+    import os
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index('# ▼ EMBED START')
+    end = source.index('# ▲ EMBED END')
+    return source[start:end].rstrip()